@@ -0,0 +1,90 @@
+"""
+Benchmark listing a large catalog: the whole result as a list, or paged with iter_hfr_db.
+
+We report the time to the first hframe, the total time, and the peak RSS of a
+fresh process that walks every hframe, as 'dsdt ls -v' and 'dsdt rm --all' do.
+
+Usage:
+    python benchmarks/bench_catalog_iter.py [--bundles 100000] [--frames 10] [--page-size 1000]
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+import uuid
+
+import disdat.data_context as data_context
+import disdat.hyperframe as hyperframe
+
+
+def _engine(db_file):
+    settings = data_context.catalog_settings(__import__('ConfigParser').SafeConfigParser())
+    return data_context.create_catalog_engine('sqlite:///' + db_file, settings)
+
+
+def build(db_file, num_bundles, num_frames, batch=5000):
+    engine = _engine(db_file)
+    hyperframe.HyperFrameRecord.create_table(engine)
+    for start in range(0, num_bundles, batch):
+        bundles = []
+        for i in range(start, min(start + batch, num_bundles)):
+            frames = [('col_{}'.format(j), str(uuid.uuid1())) for j in range(num_frames)]
+            hfr = hyperframe.HyperFrameRecord(owner='bench', human_name='bench_{}'.format(i % 1000),
+                                              processing_name='BenchTask_{}'.format(i), uuid=str(uuid.uuid1()),
+                                              frames=frames, tags={'i': str(i), 'root_task': 'True'})
+            bundles.append((hfr, []))
+        hyperframe.w_bundles_db(bundles, engine)
+
+
+def _walk(args):
+    db_file, mode, projection, page_size = args
+    engine = _engine(db_file)
+    start = time.time()
+    first = None
+    count = 0
+    if mode == 'list':
+        hfrs = hyperframe.select_hfr_db(engine, orderby=True, projection=projection)
+    else:
+        hfrs = hyperframe.iter_hfr_db(engine, projection=projection, page_size=page_size)
+    for hfr in hfrs:
+        if first is None:
+            first = time.time() - start
+        count += 1
+    return count, first, time.time() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Catalog listing benchmark')
+    parser.add_argument('--bundles', type=int, default=100000, help='Number of bundles')
+    parser.add_argument('--frames', type=int, default=10, help='Frames in each bundle pb')
+    parser.add_argument('--page-size', type=int, default=hyperframe.HFR_PAGE_SIZE, help='iter_hfr_db page size')
+    args = parser.parse_args()
+
+    db_dir = tempfile.mkdtemp()
+    try:
+        db_file = os.path.join(db_dir, data_context.DB_FILE)
+        start = time.time()
+        build(db_file, args.bundles, args.frames)
+        print "Built {} bundles in {:.1f}s".format(args.bundles, time.time() - start)
+
+        print "{:10} {:>6} {:>8} {:>12} {:>10} {:>12}".format('walk', 'rows', 'count', 'first ms', 'total s',
+                                                               'peak MB')
+        for projection in (False, True):
+            for mode in ('list', 'iter'):
+                # A fresh process for each walk, so peak RSS is only this walk's.
+                pool = multiprocessing.Pool(1)
+                count, first, total, peak = pool.apply(_walk, ((db_file, mode, projection, args.page_size),))
+                pool.close()
+                pool.join()
+                print "{:10} {:>6} {:>8} {:>12.1f} {:>10.2f} {:>12.1f}".format(
+                    mode, 'row' if projection else 'record', count, first * 1000, total, peak)
+    finally:
+        shutil.rmtree(db_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark catalog write throughput with N concurrent writers.
+
+Each worker process opens its own engine on one shared ctxt.db and writes
+bundles (an hframe, its tags, and its frames) with hyperframe.w_bundles_db,
+as concurrent luigi workers do.  We compare sqlite's defaults against the
+[catalog] profile from disdat.cfg.
+
+Usage:
+    python benchmarks/bench_catalog_writers.py [--workers 1,2,4,8] [--bundles 200] [--frames 20]
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+import disdat.data_context as data_context
+import disdat.hyperframe as hyperframe
+
+
+PROFILES = {
+    # sqlite defaults: rollback journal, full fsync, pysqlite's 5s lock wait
+    'default': None,
+    'catalog': data_context.CATALOG_DEFAULTS,
+}
+
+
+def _make_engine(db_file, profile):
+    engine = create_engine('sqlite:///' + db_file)
+    if PROFILES[profile] is not None:
+        settings = data_context.catalog_settings(_parser(PROFILES[profile]))
+        data_context.set_sqlite_pragmas(engine, settings)
+    return engine
+
+
+def _parser(options):
+    import ConfigParser
+    parser = ConfigParser.SafeConfigParser()
+    parser.add_section(data_context.CATALOG_SECTION)
+    for k, v in options.iteritems():
+        parser.set(data_context.CATALOG_SECTION, k, v)
+    return parser
+
+
+def _make_bundle(worker, i, num_frames):
+    hfid = str(uuid.uuid1())
+    frames = [hyperframe.FrameRecord.from_ndarray(hfid, 'col_{}'.format(j), np.arange(16, dtype=np.int64))
+              for j in range(num_frames)]
+    hfr = hyperframe.HyperFrameRecord(owner='bench', human_name='bench_{}'.format(worker),
+                                      processing_name='BenchTask_{}_{}'.format(worker, i),
+                                      uuid=hfid, frames=frames, tags={'worker': str(worker), 'i': str(i)})
+    return hfr, frames
+
+
+def _worker(args):
+    db_file, profile, worker, num_bundles, num_frames = args
+    engine = _make_engine(db_file, profile)
+    bundles = [_make_bundle(worker, i, num_frames) for i in range(num_bundles)]
+    written = 0
+    failed = 0
+    start = time.time()
+    for bundle in bundles:
+        try:
+            hyperframe.w_bundles_db(bundle, engine)
+            written += 1
+        except OperationalError:
+            failed += 1
+    return written, failed, time.time() - start
+
+
+def run(profile, num_workers, num_bundles, num_frames):
+    db_dir = tempfile.mkdtemp()
+    try:
+        db_file = os.path.join(db_dir, data_context.DB_FILE)
+        engine = _make_engine(db_file, profile)
+        hyperframe.HyperFrameRecord.create_table(engine)
+        hyperframe.FrameRecord.create_table(engine)
+        engine.dispose()
+
+        pool = multiprocessing.Pool(num_workers)
+        results = pool.map(_worker, [(db_file, profile, w, num_bundles, num_frames) for w in range(num_workers)])
+        pool.close()
+        pool.join()
+    finally:
+        shutil.rmtree(db_dir)
+
+    written = sum(r[0] for r in results)
+    failed = sum(r[1] for r in results)
+    # Workers build their bundles before writing, so only count the slowest writer.
+    elapsed = max(r[2] for r in results)
+    return written, failed, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent catalog writers benchmark')
+    parser.add_argument('--workers', type=str, default='1,2,4,8', help='Comma separated worker counts')
+    parser.add_argument('--bundles', type=int, default=200, help='Bundles written by each worker')
+    parser.add_argument('--frames', type=int, default=20, help='Frames in each bundle')
+    args = parser.parse_args()
+
+    print "{:8} {:>8} {:>10} {:>8} {:>10} {:>12}".format('profile', 'workers', 'written', 'failed', 'secs', 'bundles/s')
+    for num_workers in [int(w) for w in args.workers.split(',')]:
+        for profile in sorted(PROFILES):
+            written, failed, elapsed = run(profile, num_workers, args.bundles, args.frames)
+            print "{:8} {:>8} {:>10} {:>8} {:>10.2f} {:>12.1f}".format(profile, num_workers, written, failed,
+                                                                     elapsed, written / elapsed)
+
+
+if __name__ == '__main__':
+    main()
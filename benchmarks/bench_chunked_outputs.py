@@ -0,0 +1,89 @@
+"""
+Benchmark writing a large DF bundle returned whole, and yielded a chunk at a time.
+
+A pipe_run that returns a dataframe holds all of it, and convert_df2frames encodes each
+column from it.  A pipe_run generator yields chunks, and each numeric column is appended to
+its .npy sidecar as they arrive, see data_context.ChunkedColumn, so only a chunk or two is
+held.  Each mode runs in its own process, and we report its time and peak resident memory.
+Columns are streamed once they reach --sidecar-size bytes, the [storage] sidecar_size.
+
+Usage:
+    python benchmarks/bench_chunked_outputs.py [--columns 10] [--rows 4000000] [--chunk-rows 100000]
+                                               [--sidecar-size 1048576]
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import disdat.data_context as data_context
+
+
+def make_chunk(num_columns, start, num_rows):
+    return pd.DataFrame(OrderedDict(('col_{}'.format(i), np.arange(start, start + num_rows, dtype=np.float64) * i)
+                                    for i in range(num_columns)))
+
+
+def write_whole(bundle_dir, args):
+    df = make_chunk(args.columns, 0, args.rows)
+    return data_context.DataContext.convert_df2frames(os.path.basename(bundle_dir), df, bundle_dir)
+
+
+def write_chunked(bundle_dir, args):
+    hfid = os.path.basename(bundle_dir)
+    columns = None
+    for start in range(0, args.rows, args.chunk_rows):
+        chunk = make_chunk(args.columns, start, min(args.chunk_rows, args.rows - start))
+        if columns is None:
+            columns = [data_context.ChunkedColumn(hfid, c, bundle_dir) for c in chunk.columns]
+        for column in columns:
+            column.append(chunk[column.name].values)
+    return [column.close() for column in columns]
+
+
+def run(mode, args, results):
+    settings = dict(data_context.storage_settings(), sidecar_size=args.sidecar_size)
+    data_context.storage_settings = lambda: settings
+    bundle_dir = os.path.join(tempfile.mkdtemp(), str(uuid.uuid1()))
+    os.makedirs(bundle_dir)
+    try:
+        start = time.time()
+        frames = (write_chunked if mode == 'chunked' else write_whole)(bundle_dir, args)
+        secs = time.time() - start
+        assert all(fr.is_sidecar_frame() for fr in frames)
+        # ru_maxrss is in KB on Linux
+        results.put((secs, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0))
+    finally:
+        shutil.rmtree(os.path.dirname(bundle_dir))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Chunked output benchmark')
+    parser.add_argument('--columns', type=int, default=10, help='Columns in the dataframe')
+    parser.add_argument('--rows', type=int, default=4000000, help='Rows in the dataframe')
+    parser.add_argument('--chunk-rows', type=int, default=100000, help='Rows in each yielded chunk')
+    parser.add_argument('--sidecar-size', type=int, default=1 << 20, help='Bytes before a column is streamed')
+    args = parser.parse_args()
+
+    print "{:8} {:>10} {:>10} {:>10}".format('mode', 'data MB', 'write ms', 'peak MB')
+    for mode in ('whole', 'chunked'):
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(target=run, args=(mode, args, results))
+        process.start()
+        process.join()
+        secs, peak = results.get(block=False)
+        print "{:8} {:>10.1f} {:>10.1f} {:>10.1f}".format(mode, args.columns * args.rows * 8 / float(1 << 20),
+                                                         secs * 1000, peak)
+
+
+if __name__ == '__main__':
+    main()
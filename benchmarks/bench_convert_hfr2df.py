@@ -0,0 +1,96 @@
+"""
+Benchmark presenting a DF bundle with DataContext.convert_hfr2df.
+
+Before, each frame became a pd.Series of its inline bytes and pd.concat(axis=1)
+aligned them and consolidated every column into new blocks, so all of the frames'
+bytes and the copy were held at once.  Now each frame is decoded into an array
+the dataframe keeps as its own block.  Each run is a fresh process, with the frame
+pbs already loaded, and we report the time and the peak RSS growth of the conversion.
+
+Usage:
+    python benchmarks/bench_convert_hfr2df.py [--columns 50] [--rows 1000000]
+"""
+
+import argparse
+import multiprocessing
+import resource
+import shutil
+import tempfile
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+import disdat.data_context as data_context
+import disdat.hyperframe as hyperframe
+
+
+class _BenchContext(object):
+    """ Just enough of a DataContext for convert_hfr2df """
+    load_frames = data_context.DataContext.load_frames.__func__
+    implicit_hframe_path = data_context.DataContext.implicit_hframe_path.__func__
+    convert_hfr2df = data_context.DataContext.convert_hfr2df.__func__
+
+    def __init__(self, object_dir):
+        self.object_dir = object_dir
+        self.frame_cache = data_context.FrameCache(1 << 40)
+        self.local_engine = create_engine('sqlite:///:memory:')
+        hyperframe.HyperFrameRecord.create_table(self.local_engine)
+        hyperframe.FrameRecord.create_table(self.local_engine)
+
+    def get_object_dir(self):
+        return self.object_dir
+
+
+def concat_hfr2df(ctxt, hfr):
+    """ convert_hfr2df as it was """
+    columns = [fr.to_series() for fr in hfr.get_frames(ctxt)]
+    return pd.concat(columns, axis=1)
+
+
+def _peak_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _convert(object_dir, num_columns, num_rows, concat):
+    ctxt = _BenchContext(object_dir)
+    hfid = str(uuid.uuid1())
+    frames = [hyperframe.FrameRecord.from_ndarray(hfid, 'col_{}'.format(i), np.random.rand(num_rows))
+              for i in range(num_columns)]
+    hfr = hyperframe.HyperFrameRecord(owner='bench', human_name='df', processing_name='DFTask', uuid=hfid,
+                                      frames=frames)
+    for fr in frames:
+        ctxt.frame_cache.put(fr)
+    del frames
+
+    before = _peak_mb()
+    start = time.time()
+    df = concat_hfr2df(ctxt, hfr) if concat else ctxt.convert_hfr2df(hfr)
+    secs = time.time() - start
+    return df.shape, secs, _peak_mb() - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description='convert_hfr2df benchmark')
+    parser.add_argument('--columns', type=int, default=50, help='float64 frames in the bundle')
+    parser.add_argument('--rows', type=int, default=1000000, help='values in each frame')
+    args = parser.parse_args()
+
+    object_dir = tempfile.mkdtemp()
+    try:
+        print "Data {:.1f} MB".format(args.columns * args.rows * 8 / float(1 << 20))
+        print "{:10} {:>14} {:>10} {:>10}".format('convert', 'shape', 'ms', 'peak MB')
+        for name, concat in (('concat', True), ('blocks', False)):
+            pool = multiprocessing.Pool(1)
+            shape, secs, peak_mb = pool.apply(_convert, (object_dir, args.columns, args.rows, concat))
+            pool.close()
+            pool.join()
+            print "{:10} {:>14} {:>10.1f} {:>10.1f}".format(name, shape, secs * 1000, peak_mb)
+    finally:
+        shutil.rmtree(object_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark parsing a csv into a bundle's frames, as `dsdt add` does.
+
+AddTask used to read the csv with pd.read_csv(sep=None), which finds the delimiter with
+the Python parser engine, reads the whole file, and then convert_df2frames encodes it.
+Now the delimiter is sniffed from the first lines, see add.sniff_delimiter, and the C engine
+parses --chunksize rows at a time into the frames.  Each mode runs in its own process, and
+we report its time and peak resident memory.
+
+Usage:
+    python benchmarks/bench_csv_add.py [--columns 10] [--rows 1000000] [--chunksize 262144]
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import disdat.add as add
+import disdat.data_context as data_context
+
+
+def write_csv(path, num_columns, num_rows):
+    rng = np.random.RandomState(0)
+    columns = [('col_{}'.format(i), rng.rand(num_rows)) for i in range(num_columns - 1)]
+    columns.append(('name', np.array(['name_{}'.format(i) for i in rng.randint(0, 1000, num_rows)])))
+    pd.DataFrame(OrderedDict(columns)).to_csv(path, index=False)
+
+
+def parse_python(input_path, bundle_dir, args):
+    df = pd.read_csv(input_path, sep=None, engine='python')
+    return data_context.DataContext.convert_df2frames(os.path.basename(bundle_dir), df, bundle_dir)
+
+
+def parse_chunked(input_path, bundle_dir, args):
+    task = add.AddTask(input_path, 'bench', {}, chunksize=args.chunksize)
+    return task.convert_csv2frames(os.path.basename(bundle_dir), bundle_dir)
+
+
+def run(mode, input_path, args, results):
+    bundle_dir = os.path.join(tempfile.mkdtemp(), str(uuid.uuid1()))
+    os.makedirs(bundle_dir)
+    try:
+        start = time.time()
+        frames = (parse_chunked if mode == 'chunked' else parse_python)(input_path, bundle_dir, args)
+        secs = time.time() - start
+        assert len(frames) == args.columns
+        # ru_maxrss is in KB on Linux
+        results.put((secs, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0))
+    finally:
+        shutil.rmtree(os.path.dirname(bundle_dir))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='csv add benchmark')
+    parser.add_argument('--columns', type=int, default=10, help='Columns in the csv')
+    parser.add_argument('--rows', type=int, default=1000000, help='Rows in the csv')
+    parser.add_argument('--chunksize', type=int, default=add.ADD_CHUNK_ROWS, help='Rows parsed at a time')
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        input_path = os.path.join(tmp_dir, 'bench.csv')
+        write_csv(input_path, args.columns, args.rows)
+        csv_mb = os.path.getsize(input_path) / float(1 << 20)
+
+        print "{:8} {:>10} {:>10} {:>10}".format('mode', 'csv MB', 'add ms', 'peak MB')
+        for mode in ('python', 'chunked'):
+            results = multiprocessing.Queue()
+            process = multiprocessing.Process(target=run, args=(mode, input_path, args, results))
+            process.start()
+            process.join()
+            secs, peak = results.get(block=False)
+            print "{:8} {:>10.1f} {:>10.1f} {:>10.1f}".format(mode, csv_mb, secs * 1000, peak)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark compressing frame data with each installed codec.
+
+Frame data used to be stored, and pushed and pulled, as raw bytes.  With a codec
+FrameRecord.from_ndarray compresses it and make_numpy_array decompresses it.  For
+columns like those in our bundles we report the serialized frame size, the ratio to
+the uncompressed frame, and the median time to make the frame and to read it back.
+'auto' is the [storage] default, which skips frames whose sample does not compress.
+
+Usage:
+    python benchmarks/bench_frame_codecs.py [--rows 1000000] [--repeat 3]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import disdat.compression as compression
+import disdat.hyperframe as hyperframe
+
+
+def make_columns(num_rows):
+    rng = np.random.RandomState(0)
+    sparse = np.zeros(num_rows)
+    sparse[rng.randint(0, num_rows, num_rows // 100)] = rng.rand(num_rows // 100)
+    return (('sparse', sparse),
+            ('category', rng.randint(0, 12, num_rows).astype(np.int64)),
+            ('status', np.array(['ok', 'retry', 'failed'])[rng.randint(0, 3, num_rows)]),
+            ('random', rng.rand(num_rows)))
+
+
+def timed(fn, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.time()
+        result = fn()
+        times.append(time.time() - start)
+    return sorted(times)[len(times) // 2], result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Frame codec benchmark')
+    parser.add_argument('--rows', type=int, default=1000000, help='Values in each column')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per step, we report the median')
+    args = parser.parse_args()
+
+    codecs = ['none', 'auto'] + [c for c in ('zlib', 'lz4', 'zstd') if compression.CODECS[c] is not None]
+
+    print "{:10} {:6} {:>10} {:>8} {:>10} {:>10}".format('column', 'codec', 'MB', 'ratio', 'write ms', 'read ms')
+    for column, nda in make_columns(args.rows):
+        raw_size = None
+        for codec in codecs:
+            write_secs, fr = timed(lambda: hyperframe.FrameRecord.from_ndarray('bench', column, nda, codec=codec),
+                                   args.repeat)
+            size = fr.pb.ByteSize()
+            raw_size = raw_size or size
+            read_secs, found = timed(fr.to_ndarray, args.repeat)
+            assert np.array_equal(found, nda)
+            print "{:10} {:6} {:>10.2f} {:>8.1f} {:>10.1f} {:>10.1f}".format(
+                column, codec, size / float(1 << 20), raw_size / float(size), write_secs * 1000, read_secs * 1000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark reading frame pbs from disk under each hash algorithm and verify policy.
+
+Each frame holds --mb MB of float64 data inline.  We time hyperframe.r_pb_fs for
+an ordinary read, so 'rebuild-and-pull' and 'never' skip the check and 'sampled'
+checks sample_rate of the reads.
+
+Usage:
+    python benchmarks/bench_integrity.py [--frames 20] [--mb 8] [--repeat 3]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+import disdat.hyperframe as hyperframe
+import disdat.integrity as integrity
+
+
+def write_frames(testdir, num_frames, mb):
+    paths = []
+    count = mb * (1 << 20) // 8
+    for i in range(num_frames):
+        fr = hyperframe.FrameRecord(name='col_{}'.format(i), hframe_uuid=str(uuid.uuid1()), type='FLOAT64',
+                                    data=np.random.rand(count).tobytes(), shape=(count,))
+        hyperframe.w_pb_fs(testdir, fr)
+        paths.append(os.path.join(testdir, fr.get_filename()))
+    return paths
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        fn()
+        times.append(time.time() - start)
+    return sorted(times)[len(times) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record integrity check benchmark')
+    parser.add_argument('--frames', type=int, default=20, help='Number of frame pbs')
+    parser.add_argument('--mb', type=int, default=8, help='MB of data in each frame')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per read, we report the median')
+    args = parser.parse_args()
+
+    print "{:10} {:18} {:>12} {:>12}".format('hash', 'verify', 'ms', 'MB/s')
+    for algorithm in sorted(integrity.HASH_ALGORITHMS):
+        if integrity.HASH_ALGORITHMS[algorithm] is None:
+            print "{:10} not installed".format(algorithm)
+            continue
+        testdir = tempfile.mkdtemp()
+        try:
+            integrity.configure(dict(integrity.get_settings(), hash=algorithm))
+            paths = write_frames(testdir, args.frames, args.mb)
+            for policy in integrity.VERIFY_POLICIES:
+                integrity.configure(dict(integrity.get_settings(), verify=policy))
+                secs = timed(lambda: [hyperframe.r_pb_fs(p, hyperframe.FrameRecord) for p in paths], args.repeat)
+                print "{:10} {:18} {:>12.1f} {:>12.1f}".format(algorithm, policy, secs * 1000,
+                                                                args.frames * args.mb / secs)
+        finally:
+            integrity.configure()
+            shutil.rmtree(testdir)
+
+
+if __name__ == '__main__':
+    main()
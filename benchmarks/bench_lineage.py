@@ -0,0 +1,118 @@
+"""
+Benchmark lineage walks on a catalog of layered pipeline runs.
+
+Each run is a chain of layers, each bundle depending on two bundles of the layer
+before it.  We compare walking downstream (impact analysis) by parsing every
+hframe pb in the catalog, which is what lineage needed before, against
+hyperframe.select_lineage_db over the lineage_edges table.
+
+Usage:
+    python benchmarks/bench_lineage.py [--runs 500] [--layers 5] [--width 4] [--repeat 5]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+
+from sqlalchemy.sql import select
+
+import disdat.data_context as data_context
+import disdat.hyperframe as hyperframe
+
+
+def _lineage(name, hfid, depends_on):
+    return hyperframe.LineageRecord(hframe_name=name, hframe_uuid=hfid, code_repo='bench', code_name='bench',
+                                    code_semver='0.1.0', code_hash='abc', code_branch='develop',
+                                    depends_on=depends_on)
+
+
+def build(engine, num_runs, num_layers, width):
+    """
+    Returns:
+        (str): uuid of a bundle in the first layer of the first run
+    """
+    hyperframe.HyperFrameRecord.create_table(engine)
+    first = None
+    for run in range(num_runs):
+        bundles = []
+        prev = []
+        for layer in range(num_layers):
+            current = []
+            for w in range(width):
+                name = 'Task_{}_{}_{}'.format(run, layer, w)
+                hfid = str(uuid.uuid1())
+                depends_on = [prev[w], prev[(w + 1) % width]] if prev else []
+                hfr = hyperframe.HyperFrameRecord(owner='bench', human_name='layer_{}'.format(layer),
+                                                  processing_name=name, uuid=hfid,
+                                                  lin_obj=_lineage(name, hfid, depends_on))
+                bundles.append((hfr, []))
+                current.append((name, hfid))
+            prev = current
+        hyperframe.w_bundles_db(bundles, engine)
+        if first is None:
+            first = bundles[0][0].pb.uuid
+    return first
+
+
+def downstream_from_pbs(engine, start_uuid):
+    """ Parse every hframe pb to build the child map, then walk it """
+    hframes = hyperframe.HyperFrameRecord.get_tables()[hyperframe.HyperFrameRecord.table_name]
+    children = defaultdict(list)
+    with engine.connect() as conn:
+        for row in conn.execute(select([hframes.c.pb])):
+            hfr = hyperframe.HyperFrameRecord.from_str_bytes(row['pb'])
+            for dep in hfr.pb.lineage.depends_on:
+                children[dep.hframe_uuid].append(hfr.pb.uuid)
+    found = set()
+    frontier = [start_uuid]
+    while frontier:
+        frontier = [c for u in frontier for c in children[u] if c not in found]
+        found.update(frontier)
+    return found
+
+
+def timed(fn, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.time()
+        result = fn()
+        times.append(time.time() - start)
+    return sorted(times)[len(times) // 2], result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lineage walk benchmark')
+    parser.add_argument('--runs', type=int, default=500, help='Number of pipeline runs')
+    parser.add_argument('--layers', type=int, default=5, help='Layers in each run')
+    parser.add_argument('--width', type=int, default=4, help='Bundles in each layer')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per walk, we report the median')
+    args = parser.parse_args()
+
+    db_dir = tempfile.mkdtemp()
+    try:
+        settings = data_context.catalog_settings(__import__('ConfigParser').SafeConfigParser())
+        engine = data_context.create_catalog_engine('sqlite:///' + os.path.join(db_dir, data_context.DB_FILE),
+                                                    settings)
+        start = time.time()
+        start_uuid = build(engine, args.runs, args.layers, args.width)
+        print "Built {} bundles in {:.1f}s".format(args.runs * args.layers * args.width, time.time() - start)
+
+        pb_secs, pb_found = timed(lambda: downstream_from_pbs(engine, start_uuid), args.repeat)
+        sql_secs, nodes = timed(lambda: hyperframe.select_lineage_db(engine, start_uuid, direction='downstream'),
+                                args.repeat)
+        assert pb_found == set(n.uuid for n in nodes)
+
+        print "{:24} {:>8} {:>12}".format('walk', 'found', 'ms')
+        print "{:24} {:>8} {:>12.1f}".format('parse every pb', len(pb_found), pb_secs * 1000)
+        print "{:24} {:>8} {:>12.1f}".format('lineage_edges CTE', len(nodes), sql_secs * 1000)
+    finally:
+        shutil.rmtree(db_dir)
+
+
+if __name__ == '__main__':
+    main()
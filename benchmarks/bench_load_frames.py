@@ -0,0 +1,88 @@
+"""
+Benchmark loading every frame of a wide bundle.
+
+Before, each frame pb was opened and read from objects/<uuid>/<frame uuid>_frame.pb.
+Now DataContext.load_frames reads them from the pb blobs in the catalog's frames
+table with hyperframe.select_fr_db, one query for up to FRAME_QUERY_BATCH frames.
+On a network filesystem the difference is one round trip per column.
+
+Usage:
+    python benchmarks/bench_load_frames.py [--columns 500] [--rows 1000] [--repeat 5]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+import disdat.data_context as data_context
+import disdat.hyperframe as hyperframe
+
+
+def build(db_dir, num_columns, num_rows):
+    settings = data_context.catalog_settings(__import__('ConfigParser').SafeConfigParser())
+    engine = data_context.create_catalog_engine('sqlite:///' + os.path.join(db_dir, data_context.DB_FILE), settings)
+    hyperframe.HyperFrameRecord.create_table(engine)
+    hyperframe.FrameRecord.create_table(engine)
+
+    hfid = str(uuid.uuid1())
+    hfr_dir = os.path.join(db_dir, hfid)
+    os.makedirs(hfr_dir)
+    frames = []
+    for i in range(num_columns):
+        fr = hyperframe.FrameRecord(name='col_{}'.format(i), hframe_uuid=hfid, type='FLOAT64',
+                                    data=np.random.rand(num_rows).tobytes(), shape=(num_rows,))
+        hyperframe.w_pb_fs(hfr_dir, fr)
+        frames.append(fr)
+    hfr = hyperframe.HyperFrameRecord(owner='bench', human_name='wide', processing_name='WideTask', uuid=hfid,
+                                      frames=[(fr.pb.name, fr.pb.uuid) for fr in frames])
+    hyperframe.w_bundles_db((hfr, frames), engine)
+    return engine, hfr, hfr_dir
+
+
+def from_files(hfr, hfr_dir):
+    return [hyperframe.r_pb_fs(os.path.join(hfr_dir, hyperframe.FrameRecord.make_filename(fr_uuid)),
+                               hyperframe.FrameRecord)
+            for _, fr_uuid in hfr.get_frame_ids()]
+
+
+def from_catalog(engine, hfr):
+    return hyperframe.select_fr_db(engine, [fr_uuid for _, fr_uuid in hfr.get_frame_ids()])
+
+
+def timed(fn, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.time()
+        result = fn()
+        times.append(time.time() - start)
+    return sorted(times)[len(times) // 2], len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Wide bundle frame loading benchmark')
+    parser.add_argument('--columns', type=int, default=500, help='Frames in the bundle')
+    parser.add_argument('--rows', type=int, default=1000, help='float64 values in each frame')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per load, we report the median')
+    args = parser.parse_args()
+
+    db_dir = tempfile.mkdtemp()
+    try:
+        engine, hfr, hfr_dir = build(db_dir, args.columns, args.rows)
+
+        print "{:24} {:>8} {:>12}".format('load', 'frames', 'ms')
+        for name, fn in (('one file per frame', lambda: from_files(hfr, hfr_dir)),
+                         ('catalog blobs', lambda: from_catalog(engine, hfr))):
+            secs, count = timed(fn, args.repeat)
+            print "{:24} {:>8} {:>12.1f}".format(name, count, secs * 1000)
+    finally:
+        shutil.rmtree(db_dir)
+
+
+if __name__ == '__main__':
+    main()
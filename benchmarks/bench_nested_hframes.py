@@ -0,0 +1,120 @@
+"""
+Benchmark building and walking a deep tree of nested hyperframes.
+
+Every inner bundle holds one HFRAME frame with --fanout child hframes, as tree
+pipelines like examples/pipelines/simple_tree.py make.  We compare the previous
+behavior, which copied each child pb twice when making the frame and once more
+on every FrameRecord.get_hframes, against frames that copy each child once and
+get_hframes views that only copy when modified.
+
+'frames ms' is making just the frames of the deepest inner level.
+
+Usage:
+    python benchmarks/bench_nested_hframes.py [--fanout 100] [--depth 3] [--repeat 3]
+"""
+
+import argparse
+import time
+import uuid
+from collections import deque
+
+import disdat.hyperframe as hyperframe
+
+
+def _lineage(name, hfid):
+    return hyperframe.LineageRecord(hframe_name=name, hframe_uuid=hfid, code_repo='bench', code_name='bench',
+                                    code_semver='0.1.0', code_hash='abc', code_branch='develop')
+
+
+def _hfr(name, frames):
+    hfid = str(uuid.uuid1())
+    return hyperframe.HyperFrameRecord(owner='bench', human_name=name, processing_name=name, uuid=hfid,
+                                       frames=frames, tags={'level': name, 'root_task': 'False'},
+                                       lin_obj=_lineage(name, hfid))
+
+
+def copy_hframe_frame(hfid, name, hframes):
+    """ make_hframe_frame as it was, a copy of each child then a copy into the frame """
+    fr = hyperframe.FrameRecord(name=name, hframe_uuid=hfid, type='HFRAME', shape=(len(hframes),))
+    fr.pb.hframes.extend([hyperframe.HyperFrameRecord.copy_from_pb(h.pb).pb for h in hframes])
+    return fr
+
+
+def copy_get_hframes(fr):
+    """ get_hframes as it was """
+    return [hyperframe.HyperFrameRecord.copy_from_pb(pb) for pb in fr.pb.hframes]
+
+
+def build(fanout, depth, make_frame):
+    """
+    Returns:
+        (HyperFrameRecord, dict): the root, and hframe uuid to its frames
+    """
+    frames = {}
+    level = []
+    for i in range(fanout ** (depth - 1)):
+        leaf = _hfr('leaf', [])
+        frames[leaf.pb.uuid] = []
+        level.append(leaf)
+    for d in range(depth - 1):
+        parents = []
+        for start in range(0, len(level), fanout):
+            hfid = str(uuid.uuid1())
+            fr = make_frame(hfid, 'children', level[start:start + fanout])
+            parent = _hfr('inner_{}'.format(d), [(fr.pb.name, fr.pb.uuid)])
+            frames[parent.pb.uuid] = [fr]
+            parents.append(parent)
+        level = parents
+    return level[0], frames
+
+
+def make_frames(hframes, fanout, make_frame):
+    """ Just the frames of the deepest inner level """
+    return [make_frame('parent', 'children', hframes[start:start + fanout])
+            for start in range(0, len(hframes), fanout)]
+
+
+def walk(root, frames, get_hframes):
+    """ Breadth first, as get_presentables and _get_all_link_frames do """
+    frontier = deque([root])
+    count = 0
+    while frontier:
+        hfr = frontier.popleft()
+        count += 1
+        for fr in frames[hfr.pb.uuid]:
+            frontier.extend(get_hframes(fr))
+    return count
+
+
+def timed(fn, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.time()
+        result = fn()
+        times.append(time.time() - start)
+    return sorted(times)[len(times) // 2], result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Nested hyperframe benchmark')
+    parser.add_argument('--fanout', type=int, default=100, help='Children of each inner bundle')
+    parser.add_argument('--depth', type=int, default=3, help='Levels in the tree, including the root')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per step, we report the median')
+    args = parser.parse_args()
+
+    leaves = [_hfr('leaf', []) for _ in range(args.fanout ** (args.depth - 1))]
+
+    print "{:10} {:>10} {:>12} {:>12} {:>12}".format('hframes', 'nodes', 'build ms', 'frames ms', 'walk ms')
+    for name, make_frame, get_hframes in (('copies', copy_hframe_frame, copy_get_hframes),
+                                          ('views', hyperframe.FrameRecord.make_hframe_frame,
+                                           hyperframe.FrameRecord.get_hframes)):
+        build_secs, (root, frames) = timed(lambda: build(args.fanout, args.depth, make_frame), args.repeat)
+        frame_secs, _ = timed(lambda: make_frames(leaves, args.fanout, make_frame), args.repeat)
+        walk_secs, count = timed(lambda: walk(root, frames, get_hframes), args.repeat)
+        print "{:10} {:>10} {:>12.1f} {:>12.1f} {:>12.1f}".format(name, count, build_secs * 1000,
+                                                                  frame_secs * 1000, walk_secs * 1000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark writing and reading a wide bundle in each storage layout.
+
+With layout = files a bundle is a <uuid>_hframe.pb plus a <uuid>_frame.pb per
+column, so a push or pull of a --columns bundle is --columns + 1 s3 requests.
+With layout = packed it is one <uuid>_bundle.pb and one request.  We report the
+files written, their bytes, and the time to write the bundle and read it back
+with r_pb_fs (files) or r_packed_fs (packed).
+
+Usage:
+    python benchmarks/bench_packed_bundle.py [--columns 300] [--rows 1000] [--repeat 5]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+import disdat.hyperframe as hyperframe
+
+
+def make_bundle(num_columns, num_rows):
+    hfid = str(uuid.uuid1())
+    frames = [hyperframe.FrameRecord(name='col_{}'.format(i), hframe_uuid=hfid, type='FLOAT64',
+                                     data=np.random.rand(num_rows).tobytes(), shape=(num_rows,))
+              for i in range(num_columns)]
+    hfr = hyperframe.HyperFrameRecord(owner='bench', human_name='wide', processing_name='WideTask', uuid=hfid,
+                                      frames=[(fr.pb.name, fr.pb.uuid) for fr in frames])
+    return hfr, frames
+
+
+def write_files(bundle_dir, hfr, frames):
+    for fr in frames:
+        hyperframe.w_pb_fs(bundle_dir, fr)
+    hyperframe.w_pb_fs(bundle_dir, hfr)
+
+
+def read_files(bundle_dir, hfr):
+    hyperframe.r_pb_fs(os.path.join(bundle_dir, hfr.get_filename()), hyperframe.HyperFrameRecord)
+    return [hyperframe.r_pb_fs(os.path.join(bundle_dir, hyperframe.FrameRecord.make_filename(fr_uuid)),
+                               hyperframe.FrameRecord)
+            for _, fr_uuid in hfr.get_frame_ids()]
+
+
+def write_packed(bundle_dir, hfr, frames):
+    hyperframe.w_packed_fs(bundle_dir, hfr, frames)
+
+
+def read_packed(bundle_dir, hfr):
+    return hyperframe.r_packed_fs(os.path.join(bundle_dir, hyperframe.packed_filename(hfr.pb.uuid)))
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        fn()
+        times.append(time.time() - start)
+    return sorted(times)[len(times) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Packed bundle benchmark')
+    parser.add_argument('--columns', type=int, default=300, help='Frames in the bundle')
+    parser.add_argument('--rows', type=int, default=1000, help='float64 values in each frame')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per step, we report the median')
+    args = parser.parse_args()
+
+    hfr, frames = make_bundle(args.columns, args.rows)
+
+    print "{:8} {:>8} {:>12} {:>12} {:>12}".format('layout', 'files', 'MB', 'write ms', 'read ms')
+    for name, write, read in (('files', write_files, read_files), ('packed', write_packed, read_packed)):
+        bundle_dir = tempfile.mkdtemp()
+        try:
+            write_secs = timed(lambda: write(bundle_dir, hfr, frames), args.repeat)
+            read_secs = timed(lambda: read(bundle_dir, hfr), args.repeat)
+            names = os.listdir(bundle_dir)
+            mb = sum(os.path.getsize(os.path.join(bundle_dir, n)) for n in names) / float(1 << 20)
+            print "{:8} {:>8} {:>12.2f} {:>12.1f} {:>12.1f}".format(name, len(names), mb, write_secs * 1000,
+                                                                    read_secs * 1000)
+        finally:
+            shutil.rmtree(bundle_dir)
+
+
+if __name__ == '__main__':
+    main()
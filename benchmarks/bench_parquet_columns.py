@@ -0,0 +1,117 @@
+"""
+Benchmark a wide DF bundle stored as a frame per column and as one Parquet file.
+
+With df_format = frames, writing makes and writes a frame pb per column, and
+convert_hfr2df reads every frame it is asked for.  With df_format = parquet the
+columns go to one <uuid>_bundle.parquet, and convert_hfr2df reads only the columns
+asked for from it.  We report the bytes on disk, the time to write the bundle, and
+the time to read all of its columns and just --select of them.  Needs pyarrow.
+
+Usage:
+    python benchmarks/bench_parquet_columns.py [--columns 200] [--rows 100000] [--select 5]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+import disdat.data_context as data_context
+import disdat.hyperframe as hyperframe
+
+
+class _BenchContext(object):
+    """ Just enough of a DataContext for convert_hfr2df """
+    load_frames = data_context.DataContext.load_frames.__func__
+    implicit_hframe_path = data_context.DataContext.implicit_hframe_path.__func__
+    convert_hfr2df = data_context.DataContext.convert_hfr2df.__func__
+
+    def __init__(self, object_dir):
+        self.object_dir = object_dir
+        # No frame cache, each read parses the frame pbs from the catalog as a new process would
+        self.frame_cache = data_context.FrameCache(0)
+        self.local_engine = create_engine('sqlite:///:memory:')
+        hyperframe.HyperFrameRecord.create_table(self.local_engine)
+        hyperframe.FrameRecord.create_table(self.local_engine)
+
+    def get_object_dir(self):
+        return self.object_dir
+
+
+def make_df(num_columns, num_rows):
+    rng = np.random.RandomState(0)
+    columns = []
+    for i in range(num_columns):
+        if i % 4 == 0:
+            values = np.array(['k{}'.format(v) for v in rng.randint(0, 1000, num_rows)], dtype=np.object_)
+        elif i % 4 == 1:
+            values = rng.randint(0, 100, num_rows)
+        else:
+            values = rng.rand(num_rows)
+        columns.append(('col_{}'.format(i), values))
+    return pd.DataFrame(OrderedDict(columns))
+
+
+def write(ctxt, df, parquet):
+    hfid = str(uuid.uuid1())
+    bundle_dir = os.path.join(ctxt.object_dir, hfid)
+    os.makedirs(bundle_dir)
+    if parquet:
+        frames = hyperframe.FrameRecord.make_parquet_frames(hfid, df, bundle_dir)
+    else:
+        frames = [hyperframe.FrameRecord.from_serieslike(hfid, c, df[c]) for c in df.columns]
+    for fr in frames:
+        hyperframe.w_pb_fs(bundle_dir, fr)
+    hfr = hyperframe.HyperFrameRecord(owner='bench', human_name='wide', processing_name='WideTask', uuid=hfid,
+                                      frames=frames)
+    hyperframe.w_pb_fs(bundle_dir, hfr)
+    hyperframe.w_bundles_db((hfr, frames), ctxt.local_engine)
+    return hfr, bundle_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parquet DF bundle benchmark')
+    parser.add_argument('--columns', type=int, default=200, help='Columns in the dataframe')
+    parser.add_argument('--rows', type=int, default=100000, help='Rows in the dataframe')
+    parser.add_argument('--select', type=int, default=5, help='Columns a downstream task reads')
+    args = parser.parse_args()
+
+    if hyperframe.PYARROW is None:
+        raise Exception("This benchmark needs pyarrow, try 'pip install pyarrow'")
+
+    df = make_df(args.columns, args.rows)
+    selected = list(df.columns[::args.columns // args.select][:args.select])
+
+    print "{:8} {:>10} {:>10} {:>12} {:>14}".format('format', 'MB', 'write ms', 'read all ms',
+                                                    'read {} ms'.format(len(selected)))
+    for name, parquet in (('frames', False), ('parquet', True)):
+        object_dir = tempfile.mkdtemp()
+        try:
+            ctxt = _BenchContext(object_dir)
+            start = time.time()
+            hfr, bundle_dir = write(ctxt, df, parquet)
+            write_secs = time.time() - start
+            mb = sum(os.path.getsize(os.path.join(bundle_dir, f)) for f in os.listdir(bundle_dir)) / float(1 << 20)
+
+            start = time.time()
+            assert ctxt.convert_hfr2df(hfr).shape == df.shape
+            all_secs = time.time() - start
+            start = time.time()
+            assert list(ctxt.convert_hfr2df(hfr, columns=selected).columns) == selected
+            select_secs = time.time() - start
+
+            print "{:8} {:>10.1f} {:>10.1f} {:>12.1f} {:>14.1f}".format(name, mb, write_secs * 1000,
+                                                                        all_secs * 1000, select_secs * 1000)
+        finally:
+            shutil.rmtree(object_dir)
+
+
+if __name__ == '__main__':
+    main()
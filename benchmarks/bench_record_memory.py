@@ -0,0 +1,79 @@
+"""
+Benchmark the memory held by 100k parsed HyperFrameRecords.
+
+Each record has --frames frames, --tags tags, and lineage, like the bundles
+'dsdt ls -l', rebuild_db and prune_uncommitted_history load.  A fresh process
+parses the pbs with HyperFrameRecord.from_str_bytes and keeps them all.  We
+report the growth in RSS per record, first with the records as loaded, and
+then after reading every record's tags and frames (which builds the maps).
+
+Usage:
+    python benchmarks/bench_record_memory.py [--records 100000] [--frames 10] [--tags 5]
+"""
+
+import argparse
+import multiprocessing
+import time
+import uuid
+
+import disdat.hyperframe as hyperframe
+
+
+def _rss_mb():
+    """ Current, not peak, RSS """
+    with open('/proc/self/statm') as f:
+        pages = int(f.read().split()[1])
+    return pages * 4096 / float(1 << 20)
+
+
+def make_pbs(num_records, num_frames, num_tags):
+    pbs = []
+    for i in range(num_records):
+        hfid = str(uuid.uuid1())
+        lin = hyperframe.LineageRecord(hframe_name='bench_{}'.format(i % 100), hframe_uuid=hfid, code_repo='bench',
+                                       code_name='bench', code_semver='0.1.0', code_hash='abc', code_branch='develop')
+        hfr = hyperframe.HyperFrameRecord(owner='bench', human_name='bench_{}'.format(i % 100),
+                                          processing_name='BenchTask_{}'.format(i), uuid=hfid,
+                                          frames=[('col_{}'.format(j), str(uuid.uuid1())) for j in range(num_frames)],
+                                          tags={'k{}'.format(j): 'v{}'.format(i % (j + 7)) for j in range(num_tags)},
+                                          lin_obj=lin)
+        pbs.append(hfr.pb.SerializeToString())
+    return pbs
+
+
+def _load(pbs):
+    before = _rss_mb()
+    start = time.time()
+    records = [hyperframe.HyperFrameRecord.from_str_bytes(pb) for pb in pbs]
+    load_secs = time.time() - start
+    loaded = _rss_mb()
+    for hfr in records:
+        hfr.get_tags()
+        hfr.get_frame_ids()
+    used = _rss_mb()
+    return len(records), load_secs, loaded - before, used - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HyperFrameRecord memory benchmark')
+    parser.add_argument('--records', type=int, default=100000, help='Number of records')
+    parser.add_argument('--frames', type=int, default=10, help='Frames in each record')
+    parser.add_argument('--tags', type=int, default=5, help='Tags on each record')
+    args = parser.parse_args()
+
+    pbs = make_pbs(args.records, args.frames, args.tags)
+    print "Made {} pbs, {:.1f} MB serialized".format(len(pbs), sum(len(pb) for pb in pbs) / float(1 << 20))
+
+    # A fresh process, so RSS is only this load's.
+    pool = multiprocessing.Pool(1)
+    count, load_secs, loaded_mb, used_mb = pool.apply(_load, (pbs,))
+    pool.close()
+    pool.join()
+
+    print "{:>10} {:>10} {:>14} {:>14} {:>14}".format('records', 'load s', 'loaded MB', 'used MB', 'KB/record')
+    print "{:>10} {:>10.2f} {:>14.1f} {:>14.1f} {:>14.2f}".format(count, load_secs, loaded_mb, used_mb,
+                                                                  used_mb * 1024 / count)
+
+
+if __name__ == '__main__':
+    main()
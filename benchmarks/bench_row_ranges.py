@@ -0,0 +1,102 @@
+"""
+Benchmark reading the head of a large DF bundle, as `dsdt cat --head` does.
+
+convert_hfr2df used to decode every frame in full.  With rows, sidecar frames map only
+those rows of their .npy files, Parquet frames read only the row groups that hold them,
+and inline frames decode only those rows of their data.  For each layout we report the
+time to read all rows, and just the first --head.  Parquet needs pyarrow.
+
+Usage:
+    python benchmarks/bench_row_ranges.py [--columns 20] [--rows 2000000] [--head 10]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+import disdat.data_context as data_context
+import disdat.hyperframe as hyperframe
+
+
+class _BenchContext(object):
+    """ Just enough of a DataContext for convert_hfr2df """
+    load_frames = data_context.DataContext.load_frames.__func__
+    implicit_hframe_path = data_context.DataContext.implicit_hframe_path.__func__
+    convert_hfr2df = data_context.DataContext.convert_hfr2df.__func__
+
+    def __init__(self, object_dir):
+        self.object_dir = object_dir
+        self.frame_cache = data_context.FrameCache(0)
+        self.local_engine = create_engine('sqlite:///:memory:')
+        hyperframe.HyperFrameRecord.create_table(self.local_engine)
+        hyperframe.FrameRecord.create_table(self.local_engine)
+
+    def get_object_dir(self):
+        return self.object_dir
+
+
+def make_df(num_columns, num_rows):
+    rng = np.random.RandomState(0)
+    return pd.DataFrame(OrderedDict(('col_{}'.format(i), rng.rand(num_rows)) for i in range(num_columns)))
+
+
+def write(ctxt, df, layout):
+    hfid = str(uuid.uuid1())
+    bundle_dir = os.path.join(ctxt.object_dir, hfid)
+    os.makedirs(bundle_dir)
+    if layout == 'parquet':
+        frames = hyperframe.FrameRecord.make_parquet_frames(hfid, df, bundle_dir)
+    else:
+        frames = [hyperframe.FrameRecord.from_serieslike(hfid, c, df[c], sidecar_dir=bundle_dir,
+                                                         sidecar_size=1 if layout == 'sidecar' else 0)
+                  for c in df.columns]
+    for fr in frames:
+        hyperframe.w_pb_fs(bundle_dir, fr)
+    hfr = hyperframe.HyperFrameRecord(owner='bench', human_name='big', processing_name='BigTask', uuid=hfid,
+                                      frames=frames)
+    hyperframe.w_pb_fs(bundle_dir, hfr)
+    hyperframe.w_bundles_db((hfr, frames), ctxt.local_engine)
+    return hfr
+
+
+def timed_read(ctxt, hfr, rows):
+    start = time.time()
+    df = ctxt.convert_hfr2df(hfr, rows=rows)
+    # Touch every value, memory mapped columns are read when used
+    df.values.sum()
+    return time.time() - start, len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Row range benchmark')
+    parser.add_argument('--columns', type=int, default=20, help='Columns in the dataframe')
+    parser.add_argument('--rows', type=int, default=2000000, help='Rows in the dataframe')
+    parser.add_argument('--head', type=int, default=10, help='Rows dsdt cat --head shows')
+    args = parser.parse_args()
+
+    df = make_df(args.columns, args.rows)
+    layouts = ['frames', 'sidecar'] + (['parquet'] if hyperframe.PYARROW is not None else [])
+
+    print "{:8} {:>10} {:>10}".format('layout', 'rows', 'read ms')
+    for layout in layouts:
+        object_dir = tempfile.mkdtemp()
+        try:
+            ctxt = _BenchContext(object_dir)
+            hfr = write(ctxt, df, layout)
+            for rows in (None, slice(args.head)):
+                secs, num_rows = timed_read(ctxt, hfr, rows)
+                print "{:8} {:>10} {:>10.1f}".format(layout, num_rows, secs * 1000)
+        finally:
+            shutil.rmtree(object_dir)
+
+
+if __name__ == '__main__':
+    main()
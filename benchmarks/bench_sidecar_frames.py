@@ -0,0 +1,78 @@
+"""
+Benchmark writing and reading one large float64 frame inline and as a .npy sidecar.
+
+Inline, FrameRecord.from_ndarray copies the array into the pb with tobytes, and
+reading parses the whole pb before np.frombuffer.  As a sidecar the array goes
+straight to <uuid>_frame.npy and to_ndarray returns a memory map, so nothing is
+read until it is used.  Each step runs in a fresh process and we report its peak
+RSS growth; 'sum ms' is reading the array back and summing it.
+
+Usage:
+    python benchmarks/bench_sidecar_frames.py [--mb 512]
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+import disdat.hyperframe as hyperframe
+
+
+def _peak_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _write(bundle_dir, mb, sidecar):
+    nda = np.random.rand(mb * (1 << 20) // 8)
+    before = _peak_mb()
+    start = time.time()
+    fr = hyperframe.FrameRecord.from_ndarray(str(uuid.uuid1()), 'big', nda, sidecar_dir=bundle_dir,
+                                             sidecar_size=1 if sidecar else 0)
+    hyperframe.w_pb_fs(bundle_dir, fr)
+    return fr.get_filename(), time.time() - start, _peak_mb() - before
+
+
+def _read(bundle_dir, filename):
+    before = _peak_mb()
+    start = time.time()
+    fr = hyperframe.r_pb_fs(os.path.join(bundle_dir, filename), hyperframe.FrameRecord)
+    nda = fr.to_ndarray(data_dir=bundle_dir)
+    read_secs = time.time() - start
+    total = nda.sum()
+    return read_secs, time.time() - start, _peak_mb() - before, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sidecar frame benchmark')
+    parser.add_argument('--mb', type=int, default=512, help='MB of float64 data in the frame')
+    args = parser.parse_args()
+
+    print "{:8} {:>10} {:>14} {:>10} {:>10} {:>14}".format('frame', 'write ms', 'write peak MB', 'read ms',
+                                                           'sum ms', 'read peak MB')
+    for name, sidecar in (('inline', False), ('sidecar', True)):
+        bundle_dir = tempfile.mkdtemp()
+        try:
+            # A fresh process for each step, so peak RSS is only that step's.
+            pool = multiprocessing.Pool(1)
+            filename, write_secs, write_mb = pool.apply(_write, (bundle_dir, args.mb, sidecar))
+            pool.close()
+            pool.join()
+            pool = multiprocessing.Pool(1)
+            read_secs, sum_secs, read_mb, _ = pool.apply(_read, (bundle_dir, filename))
+            pool.close()
+            pool.join()
+            print "{:8} {:>10.1f} {:>14.1f} {:>10.1f} {:>10.1f} {:>14.1f}".format(
+                name, write_secs * 1000, write_mb, read_secs * 1000, sum_secs * 1000, read_mb)
+        finally:
+            shutil.rmtree(bundle_dir)
+
+
+if __name__ == '__main__':
+    main()
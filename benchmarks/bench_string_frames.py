@@ -0,0 +1,61 @@
+"""
+Benchmark writing and reading a string column as a STRING frame and a UTF8 frame.
+
+A STRING frame is a protobuf string per value, so writing adds each one to the pb,
+and reading builds a python string per value before numpy copies them into an array.
+A UTF8 frame is one buffer of UTF-8 bytes after an offsets array, which from_ndarray
+and to_ndarray pack and unpack with array operations.  We report the serialized
+frame size and the median time for each step, including the pb round trip.
+
+Usage:
+    python benchmarks/bench_string_frames.py [--rows 1000000] [--repeat 3]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import disdat.hyperframe as hyperframe
+
+
+def make_columns(num_rows):
+    ids = np.array(['id_{:08d}'.format(i) for i in range(num_rows)])
+    paths = np.array(['s3://bucket/prefix/{}/part-{:05d}.csv'.format(i % 97, i) for i in range(num_rows)],
+                     dtype=np.object_)
+    return (('ids', ids), ('paths', paths))
+
+
+def timed(fn, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.time()
+        result = fn()
+        times.append(time.time() - start)
+    return sorted(times)[len(times) // 2], result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='String frame benchmark')
+    parser.add_argument('--rows', type=int, default=1000000, help='Strings in each column')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per step, we report the median')
+    args = parser.parse_args()
+
+    print "{:8} {:8} {:>10} {:>12} {:>12} {:>12} {:>12}".format('column', 'type', 'MB', 'write ms',
+                                                                'serialize ms', 'parse ms', 'read ms')
+    for column, nda in make_columns(args.rows):
+        for string_type in hyperframe.STRING_TYPES:
+            write_secs, fr = timed(lambda: hyperframe.FrameRecord.from_ndarray('bench', column, nda,
+                                                                               string_type=string_type), args.repeat)
+            serialize_secs, pb = timed(lambda: fr.pb.SerializeToString(), args.repeat)
+            parse_secs, fr = timed(lambda: hyperframe.FrameRecord.from_str_bytes(pb), args.repeat)
+            read_secs, found = timed(fr.to_ndarray, args.repeat)
+            assert len(found) == len(nda)
+            print "{:8} {:8} {:>10.1f} {:>12.1f} {:>12.1f} {:>12.1f} {:>12.1f}".format(
+                column, string_type, len(pb) / float(1 << 20), write_secs * 1000, serialize_secs * 1000,
+                parse_secs * 1000, read_secs * 1000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark tag queries on a catalog of 100k bundles x 10 tags.
+
+Compares the tag query engine (disdat.tag_query) against the previous
+OR / GROUP BY / HAVING count(*) = N form, for the exact match queries the
+previous form could answer.  Both return (uuid, human_name).  'rows ms' is the
+full hyperframe.select_hfr_db(projection=True) call that 'dsdt ls' makes.
+
+Usage:
+    python benchmarks/bench_tag_query.py [--bundles 100000] [--repeat 5] [--db /tmp/tags.db]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy.sql import text, select
+
+import disdat.data_context as data_context
+import disdat.hyperframe as hyperframe
+import disdat.tag_query as tag_query
+
+
+def _tags(i):
+    tags = {'team': 'x{}'.format(i % 10),
+            'dataset': 'genome_{}'.format(i % 1000),
+            'version': '{}'.format((i % 100) / 10.0),
+            'uid': 'u{}'.format(i)}
+    for j in range(4, 10):
+        tags['k{}'.format(j)] = 'v{}'.format(i % (j * 7 + 3))
+    return tags
+
+
+def build(engine, num_bundles, batch=10000):
+    hyperframe.HyperFrameRecord.create_table(engine)
+    tbls = hyperframe.HyperFrameRecord.get_tables()
+    hframes, tags_tbl = tbls['hframes'], tbls['hframes_tags']
+    now = datetime.now()
+    for start in range(0, num_bundles, batch):
+        hfr_rows = []
+        tag_rows = []
+        for i in range(start, min(start + batch, num_bundles)):
+            hfid = str(uuid.uuid1())
+            hfr_rows.append({'uuid': hfid, 'owner': 'bench', 'human_name': 'bench_{}'.format(i % 100),
+                             'processing_name': 'BenchTask_{}'.format(i), 'creation_date': now,
+                             'state': hyperframe.RecordState.valid, 'pb': b''})
+            for k, v in _tags(i).iteritems():
+                tag_rows.append({'uuid': hfid, 'key': k, 'value': v, 'num_value': tag_query.tag_number(v)})
+        with engine.begin() as conn:
+            conn.execute(hframes.insert(), hfr_rows)
+            conn.execute(tags_tbl.insert(), tag_rows)
+
+
+def old_tag_query(engine, tags):
+    """ The exact-match-only query that select_hfr_db used to build """
+    clauses = ' OR '.join("(key='{}' AND value='{}')".format(k, v) for k, v in tags.iteritems())
+    sql = ("SELECT uuid, human_name FROM hframes WHERE uuid IN "
+           "(SELECT uuid FROM hframes_tags WHERE {} GROUP BY uuid HAVING count(*) = {})".format(clauses, len(tags)))
+    with engine.connect() as conn:
+        return conn.execute(text(sql)).fetchall()
+
+
+def new_tag_query(engine, tags):
+    """ The same projection as old_tag_query, with the tag query engine's filter """
+    tbls = hyperframe.HyperFrameRecord.get_tables()
+    hframes, tags_tbl = tbls['hframes'], tbls['hframes_tags']
+    with engine.connect() as conn:
+        preds = tag_query.order_by_selectivity(conn, tags_tbl, tag_query.parse_tag_queries(tags, operators=True))
+        tag_shape = tuple((pred.op, pred.numeric, i) for i, pred in enumerate(preds))
+        params = {}
+        for i, pred in enumerate(preds):
+            params.update(tag_query.predicate_params(pred, i))
+        stmt = select([hframes.c.uuid, hframes.c.human_name]).where(
+            tag_query.tag_filter(hframes.c.uuid, tags_tbl, tag_shape))
+        return conn.execute(stmt, params).fetchall()
+
+
+def rows_tag_query(engine, tags):
+    """ What dsdt ls does: HyperFrameRows with all of their tags """
+    return hyperframe.select_hfr_db(engine, tags=tags, projection=True, tag_operators=True)
+
+
+def timed(fn, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.time()
+        result = fn()
+        times.append(time.time() - start)
+    return sorted(times)[len(times) // 2], len(result)
+
+
+QUERIES = [
+    ('exact, 10%', {'team': 'x3'}),
+    ('exact x2', {'team': 'x3', 'k4': 'v3'}),
+    ('unique + broad', {'uid': 'u12345', 'team': 'x5'}),
+    ('exact x4', {'team': 'x1', 'k5': 'v1', 'k6': 'v1', 'k7': 'v1'}),
+    ('prefix', {'dataset': 'genome_12*'}),
+    ('numeric range', {'version': '>=9.5'}),
+    ('range + prefix + exact', {'version': '0.5..1.5', 'dataset': 'genome_1*', 'team': 'x2'}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tag query benchmark')
+    parser.add_argument('--bundles', type=int, default=100000, help='Number of bundles, each with 10 tags')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per query, we report the median')
+    parser.add_argument('--db', type=str, default=None, help='Keep the catalog in this file (re-used if present)')
+    args = parser.parse_args()
+
+    db_dir = None
+    if args.db is None:
+        db_dir = tempfile.mkdtemp()
+        db_file = os.path.join(db_dir, data_context.DB_FILE)
+    else:
+        db_file = args.db
+
+    try:
+        settings = data_context.catalog_settings(__import__('ConfigParser').SafeConfigParser())
+        engine = data_context.create_catalog_engine('sqlite:///' + db_file, settings)
+        if not os.path.isfile(db_file) or os.path.getsize(db_file) == 0:
+            start = time.time()
+            build(engine, args.bundles)
+            print "Built {} bundles x 10 tags in {:.1f}s".format(args.bundles, time.time() - start)
+        with engine.connect() as conn:
+            conn.execute(text('ANALYZE'))
+
+        print "{:24} {:>8} {:>12} {:>12} {:>12}".format('query', 'found', 'old ms', 'new ms', 'rows ms')
+        for name, tags in QUERIES:
+            new_ms, found = timed(lambda: new_tag_query(engine, tags), args.repeat)
+            rows_ms, _ = timed(lambda: rows_tag_query(engine, tags), args.repeat)
+            exact = all(tag_query.parse_tag_query(k, v).op == 'eq' for k, v in tags.iteritems())
+            if exact:
+                old_ms, old_found = timed(lambda: old_tag_query(engine, tags), args.repeat)
+                assert old_found == found
+                old_ms = "{:.1f}".format(old_ms * 1000)
+            else:
+                old_ms = 'n/a'
+            print "{:24} {:>8} {:>12} {:>12.1f} {:>12.1f}".format(name, found, old_ms, new_ms * 1000,
+                                                                   rows_ms * 1000)
+    finally:
+        if db_dir is not None:
+            shutil.rmtree(db_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark an event table's datetime, categorical, and nullable columns as strings and as typed frames.
+
+Before DATETIME64, TIMEDELTA64, and CATEGORICAL frames and validity bitmaps, datetimes had to be
+bundled as strings, and object columns with missing values took the JSON escape hatch, a
+json.dumps per value.  Both came back as strings.  Typed frames keep int64 datetimes, codes, and
+a bitmap of missing values, encoded and decoded with array operations.  For each column we report
+the serialized frame size, the median time to make the frame, and to read its values back.
+
+Usage:
+    python benchmarks/bench_typed_frames.py [--rows 1000000] [--repeat 3]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import disdat.hyperframe as hyperframe
+
+
+def make_columns(num_rows):
+    rng = np.random.RandomState(0)
+    when = pd.Series(pd.Timestamp('2020-01-01') + pd.to_timedelta(np.sort(rng.randint(0, 86400 * 30, num_rows)),
+                                                                   unit='s'))
+    status = pd.Series(pd.Categorical(np.array(['ok', 'retry', 'failed'])[rng.randint(0, 3, num_rows)]))
+    user = pd.Series(np.array(['user_{}'.format(i) for i in rng.randint(0, 10000, num_rows)], dtype=np.object_))
+    user[rng.rand(num_rows) < 0.1] = None
+    attempts = pd.Series(rng.randint(0, 5, num_rows).astype(np.object_))
+    attempts[rng.rand(num_rows) < 0.1] = None
+    return (('when', when), ('status', status), ('user', user), ('attempts', attempts))
+
+
+def as_strings(series):
+    """ What the column had to be before typed frames: strings, or objects for the JSON escape hatch """
+    if series.dtype.kind == 'M':
+        return np.datetime_as_string(series.values)
+    return np.asarray(series.astype(np.object_))
+
+
+def timed(fn, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.time()
+        result = fn()
+        times.append(time.time() - start)
+    return sorted(times)[len(times) // 2], result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Typed frame benchmark')
+    parser.add_argument('--rows', type=int, default=1000000, help='Rows in the event table')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per step, we report the median')
+    args = parser.parse_args()
+
+    print "{:10} {:8} {:12} {:>10} {:>10} {:>10}".format('column', 'frames', 'type', 'MB', 'write ms', 'read ms')
+    for column, series in make_columns(args.rows):
+        for frames, values, string_type in (('strings', as_strings(series), 'STRING'), ('typed', series, 'UTF8')):
+            write_secs, fr = timed(lambda: hyperframe.FrameRecord.from_serieslike('bench', column, values,
+                                                                                  string_type=string_type),
+                                   args.repeat)
+            read_secs, found = timed(fr.to_values, args.repeat)
+            assert len(found) == len(series)
+            print "{:10} {:8} {:12} {:>10.1f} {:>10.1f} {:>10.1f}".format(
+                column, frames, hyperframe.hyperframe_pb2.Type.Name(fr.pb.type), fr.pb.ByteSize() / float(1 << 20),
+                write_secs * 1000, read_secs * 1000)
+
+
+if __name__ == '__main__':
+    main()
@@ -30,12 +30,48 @@ import disdat.hyperframe_pb2 as hyperframe_pb2
 from disdat.fs import DataContext
 import luigi
 import pandas as pd
+import csv
 import logging
 import os
 import urlparse
 
 _logger = logging.getLogger(__name__)
 
+# Rows of a csv/tsv parsed at a time, 0 parses it all at once.
+ADD_CHUNK_ROWS = 1 << 18
+
+# Bytes of a csv/tsv read to find its delimiter, and the delimiters we look for.
+SNIFF_SAMPLE_BYTES = 1 << 16
+SNIFF_DELIMITERS = ',\t;|'
+
+
+def sniff_delimiter(input_path, sample_size=SNIFF_SAMPLE_BYTES):
+    """ Find the delimiter and quote character of a csv/tsv from its first lines.
+
+    pd.read_csv(sep=None) does this too, but only with the Python parser engine, which is much
+    slower than the C engine, and cannot read in chunks.  If the sample has no consistent
+    delimiter, e.g., it has one column, use the one the file name suggests.
+
+    Args:
+        input_path (str): the csv/tsv file
+        sample_size (int): the bytes to read
+
+    Returns:
+        (str, str): delimiter, quote character
+    """
+    with open(input_path, 'rb') as f:
+        sample = f.read(sample_size)
+
+    # Only look at whole lines
+    if len(sample) == sample_size and '\n' in sample:
+        sample = sample[:sample.rindex('\n')]
+
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=SNIFF_DELIMITERS)
+        return dialect.delimiter, dialect.quotechar
+    except csv.Error:
+        return ('\t' if str(input_path).endswith('.tsv') else ','), '"'
+
 
 class AddTask(luigi.Task, PipeBase):
     """
@@ -44,10 +80,15 @@ class AddTask(luigi.Task, PipeBase):
     Properties:
          input_path:  The data set to be processed
          output_bundle: The name of the collection of resulting data items
+         tags: Tags for the bundle
+         chunksize: Rows of a csv/tsv to parse at a time, 0 parses it all at once
+         dtypes: Column name to type, e.g., {'zip': 'str'}, for columns of a csv/tsv
     """
     input_path = luigi.Parameter(default=None)
     output_bundle = luigi.Parameter(default=None)
     tags = luigi.DictParameter()
+    chunksize = luigi.IntParameter(default=ADD_CHUNK_ROWS)
+    dtypes = luigi.DictParameter(default={})
 
     def __init__(self, *args, **kwargs):
         """
@@ -125,6 +166,36 @@ class AddTask(luigi.Task, PipeBase):
 
         return PipeBase.add_bundle_meta_files(self)
 
+    def convert_csv2frames(self, hfid, managed_path):
+        """ Parse the csv/tsv input_path into frames, chunksize rows at a time.
+
+        Each chunk's columns are added to their frames, or with [storage] df_format = parquet
+        to the bundle's Parquet file, as it is parsed, see PipeBase.convert_chunks2frames, so the
+        file need not fit in memory.  Chunks are typed on their own, a column of ints with a
+        missing value in a later chunk, for example, is promoted to floats then.  dtypes avoid
+        rewriting the rows so far.
+
+        Args:
+            hfid (str): the bundle's uuid
+            managed_path (str): the bundle's managed path
+
+        Returns:
+            list(`FrameRecord`)
+        """
+        sep, quotechar = sniff_delimiter(self.input_path)
+        dtypes = dict(self.dtypes) if self.dtypes else None
+
+        _logger.debug('Parsing {} with sep {!r}, {} rows at a time'.format(self.input_path, sep, self.chunksize))
+
+        if self.chunksize == 0:
+            bundle_df = pd.read_csv(self.input_path, sep=sep, quotechar=quotechar, dtype=dtypes, engine='c')
+            return DataContext.convert_df2frames(hfid, bundle_df, managed_path=managed_path)
+
+        chunks = pd.read_csv(self.input_path, sep=sep, quotechar=quotechar, dtype=dtypes, engine='c',
+                             chunksize=self.chunksize)
+        _, frames = PipeBase.convert_chunks2frames(hfid, chunks, managed_path)
+        return frames
+
     def run(self):
         """ Convert an existing file, csv, or dir to the bundle
         """
@@ -142,8 +213,7 @@ class AddTask(luigi.Task, PipeBase):
             presentation = hyperframe_pb2.TENSOR
         elif os.path.isfile(self.input_path):
             if str(self.input_path).endswith('.csv') or str(self.input_path).endswith('.tsv'):
-                bundle_df = pd.read_csv(self.input_path, sep=None) # sep=None means python parse engine detects sep
-                frames = DataContext.convert_df2frames(add_hf_uuid, bundle_df, managed_path=managed_path)
+                frames = self.convert_csv2frames(add_hf_uuid, managed_path)
                 presentation = hyperframe_pb2.DF
             else:
                 """ Other kinds of file """
@@ -198,7 +198,8 @@ def push(remote, bndl, uuid, tags):
     raise NotImplementedError
 
 
-def apply(ctxt, input_bundle, output_bundle, transform, input_tags=None, output_tags=None, force=False, params=None):
+def apply(ctxt, input_bundle, output_bundle, transform, input_tags=None, output_tags=None, force=False, params=None,
+          input_tag_operators=False):
     """
     Similar to apply.main() but we create our inputs and supply the context
     directly.
@@ -212,6 +213,7 @@ def apply(ctxt, input_bundle, output_bundle, transform, input_tags=None, output_
         output_tags: optional tags dictionary to tag output bundle
         force: Force re-running this transform, default False
         params: optional parameters dictionary
+        input_tag_operators: input tag values may use the operators in `disdat.tag_query`, default False
 
     Returns:
 
@@ -233,7 +235,7 @@ def apply(ctxt, input_bundle, output_bundle, transform, input_tags=None, output_
 
         dynamic_params = json.dumps(params)
         disdat.apply.apply(input_bundle, output_bundle, dynamic_params, transform, input_tags, output_tags, force,
-                           sysexit=False)
+                           sysexit=False, input_tag_operators=input_tag_operators)
     except SystemExit as se:
         print "SystemExist caught: {}".format(se)
     except Exception as e:
@@ -44,7 +44,7 @@ META_FILE = 'info.json'
 
 
 def apply(input_bundle, output_bundle, pipe_params, pipe_cls, input_tags, output_tags, force,
-          output_bundle_uuid=None, sysexit=True, central_scheduler=False, workers=1):
+          output_bundle_uuid=None, sysexit=True, central_scheduler=False, workers=1, input_tag_operators=False):
     """
     Given an input bundle, run the pipesline on the bundle.
     Note, we first make a copy of all tasks that are parameterized identically to the tasks we will run.
@@ -64,6 +64,7 @@ def apply(input_bundle, output_bundle, pipe_params, pipe_cls, input_tags, output
         sysexit: Run with sys exist return codes (will raise SystemExit) (default False)
         central_scheduler: Use a centralized Luigi scheduler (default False, i.e., --local-scheduler is used)
         workers: The number of luigi workers to use for this workflow (default 1)
+        input_tag_operators (bool): Input tag values may use the operators in `disdat.tag_query` (default False)
 
     Returns:
         None
@@ -74,6 +75,7 @@ def apply(input_bundle, output_bundle, pipe_params, pipe_cls, input_tags, output
     _logger.debug("pipe params: {}".format(pipe_params))
     _logger.debug("force: {}".format(force))
     _logger.debug("input tags: {}".format(input_tags))
+    _logger.debug("input tag operators: {}".format(input_tag_operators))
     _logger.debug("output tags: {}".format(output_tags))
     _logger.debug("sys.path {}".format(sys.path))
     _logger.debug("central_scheduler {}".format(central_scheduler))
@@ -96,11 +98,15 @@ def apply(input_bundle, output_bundle, pipe_params, pipe_cls, input_tags, output
     if force:
         args += ['--force']
 
+    if input_tag_operators:
+        args += ['--input-tag-operators']
+
     # Re-execute logic -- make copy of task DAG
     # Creates a cache of {pipe:path_cache_entry} in the pipesFS object.
     # This "task_path_cache" is used throughout execution to find output bundles.
     reexecute_dag = driver.DriverTask(input_bundle, output_bundle, pipe_params,
-                                      pipe_cls, input_tags, output_tags, force)
+                                      pipe_cls, input_tags, output_tags, force,
+                                      input_tag_operators=input_tag_operators)
 
     resolve_workflow_bundles(reexecute_dag)
 
@@ -382,5 +388,6 @@ def main(disdat_config, args):
     output_tags = common.parse_args_tags(args.output_tag)
 
     apply(args.input_bundle, args.output_bundle, dynamic_params, args.pipe_cls, input_tags, output_tags,
-          args.force, central_scheduler=args.central_scheduler, workers=args.workers)
+          args.force, central_scheduler=args.central_scheduler, workers=args.workers,
+          input_tag_operators=args.input_tag_operators)
 
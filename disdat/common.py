@@ -315,11 +315,27 @@ def parse_args_tags(args_tag, to='dict'):
         if to == 'list':
             tag_thing = ['{}'.format(kv[0]) for kv in args_tag]
         if to == 'dict':
-            tag_thing = {k: v for k, v in [kv[0].split(':') for kv in args_tag]}
+            tag_thing = {k: v for k, v in [kv[0].split(':', 1) for kv in args_tag]}
 
     return tag_thing
 
 
+def parse_args_rows(args_rows):
+    """ parse argument string of rows 'start:stop', either may be left out,
+    into a slice.
+
+    Args:
+        args_rows (str): rows in string format 'start:stop', e.g., '100:200' or ':10'
+    Returns:
+        (slice):
+    """
+    try:
+        start, stop = [int(r) if r.strip() else None for r in args_rows.split(':')]
+    except ValueError:
+        raise Exception("Rows must be 'start:stop', found '{}'".format(args_rows))
+    return slice(start, stop)
+
+
 def parse_params(params):
     """
     Input is the string "--arg value --arg2 value2"
@@ -0,0 +1,142 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Compression of frame data.
+
+A Frame pb's codec field names how its inline data is compressed.  zlib is always
+available, lz4 (lz4) and zstd (zstandard) when installed, 'pip install disdat[compress]'.
+Any installed codec can read frames, whatever the [storage] codec setting is now.
+
+The [storage] section of disdat.cfg sets how new frames are written:
+
+    codec           auto (default) compresses each frame whose first SAMPLE_SIZE bytes
+                    shrink by MIN_RATIO, with zstd, lz4, or zlib, the first installed.
+                    none, or zlib, lz4, or zstd to use that codec whenever it shrinks a frame.
+    codec_min_size  frames with fewer bytes than this are never compressed
+
+Sidecar .npy files are not compressed, readers memory map them.
+"""
+
+import logging
+import zlib
+
+_logger = logging.getLogger(__name__)
+
+CODEC_SETTINGS = ('auto', 'none', 'zlib', 'lz4', 'zstd')
+
+# 'auto' tries codecs in this order
+AUTO_CODECS = ('zstd', 'lz4', 'zlib')
+
+# The default codec_min_size
+MIN_SIZE = 1 << 16
+
+# 'auto' compresses a frame if this many leading bytes compress at least MIN_RATIO times
+SAMPLE_SIZE = 1 << 16
+MIN_RATIO = 1.5
+
+# zlib's fastest level, most of what we get from frames is long runs
+ZLIB_LEVEL = 1
+
+
+def _lz4():
+    try:
+        import lz4.frame
+    except ImportError:
+        return None
+    return lz4.frame.compress, lz4.frame.decompress
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    # Compressors are not thread safe, make one per call
+    return (lambda data: zstandard.ZstdCompressor().compress(data),
+            lambda data: zstandard.ZstdDecompressor().decompress(data))
+
+
+# codec -> (compress, decompress), or None if not installed
+CODECS = {'zlib': (lambda data: zlib.compress(data, ZLIB_LEVEL), zlib.decompress),
+          'lz4': _lz4(),
+          'zstd': _zstd()}
+
+
+def check_codec(codec):
+    """
+    Args:
+        codec (str): a [storage] codec setting
+
+    Returns:
+        (str): the setting, lower case, raises an Exception if it is not one or not installed
+    """
+    codec = codec.lower()
+    if codec not in CODEC_SETTINGS:
+        raise Exception("Disdat codec must be one of {}, found {}".format(CODEC_SETTINGS, codec))
+    if codec in CODECS and CODECS[codec] is None:
+        raise Exception("Disdat codec {} is not installed, try 'pip install disdat[compress]'".format(codec))
+    return codec
+
+
+def auto_codec():
+    """
+    Returns:
+        (str): the codec 'auto' uses, the first of AUTO_CODECS installed
+    """
+    return [c for c in AUTO_CODECS if CODECS[c] is not None][0]
+
+
+def compress(data, codec='auto', min_size=MIN_SIZE):
+    """
+    Compress frame data if the codec setting and the data call for it.
+
+    Args:
+        data (str): the frame's bytes
+        codec (str): a [storage] codec setting
+        min_size (int): leave data with fewer bytes alone
+
+    Returns:
+        (str, str): the codec used, or None, and the data to store
+    """
+    if codec == 'none' or len(data) == 0 or len(data) < min_size:
+        return None, data
+
+    if codec == 'auto':
+        codec = auto_codec()
+        sample = data[:SAMPLE_SIZE]
+        if len(sample) < MIN_RATIO * len(CODECS[codec][0](sample)):
+            return None, data
+
+    compressed = CODECS[codec][0](data)
+    if len(compressed) >= len(data):
+        return None, data
+
+    _logger.debug("Compressed frame data with {} from {} to {} bytes".format(codec, len(data), len(compressed)))
+    return codec, compressed
+
+
+def decompress(data, codec):
+    """
+    Args:
+        data (str): compressed frame data
+        codec (str): the codec that compressed it
+
+    Returns:
+        (str): the frame's bytes
+    """
+    if CODECS.get(codec) is None:
+        raise Exception("Disdat frame data is compressed with {}, which is not installed, "
+                        "try 'pip install disdat[compress]'".format(codec))
+    return CODECS[codec][1](data)
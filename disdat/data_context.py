@@ -20,6 +20,9 @@ A DisDat context
 import disdat.constants as constants
 import disdat.hyperframe_pb2 as hyperframe_pb2
 import disdat.hyperframe as hyperframe
+import disdat.tag_query as tag_query
+import disdat.integrity as integrity
+import disdat.compression as compression
 import disdat.common as common
 import disdat.utility.aws_s3 as aws_s3
 from disdat.common import DisdatConfig
@@ -30,8 +33,13 @@ import os
 import json
 import glob
 import shutil
-from sqlalchemy import create_engine
+import threading
+from collections import OrderedDict, defaultdict
+from sqlalchemy import create_engine, event, inspect, MetaData, Table, Column, Integer, select
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.sql import text, and_, bindparam
 import pandas as pd
+from pandas.core.internals import BlockManager, make_block
 import numpy as np
 import luigi
 from urlparse import urlparse, urljoin
@@ -42,6 +50,499 @@ META_CTXT_FILE = 'ctxt.json'
 DB_FILE = 'ctxt.db'
 DEFAULT_LEN_UNCOMMITTED_HISTORY = 1
 
+# rebuild_db writes the bundles it finds on disk this many at a time
+REBUILD_BATCH = 1000
+
+# Version of the local catalog schema.  Bump this and add a step to
+# DataContext._catalog_migrations() when the tables or indexes change.
+CATALOG_SCHEMA_VERSION = 4
+CATALOG_VERSION_TABLE = 'catalog_version'
+
+# The [catalog] section of disdat.cfg picks and tunes the database behind each context.
+CATALOG_SECTION = 'catalog'
+CATALOG_DEFAULTS = {'url': '',
+                    'journal_mode': 'WAL',
+                    'synchronous': 'NORMAL',
+                    'mmap_size': '268435456',
+                    'cache_size': '-65536',
+                    'busy_timeout': '30000',
+                    'pool_size': '5',
+                    'max_overflow': '10',
+                    'pool_recycle': '3600',
+                    'frame_cache_size': '268435456'}
+_JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+_SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+
+def catalog_settings(parser=None):
+    """
+    Read the [catalog] section of disdat.cfg.   Missing options take CATALOG_DEFAULTS.
+    PRAGMA values cannot be bound parameters, so we validate every value here.
+    The url is checked when we make the engine.
+
+    Args:
+        parser (ConfigParser): Optional, defaults to the DisdatConfig parser
+
+    Returns:
+        (dict): option name to value, e.g., {'journal_mode': 'WAL', 'busy_timeout': 30000, ...}
+    """
+    if parser is None:
+        parser = DisdatConfig.instance().parser
+
+    settings = {}
+    for option, default in CATALOG_DEFAULTS.iteritems():
+        if parser.has_section(CATALOG_SECTION) and parser.has_option(CATALOG_SECTION, option):
+            value = parser.get(CATALOG_SECTION, option).strip()
+        else:
+            value = default
+
+        if option == 'url':
+            pass
+        elif option == 'journal_mode':
+            value = value.upper()
+            if value not in _JOURNAL_MODES:
+                raise Exception("disdat.cfg [{}] journal_mode must be one of {}, found {}".format(
+                    CATALOG_SECTION, _JOURNAL_MODES, value))
+        elif option == 'synchronous':
+            value = value.upper()
+            if value not in _SYNCHRONOUS_MODES:
+                raise Exception("disdat.cfg [{}] synchronous must be one of {}, found {}".format(
+                    CATALOG_SECTION, _SYNCHRONOUS_MODES, value))
+        else:
+            try:
+                value = int(value)
+            except ValueError:
+                raise Exception("disdat.cfg [{}] {} must be an integer, found {}".format(
+                    CATALOG_SECTION, option, value))
+        settings[option] = value
+
+    return settings
+
+
+# The [storage] section of disdat.cfg picks how new bundles are written to a context's objects directory.
+# 'files' writes <uuid>_hframe.pb and a <uuid>_frame.pb per frame, 'packed' writes one <uuid>_bundle.pb.
+# Numeric arrays of at least sidecar_size bytes are written to .npy files next to them, 0 disables.
+# string_type 'utf8' writes string columns as UTF8 frames, 'string' as the STRING frames older readers need.
+# codec and codec_min_size pick how inline frame data is compressed, see disdat/compression.py.
+# df_format 'parquet' writes the columns of DF bundles to one Parquet file (needs pyarrow), 'frames' to frames.
+STORAGE_SECTION = 'storage'
+STORAGE_DEFAULTS = {'layout': 'files', 'sidecar_size': '67108864', 'string_type': 'utf8', 'codec': 'auto',
+                    'codec_min_size': str(compression.MIN_SIZE), 'df_format': 'frames'}
+BUNDLE_LAYOUTS = ('files', 'packed')
+DF_FORMATS = ('frames', 'parquet')
+
+
+def storage_settings(parser=None):
+    """
+    Read the [storage] section of disdat.cfg.   Missing options take STORAGE_DEFAULTS.
+
+    Args:
+        parser (ConfigParser): Optional, defaults to the DisdatConfig parser
+
+    Returns:
+        (dict): option name to value, e.g., {'layout': 'files', 'sidecar_size': 67108864, 'string_type': 'UTF8',
+                'codec': 'auto', 'codec_min_size': 65536, 'df_format': 'frames'}
+    """
+    if parser is None:
+        parser = DisdatConfig.instance().parser
+
+    settings = {}
+    for option, default in STORAGE_DEFAULTS.iteritems():
+        if parser.has_section(STORAGE_SECTION) and parser.has_option(STORAGE_SECTION, option):
+            value = parser.get(STORAGE_SECTION, option).strip()
+        else:
+            value = default
+
+        if option == 'layout':
+            value = value.lower()
+            if value not in BUNDLE_LAYOUTS:
+                raise Exception("disdat.cfg [{}] layout must be one of {}, found {}".format(
+                    STORAGE_SECTION, BUNDLE_LAYOUTS, value))
+        elif option in ('sidecar_size', 'codec_min_size'):
+            try:
+                value = int(value)
+            except ValueError:
+                value = -1
+            if value < 0:
+                raise Exception("disdat.cfg [{}] {} must be a number of bytes, found {}".format(
+                    STORAGE_SECTION, option, parser.get(STORAGE_SECTION, option)))
+        elif option == 'string_type':
+            value = value.upper()
+            if value not in hyperframe.STRING_TYPES:
+                raise Exception("disdat.cfg [{}] string_type must be one of {}, found {}".format(
+                    STORAGE_SECTION, tuple(t.lower() for t in hyperframe.STRING_TYPES), value.lower()))
+        elif option == 'codec':
+            try:
+                value = compression.check_codec(value)
+            except Exception as e:
+                raise Exception("disdat.cfg [{}]: {}".format(STORAGE_SECTION, e))
+        elif option == 'df_format':
+            value = value.lower()
+            if value not in DF_FORMATS:
+                raise Exception("disdat.cfg [{}] df_format must be one of {}, found {}".format(
+                    STORAGE_SECTION, DF_FORMATS, value))
+            if value == 'parquet' and hyperframe.PYARROW is None:
+                raise Exception("disdat.cfg [{}] df_format parquet needs pyarrow, try 'pip install disdat[parquet]'".format(
+                    STORAGE_SECTION))
+        settings[option] = value
+
+    return settings
+
+
+def set_sqlite_pragmas(engine, settings):
+    """
+    Apply catalog settings to every new sqlite connection the engine makes.
+
+    Args:
+        engine: sqlalchemy engine for a sqlite database
+        settings (dict): from catalog_settings()
+
+    Returns:
+        None
+    """
+    pragmas = ["PRAGMA busy_timeout = {}".format(settings['busy_timeout']),
+               "PRAGMA journal_mode = {}".format(settings['journal_mode']),
+               "PRAGMA synchronous = {}".format(settings['synchronous']),
+               "PRAGMA mmap_size = {}".format(settings['mmap_size']),
+               "PRAGMA cache_size = {}".format(settings['cache_size'])]
+
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def create_catalog_engine(url, settings):
+    """
+    Make the engine for a context's catalog.
+    SQLite gets the catalog pragmas.  Any other database gets a connection pool that
+    checks connections before use, so many workers can share one catalog.
+
+    Args:
+        url (str): sqlalchemy url, e.g., 'sqlite:////path/ctxt.db' or 'postgresql://user@host/disdat'
+        settings (dict): from catalog_settings()
+
+    Returns:
+        sqlalchemy engine
+    """
+    if make_url(url).get_backend_name() == 'sqlite':
+        engine = create_engine(url, echo=False)
+        set_sqlite_pragmas(engine, settings)
+    else:
+        engine = create_engine(url, echo=False,
+                               pool_size=settings['pool_size'],
+                               max_overflow=settings['max_overflow'],
+                               pool_recycle=settings['pool_recycle'],
+                               pool_pre_ping=True)
+    return engine
+
+
+class FrameCache(object):
+    """
+    Least recently used FrameRecords of a context, keyed by frame uuid, up to max_bytes of serialized pb.
+    Frames are immutable once written, so a cached FrameRecord is good until its bundle is removed.
+
+    Callers share the cached FrameRecord, they must not modify it.
+    """
+
+    def __init__(self, max_bytes):
+        """
+        Args:
+            max_bytes (int): Most bytes of frame pb to hold.  0 disables the cache.
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._frames)
+
+    def get(self, frame_uuid):
+        """
+        Args:
+            frame_uuid (str):
+
+        Returns:
+            (`hyperframe.FrameRecord`): or None if not cached
+        """
+        with self._lock:
+            entry = self._frames.pop(frame_uuid, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._frames[frame_uuid] = entry
+            self.hits += 1
+            return entry[0]
+
+    def put(self, fr):
+        """
+        Cache a FrameRecord, evicting the least recently used frames to stay under max_bytes.
+        A frame bigger than max_bytes is not cached.
+
+        Args:
+            fr (`hyperframe.FrameRecord`):
+
+        Returns:
+            None
+        """
+        size = fr.pb.ByteSize()
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._frames.pop(fr.pb.uuid, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            self._frames[fr.pb.uuid] = (fr, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._frames.popitem(last=False)
+                self.nbytes -= evicted
+
+    def invalidate(self, frame_uuids):
+        """
+        Args:
+            frame_uuids (list(str)): frames to drop, e.g., those of a removed bundle
+
+        Returns:
+            None
+        """
+        with self._lock:
+            for frame_uuid in frame_uuids:
+                entry = self._frames.pop(frame_uuid, None)
+                if entry is not None:
+                    self.nbytes -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """
+        Returns:
+            (dict): hits, misses, frames, and bytes held
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'frames': len(self._frames), 'bytes': self.nbytes}
+
+
+class ChunkedColumn(object):
+    """
+    One column, or tensor, of a pipe_run generator's output, added to a chunk at a time.
+
+    Numeric, boolean, and datetime values are held until they reach the [storage] sidecar_size,
+    and from then on appended to a .npy sidecar as each chunk arrives, see hyperframe.SidecarAppender.
+    A chunk of a wider type, e.g., floats after ints, promotes the sidecar.
+    Other values, e.g., strings, and all values when there is no local managed path or sidecar_size
+    is 0, are held until close() makes their frame with convert_serieslike2frame.  If such a chunk
+    arrives after the column is in a sidecar, the sidecar stays on disk, memory mapped, until close().
+    close() then holds the whole column in memory, as a column returned in one DataFrame is.
+
+    If some chunks are numbers and others strings, e.g., a code column that turns alphanumeric late
+    in a csv, close() makes the numbers strings too, as pd.read_csv of the whole file would.
+    """
+
+    def __init__(self, hfid, name, managed_path):
+        """
+        Args:
+            hfid (str): hyperframe id
+            name (str): column name
+            managed_path (str): the bundle's managed path
+        """
+        self.hfid = hfid
+        self.name = name
+        self.managed_path = managed_path
+        self.sidecar_dir = DataContext.local_managed_dir(managed_path)
+        self.sidecar_size = storage_settings()['sidecar_size']
+        self.chunks = []
+        self.nbytes = 0
+        self.appender = None
+        # A sidecar whose rows are the first chunk, after strings arrived
+        self.read_back = None
+
+    def append(self, values):
+        """
+        Args:
+            values (`numpy.ndarray`, `pandas.Categorical`): the column's values in this chunk
+
+        Returns:
+            None
+        """
+        streams = isinstance(values, np.ndarray) and values.dtype.kind in 'biufmM'
+
+        if self.appender is not None:
+            if streams:
+                self.appender.append(values)
+                return
+            self.read_back = self.appender
+            self.appender = None
+            self.chunks = [self.read_back.read()]
+            self.nbytes = self.chunks[0].nbytes
+
+        self.chunks.append(values)
+        self.nbytes += values.nbytes
+        if self.sidecar_dir is None or not 0 < self.sidecar_size <= self.nbytes:
+            return
+        if all(isinstance(chunk, np.ndarray) and chunk.dtype.kind in 'biufmM' for chunk in self.chunks):
+            self.appender = hyperframe.SidecarAppender(self.hfid, self.name, self.sidecar_dir,
+                                                       np.result_type(*self.chunks), row_shape=values.shape[1:])
+            for chunk in self.chunks:
+                self.appender.append(chunk)
+            self.chunks = []
+
+    def close(self):
+        """
+        Returns:
+            (`hyperframe.FrameRecord`): the column's frame
+        """
+        if self.appender is not None:
+            return self.appender.close()
+
+        if all(pd.api.types.is_categorical_dtype(chunk) for chunk in self.chunks):
+            values = pd.api.types.union_categoricals(self.chunks)
+        else:
+            values = ChunkedColumn.concatenate([np.asarray(chunk) for chunk in self.chunks])
+        self.chunks = []
+        if self.read_back is not None:
+            self.read_back.abort()
+            self.read_back = None
+        return DataContext.convert_serieslike2frame(self.hfid, self.name, values, self.managed_path)
+
+    @staticmethod
+    def concatenate(chunks):
+        """
+        Join a column's chunks.  If some chunks hold strings, the chunks of numbers become strings,
+        with NaN left missing, so the column is typed once as strings instead of as mixed objects.
+
+        Args:
+            chunks (list(`numpy.ndarray`)):
+
+        Returns:
+            (`numpy.ndarray`)
+        """
+        if any(chunk.dtype.kind in 'SU' or (chunk.dtype.type == np.object_ and
+                                            any(isinstance(x, basestring) for x in chunk.ravel()))
+               for chunk in chunks):
+            chunks = [ChunkedColumn._stringify(chunk) if chunk.dtype.kind in 'biuf' else chunk for chunk in chunks]
+        return np.concatenate(chunks)
+
+    @staticmethod
+    def _stringify(chunk):
+        strings = chunk.astype(str).astype(np.object_)
+        if chunk.dtype.kind == 'f':
+            strings[np.isnan(chunk)] = np.nan
+        return strings
+
+    def abort(self):
+        """
+        Drop the column's chunks, and remove its sidecar, e.g., when the bundle's generator fails.
+
+        Returns:
+            None
+        """
+        if self.appender is not None:
+            self.appender.abort()
+            self.appender = None
+        if self.read_back is not None:
+            self.read_back.abort()
+            self.read_back = None
+        self.chunks = []
+
+
+class ChunkedDataFrame(object):
+    """
+    The columns of a DF bundle, added a DataFrame chunk at a time.
+
+    With [storage] df_format = parquet, and a local managed path, the columns of numbers, booleans,
+    or strings in the first chunk go to one Parquet file, as in convert_df2frames, a row group at a
+    time, see hyperframe.ParquetAppender.  A later chunk of a wider number type promotes its column,
+    and one that no longer fits, e.g., strings in a column of numbers, takes the column out of the
+    Parquet file into a ChunkedColumn.  The other columns are ChunkedColumns.
+    """
+
+    def __init__(self, hfid, names, managed_path):
+        """
+        Args:
+            hfid (str): hyperframe id
+            names (list(str)): column names
+            managed_path (str): the bundle's managed path
+        """
+        self.hfid = hfid
+        self.names = names
+        self.managed_path = managed_path
+        self.columns = {}
+        self.parquet = None
+
+    def append(self, df):
+        """
+        Args:
+            df (`pandas.DataFrame`): the rows of this chunk, with at least the columns in names
+
+        Returns:
+            None
+        """
+        if len(self.columns) == 0 and self.parquet is None:
+            self._start(df)
+
+        if self.parquet is not None:
+            promote = {}
+            drop = []
+            for c, dtype in self.parquet.dtypes.items():
+                values = df[c].values
+                if dtype.type == np.object_:
+                    if values.dtype.type != np.object_ or not DataContext.is_parquet_column(values):
+                        drop.append(c)
+                elif values.dtype.kind not in 'biuf':
+                    drop.append(c)
+                elif not np.can_cast(values.dtype, dtype, casting='safe'):
+                    promote[c] = np.result_type(dtype, values.dtype)
+            if len(drop) > 0:
+                for c, values in self.parquet.drop(drop).items():
+                    self.columns[c] = ChunkedColumn(self.hfid, c, self.managed_path)
+                    self.columns[c].append(values)
+            if len(promote) > 0:
+                self.parquet.promote(promote)
+            self.parquet.append(df)
+
+        for c, column in self.columns.items():
+            column.append(df[c].values)
+
+    def _start(self, df):
+        parquet_names = []
+        data_dir = DataContext.local_managed_dir(self.managed_path)
+        if data_dir is not None and storage_settings()['df_format'] == 'parquet':
+            parquet_names = [c for c in self.names if DataContext.is_parquet_column(df[c].values)]
+        if len(parquet_names) > 0:
+            self.parquet = hyperframe.ParquetAppender(self.hfid, data_dir,
+                                                      [(c, df[c].values.dtype) for c in parquet_names])
+        self.columns = dict((c, ChunkedColumn(self.hfid, c, self.managed_path))
+                            for c in self.names if c not in parquet_names)
+
+    def close(self):
+        """
+        Returns:
+            (list:`hyperframe.FrameRecord`): a frame for each column, in the order of names
+        """
+        frames = {} if self.parquet is None else dict((fr.pb.name, fr) for fr in self.parquet.close())
+        frames.update((c, column.close()) for c, column in self.columns.items())
+        return [frames[c] for c in self.names]
+
+    def abort(self):
+        """
+        Drop the chunks, and remove the Parquet file and sidecars, e.g., when the bundle's generator fails.
+
+        Returns:
+            None
+        """
+        if self.parquet is not None:
+            self.parquet.abort()
+        for column in self.columns.values():
+            column.abort()
+
 
 class DataContext(object):
     """
@@ -87,6 +588,8 @@ class DataContext(object):
         self.remote_engine = None
         self.valid = False
         self.len_uncommitted_history = DEFAULT_LEN_UNCOMMITTED_HISTORY
+        self.frame_cache = None
+        self.storage = None
 
         self.init_local_db()
         self.init_remote_db()
@@ -322,20 +825,140 @@ class DataContext(object):
 
         """
 
+        settings = catalog_settings()
+        integrity.configure(integrity.integrity_settings())
+        self.frame_cache = FrameCache(settings['frame_cache_size'])
+        self.storage = storage_settings()
+
         if in_memory:
             _logger.debug("Building in-memory database from local state...")
-            self.local_engine = create_engine('sqlite:///:memory:', echo=False)
+            self.local_engine = create_catalog_engine('sqlite:///:memory:', settings)
             self.rebuild_db()
         else:
-            db_file = os.path.join(self._get_local_context_dir(), DB_FILE)
-            self.local_engine = create_engine('sqlite:///' + db_file, echo=False)
-            if not os.path.isfile(db_file):
-                _logger.debug("No disdat {} local db data file found.".format(db_file))
-                _logger.debug("\t  Rebuilding local database from local state...".format(db_file))
+            catalog_url = self.get_catalog_url(settings)
+            self.local_engine = create_catalog_engine(catalog_url, settings)
+            if hyperframe.HyperFrameRecord.table_name not in inspect(self.local_engine).get_table_names():
+                _logger.debug("No disdat catalog found at {}.".format(self.local_engine.url))
+                _logger.debug("\t  Rebuilding local database from local state...")
                 self.rebuild_db()
+        self.migrate_local_db()
         self.dbck()
         return
 
+    def get_catalog_url(self, settings):
+        """
+        The sqlalchemy url of this context's catalog.  By default each context keeps a
+        sqlite db in its directory.  The [catalog] url may use '{context}' to give each
+        context its own database on a shared server.
+
+        Args:
+            settings (dict): from catalog_settings()
+
+        Returns:
+            (str): sqlalchemy url
+        """
+        if settings['url'] == '':
+            return 'sqlite:///' + os.path.join(self._get_local_context_dir(), DB_FILE)
+        return settings['url'].format(context=self.local_ctxt)
+
+    @staticmethod
+    def _catalog_version_table(metadata):
+        """
+        Single row table holding the schema version of this context's catalog.
+
+        Args:
+            metadata: sqlalchemy MetaData
+
+        Returns:
+            sqlalchemy.Table
+        """
+        return Table(CATALOG_VERSION_TABLE, metadata,
+                     Column('version', Integer, nullable=False))
+
+    def _catalog_migrations(self):
+        """
+        Ordered list of (version, description, function) steps.  Each step upgrades
+        the catalog from version-1 to version and must be safe to re-run.
+
+        Returns:
+            (list)
+        """
+        return [
+            (1, 'add hframes and hframes_tags indexes', self._migrate_add_hframe_indexes),
+            (2, 'add numeric tag values', self._migrate_add_tag_num_value),
+            (3, 'add lineage edges', self._migrate_add_lineage_edges),
+            (4, 'add paging indexes', self._migrate_add_hframe_indexes),
+        ]
+
+    def _migrate_add_hframe_indexes(self):
+        hyperframe.HyperFrameRecord.create_table(self.local_engine)
+        created = hyperframe.HyperFrameRecord.create_indexes(self.local_engine)
+        _logger.debug("Created catalog indexes {}".format(created))
+
+    def _migrate_add_tag_num_value(self):
+        tags_tbl = hyperframe.HyperFrameRecord.get_tables()[hyperframe.HyperFrameRecord.table_name + '_tags']
+        columns = [c['name'] for c in inspect(self.local_engine).get_columns(tags_tbl.name)]
+        with self.local_engine.begin() as conn:
+            if 'num_value' not in columns:
+                conn.execute(text('ALTER TABLE {} ADD COLUMN num_value FLOAT'.format(tags_tbl.name)))
+            rows = []
+            for row in conn.execute(select([tags_tbl.c.key, tags_tbl.c.uuid, tags_tbl.c.value])):
+                num_value = tag_query.tag_number(row['value'])
+                if num_value is not None:
+                    rows.append({'b_key': row['key'], 'b_uuid': row['uuid'], 'b_num_value': num_value})
+            if len(rows) > 0:
+                conn.execute(tags_tbl.update().where(and_(tags_tbl.c.key == bindparam('b_key'),
+                                                          tags_tbl.c.uuid == bindparam('b_uuid')))
+                             .values(num_value=bindparam('b_num_value')), rows)
+        self._migrate_add_hframe_indexes()
+
+    def _migrate_add_lineage_edges(self):
+        """ Create lineage_edges and fill it from the lineage in each hframe pb """
+        hyperframe.HyperFrameRecord.create_table(self.local_engine)
+        tbls = hyperframe.HyperFrameRecord.get_tables()
+        hframes = tbls[hyperframe.HyperFrameRecord.table_name]
+        edges = tbls[hyperframe.LINEAGE_EDGES_TABLE]
+        with self.local_engine.begin() as conn:
+            conn.execute(edges.delete())
+            rows = []
+            for row in conn.execute(select([hframes.c.pb])):
+                rows.extend(hyperframe.lineage_edge_rows(hyperframe.HyperFrameRecord.from_str_bytes(row['pb']).pb))
+            if len(rows) > 0:
+                conn.execute(edges.insert(), rows)
+        self._migrate_add_hframe_indexes()
+
+    def migrate_local_db(self):
+        """
+        Upgrade an existing local catalog in place to CATALOG_SCHEMA_VERSION.
+        A freshly built catalog already has the current schema, but still gets stamped here.
+
+        Returns:
+            (int): the version the catalog was at before migrating
+        """
+        metadata = MetaData()
+        version_tbl = self._catalog_version_table(metadata)
+        metadata.create_all(self.local_engine)
+
+        with self.local_engine.begin() as conn:
+            current = conn.execute(select([version_tbl.c.version])).scalar()
+            if current is None:
+                current = 0
+                conn.execute(version_tbl.insert().values(version=0))
+
+        if current > CATALOG_SCHEMA_VERSION:
+            raise Exception("Context {} catalog has schema version {}, newer than this version of disdat supports ({})".format(
+                self.local_ctxt, current, CATALOG_SCHEMA_VERSION))
+
+        for version, description, step in self._catalog_migrations():
+            if version <= current:
+                continue
+            _logger.debug("Migrating context {} catalog to version {}: {}".format(self.local_ctxt, version, description))
+            step()
+            with self.local_engine.begin() as conn:
+                conn.execute(version_tbl.update().values(version=version))
+
+        return current
+
     @staticmethod
     def _validate_hframe(hfr, found_frames, found_auths):
         """
@@ -438,50 +1061,70 @@ class DataContext(object):
             num errors (int):
 
         """
-        hframes = {}
-        frames = {}
-        auths = {}
-
-        pb_types = [('*_hframe.pb', hyperframe.HyperFrameRecord, hframes),
-                    ('*_frame.pb', hyperframe.FrameRecord, frames),
-                    ('*_auth.pb', hyperframe.LinkAuthBase, auths)]
+        pb_types = [('*_hframe.pb', hyperframe.HyperFrameRecord),
+                    ('*_frame.pb', hyperframe.FrameRecord),
+                    ('*_auth.pb', hyperframe.LinkAuthBase)]
 
         # Make all the tables first.
-        for glb, rcd_type, store in pb_types:
+        for glb, rcd_type in pb_types:
             rcd_type.create_table(self.local_engine)
 
+        # A bundle's frames (and auths) are written to its own objects/<uuid> directory.  So we
+        # read one directory at a time, and only hold REBUILD_BATCH bundles before writing them.
+        valid_bundles = []
         for uuid_dir in os.listdir(self.get_object_dir()):
-            for glb, rcd_type, store in pb_types:
+            hframes = {}
+            frames = {}
+            auths = {}
+            for (glb, rcd_type), store in zip(pb_types, (hframes, frames, auths)):
                 files = glob.glob(os.path.join(os.path.join(self.get_object_dir(), uuid_dir), glb))
                 for f in files:
                     # hyperframes, frames, and links all have uuid fields
-                    rcd = hyperframe.r_pb_fs(f, rcd_type)
+                    rcd = hyperframe.r_pb_fs(f, rcd_type, event='rebuild')
                     store[rcd.pb.uuid] = rcd
 
-        for hfr in hframes.itervalues():
-            if DataContext._validate_hframe(hfr, frames, auths):
-                # looks like a good hyperframe
-                # print "Writing out HFR {} {}".format(hfr.pb.human_name, hfr.pb.uuid)
-                hyperframe.w_pb_db(hfr, self.local_engine)
-                for str_tuple in hfr.pb.frames:
-                    fr_uuid = str_tuple.v
-                    # The frame pb doesn't store the hfr_uuid, but the db
-                    # does.  Since we are reading from disk, we need to
-                    # set it back into the FrameRecord.
-                    frames[fr_uuid].hframe_uuid = hfr.pb.uuid
-                    hyperframe.w_pb_db(frames[fr_uuid], self.local_engine)
-            else:
-                # invalid hyperframe, if present in db as valid, mark invalid
-                # Try to read it in
-                hfr_from_db_list = hyperframe.select_hfr_db(self.local_engine, uuid=hfr.pb.uuid)
-                assert(len(hfr_from_db_list) == 0 or len(hfr_from_db_list) == 1)
-                if len(hfr_from_db_list) == 1:
-                    hfr_from_db = hfr_from_db_list[0]
-                    if hfr_from_db.state == hyperframe.RecordState.valid:
-                        # If it is valid, and we know it isn't, mark invalid
-                        hyperframe.update_hfr_db(self.local_engine, hyperframe.RecordState.invalid,
-                                                 uuid=hfr.pb.uuid)
-                    # else, pending, invalid, deleted is all OK with an invalid hyperframe
+            # Packed bundles hold all three kinds of records
+            packed = glob.glob(os.path.join(self.get_object_dir(), uuid_dir, '*' + hyperframe.PACKED_SUFFIX))
+            for f in packed:
+                for rcd in hyperframe.r_packed_fs(f, event='rebuild').itervalues():
+                    for (glb, rcd_type), store in zip(pb_types, (hframes, frames, auths)):
+                        if isinstance(rcd, rcd_type):
+                            store[rcd.pb.uuid] = rcd
+
+            verify_data = integrity.should_verify('rebuild')
+            for hfr in hframes.itervalues():
+                if DataContext._validate_hframe(hfr, frames, auths):
+                    # looks like a good hyperframe
+                    # print "Writing out HFR {} {}".format(hfr.pb.human_name, hfr.pb.uuid)
+                    hfr_frames = []
+                    for str_tuple in hfr.pb.frames:
+                        fr_uuid = str_tuple.v
+                        # The frame pb doesn't store the hfr_uuid, but the db
+                        # does.  Since we are reading from disk, we need to
+                        # set it back into the FrameRecord.
+                        frames[fr_uuid].hframe_uuid = hfr.pb.uuid
+                        if verify_data:
+                            frames[fr_uuid].verify_data_file(os.path.join(self.get_object_dir(), uuid_dir))
+                        hfr_frames.append(frames[fr_uuid])
+                    valid_bundles.append((hfr, hfr_frames))
+                else:
+                    # invalid hyperframe, if present in db as valid, mark invalid
+                    # Try to read it in
+                    hfr_from_db_list = hyperframe.select_hfr_db(self.local_engine, uuid=hfr.pb.uuid)
+                    assert(len(hfr_from_db_list) == 0 or len(hfr_from_db_list) == 1)
+                    if len(hfr_from_db_list) == 1:
+                        hfr_from_db = hfr_from_db_list[0]
+                        if hfr_from_db.state == hyperframe.RecordState.valid:
+                            # If it is valid, and we know it isn't, mark invalid
+                            hyperframe.update_hfr_db(self.local_engine, hyperframe.RecordState.invalid,
+                                                     uuid=hfr.pb.uuid)
+                        # else, pending, invalid, deleted is all OK with an invalid hyperframe
+
+            if len(valid_bundles) >= REBUILD_BATCH:
+                hyperframe.w_bundles_db(valid_bundles, self.local_engine)
+                valid_bundles = []
+
+        hyperframe.w_bundles_db(valid_bundles, self.local_engine)
 
         #print "hframes {}".format(hframes)
         #print "frames {}".format(frames)
@@ -586,6 +1229,7 @@ class DataContext(object):
 
             if no_force_required or force:
                 hyperframe.update_hfr_db(self.local_engine, hyperframe.RecordState.deleted, uuid=hfr_uuid)
+                self.frame_cache.invalidate([fr_uuid for _, fr_uuid in hfr[0].get_frame_ids()])
                 self.rm_db_links(hfr[0], dry_run=False)
                 shutil.rmtree(self.implicit_hframe_path(hfr_uuid))
                 hyperframe.delete_hfr_db(self.local_engine, uuid=hfr_uuid)
@@ -598,12 +1242,13 @@ class DataContext(object):
             _logger.error("Removal of hyperframe directory {} failed with error {}.".format(self.implicit_hframe_path(hfr_uuid), why))
             return False
 
-    def get_hframes(self, human_name=None, processing_name=None, uuid=None, tags=None, state=None, groupby=False):
+    def get_hframes(self, human_name=None, processing_name=None, uuid=None, tags=None, state=None, groupby=False,
+                    projection=False, limit=None, latest_only=False, tag_operators=False):
         """
         Find all hframes with the given bundle_name
 
         NOTE: Potentially expensive if the PB bytes are also in the db and no filtering.
-        TODO: Return list of records without PB.
+        Use projection=True when you only need the names, dates, and tags.
 
         Args:
             human_name (str): Given name
@@ -612,9 +1257,14 @@ class DataContext(object):
             tags (dict):
             state:
             groupby (bool): group by search
+            projection (bool): return `HyperFrameRow`s, which parse the pb only if asked
+            limit (int): return at most this many hframes
+            latest_only (bool): only return the latest hframe of each human_name
+            tag_operators (bool): tag values may use the operators in `disdat.tag_query`, else they match exactly
 
         Returns:
-            results (list): list of HyperFrameRecords (or rows if groupby=True) ordered youngest to oldest
+            results (list): list of HyperFrameRecords (or rows if groupby=True, or HyperFrameRows if projection=True)
+            ordered youngest to oldest
 
         """
         found = hyperframe.select_hfr_db(self.local_engine,
@@ -624,10 +1274,118 @@ class DataContext(object):
                                          tags=tags,
                                          state=state,
                                          orderby=True,
-                                         groupby=groupby)
+                                         groupby=groupby,
+                                         projection=projection,
+                                         limit=limit,
+                                         latest_only=latest_only,
+                                         tag_operators=tag_operators)
 
         return found
 
+    def iter_hframes(self, human_name=None, processing_name=None, uuid=None, tags=None, state=None,
+                     projection=False, latest_only=False, page_size=hyperframe.HFR_PAGE_SIZE, tag_operators=False):
+        """
+        Like get_hframes, but yield the hframes youngest to oldest, fetching page_size at a time.
+        Memory stays flat however large the context is, and callers may act on (or remove)
+        each hframe as it arrives.
+
+        Args:
+            human_name (str): Given name
+            processing_name (str): name of the process that created the hframe
+            uuid (str): UUID
+            tags (dict):
+            state:
+            projection (bool): yield `HyperFrameRow`s, which parse the pb only if asked
+            latest_only (bool): only yield the latest hframe of each human_name
+            page_size (int): hframes fetched by each query
+            tag_operators (bool): tag values may use the operators in `disdat.tag_query`, else they match exactly
+
+        Returns:
+            (generator): of HyperFrameRecords (or HyperFrameRows if projection=True)
+        """
+        return hyperframe.iter_hfr_db(self.local_engine,
+                                      human_name=human_name,
+                                      processing_name=processing_name,
+                                      uuid=uuid,
+                                      tags=tags,
+                                      state=state,
+                                      projection=projection,
+                                      latest_only=latest_only,
+                                      page_size=page_size,
+                                      tag_operators=tag_operators)
+
+    def lineage(self, uuid, direction='upstream', depth=None):
+        """
+        The bundles upstream (inputs, their inputs, ...) or downstream (outputs made from it, ...)
+        of a bundle, found with a recursive query over the lineage_edges table.
+
+        Args:
+            uuid (str): the bundle to start from
+            direction (str): 'upstream' or 'downstream'
+            depth (int): Optional.  Number of hops to follow, default all of them.
+
+        Returns:
+            (list): of `hyperframe.LineageNode`, nearest first.  human_name is None for
+            bundles that are not in this context.
+        """
+        return hyperframe.select_lineage_db(self.local_engine, uuid, direction=direction, depth=depth)
+
+    def load_frames(self, hfrs, frame_uuids=None):
+        """
+        Load the frames of one or more hframes.  Frames come from the frame cache, then from
+        the pb blobs in the catalog in one query, and only then from their files, for catalogs
+        that do not hold them.  Loaded frames go into the frame cache.
+
+        Args:
+            hfrs (list(`hyperframe.HyperFrameRecord`)): the hframes
+            frame_uuids (set(str)): Optional.  Only load these frames of the hframes.
+
+        Returns:
+            (dict): frame uuid to `hyperframe.FrameRecord`
+        """
+        wanted = {}
+        for hfr in hfrs:
+            for _, fr_uuid in hfr.get_frame_ids():
+                if frame_uuids is None or fr_uuid in frame_uuids:
+                    wanted[fr_uuid] = hfr.pb.uuid
+
+        frames = {}
+        missing = []
+        for fr_uuid in wanted:
+            fr = self.frame_cache.get(fr_uuid)
+            if fr is None:
+                missing.append(fr_uuid)
+            else:
+                frames[fr_uuid] = fr
+
+        if len(missing) == 0:
+            return frames
+
+        loaded = {fr.pb.uuid: fr for fr in hyperframe.select_fr_db(self.local_engine, missing)}
+
+        # Packed bundles give up all their missing frames in one read
+        unloaded = defaultdict(list)
+        for fr_uuid in missing:
+            if fr_uuid not in loaded:
+                unloaded[wanted[fr_uuid]].append(fr_uuid)
+        for hfr_uuid, fr_uuids in unloaded.iteritems():
+            packed_path = os.path.join(self.get_object_dir(), hfr_uuid, hyperframe.packed_filename(hfr_uuid))
+            if os.path.exists(packed_path):
+                loaded.update(hyperframe.r_packed_fs(packed_path, uuids=fr_uuids))
+
+        for fr_uuid in missing:
+            fr = loaded.get(fr_uuid)
+            if fr is None:
+                _logger.debug("Frame {} is not in the catalog, reading it from disk".format(fr_uuid))
+                fr = hyperframe.r_pb_fs(os.path.join(self.get_object_dir(), wanted[fr_uuid],
+                                                     hyperframe.FrameRecord.make_filename(fr_uuid)),
+                                        hyperframe.FrameRecord)
+            # NOTE: one extra variable in the FrameRecord that is not in the FrameRecord.pb
+            fr.hframe_uuid = wanted[fr_uuid]
+            self.frame_cache.put(fr)
+            frames[fr_uuid] = fr
+        return frames
+
     def write_hframe_db_only(self, hfr):
         """
         Quick hack to write an HFR pb into the db from DisdatFS
@@ -638,11 +1396,7 @@ class DataContext(object):
         Returns:
 
         """
-        hyperframe.w_pb_db(hfr, self.local_engine)
-
-        # Write DB Frames
-        for fr in hfr.get_frames(self):
-            hyperframe.w_pb_db(fr, self.local_engine)
+        hyperframe.w_bundles_db((hfr, hfr.get_frames(self)), self.local_engine)
 
     def _write_hframe_local(self, hfr):
         """
@@ -654,19 +1408,22 @@ class DataContext(object):
         Returns:
 
         """
-        # Write DB HyperFrame
-        result = hyperframe.w_pb_db(hfr, self.local_engine)
+        frames = hfr.get_frames(self)
+        bundle_dir = os.path.join(self.get_object_dir(), hfr.pb.uuid)
 
-        # Write FS Frames
-        for fr in hfr.get_frames(self):
-            hyperframe.w_pb_fs(os.path.join(self.get_object_dir(), hfr.pb.uuid), fr)
+        if self.storage['layout'] == 'packed':
+            # Write FS HyperFrame and Frames in one file
+            hyperframe.w_packed_fs(bundle_dir, hfr, frames)
+        else:
+            # Write FS Frames
+            for fr in frames:
+                hyperframe.w_pb_fs(bundle_dir, fr)
 
-        # Write FS HyperFrame
-        hyperframe.w_pb_fs(os.path.join(self.get_object_dir(), hfr.pb.uuid), hfr)
+            # Write FS HyperFrame
+            hyperframe.w_pb_fs(bundle_dir, hfr)
 
-        # Write DB Frames
-        for fr in hfr.get_frames(self):
-            hyperframe.w_pb_db(fr, self.local_engine)
+        # Write DB HyperFrame, tags, and Frames in one transaction
+        result = hyperframe.w_bundles_db((hfr, frames), self.local_engine)
 
         self.prune_uncommitted_history(hfr.pb.human_name)
 
@@ -686,6 +1443,8 @@ class DataContext(object):
             raise Exception("Write HFrame to remote failed because hfr {} doesn't appear to be in local context".format(
                 hfr.pb.uuid))
         to_copy_files = glob.glob(os.path.join(local_obj_dir, '*.pb'))
+        to_copy_files.extend(glob.glob(os.path.join(local_obj_dir, '*' + hyperframe.SIDECAR_SUFFIX)))
+        to_copy_files.extend(glob.glob(os.path.join(local_obj_dir, '*' + hyperframe.PARQUET_SUFFIX)))
         for f in to_copy_files:
             aws_s3.put_s3_file(f, os.path.join(self.get_remote_object_dir(), hfr.pb.uuid))
 
@@ -815,7 +1574,14 @@ class DataContext(object):
         hyperframe.delete_hfr_db(self.local_engine, uuid=hfr.pb.uuid)
 
         # 2.) Write FS HyperFrame PB to a sister file and then move to original file.
-        hyperframe.w_pb_fs(os.path.join(self.get_object_dir(), hfr.pb.uuid), hfr, atomic=True)
+        bundle_dir = os.path.join(self.get_object_dir(), hfr.pb.uuid)
+        packed_path = os.path.join(bundle_dir, hyperframe.packed_filename(hfr.pb.uuid))
+        if os.path.exists(packed_path):
+            records = hyperframe.r_packed_fs(packed_path)
+            hyperframe.w_packed_fs(bundle_dir, hfr, [r for u, r in records.iteritems() if u != hfr.pb.uuid],
+                                   atomic=True)
+        else:
+            hyperframe.w_pb_fs(bundle_dir, hfr, atomic=True)
 
         # 3.) Write DB HyperFrame and tags
         result = hyperframe.w_pb_db(hfr, self.local_engine)
@@ -862,7 +1628,7 @@ class DataContext(object):
 
         """
 
-        hfrs = self.get_hframes(human_name=human_name)
+        hfrs = self.get_hframes(human_name=human_name, projection=True)
         removed_history = 0
 
         if len(hfrs) == 0:
@@ -878,7 +1644,7 @@ class DataContext(object):
                 removed_history += 1
                 continue
 
-            self.rm_hframe(hfr.pb.uuid)
+            self.rm_hframe(hfr.uuid)
 
     def push_hfr_to_remote(self, hfr):
         """
@@ -898,8 +1664,6 @@ class DataContext(object):
 
         NOTE: Only chooses valid frames
 
-        TODO: use a select that projects out human_name
-
         Returns:
             results (list:(str)): sorted name list
         """
@@ -930,14 +1694,13 @@ class DataContext(object):
     def get_hframe_processing_names(self):
         """
         Return all processing names of all hframes in context
-        TODO: use a select that projects out processing_name
 
         Returns:
             results (list:(str)): sorted name list
         """
-        found = self.get_hframes(state=hyperframe.RecordState.valid)
+        found = self.get_hframes(processing_name='.*', state=hyperframe.RecordState.valid, groupby=True)
 
-        return found.sort(key=lambda hfr: hfr.pb.processing_name)
+        return sorted(row['processing_name'] for row in found)
 
     @staticmethod
     def convert_scalar2frame(hfid, name, scalar, managed_path):
@@ -976,24 +1739,35 @@ class DataContext(object):
             (`hyperframe.FrameRecord`)
 
         """
-        # Force everything to be ndarrays.
-        try:
-            if not isinstance(series_like, np.ndarray):
-                series_like = np.array(series_like[0:])
-        except TypeError:
-            series_like = np.array(series_like)
+        # Categoricals keep their codes, see FrameRecord.from_categorical
+        categorical = pd.api.types.is_categorical_dtype(series_like)
+
+        if not categorical:
+            # Force everything to be ndarrays.
+            try:
+                if not isinstance(series_like, np.ndarray):
+                    series_like = np.array(series_like[0:])
+            except TypeError:
+                series_like = np.array(series_like)
 
-        local_files_series = hyperframe.detect_local_fs_path(series_like)
+            local_files_series = hyperframe.detect_local_fs_path(series_like)
 
-        if local_files_series is not None:
-            series_like = local_files_series
+            if local_files_series is not None:
+                series_like = local_files_series
 
-        if hyperframe.FrameRecord.is_link_series(series_like):
+        if not categorical and hyperframe.FrameRecord.is_link_series(series_like):
             assert managed_path is not None
             series_like = [DataContext.copy_in_files(x, managed_path) for x in series_like]
             frame = hyperframe.FrameRecord.make_link_frame(hfid, name, series_like, managed_path)
         else:
-            frame = hyperframe.FrameRecord.from_serieslike(hfid, name, series_like)
+            # Large arrays go to .npy sidecars in a local managed path
+            sidecar_dir = DataContext.local_managed_dir(managed_path)
+            settings = storage_settings()
+            frame = hyperframe.FrameRecord.from_serieslike(hfid, name, series_like, sidecar_dir=sidecar_dir,
+                                                           sidecar_size=settings['sidecar_size'],
+                                                           string_type=settings['string_type'],
+                                                           codec=settings['codec'],
+                                                           codec_min_size=settings['codec_min_size'])
         return frame
 
     @staticmethod
@@ -1003,6 +1777,9 @@ class DataContext(object):
 
         For each 'file' column, move the files, and make the links
 
+        With [storage] df_format = parquet, and a local managed path, the other columns of numbers,
+        booleans, or strings go to one Parquet file, see FrameRecord.make_parquet_frames.
+
         Note: If the csv/tsv was saved with an index, the name will be 'Unnamed: 0'.
         We ignore all Unnamed columns.   Currently frames / columns are re-indexed
         by default from [0,len(frame)-1]
@@ -1015,15 +1792,55 @@ class DataContext(object):
         Returns:
             (list:`hyperframe.FrameRecord`)
         """
-        frames = []
+        columns = [c for c in df.columns if 'Unnamed:' not in c]  # ignore columns without names, like default index columns
 
-        for idx, c in enumerate(df.columns):  # @UnusedVariable
-            if 'Unnamed:' in c:
-                # ignore columsn without names, like default index columns
-                continue
-            frames.append(DataContext.convert_serieslike2frame(hfid, c, df[c], managed_path))
+        parquet_frames = {}
+        data_dir = DataContext.local_managed_dir(managed_path)
+        if data_dir is not None and storage_settings()['df_format'] == 'parquet':
+            parquet_columns = [c for c in columns if DataContext.is_parquet_column(df[c].values)]
+            if len(parquet_columns) > 0:
+                parquet_frames = {fr.pb.name: fr for fr in
+                                  hyperframe.FrameRecord.make_parquet_frames(hfid, df[parquet_columns], data_dir)}
+
+        frames = []
+        for c in columns:
+            if c in parquet_frames:
+                frames.append(parquet_frames[c])
+            else:
+                frames.append(DataContext.convert_serieslike2frame(hfid, c, df[c], managed_path))
         return frames
 
+    @staticmethod
+    def is_parquet_column(nda):
+        """
+        Whether convert_df2frames may put this column in a Parquet file: numbers, booleans, or strings
+        that are not paths to files.
+
+        Args:
+            nda (`numpy.ndarray`): the column's values
+
+        Returns:
+            (bool)
+        """
+        if nda.dtype.type == np.object_:
+            if pd.api.types.infer_dtype(nda) not in ('string', 'unicode'):
+                return False
+            return hyperframe.detect_local_fs_path(nda) is None and not hyperframe.FrameRecord.is_link_series(nda)
+        return nda.dtype.kind in 'biuf'
+
+    @staticmethod
+    def local_managed_dir(managed_path):
+        """
+        Args:
+            managed_path (str): a bundle's managed path, or None
+
+        Returns:
+            (str): the local directory of the managed path, or None if there is none or it is remote
+        """
+        if managed_path is not None and urlparse(managed_path).scheme in ('', 'file'):
+            return urlparse(managed_path).path
+        return None
+
     @staticmethod
     def find_subdir(src, dst):
         """
@@ -1225,7 +2042,7 @@ class DataContext(object):
 
         return file_set
 
-    def convert_hfr2df(self, hfr):
+    def convert_hfr2df(self, hfr, columns=None, rows=None):
         """
         Given a HyperFrameRecord, convert into a dataframe.  If no data, return empty dataframe
 
@@ -1234,27 +2051,117 @@ class DataContext(object):
         Note: This is an instance method.   A HyperFrameRecord may not have all its frames cached.
         To find its frames, we need to know the context we are in.
 
+        Note: Columns are in the hframe's frame order, and the dataframe holds each frame's decoded
+        array without a further copy, see convert_arrays2df.  Sidecar frames are copy-on-write maps.
+        Columns in a Parquet file are read from it together, and only those asked for.
+        With rows, sidecar and Parquet frames read only those rows, see FrameRecord.to_ndarray.
+
         Args:
             hfid: hyperframe uuid
             hfr: hyperframe to convert
+            columns (list(str)): Optional.  Only these columns, in this order
+            rows (slice): Optional.  Only these rows, e.g., slice(10) for the first ten
 
         Returns:
             (`pandas.DataFrame`)
         """
 
-        frames = hfr.get_frames(self)
-        columns = []
+        DataContext.check_columns(hfr, columns)
+        frames = hfr.get_frames(self, names=columns)
+
+        parquet_columns = defaultdict(list)
         for fr in frames:
-            if fr.is_local_fs_link_frame() or fr.is_s3_link_frame() or fr.is_db_link_frame():
+            if fr.is_parquet_frame():
+                parquet_columns[(fr.hframe_uuid, fr.get_data_filename())].append(fr)
+        parquet_arrays = {}
+        for (hfid, filename), file_frames in parquet_columns.iteritems():
+            file_path = os.path.join(self.implicit_hframe_path(hfid), filename)
+            file_columns = [fr.pb.name for fr in file_frames]
+            step = 1
+            file_rows = None
+            if rows is not None:
+                file_rows, step = hyperframe.row_range(rows, file_frames[0].pb.shape[0])
+            arrays = hyperframe.read_parquet_columns(file_path, file_columns, rows=file_rows)
+            parquet_arrays.update(zip(file_columns, [nda[::step] for nda in arrays]))
+
+        names = []
+        arrays = []
+        for fr in frames:
+            if fr.is_parquet_frame():
+                nda = parquet_arrays[fr.pb.name]
+            elif fr.is_local_fs_link_frame() or fr.is_s3_link_frame() or fr.is_db_link_frame():
                 src_paths = self.actualize_link_urls(fr, strip_file_scheme=True)
-                columns.append(pd.Series(data=src_paths, name=fr.pb.name))
+                nda = np.array(src_paths, dtype=np.object_)
+                if rows is not None:
+                    nda = nda[rows]
             else:
-                columns.append(fr.to_series())
-
-        if len(columns) == 0:
+                nda = fr.to_values(data_dir=self.implicit_hframe_path(fr.hframe_uuid), mmap_mode='c', rows=rows)
+                if isinstance(nda, np.ndarray) and not nda.flags.writeable:
+                    # Decode inline bytes into an array we own, so tasks may modify the dataframe in place.
+                    # Each frame's bytes are freed as we go, rather than all held until one big concat.
+                    nda = nda.copy()
+                if nda.ndim == 0:
+                    nda = nda.reshape((1,))
+            names.append(fr.pb.name)
+            arrays.append(nda)
+
+        if len(arrays) == 0:
             return pd.DataFrame()
         else:
-            return pd.concat(columns, axis=1)
+            return DataContext.convert_arrays2df(names, arrays)
+
+    @staticmethod
+    def check_columns(hfr, columns):
+        """
+        Raise an Exception if the bundle does not have all of the columns.
+
+        Args:
+            hfr (`hyperframe.HyperFrameRecord`):
+            columns (list(str)): column names, or None for all of them
+
+        Returns:
+            None
+        """
+        if columns is not None:
+            missing = [c for c in columns if c not in hfr.frame_dict]
+            if len(missing) > 0:
+                raise Exception("Bundle {} has no columns {}".format(hfr.pb.human_name, missing))
+
+    @staticmethod
+    def convert_arrays2df(names, arrays):
+        """
+        Make a dataframe from columns of decoded frame arrays without copying them.
+
+        pd.concat of series, or pd.DataFrame of a dict, aligns the indexes and then consolidates
+        columns of a dtype into one 2d block, a copy of every column.   Instead each column is its
+        own block, a view of its array.  Pandas consolidates the blocks later, if an operation needs it.
+
+        Columns of different lengths, or of more than one dimension, take the pd.concat path.
+        Categoricals are blocks of their own too.
+
+        Args:
+            names (list(str)): column names
+            arrays (list(`numpy.ndarray`, `pandas.Categorical`)): column values, in the order of names
+
+        Returns:
+            (`pandas.DataFrame`)
+        """
+        if any(nda.ndim != 1 for nda in arrays) or len(set(len(nda) for nda in arrays)) != 1:
+            return pd.concat([pd.Series(data=nda, name=name) for name, nda in zip(names, arrays)], axis=1)
+
+        blocks = []
+        for i, nda in enumerate(arrays):
+            if pd.api.types.is_categorical_dtype(nda):
+                blocks.append(make_block(nda, placement=[i]))
+                continue
+            # A plain ndarray view of memory mapped (sidecar) columns
+            nda = np.asarray(nda)
+            if nda.dtype.kind in 'SU':
+                # As pd.Series does, pandas keeps strings in object columns
+                nda = nda.astype(np.object_)
+            blocks.append(make_block(nda.reshape((1, len(nda))), placement=[i]))
+
+        return pd.DataFrame(BlockManager(blocks, [pd.Index(names), pd.RangeIndex(len(arrays[0]))]))
 
     def convert_hfr2scalar(self, hfr):
         """
@@ -1275,15 +2182,16 @@ class DataContext(object):
             src_paths = self.actualize_link_urls(fr, strip_file_scheme=True)
             nda = np.array(src_paths)
         else:
-            nda = fr.to_ndarray()
+            nda = fr.to_ndarray(data_dir=self.implicit_hframe_path(fr.hframe_uuid))
 
         return nda.item()
 
-    def convert_hfr2ndarray(self, hfr):
+    def convert_hfr2ndarray(self, hfr, rows=None):
         """
         Convert a HyperFrameRecord into an ndarray.
         Args:
             hfr:
+            rows (slice): Optional.  Only these rows, of the first dimension
 
         Returns:
 
@@ -1294,11 +2202,12 @@ class DataContext(object):
 
         if fr.is_local_fs_link_frame() or fr.is_s3_link_frame() or fr.is_db_link_frame():
             src_paths = self.actualize_link_urls(fr, strip_file_scheme=True)
-            return np.array(src_paths)
+            nda = np.array(src_paths)
+            return nda if rows is None else nda[rows]
         else:
-            return fr.to_ndarray()
+            return fr.to_ndarray(data_dir=self.implicit_hframe_path(fr.hframe_uuid), rows=rows)
 
-    def convert_hfr2row(self, hfr):
+    def convert_hfr2row(self, hfr, columns=None):
         """
         Convert a HyperFrameRecord into a tuple (row).  The user can input either a tuple (x,y,z), in which case we
         fabricate column names.  Or the user may pass a dictionary.   If there are multiple values to unpack then we
@@ -1306,11 +2215,13 @@ class DataContext(object):
 
         Args:
             hfr:
+            columns (list(str)): Optional.  Only the values of these names
 
         Returns:
 
         """
-        frames = hfr.get_frames(self)
+        DataContext.check_columns(hfr, columns)
+        frames = hfr.get_frames(self, names=columns)
         row = []
         for fr in frames:
             if fr.is_local_fs_link_frame() or fr.is_s3_link_frame() or fr.is_db_link_frame():
@@ -1320,10 +2231,11 @@ class DataContext(object):
                 else:
                     row.append((fr.pb.name, np.array(src_paths)))
             else:
+                nda = fr.to_ndarray(data_dir=self.implicit_hframe_path(fr.hframe_uuid))
                 if fr.pb.shape[0] == 1:
-                    row.append((fr.pb.name, fr.to_ndarray().item()))
+                    row.append((fr.pb.name, nda.item()))
                 else:
-                    row.append((fr.pb.name, fr.to_ndarray()))
+                    row.append((fr.pb.name, nda))
         if common.DEFAULT_FRAME_NAME in frames[0].pb.name:
             # Drop the names and return a list of unkeyed values.
             return tuple([r[1] for r in row])
@@ -1331,12 +2243,17 @@ class DataContext(object):
             d = { t[0]: (t[1] if isinstance(t[1], (tuple, list, np.ndarray)) else [t[1]]) for t in row }
             return d
 
-    def present_hfr(self, hfr):
+    def present_hfr(self, hfr, columns=None, rows=None):
         """
         If HyperFrame is presentable, return presentable data type.
 
+        Dataframes may be presented with only some columns or rows, tensors with only some rows, and
+        rows (tuples or dicts) with only some columns.
+
         Args:
             hfr:
+            columns (list(str)): Optional.  Only these columns of a DF, or names of a ROW
+            rows (slice): Optional.  Only these rows of a DF or TENSOR, e.g., slice(10) for the first ten
 
         Returns:
             one of DataFrame, ndarray, scalar, tuple, or just the hyperframe
@@ -1344,6 +2261,13 @@ class DataContext(object):
         """
         assert hfr.pb.presentation != hyperframe_pb2.DEFAULT
 
+        if columns is not None and hfr.pb.presentation not in (hyperframe_pb2.DF, hyperframe_pb2.ROW):
+            raise Exception("Bundle {} is a {}, only DF and ROW bundles have columns".format(
+                hfr.pb.human_name, hyperframe_pb2.Presentation.Name(hfr.pb.presentation)))
+        if rows is not None and hfr.pb.presentation not in (hyperframe_pb2.DF, hyperframe_pb2.TENSOR):
+            raise Exception("Bundle {} is a {}, only DF and TENSOR bundles have rows".format(
+                hfr.pb.human_name, hyperframe_pb2.Presentation.Name(hfr.pb.presentation)))
+
         if hfr.pb.presentation == hyperframe_pb2.HF:
             frames = hfr.get_frames(self)
             assert len(frames) == 1
@@ -1351,16 +2275,16 @@ class DataContext(object):
             return frames[0].get_hframes()
 
         elif hfr.pb.presentation == hyperframe_pb2.DF:
-            return self.convert_hfr2df(hfr)
+            return self.convert_hfr2df(hfr, columns=columns, rows=rows)
 
         elif hfr.pb.presentation == hyperframe_pb2.SCALAR:
             return self.convert_hfr2scalar(hfr)
 
         elif hfr.pb.presentation == hyperframe_pb2.TENSOR:
-            return self.convert_hfr2ndarray(hfr)
+            return self.convert_hfr2ndarray(hfr, rows=rows)
 
         elif hfr.pb.presentation == hyperframe_pb2.ROW:
-            return self.convert_hfr2row(hfr)
+            return self.convert_hfr2row(hfr, columns=columns)
 
         else:
             raise Exception("present_hfr with HFR using unknown presentation enumeration {}".format(hfr.pb.presentation))
@@ -65,6 +65,7 @@ class DriverTask(luigi.WrapperTask, PipeBase):
          input_tags:
          output_tags:
          force:         Force recompute of dependencies (requires)
+         input_tag_operators: Input tag values may use the operators in `disdat.tag_query`
     """
     input_bundle = luigi.Parameter(default=None)
     output_bundle = luigi.Parameter(default=None)
@@ -73,6 +74,7 @@ class DriverTask(luigi.WrapperTask, PipeBase):
     input_tags = luigi.DictParameter()
     output_tags = luigi.DictParameter()
     force = luigi.BoolParameter(default=False)
+    input_tag_operators = luigi.BoolParameter(default=False)
 
     def __init__(self, *args, **kwargs):
         """
@@ -86,7 +88,8 @@ class DriverTask(luigi.WrapperTask, PipeBase):
         super(DriverTask, self).__init__(*args, **kwargs)
 
         if self.input_bundle != '-':  # '-' means no input bundle
-            self.input_bundle_obj = self.pfs.get_latest_hframe(self.input_bundle, tags=self.input_tags)
+            self.input_bundle_obj = self.pfs.get_latest_hframe(self.input_bundle, tags=self.input_tags,
+                                                               tag_operators=self.input_tag_operators)
             if self.input_bundle_obj is None:
                 raise Exception("Driver unable to find input bundle {}".format(self.input_bundle))
         else:
@@ -95,6 +95,9 @@ def main():
     apply_p.add_argument('-w', '--workers', type=int, default=1, help="Number of Luigi workers on this node")
     apply_p.add_argument('-it', '--input-tag', nargs=1, type=str, action='append',
                          help="Input bundle tags: '-it authoritative:True -it version:0.7.1'")
+    apply_p.add_argument('-ito', '--input-tag-operators', action='store_true',
+                         help="Input tag values may be a prefix 'dataset:genome_*' or a range 'version:>=0.7', "
+                              "'version:0.7..1.0'.  Use '=' to match a value exactly, 'version:=>1'")
     apply_p.add_argument('-ot', '--output-tag', nargs=1, type=str, action='append',
                          help="Output bundle tags: '-ot authoritative:True -ot version:0.7.1'")
     apply_p.add_argument("input_bundle", type=str, help="Name of source data bundle.  '-' means no input bundle.")
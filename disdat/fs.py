@@ -23,6 +23,7 @@ from a variety of backend resources.
 
 
 import disdat.hyperframe as hyperframe
+import disdat.integrity as integrity
 import disdat.common as common
 import disdat.utility.aws_s3 as aws_s3
 from disdat.data_context import DataContext
@@ -30,6 +31,7 @@ from disdat.common import DisdatConfig, error
 
 import logging
 import os
+import io
 import json
 import uuid
 import time
@@ -377,24 +379,26 @@ class DisdatFS(object):
             return_strings.append("Disdat Context {}".format(self._curr_context.get_repo_name()))
             return_strings.append("On local branch {}".format(self._curr_context.get_local_name()))
 
-            hfrs = self._curr_context.get_hframes(human_name=human_name, tags=tags)
+            # Youngest first, so the first is the latest.  We remove the rest as they stream in.
+            hfrs = self._curr_context.iter_hframes(human_name=human_name, tags=tags)
 
-            if len(hfrs) == 0:
+            latest = next(hfrs, None)
+            if latest is None:
                 return_strings.append("No bundles to remove.")
                 return return_strings
 
             if rm_old_only or rm_all:
-                for hfr in hfrs[1:]:
+                for hfr in hfrs:
                     if self._curr_context.rm_hframe(hfr.pb.uuid, force=force):
                         return_strings.append("Removing old bundle {}".format(hfr.to_string()))
 
             if not rm_old_only:
-                if self._curr_context.rm_hframe(hfrs[0].pb.uuid, force=force):
-                    return_strings.append("Removing latest bundle {}".format(hfrs[0].to_string()))
+                if self._curr_context.rm_hframe(latest.pb.uuid, force=force):
+                    return_strings.append("Removing latest bundle {}".format(latest.to_string()))
 
             return return_strings
 
-    def add(self, bundle_name, path_name, tags):
+    def add(self, bundle_name, path_name, tags, chunksize=None, dtypes=None):
         """  Create bundle bundle_name given path path_name.
         The path may point to a file or a csv/tsv file.  If a file, create a simple bundle
         with a single link.  Otherwise create a bundle with the data in the csv/tsv file.
@@ -406,6 +410,8 @@ class DisdatFS(object):
             bundle_name (str):
             path_name (str):
             tags (dict):
+            chunksize (int): Rows of a csv/tsv to parse at a time, 0 all at once, default add.ADD_CHUNK_ROWS
+            dtypes (dict): Column name to type for a csv/tsv, e.g., {'zip': 'str'}
 
         Returns:
 
@@ -419,11 +425,6 @@ class DisdatFS(object):
                                                                          bundle_name,
                                                                          self._curr_context.get_repo_name()))
 
-        # we only make the instance to add the output bundle -- it MUST have the same args as args below!
-        add_pipe = disdat.add.AddTask(path_name, bundle_name, tags)
-
-        self.new_output_hframe(add_pipe, is_left_edge_task=False)
-
         args = [disdat.add.AddTask.task_family,
                 '--local-scheduler',
                 '--input-path', path_name,
@@ -431,9 +432,22 @@ class DisdatFS(object):
                 '--tags', json.dumps(tags)
                 ]
 
+        params = {}
+        if chunksize is not None:
+            params['chunksize'] = chunksize
+            args.extend(['--chunksize', str(chunksize)])
+        if dtypes:
+            params['dtypes'] = dtypes
+            args.extend(['--dtypes', json.dumps(dtypes)])
+
+        # we only make the instance to add the output bundle -- it MUST have the same args as args above!
+        add_pipe = disdat.add.AddTask(path_name, bundle_name, tags, **params)
+
+        self.new_output_hframe(add_pipe, is_left_edge_task=False)
+
         retcodes.run_with_retcodes(args)
 
-    def get_latest_hframe(self, human_name, tags=None, getall=False):
+    def get_latest_hframe(self, human_name, tags=None, getall=False, tag_operators=False):
         """
         Given bundle_name, what is the most recent one (by date created) in this context?
 
@@ -441,14 +455,15 @@ class DisdatFS(object):
             human_name (str):
             tags (:dict):
             getall:
+            tag_operators (bool): Tag values may use the operators in `disdat.tag_query`, else they match exactly
 
         Returns:
             None or (`hyperframe.HyperFrameRecord`): None or latest hframe
         """
 
-        found = self._curr_context.get_hframes(human_name=human_name, tags=tags)
+        found = self._curr_context.get_hframes(human_name=human_name, tags=tags, limit=None if getall else 1,
+                                               tag_operators=tag_operators)
 
-        # TODO: filter at SQL instead
         if len(found) > 0:
             if getall:
                 return found
@@ -493,9 +508,8 @@ class DisdatFS(object):
             None or HyperFrameRecord
         """
 
-        found = self._curr_context.get_hframes(processing_name=processing_name)
+        found = self._curr_context.get_hframes(processing_name=processing_name, limit=None if getall else 1)
 
-        # TODO: filter at SQL instead
         if len(found) > 0:
             if getall:
                 return found
@@ -504,7 +518,7 @@ class DisdatFS(object):
         else:
             return None
 
-    def ls(self, search_name, print_tags, print_intermediates, print_long, tags=None):
+    def ls(self, search_name, print_tags, print_intermediates, print_long, tags=None, tag_operators=False):
         """
         Enumerate bundles (hyperframes) in this context.
 
@@ -513,13 +527,31 @@ class DisdatFS(object):
             print_tags (bool): Whether to print the bundle tags
             print_intermediates (bool): Whether to show intermediate bundles
             tags: Optional. A dictionary of tags to search for.
+            tag_operators (bool): Tag values may use the operators in `disdat.tag_query`, else they match exactly
 
         Returns:
 
+        """
+        return list(self.iter_ls(search_name, print_tags, print_intermediates, print_long, tags=tags,
+                                 tag_operators=tag_operators))
+
+    def iter_ls(self, search_name, print_tags, print_intermediates, print_long, tags=None, tag_operators=False):
+        """
+        Like ls, but yield each line as we page through the catalog.
+
+        Args:
+            search_name: May be None.  Interpret as a simple regex (one kleene star)
+            print_tags (bool): Whether to print the bundle tags
+            print_intermediates (bool): Whether to show intermediate bundles
+            tags: Optional. A dictionary of tags to search for.
+            tag_operators (bool): Tag values may use the operators in `disdat.tag_query`, else they match exactly
+
+        Returns:
+            (generator): of str
         """
         if not self.in_context():
             _logger.warning('Not in a data context')
-            return []
+            return
 
         if not print_intermediates:
             if tags is not None:
@@ -527,18 +559,18 @@ class DisdatFS(object):
             else:
                 tags = {'root_task': True}
 
-        output_strings = []
-
         if print_long:
-            output_strings.append(DisdatFS._pretty_print_header())
+            yield DisdatFS._pretty_print_header()
 
-        for i, r in enumerate(self._curr_context.get_hframes(human_name=search_name, tags=tags)):
+        # Without print_long we only print each name once, so only fetch the latest of each.
+        seen = set()
+        for r in self._curr_context.iter_hframes(human_name=search_name, tags=tags, projection=True,
+                                                 latest_only=not print_long, tag_operators=tag_operators):
             if print_long:
-                output_strings.append(DisdatFS._pretty_print_hframe(r, print_tags=print_tags))
-            else:
-                if r.pb.human_name not in output_strings:
-                    output_strings.append(r.pb.human_name)
-        return output_strings
+                yield DisdatFS._pretty_print_hframe(r, print_tags=print_tags)
+            elif r.human_name not in seen:
+                seen.add(r.human_name)
+                yield r.human_name
 
     @staticmethod
     def _pretty_print_header():
@@ -547,25 +579,30 @@ class DisdatFS(object):
 
     @staticmethod
     def _pretty_print_hframe(hfr, print_tags=False):
+        """
+        Args:
+            hfr (`hyperframe.HyperFrameRow`):
+            print_tags (bool):
+        """
 
         if 'committed' in hfr.tag_dict:
             committed = 'True'
         else:
             committed = 'False'
 
-        output_string = "{:20}\t{:20}\t{:8}\t{:18}\t{:8}\t{:40}".format(hfr.pb.human_name,
-                                                                   hfr.pb.processing_name[:],
-                                                                   hfr.pb.owner,
-                                                                   time.strftime("%m-%d-%y %H:%M:%S ",time.gmtime(hfr.pb.lineage.creation_date)),
+        output_string = "{:20}\t{:20}\t{:8}\t{:18}\t{:8}\t{:40}".format(hfr.human_name,
+                                                                   hfr.processing_name[:],
+                                                                   hfr.owner,
+                                                                   time.strftime("%m-%d-%y %H:%M:%S ",time.gmtime(hfr.creation_date)),
                                                                    committed,
-                                                                   hfr.pb.uuid)
+                                                                   hfr.uuid)
         if print_tags:
             tags = ["[{}]:[{}]".format(k, v) for k, v in hfr.tag_dict.iteritems() if k != 'committed']
             output_string += ' '.join(tags)
 
         return output_string
 
-    def cat(self, human_name, uuid=None, tags=None, file=None):
+    def cat(self, human_name, uuid=None, tags=None, file=None, columns=None, rows=None):
         """
         Given a bundle name and optional uuid, return a dataframe with its contents
 
@@ -574,6 +611,8 @@ class DisdatFS(object):
             uuid (str):
             tags (:dict):
             file (str): output file
+            columns (list(str)): Optional.  Only these columns
+            rows (slice): Optional.  Only these rows, e.g., slice(10) for the first ten
 
         Returns:
             (`DataFrame`):
@@ -588,7 +627,7 @@ class DisdatFS(object):
             hfr = self.get_hframe_by_uuid(uuid, tags=tags)
 
         if hfr is not None:
-            df = self._curr_context.convert_hfr2df(hfr)
+            df = self._curr_context.convert_hfr2df(hfr, columns=columns, rows=rows)
             if df is not None and file is not None:
                 print "Saving to file {}".format(file)
                 df.to_csv(file, sep=',', index=False)
@@ -596,6 +635,38 @@ class DisdatFS(object):
         else:
             return None
 
+    def lineage(self, human_name=None, uuid=None, downstream=False, depth=None):
+        """
+        List the bundles a bundle was made from, or with downstream=True, the bundles made from it.
+
+        Args:
+            human_name (str): bundle name, we start from its latest version
+            uuid (str): or the uuid of the bundle to start from
+            downstream (bool): walk to the bundles made from this one
+            depth (int): Optional.  Number of hops to follow, default all of them.
+
+        Returns:
+            (list): of str
+        """
+        if not self.in_context():
+            _logger.warning('Not in a data context')
+            return []
+
+        if uuid is None:
+            hfr = self.get_latest_hframe(human_name)
+            if hfr is None:
+                return ["No bundle with name {}".format(human_name)]
+            uuid = hfr.pb.uuid
+
+        direction = 'downstream' if downstream else 'upstream'
+        output_strings = ["{:6}\t{:40}\t{:30}\t{}".format('DEPTH', 'UUID', 'PROC_NAME', 'NAME')]
+        for node in self._curr_context.lineage(uuid, direction=direction, depth=depth):
+            output_strings.append("{:6}\t{:40}\t{:30}\t{}".format(node.depth, node.uuid,
+                                                                   node.processing_name,
+                                                                   node.human_name if node.human_name is not None
+                                                                   else '[not in context]'))
+        return output_strings
+
     @staticmethod
     def _extract_uuid(managed_path):
         """
@@ -912,6 +983,7 @@ class DisdatFS(object):
 
         frame_copies = []
         need_to_copy = False
+        copied_files = set()
 
         # Move files in LINK frames to new local destination
         for fr in hfr.get_frames(self.get_curr_context()):
@@ -929,7 +1001,7 @@ class DisdatFS(object):
                 # For now we copy the remote S3 file to the local bundle.  Requires connectivity.  But
                 # this breaks the implicit dependency.
 
-                possible_fr_copy = self._copy_fr(fr, new_hfr_uuid, local_fs_managed_path)
+                possible_fr_copy = self._copy_fr(fr, new_hfr_uuid, local_fs_managed_path, copied_files)
 
                 if possible_fr_copy is not fr:
                     need_to_copy = True
@@ -1068,6 +1140,7 @@ class DisdatFS(object):
 
         frame_copies = []
         need_to_copy = False
+        copied_files = set()
 
         for fr in hfr.get_frames(self.get_curr_context()):
 
@@ -1096,7 +1169,7 @@ class DisdatFS(object):
                 # CASE 2:  This is a different kind of frame
                 # If it is a local fs or an s3 frame, then we have to copy
                 # the files over.  It's a new frame.
-                possible_fr_copy = self._copy_fr(fr, new_hfr_uuid, managed_path)
+                possible_fr_copy = self._copy_fr(fr, new_hfr_uuid, managed_path, copied_files)
 
                 if possible_fr_copy is not fr:
                     need_to_copy = True
@@ -1134,7 +1207,7 @@ class DisdatFS(object):
 
         return need_to_copy
 
-    def _copy_fr(self, fr, new_hfr_uuid, managed_path):
+    def _copy_fr(self, fr, new_hfr_uuid, managed_path, copied_files=None):
         """
         Given a non-HyperFrame frame, if a local fs or s3 frame, do the
         copy_in to the managed_path.
@@ -1143,6 +1216,8 @@ class DisdatFS(object):
             fr:  Frame to possibly copy_in files to managed_path
             new_hfr_uuid:  The new uuid of the new enclosing hframe
             managed_path: The s3 path where these files should go.
+            copied_files (set): Optional.  Data files already copied for the bundle, the frames of
+                a Parquet file share it.
 
         Returns:
             (`hyperframe.FrameRecord`): Return either a fr copy with new paths or same fr
@@ -1156,6 +1231,14 @@ class DisdatFS(object):
             src_paths = self._curr_context.actualize_link_urls(fr)
             new_paths = DataContext.copy_in_files(src_paths, managed_path)
             fr = hyperframe.FrameRecord.make_link_frame(new_hfr_uuid, fr.pb.name, new_paths, managed_path)
+        elif fr.get_data_filename() is not None:
+            # The frame links to its .npy or Parquet file by name, relative to the bundle, so only the file moves
+            assert self._curr_context is not None
+            src_path = os.path.join(self._curr_context.implicit_hframe_path(fr.hframe_uuid), fr.get_data_filename())
+            if copied_files is None or src_path not in copied_files:
+                DataContext.copy_in_files(src_path, managed_path)
+                if copied_files is not None:
+                    copied_files.add(src_path)
         return fr
 
     def push(self, human_name=None, uuid=None, tags=None, force_uuid=None):
@@ -1274,11 +1357,14 @@ class DisdatFS(object):
 
         possible_hframe_objects = aws_s3.ls_s3_url_objects(self.get_curr_context().get_remote_object_dir())
 
-        hframe_objects = [obj for obj in possible_hframe_objects if '_hframe.pb' in obj.key]
+        # A bundle is either a <uuid>_hframe.pb with a <uuid>_frame.pb per frame, or one packed <uuid>_bundle.pb
+        hframe_objects = [obj for obj in possible_hframe_objects
+                          if '_hframe.pb' in obj.key or hyperframe.PACKED_SUFFIX in obj.key]
 
         for s3_hfr_obj in hframe_objects:
             hfr_basename = os.path.basename(s3_hfr_obj.key)
             s3_uuid = hfr_basename.split('_')[0]
+            packed = hyperframe.PACKED_SUFFIX in hfr_basename
 
             if uuid is not None:   # filter by UUID
                 if s3_uuid != uuid:
@@ -1294,7 +1380,10 @@ class DisdatFS(object):
                     # Are we trying to localize a particular HyperFrame?  match name and uuid. 
 
                     obj = s3_hfr_obj.Object().get()
-                    hfr_test = hyperframe.HyperFrameRecord.from_str_bytes(obj['Body'].read())
+                    if packed:
+                        hfr_test = hyperframe.unpack_records(io.BytesIO(obj['Body'].read()), uuids=[s3_uuid])[s3_uuid]
+                    else:
+                        hfr_test = hyperframe.HyperFrameRecord.from_str_bytes(obj['Body'].read())
                     if human_name is not None:
                         if human_name != hfr_test.pb.human_name:
                             continue
@@ -1307,7 +1396,14 @@ class DisdatFS(object):
 
             else:
                 obj = s3_hfr_obj.Object().get()
-                hfr_test = hyperframe.HyperFrameRecord.from_str_bytes(obj['Body'].read())
+                contents = obj['Body'].read()
+                if packed:
+                    # Verifies every record in the bundle
+                    hfr_test = hyperframe.unpack_records(io.BytesIO(contents), event='pull')[s3_uuid]
+                else:
+                    hfr_test = hyperframe.HyperFrameRecord.from_str_bytes(contents)
+                    if integrity.should_verify('pull'):
+                        integrity.verify_pb(hfr_test.pb, contents)
                 if human_name is not None:
                     if human_name != hfr_test.pb.human_name:
                         continue
@@ -1325,16 +1421,42 @@ class DisdatFS(object):
 
                 os.makedirs(local_uuid_dir)
 
-                hyperframe.w_pb_fs(None, hfr_test, local_hfr_path)
-
-                # grab frames for this hyperframe
                 s3_hfr_dir = os.path.join(self.get_curr_context().get_remote_object_dir(), s3_uuid)
-                possible_frame_objects = aws_s3.ls_s3_url_objects(s3_hfr_dir)
-                frame_objects = [obj for obj in possible_frame_objects if '_frame.pb' in obj.key]
-                for s3_fr_obj in frame_objects:
-                    fr_basename = os.path.basename(s3_fr_obj.key)
-                    local_fr_path = os.path.join(local_uuid_dir,fr_basename)
-                    s3_fr_obj.Object().download_file(local_fr_path)
+                if packed:
+                    # The hframe and its frames came down in one object, fetch just their sidecar and Parquet files
+                    with open(local_hfr_path, 'wb') as f:
+                        f.write(contents)
+                    local_frames = [fr for fr in hyperframe.r_packed_fs(local_hfr_path).itervalues()
+                                    if isinstance(fr, hyperframe.FrameRecord)]
+                    data_files = set(fr.get_data_filename() for fr in local_frames)
+                    data_files.discard(None)
+                    for data_file in data_files:
+                        aws_s3.get_s3_file(os.path.join(s3_hfr_dir, data_file), os.path.join(local_uuid_dir, data_file))
+                else:
+                    hyperframe.w_pb_fs(None, hfr_test, local_hfr_path)
+
+                    # grab frames, and the sidecar and Parquet files of their data, for this hyperframe
+                    possible_frame_objects = aws_s3.ls_s3_url_objects(s3_hfr_dir)
+                    frame_objects = [obj for obj in possible_frame_objects
+                                     if '_frame.pb' in obj.key or hyperframe.SIDECAR_SUFFIX in obj.key
+                                     or hyperframe.PARQUET_SUFFIX in obj.key]
+                    local_frames = []
+                    for s3_fr_obj in frame_objects:
+                        fr_basename = os.path.basename(s3_fr_obj.key)
+                        local_fr_path = os.path.join(local_uuid_dir,fr_basename)
+                        s3_fr_obj.Object().download_file(local_fr_path)
+                        if '_frame.pb' in fr_basename:
+                            local_frames.append(hyperframe.r_pb_fs(local_fr_path, hyperframe.FrameRecord, event='pull'))
+
+                # Check the sidecar and Parquet files against their frames' content hashes, and
+                # leave nothing behind for a rebuild to find if they do not match
+                if integrity.should_verify('pull'):
+                    try:
+                        for fr in local_frames:
+                            fr.verify_data_file(local_uuid_dir)
+                    except Exception:
+                        shutil.rmtree(local_uuid_dir)
+                        raise
 
                 self.get_curr_context().write_hframe_db_only(hfr_test)
 
@@ -1377,7 +1499,7 @@ class DisdatFS(object):
                 return_strings.append("No remote set.")
         if False:
             try:
-                hfrs = self._curr_context.get_hframes(human_name=human_name)
+                hfrs = self._curr_context.get_hframes(human_name=human_name, projection=True)
                 if len(hfrs) > 0:
                     return_strings.append("Most recent object with this name is:")
                     return_strings.extend(DisdatFS._pretty_print_hframe(hfrs[0]))
@@ -1403,7 +1525,8 @@ def _branch(fs, args):
 
 def _add(fs, args):
 
-    fs.add(args.bundle, args.path_name, tags=common.parse_args_tags(args.tag))
+    fs.add(args.bundle, args.path_name, tags=common.parse_args_tags(args.tag), chunksize=args.chunksize,
+           dtypes=common.parse_args_tags(args.dtype))
 
 
 def _commit(fs, args):
@@ -1450,13 +1573,21 @@ def _ls(fs, args):
     else:
         arg = None
 
-    for f in fs.ls(arg, args.print_tags, args.intermediates, args.verbose, tags=common.parse_args_tags(args.tag)):
+    for f in fs.iter_ls(arg, args.print_tags, args.intermediates, args.verbose, tags=common.parse_args_tags(args.tag),
+                        tag_operators=args.tag_operators):
         print f
 
 
 def _cat(fs, args):
 
-    df = fs.cat(args.bundle, tags=common.parse_args_tags(args.tag), file=args.file)
+    if args.head is not None:
+        rows = slice(args.head)
+    elif args.rows is not None:
+        rows = common.parse_args_rows(args.rows)
+    else:
+        rows = None
+
+    df = fs.cat(args.bundle, tags=common.parse_args_tags(args.tag), file=args.file, columns=args.columns, rows=rows)
 
     if df is None:
         print "dsdt cat found no bundle with name {}".format(args.bundle)
@@ -1466,6 +1597,14 @@ def _cat(fs, args):
         print df.to_string()
 
 
+def _lineage(fs, args):
+    if args.bundle is None and args.uuid is None:
+        print "dsdt lineage takes a bundle name or a --uuid."
+        return
+    for f in fs.lineage(args.bundle, uuid=args.uuid, downstream=args.downstream, depth=args.depth):
+        print f
+
+
 def _status(fs, args):
     for f in fs.status(args.bundle):
         print f
@@ -1504,6 +1643,10 @@ def init_fs_cl(subparsers):
                        help="Set one or more tags: 'dsdt add -t authoritative:True -t version:0.7.1'")
     add_p.add_argument('bundle', type=str, help='The destination bundle in the current context')
     add_p.add_argument('path_name', type=str, help='File or directory of files to add to the bundle', action='store')
+    add_p.add_argument('--chunksize', type=int, default=None,
+                       help='Rows of a .csv or .tsv to parse at a time, 0 parses it all at once (default 262144)')
+    add_p.add_argument('-d', '--dtype', nargs=1, type=str, action='append',
+                       help="Set the type of one or more columns of a .csv or .tsv: 'dsdt add -d zip:str -d price:float64'")
     add_p.set_defaults(func=lambda args: _add(fs, args))
 
     # commit
@@ -1533,6 +1676,9 @@ def init_fs_cl(subparsers):
                       help="Print bundles with more information.")
     ls_p.add_argument('-t', '--tag', nargs=1, type=str, action='append',
                       help="Having a specific tag: 'dsdt ls -t committed:True -t version:0.7.1'")
+    ls_p.add_argument('-to', '--tag-operators', action='store_true',
+                      help="Tag values may be a prefix 'dataset:genome_*' or a range 'version:>=0.7', "
+                           "'version:0.7..1.0'.  Use '=' to match a value exactly, 'version:=>1'")
     ls_p.set_defaults(func=lambda args: _ls(fs, args))
 
     # cat
@@ -1542,8 +1688,24 @@ def init_fs_cl(subparsers):
                       help="Having a specific tag: 'dsdt ls -t committed:True -t version:0.7.1'")
     cat_p.add_argument('-f', '--file', type=str,
                        help="Save output dataframe as csv without index to specified file")
+    cat_p.add_argument('-c', '--columns', nargs='+', type=str, default=None,
+                       help="Only these columns: 'dsdt cat -c user count <bundle>'")
+    cat_rows_g = cat_p.add_mutually_exclusive_group()
+    cat_rows_g.add_argument('--head', type=int, default=None,
+                            help="Only the first N rows, read without loading the rest of large bundles")
+    cat_rows_g.add_argument('--rows', type=str, default=None,
+                            help="Only rows start:stop, e.g., '100:200'")
     cat_p.set_defaults(func=lambda args: _cat(fs, args))
 
+    # lineage
+    lineage_p = subparsers.add_parser('lineage', description='Show the bundles a bundle was made from, or made from it.')
+    lineage_p.add_argument('bundle', nargs='?', type=str, help='A bundle in the current context, we use its latest version')
+    lineage_p.add_argument('-u', '--uuid', type=str, help='A UUID of a bundle in the current context')
+    lineage_p.add_argument('-d', '--downstream', action='store_true',
+                           help='Show the bundles made from this bundle (impact), instead of its inputs')
+    lineage_p.add_argument('--depth', type=int, default=None, help='Number of hops to follow, default all')
+    lineage_p.set_defaults(func=lambda args: _lineage(fs, args))
+
     # status
     status_p = subparsers.add_parser('status')
     status_p.add_argument('-b', '--bundle', type=str, help='A bundle in the current context')
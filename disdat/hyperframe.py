@@ -23,12 +23,12 @@ All objects are immutable.
 Read/write from DB and PB files
 
 HyperFrame -- contains Lineage PB and has pointers to Frames.   Has a Table storing PB and PB on disk
-  Lineage    -- contains lineage information.                     No table**, no PB on disk
+  Lineage    -- contains lineage information.                     Edges table (lineage_edges), no PB on disk
 Frame      -- contains data literals and links.                 Has a Table storing PB** and PB on disk.
   Link       -- contains link literals and pointer to LinkAuth.   No table, no PB on disk
 LinkAuth   -- contains auth creds.                              Has a Table storing PB, and PB on disk
 
-**question design decision.  Might have lineage table.  Might not store frame pb in db.
+**question design decision.  Might not store frame pb in db.
 
 Each Python object is called <Thing>Record
 Each PB object is called <Thing>
@@ -41,16 +41,22 @@ It may be stored in an HFrame table as a byte blob and re-inflated without worry
 
 import disdat.common as common
 from disdat.db_target import DBTarget
-from collections import namedtuple, defaultdict
+from collections import namedtuple, defaultdict, OrderedDict
 import hashlib
+import struct
 import time
 import os
 import tempfile
 from datetime import datetime
 import uuid
-from sqlalchemy import Table, Column, String, MetaData, BLOB, Text, TIMESTAMP, Enum, UniqueConstraint, DateTime
-from sqlalchemy.sql import text
+from sqlalchemy import Table, Column, String, MetaData, LargeBinary, Text, TIMESTAMP, Enum, UniqueConstraint, DateTime, Index, Float
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.sql import text, select, and_, or_, bindparam, func, literal_column
 import hyperframe_pb2
+import disdat.tag_query as tag_query
+import disdat.integrity as integrity
+import disdat.compression as compression
+from google.protobuf.internal import encoder, decoder
 import enum
 import numpy as np
 import pandas as pd
@@ -62,6 +68,12 @@ _logger = logging.getLogger(__name__)
 
 HyperFrameTuple = namedtuple('HyperFrameTuple', 'columns, links, uuid, tags')
 
+# A bundle reached by walking lineage, depth 1 are direct parents (upstream) or children (downstream)
+LineageNode = namedtuple('LineageNode', 'uuid, depth, processing_name, human_name')
+
+LINEAGE_EDGES_TABLE = 'lineage_edges'
+LINEAGE_DIRECTIONS = ('upstream', 'downstream')
+
 
 class RecordState(enum.Enum):
     """
@@ -77,29 +89,34 @@ class RecordState(enum.Enum):
     deleted = 3
 
 
-def r_pb_fs(file_path, read_pb_class):
+def r_pb_fs(file_path, read_pb_class, event='read'):
     """
     Utility function to read pb from disk and return
-      the xxxRecord that wraps the pb.  Checks hash if present
+      the xxxRecord that wraps the pb.  Checks hash if the [integrity] verify policy says so.
 
     Args:
         file_path (str):
         read_pb_class:
+        event (str): why we are reading, one of integrity.READ_EVENTS
 
     Returns:
         instance of read_pb_class
 
     """
+    if not os.path.exists(file_path):
+        # A packed bundle holds this record in <hframe uuid>_bundle.pb in the same directory
+        bundle_dir = os.path.dirname(file_path)
+        packed_path = os.path.join(bundle_dir, packed_filename(os.path.basename(bundle_dir)))
+        if os.path.exists(packed_path):
+            record_uuid = os.path.basename(file_path).split('_')[0]
+            return r_packed_fs(packed_path, uuids=[record_uuid], event=event)[record_uuid]
+
     with open(file_path, 'rb') as f:
         contents = f.read()
         pb_record = read_pb_class.from_str_bytes(contents)
 
-    old_hash = pb_record.pb.hash
-    pb_record.pb.ClearField('hash')
-    new_hash = hashlib.md5(pb_record.pb.SerializeToString()).hexdigest()
-
-    assert(old_hash == new_hash)
-    pb_record.pb.hash = old_hash
+    if integrity.should_verify(event):
+        integrity.verify_pb(pb_record.pb, contents)
 
     return pb_record
 
@@ -140,6 +157,266 @@ def w_pb_fs(file_prefix, pb_record, fq_file_path=None, atomic=False):
         os.rename(f.name, fq_file_path)
 
 
+# A packed bundle is one file, objects/<uuid>/<uuid>_bundle.pb, that holds the bundle's hframe pb
+# and all of its frame (and link auth) pbs.  It starts with PACKED_MAGIC, then a varint length of
+# the index, then the index: for each record a varint kind (see _packed_kinds), a length-delimited
+# uuid, and a varint length of its pb.  The serialized pbs follow, in index order.
+PACKED_MAGIC = b'DSDTPACK'
+PACKED_SUFFIX = '_bundle.pb'
+
+# Large arrays are not held inline in their frame.  They are written next to the frame as
+# objects/<uuid>/<frame uuid>_frame.npy, and the frame has one bundle:// link to the file.
+SIDECAR_SUFFIX = '_frame.npy'
+
+# Header bytes of sidecars written a chunk at a time, see SidecarAppender.  Room for any shape,
+# and a multiple of 64, so the data that follows stays aligned for memory maps.
+APPEND_HEADER_SIZE = 256
+
+# A DF bundle may keep its columns in one Parquet file, objects/<uuid>/<hframe uuid>_bundle.parquet.
+# Each column still has a frame with its name, type, and shape, and one bundle:// link to the file.
+PARQUET_SUFFIX = '_bundle.parquet'
+
+# Rows per Parquet row group, a row range is read a row group at a time
+PARQUET_ROW_GROUP_ROWS = 1 << 17
+
+
+def npy_header(dtype, shape, size=APPEND_HEADER_SIZE):
+    """
+    A version 1.0 .npy header, padded with spaces to size bytes, as np.load reads them.
+
+    Args:
+        dtype (`numpy.dtype`): the array's dtype
+        shape (tuple): the array's shape
+        size (int): bytes in the header
+
+    Returns:
+        (str)
+    """
+    header = "{{'descr': {!r}, 'fortran_order': False, 'shape': {!r}, }}".format(
+        np.lib.format.dtype_to_descr(np.dtype(dtype)), tuple(shape))
+    prefix_size = len(np.lib.format.MAGIC_PREFIX) + 4
+    if len(header) + 1 > size - prefix_size:
+        raise Exception("A .npy header for {} {} does not fit in {} bytes".format(dtype, shape, size))
+    header = header.ljust(size - prefix_size - 1) + '\n'
+    return np.lib.format.MAGIC_PREFIX + b'\x01\x00' + struct.pack('<H', len(header)) + header
+
+
+def packed_filename(hfr_uuid):
+    return "{}{}".format(hfr_uuid, PACKED_SUFFIX)
+
+
+def parquet_filename(hfr_uuid):
+    return "{}{}".format(hfr_uuid, PARQUET_SUFFIX)
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow
+
+
+# pyarrow, to read and write Parquet frames, or None if not installed
+PYARROW = _pyarrow()
+
+
+def write_parquet(file_path, df):
+    """
+    Write a dataframe's columns, without its index, to a Parquet file.
+
+    Args:
+        file_path (str): local path of the file
+        df (`pandas.DataFrame`): columns of numbers, booleans, or strings
+
+    Returns:
+        None
+    """
+    if PYARROW is None:
+        raise Exception("Writing Parquet frames needs pyarrow, try 'pip install disdat[parquet]'")
+    schema = parquet_schema([(c, df[c].dtype) for c in df.columns])
+    PYARROW.parquet.write_table(PYARROW.Table.from_pandas(df, schema=schema, preserve_index=False), file_path,
+                                row_group_size=PARQUET_ROW_GROUP_ROWS)
+
+
+def parquet_schema(dtypes):
+    """
+    Args:
+        dtypes (list): (column name, `numpy.dtype`) pairs, np.object_ for strings
+
+    Returns:
+        (`pyarrow.Schema`)
+    """
+    # Object columns hold python 2 str or unicode, store both as UTF-8 strings rather than binary
+    return PYARROW.schema([PYARROW.field(c, PYARROW.string() if np.dtype(d).type == np.object_
+                                         else PYARROW.from_numpy_dtype(np.dtype(d))) for c, d in dtypes])
+
+
+def read_parquet_columns(file_path, columns, rows=None):
+    """
+    Read only some columns of a Parquet file, and with rows, only the row groups that hold those rows.
+
+    Args:
+        file_path (str): local path of the file
+        columns (list(str)): column names
+        rows (slice): Optional.  Rows start to stop, see row_range
+
+    Returns:
+        (list(`numpy.ndarray`)): the columns' values, in the order of columns
+    """
+    if PYARROW is None:
+        raise Exception("Reading Parquet frames in {} needs pyarrow, try 'pip install disdat[parquet]'".format(file_path))
+
+    if rows is None:
+        df = PYARROW.parquet.read_table(file_path, columns=columns, memory_map=True).to_pandas()
+        return [df[c].values for c in columns]
+
+    parquet_file = PYARROW.parquet.ParquetFile(file_path, memory_map=True)
+    tables = []
+    skip = 0
+    group_start = 0
+    for i in range(parquet_file.num_row_groups):
+        group_rows = parquet_file.metadata.row_group(i).num_rows
+        if group_start < rows.stop and rows.start < group_start + group_rows:
+            if len(tables) == 0:
+                skip = rows.start - group_start
+            tables.append(parquet_file.read_row_group(i, columns=columns))
+        group_start += group_rows
+    if len(tables) > 0:
+        table = PYARROW.concat_tables(tables)
+    else:
+        schema = parquet_file.schema.to_arrow_schema()
+        table = PYARROW.schema([schema.field_by_name(c) for c in columns]).empty_table()
+
+    df = table.to_pandas()
+    return [df[c].values[skip:skip + rows.stop - rows.start] for c in columns]
+
+
+def _packed_kinds():
+    return (HyperFrameRecord, FrameRecord, LinkAuthBase)
+
+
+def pack_records(records):
+    """
+    Serialize records into the packed bundle format.
+
+    Args:
+        records (list): `HyperFrameRecord`, `FrameRecord`, and `LinkAuthBase` records, hframe first
+
+    Returns:
+        (str): bytes
+    """
+    kinds = _packed_kinds()
+    index = []
+    blobs = []
+    for rcd in records:
+        kind = [i for i, k in enumerate(kinds) if isinstance(rcd, k)][0]
+        blob = rcd.pb.SerializeToString()
+        record_uuid = rcd.pb.uuid.encode('utf-8')
+        index.append(encoder._VarintBytes(kind) + encoder._VarintBytes(len(record_uuid)) + record_uuid +
+                     encoder._VarintBytes(len(blob)))
+        blobs.append(blob)
+    index = b''.join(index)
+    return b''.join([PACKED_MAGIC, encoder._VarintBytes(len(index)), index] + blobs)
+
+
+def _read_packed_index(f):
+    """
+    Returns:
+        (list): (kind, uuid, offset, length) of each record, offset from the start of the file
+    """
+    head = f.read(len(PACKED_MAGIC) + 10)
+    if not head.startswith(PACKED_MAGIC):
+        raise Exception("Disdat packed bundle {} does not start with {}".format(getattr(f, 'name', ''), PACKED_MAGIC))
+    index_len, pos = decoder._DecodeVarint(head, len(PACKED_MAGIC))
+    index = head[pos:pos + index_len]
+    if len(index) < index_len:
+        index += f.read(index_len - len(index))
+    offset = pos + index_len
+    entries = []
+    pos = 0
+    while pos < index_len:
+        kind, pos = decoder._DecodeVarint(index, pos)
+        uuid_len, pos = decoder._DecodeVarint(index, pos)
+        record_uuid = index[pos:pos + uuid_len]
+        pos += uuid_len
+        length, pos = decoder._DecodeVarint(index, pos)
+        entries.append((kind, record_uuid, offset, length))
+        offset += length
+    return entries
+
+
+def unpack_records(f, uuids=None, event='read'):
+    """
+    Read records from a packed bundle.
+
+    Args:
+        f (file): open packed bundle, we seek to the records we want
+        uuids (list(str)): Optional.  Only read these records.
+        event (str): why we are reading, one of integrity.READ_EVENTS
+
+    Returns:
+        (dict): uuid to `HyperFrameRecord`, `FrameRecord`, or `LinkAuthBase` record
+    """
+    kinds = _packed_kinds()
+    entries = _read_packed_index(f)
+    wanted = None if uuids is None else set(uuids)
+    verify = integrity.should_verify(event)
+    found = {}
+    for kind, record_uuid, offset, length in entries:
+        if wanted is not None and record_uuid not in wanted:
+            continue
+        f.seek(offset)
+        contents = f.read(length)
+        rcd = kinds[kind].from_str_bytes(contents)
+        if verify:
+            integrity.verify_pb(rcd.pb, contents)
+        found[record_uuid] = rcd
+    return found
+
+
+def r_packed_fs(file_path, uuids=None, event='read'):
+    """
+    Read records from a packed bundle file.
+
+    Args:
+        file_path (str): path to <uuid>_bundle.pb
+        uuids (list(str)): Optional.  Only read these records.
+        event (str): why we are reading, one of integrity.READ_EVENTS
+
+    Returns:
+        (dict): uuid to `HyperFrameRecord`, `FrameRecord`, or `LinkAuthBase` record
+    """
+    with open(file_path, 'rb') as f:
+        return unpack_records(f, uuids=uuids, event=event)
+
+
+def w_packed_fs(file_prefix, hfr, records, atomic=False):
+    """
+    Write a bundle as one packed file, file_prefix/<uuid>_bundle.pb.
+
+    Args:
+        file_prefix (str): the bundle's directory
+        hfr (`HyperFrameRecord`): the hframe
+        records (list): its `FrameRecord` (and `LinkAuthBase`) records
+        atomic (bool): Attempt an atomic file write, see w_pb_fs.
+
+    Returns:
+        (str): path to the packed file
+    """
+    fq_file_path = os.path.join(file_prefix, packed_filename(hfr.pb.uuid))
+    contents = pack_records([hfr] + list(records))
+    if not atomic:
+        with open(fq_file_path, 'wb') as f:
+            f.write(contents)
+    else:
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(fq_file_path), delete=False) as f:
+            f.write(contents)
+        os.rename(f.name, fq_file_path)
+    return fq_file_path
+
+
 def w_pb_db(pb_record, engine_g):
     """
     Given a pb record, write it out to the database connected with engine
@@ -160,6 +437,68 @@ def w_pb_db(pb_record, engine_g):
     return pb_hash
 
 
+def w_bundles_db(bundles, engine_g, state=RecordState.valid):
+    """
+    Write whole bundles -- hframe, tag, and frame rows -- in one transaction.
+    Rows for each table go out in a single executemany against the shared, pre-built tables.
+
+    If any row already exists, the transaction rolls back and we fall back to writing
+    record by record, which skips the duplicates just like w_pb_db.
+
+    Args:
+        bundles (:list:tuple(`HyperFrameRecord`, :list:`FrameRecord`)): one (hfr, frames) or a list of them
+        engine_g:
+        state (`RecordState`): state of the new rows
+
+    Returns:
+        (int): number of hframes written
+    """
+    from sqlalchemy.exc import IntegrityError
+
+    if isinstance(bundles, tuple):
+        bundles = [bundles]
+
+    records = []
+    for hfr, frames in bundles:
+        records.append(hfr)
+        records.extend(frames)
+
+    if len(records) == 0:
+        return 0
+
+    rows = defaultdict(list)
+    tables = {}
+    for rcd in records:
+        rcd.state = state
+        tbls = rcd.get_tables()
+        pb_rows = rcd._write_row()
+        if type(tbls) is dict:
+            for k, tbl_rows in pb_rows.iteritems():
+                rows[k].extend(tbl_rows)
+        else:
+            k = tbls.name
+            tbls = {k: tbls}
+            rows[k].append(pb_rows)
+        tables.update(tbls)
+
+    try:
+        with engine_g.begin() as conn:
+            for k, tbl_rows in rows.iteritems():
+                if len(tbl_rows) > 0:
+                    conn.execute(tables[k].insert(), tbl_rows)
+    except IntegrityError as ie:
+        _logger.info("Bulk write of {} records encountered error {}, writing one at a time".format(len(records), ie))
+        with engine_g.connect() as conn:
+            for rcd in records:
+                rcd.write_row(state, conn)
+
+    return len(bundles)
+
+
+# Rows fetched at a time by iter_pb_db, and hframes fetched by each query of iter_hfr_db
+HFR_PAGE_SIZE = 1000
+
+
 def r_pb_db(pb_cls, engine_g):
     """
     Given the type of hframe pb, read it from engine_g
@@ -172,6 +511,23 @@ def r_pb_db(pb_cls, engine_g):
     Returns:
         results (list): a list of xxxRecord objects
 
+    """
+    return list(iter_pb_db(pb_cls, engine_g))
+
+
+def iter_pb_db(pb_cls, engine_g, page_size=HFR_PAGE_SIZE):
+    """
+    Given the type of hframe pb, read it from engine_g
+    Yields all entries from the db, only parsing page_size rows at a time
+
+    Args:
+        pb_cls:
+        engine_g:
+        page_size (int): rows fetched at a time
+
+    Returns:
+        (generator): of xxxRecord objects
+
     """
     from sqlalchemy.sql import text
 
@@ -181,133 +537,238 @@ def r_pb_db(pb_cls, engine_g):
 
     with engine_g.connect() as conn:
         result = conn.execute(s)
+        while True:
+            rows = result.fetchmany(page_size)
+            if len(rows) == 0:
+                break
+            for obj in pb_cls.from_row(rows):
+                yield obj
 
-    lars = pb_cls.from_row(result)
 
-    return lars
+# Filter fields that may restrict a catalog query, in the order they appear in a statement's shape.
+_FILTER_FIELDS = ('uuid', 'owner', 'human_name', 'processing_name')
 
+# Statements are built once per filter shape and re-used with new bound parameters on every call.
+_hfr_stmt_cache = {}
 
-def _groupby_clause(uuid=None, owner=None, human_name=None, processing_name=None):
-    """
-    Build the groupby clause.  Simply detect which fields are set, and group by those.
+# The hframes columns of a projection, see HyperFrameRow.  Not the pb.
+HFR_ROW_COLUMNS = ('uuid', 'owner', 'human_name', 'processing_name', 'creation_date', 'state')
 
-    Args:
-        uuid:
-        owner:
-        human_name:
-        processing_name:
+# Handed to SQLAlchemy so that each statement is only compiled once per dialect.
+_hfr_compiled_cache = {}
+
+# Unbound tables for each PBObject class, see PBObject.get_tables()
+_pb_table_cache = {}
+
+
+def _hframe_tables():
+    """
+    Return the unbound hframes and hframes_tags tables used to build catalog statements.
+    We build these once and share them across all engines.
 
     Returns:
-        (str): "field, ..., field"
+        (sqlalchemy.Table, sqlalchemy.Table): hframes table, hframes_tags table
+    """
+    tbls = HyperFrameRecord.get_tables()
+    return tbls[HyperFrameRecord.table_name], tbls[HyperFrameRecord.table_name + '_tags']
+
 
+def _is_pattern(s):
     """
+    Note, if any string contains '.*' (zero or many of any ) or . (one of any), we use a LIKE
+    comparison and translate those to '%' and '_' respectively.
+    """
+    return '.*' in s or '.' in s
 
-    gbc = ''
-    clauses = []
 
-    if uuid is not None:
-        clauses.append('uuid')
+def _translate(s):
+    if _is_pattern(s):
+        s = s.replace('.*', '%').replace('.', '_')
+    return s
 
-    if owner is not None:
-        clauses.append('owner')
 
-    if human_name is not None:
-        clauses.append('human_name')
+def _filter_shape(uuid=None, owner=None, human_name=None, processing_name=None, state=None, tag_preds=None):
+    """
+    Determine the "shape" of a filter: which fields are set, whether each is an exact match
+    or a pattern, whether state is set, and the operators of the tag predicates in the order
+    we evaluate them.
 
-    if processing_name is not None:
-        clauses.append('processing_name')
+    Two calls with the same shape can share one statement (and one compiled form of it).
 
-    if len(clauses) > 0:
-        gbc =  ','.join(clauses)
+    Returns:
+        (tuple): hashable description of the filter
+    """
+    fields = []
+    for name, value in zip(_FILTER_FIELDS, (uuid, owner, human_name, processing_name)):
+        if value is not None:
+            fields.append((name, _is_pattern(value)))
 
-    return gbc
+    tag_shape = tuple((pred.op, pred.numeric, i) for i, pred in enumerate(tag_preds or []))
 
+    return tuple(fields), state is not None, tag_shape
 
-def _translate(s):
-    if '.*' in s or '.' in s:
-        s = 'like "{}"'.format(s.replace('.*', '%').replace('.', '_'))
-    else:
-        s = '= "{}"'.format(s)
-    return s
 
+def _filter_params(uuid=None, owner=None, human_name=None, processing_name=None, state=None, tag_preds=None):
+    """
+    Build the bound parameter values for a filter.   Must line up with the bindparams
+    created in _where_criteria and tag_query.tag_filter.
 
-def _where_clause(uuid=None, owner=None, human_name=None, processing_name=None, state=None):
+    Returns:
+        (dict): bind parameter name to value
     """
-    Build the where clause.  Note, if any string contains '.*' (zero or many of any ) or . (one of any).
-    Translate that to '%' and '_' respectively.
+    params = {}
 
-    Note: If there are tags, this touches two tables.
+    for name, value in zip(_FILTER_FIELDS, (uuid, owner, human_name, processing_name)):
+        if value is not None:
+            params['f_' + name] = _translate(value)
 
-    select * from frames where <conditions>
+    if state is not None:
+        params['f_state'] = state
 
-    Args:
-        uuid (str):
-        owner (str):
-        human_name (str):
-        processing_name (str):
-        state (`RecordState`):
+    for i, pred in enumerate(tag_preds or []):
+        params.update(tag_query.predicate_params(pred, i))
 
-    Returns:
+    return params
 
+
+def _where_criteria(hframes, fields, has_state):
     """
+    Build the where criteria for a filter shape.
 
-    where = ''
-    clauses = []
+    Args:
+        hframes (sqlalchemy.Table):
+        fields (tuple): (name, is_pattern) for each set field
+        has_state (bool): whether we filter on state
 
-    if uuid is not None:
-        clauses.append('uuid {}'.format(_translate(uuid)))
+    Returns:
+        (list): sqlalchemy criteria to be AND'd together
+    """
+    criteria = []
 
-    if owner is not None:
-        clauses.append('owner {}'.format(_translate(owner)))
+    for name, is_pattern in fields:
+        if is_pattern:
+            criteria.append(hframes.c[name].like(bindparam('f_' + name)))
+        else:
+            criteria.append(hframes.c[name] == bindparam('f_' + name))
 
-    if human_name is not None:
-        clauses.append('human_name {}'.format(_translate(human_name)))
+    if has_state:
+        criteria.append(hframes.c.state == bindparam('f_state'))
 
-    if processing_name is not None:
-        clauses.append('processing_name {}'.format(_translate(processing_name)))
+    return criteria
 
-    if state is not None:
-        clauses.append('state = "{}"'.format(state.name))
 
-    if len(clauses) > 0:
-        where = 'WHERE ' + ' AND '.join(clauses)
+def _filtered_from(hframes, tags_tbl, shape):
+    """
+    The from clause and where criteria that select the hframes matching a filter shape.
 
-    return where
+    Returns:
+        (from clause, list): from clause, criteria to be AND'd together
+    """
+    fields, has_state, tag_shape = shape
+    criteria = _where_criteria(hframes, fields, has_state)
+    if len(tag_shape) > 0:
+        criteria.append(tag_query.tag_filter(hframes.c.uuid, tags_tbl, tag_shape))
+    return hframes, criteria
 
 
-def _tag_query(tags):
+def _latest_join(hframes, tags_tbl, shape, from_obj):
     """
-    Create the SQL query that returns all uuids with the all tags set.
+    Join from_obj against the latest creation_date of each human_name among the matching hframes.
+    Only the latest version of each bundle survives the join.
+
+    Returns:
+        from clause
+    """
+    others = hframes.alias('latest_hframes')
+    others_from, others_criteria = _filtered_from(others, tags_tbl, shape)
+    latest = select([others.c.human_name, func.max(others.c.creation_date).label('creation_date')])
+    latest = latest.select_from(others_from)
+    if len(others_criteria) > 0:
+        latest = latest.where(and_(*others_criteria))
+    latest = latest.group_by(others.c.human_name).alias('latest')
+    return from_obj.join(latest, and_(hframes.c.human_name == latest.c.human_name,
+                                      hframes.c.creation_date == latest.c.creation_date))
+
+
+def _select_stmt(shape, orderby, groupby, projection=False, limit=False, latest_only=False, after=False):
+    """
+    Return the (cached) select statement for this filter shape.
 
     Args:
-        tags:
+        shape (tuple): from _filter_shape
+        orderby (bool): order by creation_date, youngest first, then by uuid
+        groupby (bool): group by the set fields and only return those columns
+        projection (bool): return the HFR_ROW_COLUMNS catalog columns, without the pb
+        limit (bool): return at most 'f_limit' hframes
+        latest_only (bool): only the latest hframe of each human_name
+        after (bool): only hframes after ('k_date', 'k_uuid') in the orderby order, for keyset pagination
 
     Returns:
-        str: sql query to return list of uuids with these tags
-
+        sqlalchemy select
     """
+    key = ('select', shape, orderby, groupby, projection, limit, latest_only, after)
+    stmt = _hfr_stmt_cache.get(key)
+    if stmt is not None:
+        return stmt
 
-    tag_table_name = HyperFrameRecord.table_name + '_tags'
+    fields, has_state, tag_shape = shape
+    hframes, tags_tbl = _hframe_tables()
 
-    tag_clauses = []
+    group_cols = [hframes.c[name] for name, _ in fields]
+    order_cols = [hframes.c.creation_date.desc(), hframes.c.uuid.desc()]
 
-    if tags is None:
-        return None
+    from_obj, criteria = _filtered_from(hframes, tags_tbl, shape)
 
-    if tags is not None:
-        for k, v in tags.iteritems():
-            # SQLITE: critical to have single quotes around strings in sub-select query
-            tag_clauses.append("(key = '{}' AND value = '{}')".format(k, v))
+    if latest_only:
+        from_obj = _latest_join(hframes, tags_tbl, shape, from_obj)
+
+    if after:
+        k_date = bindparam('k_date', type_=hframes.c.creation_date.type)
+        # The leading <= lets the database start from the key in the (creation_date, uuid) index.
+        criteria.append(and_(hframes.c.creation_date <= k_date,
+                             or_(hframes.c.creation_date < k_date, hframes.c.uuid < bindparam('k_uuid'))))
 
-    tag_where = 'WHERE ' + ' OR '.join(tag_clauses)
+    if groupby and len(group_cols) > 0:
+        stmt = select(group_cols).group_by(*group_cols)
+    elif projection:
+        # Not the pb, HyperFrameRow reads it only if asked, and its tags come from select_hfr_tags_db
+        stmt = select([hframes.c[name] for name in HFR_ROW_COLUMNS])
+    else:
+        stmt = select([hframes])
 
-    s = "SELECT uuid from {} {} GROUP BY uuid HAVING count(*) = {}".format(tag_table_name, tag_where, len(tags))
+    stmt = stmt.select_from(from_obj)
 
-    return s
+    if len(criteria) > 0:
+        stmt = stmt.where(and_(*criteria))
+
+    if orderby:
+        # The uuid keeps the order total.
+        stmt = stmt.order_by(*order_cols)
+
+    if limit:
+        stmt = stmt.limit(bindparam('f_limit'))
+
+    _hfr_stmt_cache[key] = stmt
+    return stmt
+
+
+def _execute(engine_g, stmt, params):
+    """
+    Execute a cached statement with its bound parameters.
+
+    Args:
+        engine_g: sqlalchemy engine or connection
+        stmt: sqlalchemy statement
+        params (dict):
+
+    Returns:
+        result proxy
+    """
+    return engine_g.execution_options(compiled_cache=_hfr_compiled_cache).execute(stmt, params)
 
 
 def select_hfr_db(engine_g, uuid=None, owner=None, human_name=None, processing_name=None, tags=None, state=None,
-                  orderby=False, groupby=False):
+                  orderby=False, groupby=False, projection=False, limit=None, latest_only=False, tag_operators=False):
     """
     Create an HFrame Record from a row in our DB.
     Where uuid= && owner= && human_name= && processing_name=
@@ -318,10 +779,14 @@ def select_hfr_db(engine_g, uuid=None, owner=None, human_name=None, processing_n
         owner (str): add to where clause
         human_name (str): add to where clause
         processing_name (str):  add to where clause
-        tags (:dict): Dictionary of tags.  Exact match.
+        tags (:dict): Dictionary of tags, matched exactly unless tag_operators
         state (`RecordState`):  The state of the entry
         orderby (bool): enable order by creation_date timestamp
         groupby (bool): enable grouping
+        projection (bool): return `HyperFrameRow` objects that only parse the pb when asked
+        limit (int): return at most this many hframes
+        latest_only (bool): only return the latest (by creation_date) hframe of each human_name
+        tag_operators (bool): tag values may use the operators in `disdat.tag_query`
 
     Returns:
         results (list): a list of xxxRecord objects
@@ -330,38 +795,92 @@ def select_hfr_db(engine_g, uuid=None, owner=None, human_name=None, processing_n
 
     pb_cls = HyperFrameRecord
 
-    where = _where_clause(uuid, owner, human_name, processing_name, state)
+    with engine_g.connect() as conn:
+        tag_preds = tag_query.order_by_selectivity(conn, _hframe_tables()[1],
+                                                   tag_query.parse_tag_queries(tags, tag_operators),
+                                                   {'compiled_cache': _hfr_compiled_cache})
+
+        shape = _filter_shape(uuid, owner, human_name, processing_name, state, tag_preds)
+
+        params = _filter_params(uuid, owner, human_name, processing_name, state, tag_preds)
 
-    if tags is not None and tags:  # bool(l={}) = False
-        if where == '':
-            where = "WHERE uuid in (" + _tag_query(tags) + ")"
+        if limit is not None:
+            params['f_limit'] = int(limit)
+
+        s = _select_stmt(shape, orderby, groupby and not projection, projection, limit is not None, latest_only)
+
+        result = _execute(conn, s, params)
+        if projection:
+            hfrs = HyperFrameRow.from_rows(result, engine_g)
         else:
-            where = where + " AND uuid in (" + _tag_query(tags) + ")"
+            hfrs = pb_cls.from_row(result) # returns rows if no pb in rows
 
-    select = '*'
+    return hfrs
 
-    if orderby:
-        orderby = "ORDER BY creation_date DESC"
-    else:
-        orderby = ''
 
-    if groupby:
-        gbc = _groupby_clause(uuid, owner, human_name, processing_name)
-        groupby = "GROUP BY " + gbc
-        select  = gbc
-    else:
-        groupby = ''
+def iter_hfr_db(engine_g, uuid=None, owner=None, human_name=None, processing_name=None, tags=None, state=None,
+                projection=False, latest_only=False, page_size=HFR_PAGE_SIZE, tag_operators=False):
+    """
+    Like select_hfr_db(orderby=True), but yield the hframes a page at a time, youngest first.
 
-    # select from where groupby orderby
-    s = text(
-        "SELECT {} from {} {} {} {}".format(select, pb_cls.table_name, where, groupby, orderby)
-    )
+    Each page is its own query that starts after the (creation_date, uuid) of the last
+    hframe of the page before (keyset pagination).  We only hold one page in memory, and
+    we do not hold a connection while the caller works on a page.  So the caller may
+    delete the hframes it has seen.
+
+    Args:
+        engine_g:
+        uuid (str):  add to where clause
+        owner (str): add to where clause
+        human_name (str): add to where clause
+        processing_name (str):  add to where clause
+        tags (:dict): Dictionary of tags, matched exactly unless tag_operators
+        state (`RecordState`):  The state of the entry
+        projection (bool): yield `HyperFrameRow` objects that only parse the pb when asked
+        latest_only (bool): only the latest (by creation_date) hframe of each human_name
+        page_size (int): hframes per query
+        tag_operators (bool): tag values may use the operators in `disdat.tag_query`
+
+    Returns:
+        (generator): of `HyperFrameRecord` or `HyperFrameRow`
+    """
+    if page_size < 1:
+        raise Exception("iter_hfr_db page_size must be at least 1, not {}".format(page_size))
 
     with engine_g.connect() as conn:
-        result = conn.execute(s)
-        hfrs = pb_cls.from_row(result) # returns rows if no pb in rows
+        tag_preds = tag_query.order_by_selectivity(conn, _hframe_tables()[1],
+                                                   tag_query.parse_tag_queries(tags, tag_operators),
+                                                   {'compiled_cache': _hfr_compiled_cache})
+
+    shape = _filter_shape(uuid, owner, human_name, processing_name, state, tag_preds)
+    params = _filter_params(uuid, owner, human_name, processing_name, state, tag_preds)
+    params['f_limit'] = int(page_size)
+
+    after = False
+    while True:
+        s = _select_stmt(shape, True, False, projection, True, latest_only, after)
+        with engine_g.connect() as conn:
+            rows = _execute(conn, s, params).fetchall()
+
+        if len(rows) == 0:
+            return
+
+        # Rows come in page order, so the last row holds the key of the last hframe.
+        params['k_date'] = rows[-1]['creation_date']
+        params['k_uuid'] = rows[-1]['uuid']
+        after = True
+
+        if projection:
+            hfrs = HyperFrameRow.from_rows(rows, engine_g)
+        else:
+            hfrs = HyperFrameRecord.from_row(rows)
+        del rows
 
-    return hfrs
+        for hfr in hfrs:
+            yield hfr
+
+        if len(hfrs) < page_size:
+            return
 
 
 def update_hfr_db(engine_g, state, uuid=None, owner=None, human_name=None, processing_name=None):
@@ -382,16 +901,24 @@ def update_hfr_db(engine_g, state, uuid=None, owner=None, human_name=None, proce
 
     """
 
-    pb_cls = HyperFrameRecord
+    shape = _filter_shape(uuid, owner, human_name, processing_name)
 
-    where = _where_clause(uuid, owner, human_name, processing_name)
+    params = _filter_params(uuid, owner, human_name, processing_name)
+    params['new_state'] = state
 
-    s = text(
-        'UPDATE {} SET state = "{}" {}'.format(pb_cls.table_name, state.name, where)
-    )
+    key = ('update', shape)
+    s = _hfr_stmt_cache.get(key)
+    if s is None:
+        fields, _, _ = shape
+        hframes, _ = _hframe_tables()
+        s = hframes.update().values(state=bindparam('new_state'))
+        criteria = _where_criteria(hframes, fields, False)
+        if len(criteria) > 0:
+            s = s.where(and_(*criteria))
+        _hfr_stmt_cache[key] = s
 
     with engine_g.connect() as conn:
-        result = conn.execute(s)
+        result = _execute(conn, s, params)
 
     return result
 
@@ -401,7 +928,8 @@ def delete_hfr_db(engine_g, uuid=None, owner=None, human_name=None, processing_n
     Delete HFrame row from a table where
     uuid= && owner= && human_name= && processing_name=
 
-    TODO: Should be a transaction for the tags and HFR entry table.
+    The tags and lineage edges of those HFrames are removed in the same transaction.
+    Edges from other bundles to them stay, those bundles were still made from them.
 
     Args:
         engine_g:
@@ -415,38 +943,242 @@ def delete_hfr_db(engine_g, uuid=None, owner=None, human_name=None, processing_n
 
     """
 
-    pb_cls = HyperFrameRecord
+    shape = _filter_shape(uuid, owner, human_name, processing_name)
 
-    where = _where_clause(uuid, owner, human_name, processing_name)
+    fields, _, _ = shape
 
-    if where == '':
+    if len(fields) == 0:
         raise Exception("HFrame DB Delete requires a valid where clause")
 
-    hfr_del = text(
-        "DELETE FROM {} {}".format(pb_cls.table_name, where)
-    )
+    params = _filter_params(uuid, owner, human_name, processing_name)
 
-    where = _where_clause(uuid)
+    key = ('delete', shape)
+    stmts = _hfr_stmt_cache.get(key)
+    if stmts is None:
+        hframes, tags_tbl = _hframe_tables()
+        criteria = and_(*_where_criteria(hframes, fields, False))
+        hfr_del = hframes.delete().where(criteria)
+        tag_del = tags_tbl.delete().where(tags_tbl.c.uuid.in_(select([hframes.c.uuid]).where(criteria)))
+        edges = HyperFrameRecord.get_tables()[LINEAGE_EDGES_TABLE]
+        edge_del = edges.delete().where(edges.c.child_uuid.in_(select([hframes.c.uuid]).where(criteria)))
+        stmts = (hfr_del, tag_del, edge_del)
+        _hfr_stmt_cache[key] = stmts
 
-    tag_del = text(
-        "DELETE FROM {} {}".format(pb_cls.table_name + '_tags', where)
-    )
+    hfr_del, tag_del, edge_del = stmts
 
     results = []
-    with engine_g.connect() as conn:
-        results.append(conn.execute(hfr_del))
-        results.append(conn.execute(tag_del))
+    with engine_g.begin() as conn:
+        # Remove tags and edges first, we find them through the hframes rows.
+        _execute(conn, edge_del, params)
+        tag_result = _execute(conn, tag_del, params)
+        results.append(_execute(conn, hfr_del, params))
+        results.append(tag_result)
 
     return results
 
 
+# Frame uuids bound into each query of select_fr_db, under SQLite's limit of 999 parameters
+FRAME_QUERY_BATCH = 500
+
+
+def select_fr_db(engine_g, frame_uuids, batch=FRAME_QUERY_BATCH):
+    """
+    Read frames from the pb blobs in the catalog's frames table.
+    One query (by primary key) for every batch of frame uuids, which may belong to many hframes.
+    Each blob is checked against its hash if the [integrity] verify policy says so.
+
+    Args:
+        engine_g:
+        frame_uuids (list(str)): frames to read
+        batch (int): frame uuids in each query
+
+    Returns:
+        (list(`FrameRecord`)): the frames found, in no particular order, with hframe_uuid set
+    """
+    stmt = _hfr_stmt_cache.get('frames')
+    if stmt is None:
+        frames = FrameRecord.get_tables()
+        stmt = select([frames.c.uuid, frames.c.hframe_uuid, frames.c.state, frames.c.pb])\
+            .where(frames.c.uuid.in_(bindparam('fr_uuids', expanding=True)))
+        _hfr_stmt_cache['frames'] = stmt
+
+    frame_uuids = list(frame_uuids)
+    found = []
+    with engine_g.connect() as conn:
+        for start in range(0, len(frame_uuids), batch):
+            for row in _execute(conn, stmt, {'fr_uuids': frame_uuids[start:start + batch]}):
+                if not row['pb']:
+                    continue
+                contents = str(row['pb'])
+                fr = FrameRecord.from_str_bytes(contents)
+                if integrity.should_verify('read'):
+                    integrity.verify_pb(fr.pb, contents)
+                fr.state = row['state']
+                fr.hframe_uuid = row['hframe_uuid']
+                found.append(fr)
+    return found
+
+
+def select_hfr_tags_db(engine_g, hframe_uuids, batch=FRAME_QUERY_BATCH):
+    """
+    Read the tags of some hframes from the catalog's tags table.
+
+    Args:
+        engine_g:
+        hframe_uuids (list(str)): hframes to read
+        batch (int): hframe uuids in each query
+
+    Returns:
+        (dict): hframe uuid to its tags dict, for those with tags
+    """
+    stmt = _hfr_stmt_cache.get('tags')
+    if stmt is None:
+        tags_tbl = _hframe_tables()[1]
+        stmt = select([tags_tbl.c.uuid, tags_tbl.c.key, tags_tbl.c.value])\
+            .where(tags_tbl.c.uuid.in_(bindparam('f_uuids', expanding=True)))
+        _hfr_stmt_cache['tags'] = stmt
+
+    hframe_uuids = list(hframe_uuids)
+    found = defaultdict(dict)
+    with engine_g.connect() as conn:
+        for start in range(0, len(hframe_uuids), batch):
+            for row in _execute(conn, stmt, {'f_uuids': hframe_uuids[start:start + batch]}):
+                found[row['uuid']][row['key']] = row['value']
+    return found
+
+
+def select_hfr_pb_db(engine_g, hframe_uuid):
+    """
+    Read the pb blob of one hframe from the catalog.
+
+    Args:
+        engine_g:
+        hframe_uuid (str):
+
+    Returns:
+        (str): the serialized HyperFrame pb, or None if it is not in the catalog
+    """
+    stmt = _hfr_stmt_cache.get('pb')
+    if stmt is None:
+        hframes = _hframe_tables()[0]
+        stmt = select([hframes.c.pb]).where(hframes.c.uuid == bindparam('f_uuid'))
+        _hfr_stmt_cache['pb'] = stmt
+
+    with engine_g.connect() as conn:
+        row = _execute(conn, stmt, {'f_uuid': hframe_uuid}).first()
+    return None if row is None or row['pb'] is None else str(row['pb'])
+
+
+def lineage_edge_rows(hframe_pb):
+    """
+    The lineage_edges rows for one hframe, one for each bundle it depends on.
+
+    Args:
+        hframe_pb: hyperframe_pb2.HyperFrame
+
+    Returns:
+        (list): of dict rows
+    """
+    rows = []
+    parents = set()
+    for dep in hframe_pb.lineage.depends_on:
+        if dep.hframe_uuid == '' or dep.hframe_uuid in parents:
+            continue
+        parents.add(dep.hframe_uuid)
+        rows.append({'child_uuid': hframe_pb.uuid,
+                     'parent_uuid': dep.hframe_uuid,
+                     'parent_processing_name': dep.hframe_name})
+    return rows
+
+
+def _lineage_stmt(direction):
+    """
+    Recursive CTE from a bundle along lineage_edges.  The CTE only carries (uuid, depth),
+    and UNION drops repeats, so diamonds in the graph do not multiply the rows.
+
+    Returns:
+        sqlalchemy select of (uuid, depth, processing_name, human_name)
+    """
+    key = ('lineage', direction)
+    stmt = _hfr_stmt_cache.get(key)
+    if stmt is not None:
+        return stmt
+
+    hframes, _ = _hframe_tables()
+    edges = HyperFrameRecord.get_tables()[LINEAGE_EDGES_TABLE]
+
+    if direction == 'upstream':
+        src, dst = edges.c.child_uuid, edges.c.parent_uuid
+    else:
+        src, dst = edges.c.parent_uuid, edges.c.child_uuid
+
+    walk = select([dst.label('uuid'), literal_column('1').label('depth')]) \
+        .where(src == bindparam('l_uuid')).cte('lineage_walk', recursive=True)
+
+    step = edges.alias('step')
+    step_src, step_dst = (step.c.child_uuid, step.c.parent_uuid) if direction == 'upstream' \
+        else (step.c.parent_uuid, step.c.child_uuid)
+    walk = walk.union(select([step_dst, walk.c.depth + 1])
+                      .where(and_(step_src == walk.c.uuid, walk.c.depth < bindparam('l_depth'))))
+
+    nodes = select([walk.c.uuid, func.min(walk.c.depth).label('depth')]).group_by(walk.c.uuid).alias('nodes')
+
+    # Bundles that are not in this context still have the processing name on their edges.
+    edge_name = select([edges.c.parent_processing_name]).where(edges.c.parent_uuid == nodes.c.uuid)\
+        .limit(1).correlate(nodes).as_scalar()
+
+    stmt = select([nodes.c.uuid, nodes.c.depth,
+                   func.coalesce(hframes.c.processing_name, edge_name).label('processing_name'),
+                   hframes.c.human_name])\
+        .select_from(nodes.outerjoin(hframes, hframes.c.uuid == nodes.c.uuid))\
+        .order_by(nodes.c.depth, nodes.c.uuid)
+
+    _hfr_stmt_cache[key] = stmt
+    return stmt
+
+
+def select_lineage_db(engine_g, uuid, direction='upstream', depth=None):
+    """
+    Walk lineage from a bundle in the lineage_edges table.
+
+    Args:
+        engine_g:
+        uuid (str): the bundle to start from
+        direction (str): 'upstream' for the bundles it was made from, 'downstream' for the bundles made from it
+        depth (int): Optional.  Number of hops to follow, default all of them.
+
+    Returns:
+        (list): of `LineageNode`, nearest first.  Each bundle appears once, at its shortest distance.
+    """
+    if direction not in LINEAGE_DIRECTIONS:
+        raise Exception("Lineage direction must be one of {}, not {}".format(LINEAGE_DIRECTIONS, direction))
+
+    if depth is not None and depth < 1:
+        return []
+
+    with engine_g.connect() as conn:
+        params = {'l_uuid': uuid}
+        if depth is None:
+            # A DAG has no path longer than its number of edges, this only guards against cycles.
+            edges = HyperFrameRecord.get_tables()[LINEAGE_EDGES_TABLE]
+            params['l_depth'] = _execute(conn, select([func.count()]).select_from(edges), {}).scalar() + 1
+        else:
+            params['l_depth'] = depth
+        result = _execute(conn, _lineage_stmt(direction), params)
+        if not result.returns_rows:
+            # Python 2's sqlite3 has no cursor description for a WITH statement that found nothing.
+            return []
+        return [LineageNode(*row) for row in result]
+
+
 def get_files_in_dir(dir):
     """ Look for files in a user returned directory
     1.) Only look one-level down (in this directory)
     2.) Do not include anything that looks like one of disdat's pbufs
 
     TODO: One place that defines the format of the Disdat pb file names
-    See data_context.DataContext: rebuild_db() *_frame.pb, *_hframe.pb, *_auth.pb
+    See data_context.DataContext: rebuild_db() *_frame.pb, *_hframe.pb, *_auth.pb, *_bundle.pb, *_frame.npy,
+    and *_bundle.parquet
     Args:
         (str): local directory
     Returns:
@@ -454,7 +1186,8 @@ def get_files_in_dir(dir):
     """
 
     files = [os.path.join(dir, f) for f in os.listdir(dir) if os.path.isfile(os.path.join(dir, f))
-             and ('_hframe.pb' not in f) and ('_frame.pb' not in f) and ('_auth.pb' not in f)]
+             and ('_hframe.pb' not in f) and ('_frame.pb' not in f) and ('_auth.pb' not in f)
+             and (PACKED_SUFFIX not in f) and (SIDECAR_SUFFIX not in f) and (PARQUET_SUFFIX not in f)]
 
     return files
 
@@ -505,6 +1238,234 @@ def strip_file_prefix(series):
         series[i] = series[i][7:]
 
 
+# UTF8 frames hold int32 offsets, past this many bytes of strings they are LARGE_UTF8 with int64 offsets
+UTF8_MAX_BYTES = (1 << 31) - 1
+
+# How from_ndarray stores strings, UTF8 frames or the original repeated STRING frames
+STRING_TYPES = ('UTF8', 'STRING')
+
+# decode_utf8 pads strings to the longest one, unless it is this many times the mean length,
+# then one long string would make a huge array, and the strings are str or unicode objects.
+UTF8_MAX_WIDTH_RATIO = 8
+
+
+def encode_utf8(nda):
+    """
+    Pack an array of strings into UTF8 frame data: prod(shape) + 1 little-endian offsets, then the
+    strings' UTF-8 bytes end to end.  String i is buffer[offsets[i]:offsets[i + 1]].
+
+    Fixed-width numpy strings are packed with array operations.  Object arrays of str or unicode
+    have to visit each string, but only to encode and join them.
+
+    Args:
+        nda (`numpy.ndarray`): Array of np.string_, np.unicode_, or str and unicode objects
+
+    Returns:
+        (str, str): Frame type, 'UTF8' or 'LARGE_UTF8', and the frame data
+    """
+    flat = np.ascontiguousarray(nda).reshape(-1)
+
+    if flat.dtype.type == np.unicode_:
+        if flat.size > 0 and flat.view(np.uint32).max() >= 0x80:
+            flat = np.char.encode(flat, 'utf-8')
+        else:
+            flat = flat.astype(np.string_)
+
+    if flat.dtype.type == np.object_:
+        encoded = [s.encode('utf-8') if isinstance(s, unicode) else s for s in flat]
+        lengths = np.fromiter((len(s) for s in encoded), dtype=np.int64, count=len(encoded))
+        buf = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    else:
+        # numpy pads fixed-width strings with trailing NULs, a string ends after its last non-NUL byte
+        width = flat.dtype.itemsize
+        chars = flat.view(np.uint8).reshape(len(flat), width)
+        nonzero = chars != 0
+        lengths = (width - np.argmax(nonzero[:, ::-1], axis=1)).astype(np.int64)
+        lengths[~nonzero.any(axis=1)] = 0
+        buf = chars[np.arange(width) < lengths[:, None]]
+
+    if buf.size > 0 and buf.max() >= 0x80:
+        try:
+            buf.tobytes().decode('utf-8')
+        except UnicodeDecodeError as ude:
+            raise Exception("String frames must be UTF-8: {}".format(ude))
+
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    if offsets[-1] <= UTF8_MAX_BYTES:
+        return 'UTF8', offsets.astype('<i4').tobytes() + buf.tobytes()
+    return 'LARGE_UTF8', offsets.astype('<i8').tobytes() + buf.tobytes()
+
+
+def decode_utf8(frame_type, data, shape, rows=None):
+    """
+    Unpack UTF8 frame data from encode_utf8 into a fixed-width string array.
+
+    All ASCII strings come back as np.string_, four times smaller than np.unicode_, which the others need.
+    If the longest string is more than UTF8_MAX_WIDTH_RATIO times the mean length, they come back as
+    an np.object_ array of str, or unicode if not ASCII, sliced from the buffer at the offsets.
+
+    Args:
+        frame_type (int): hyperframe_pb2.UTF8 or hyperframe_pb2.LARGE_UTF8
+        data (str): The frame data
+        shape (tuple): The frame shape
+        rows (slice): Optional.  Only unpack rows start to stop, see row_range
+
+    Returns:
+        (`numpy.ndarray`)
+    """
+    offset_dtype = np.dtype('<i4') if frame_type == hyperframe_pb2.UTF8 else np.dtype('<i8')
+    n = int(np.prod(shape))
+
+    offsets = np.frombuffer(data, dtype=offset_dtype, count=n + 1)
+    buf = np.frombuffer(data, dtype=np.uint8, offset=(n + 1) * offset_dtype.itemsize)
+    if offsets[0] != 0 or offsets[-1] != buf.size:
+        raise Exception("UTF8 frame offsets do not match its {} bytes of strings".format(buf.size))
+
+    if rows is not None:
+        # Each row is prod(shape[1:]) strings
+        row_size = int(np.prod(shape[1:]))
+        shape = (rows.stop - rows.start,) + tuple(shape[1:])
+        n = int(np.prod(shape))
+        offsets = offsets[rows.start * row_size:rows.stop * row_size + 1]
+        buf = buf[offsets[0]:offsets[-1]]
+
+    offsets = offsets.astype(np.int64) - offsets[0]
+    lengths = np.diff(offsets)
+    if (lengths < 0).any():
+        raise Exception("UTF8 frame offsets do not match its {} bytes of strings".format(buf.size))
+
+    width = max(int(lengths.max()) if n > 0 else 0, 1)
+    if width > UTF8_MAX_WIDTH_RATIO * max(float(buf.size) / max(n, 1), 1.0):
+        raw = buf.tobytes()
+        ascii = buf.size == 0 or buf.max() < 0x80
+        nda = np.empty(n, dtype=np.object_)
+        nda[:] = [raw[a:b] if ascii else raw[a:b].decode('utf-8') for a, b in zip(offsets[:-1], offsets[1:])]
+        return nda.reshape(shape)
+
+    chars = np.zeros((n, width), dtype=np.uint8)
+    chars[np.arange(width) < lengths[:, None]] = buf
+    nda = chars.view('S{}'.format(width)).reshape(shape)
+
+    if buf.size > 0 and buf.max() >= 0x80:
+        nda = np.char.decode(nda, 'utf-8')
+
+    return nda
+
+
+def row_range(rows, num_rows):
+    """
+    Args:
+        rows (slice): rows of a frame, as python slices them, with a positive step
+        num_rows (int): the frame's first dimension
+
+    Returns:
+        (slice, int): rows start to stop, within the frame and with start <= stop, and the step
+    """
+    start, stop, step = rows.indices(num_rows)
+    if step < 1:
+        raise Exception("Disdat reads rows with a positive step, found {}".format(rows))
+    return slice(start, max(start, stop)), step
+
+
+def datetime_unit(dtype):
+    """
+    Args:
+        dtype (`numpy.dtype`): a datetime64 or timedelta64 dtype
+
+    Returns:
+        (str): its unit for Frame.unit, e.g., 'ns', or '10ms'
+    """
+    unit, count = np.datetime_data(dtype)
+    if unit == 'generic':
+        return ''
+    return unit if count == 1 else '{}{}'.format(count, unit)
+
+
+# infer_dtype kinds of object arrays from_ndarray stores natively -> (value for missing slots, numpy type)
+# Strings stay objects for encode_utf8
+OBJECT_KINDS = {
+    'string':   ('', None),
+    'unicode':  (u'', None),
+    'empty':    ('', None),
+    'boolean':  (False, np.bool_),
+    'integer':  (0, np.int64),
+    'floating': (np.nan, np.float64),
+    'mixed-integer-float': (np.nan, np.float64),
+}
+
+
+def typed_objects(nda):
+    """
+    Find the typed array an object array of strings, numbers, booleans, or datetimes stands for.
+
+    None, NaN, and NaT are missing values.  Datetimes and timedeltas hold them as NaT.  Other kinds
+    fill them from OBJECT_KINDS, and return a mask for the frame's validity bitmap.
+
+    datetime64 has no time zone, so time zone aware datetimes become ISO 8601 strings, which keep
+    their UTC offset, e.g., '2020-01-01T00:00:00-08:00'.
+
+    Args:
+        nda (`numpy.ndarray`): an np.object_ array
+
+    Returns:
+        (`numpy.ndarray`, `numpy.ndarray`): The typed array, or None if there is none, and a boolean
+            array that is False where a value is missing, or None if none are
+    """
+    flat = nda.reshape(-1)
+    missing = pd.isnull(flat)
+    valid = None
+    if missing.any():
+        valid = ~missing
+        kind = pd.api.types.infer_dtype(flat[valid])
+    else:
+        kind = pd.api.types.infer_dtype(flat)
+
+    if kind in ('datetime', 'datetime64', 'timedelta', 'timedelta64'):
+        try:
+            values = pd.to_timedelta(flat) if kind.startswith('timedelta') else pd.to_datetime(flat)
+        except (ValueError, TypeError):
+            return None, None
+        if getattr(values, 'tz', None) is not None:
+            strings = np.array(['' if pd.isnull(x) else x.isoformat() for x in values], dtype=np.object_)
+            return strings.reshape(nda.shape), valid
+        return np.asarray(values.values).reshape(nda.shape), None
+
+    if kind not in OBJECT_KINDS:
+        return None, None
+
+    fill, numpy_type = OBJECT_KINDS[kind]
+    if valid is not None:
+        flat = flat.copy()
+        flat[missing] = fill
+    if numpy_type is None:
+        return flat.reshape(nda.shape), valid
+    try:
+        return flat.astype(numpy_type).reshape(nda.shape), valid
+    except (OverflowError, ValueError, TypeError):
+        return None, None
+
+
+def apply_validity(nda, validity, first=0):
+    """
+    Put NaN where a frame's validity bitmap says values are missing, as pd.read_csv does.
+
+    Args:
+        nda (`numpy.ndarray`): the frame's decoded values
+        validity (str): Frame.validity, np.packbits of a mask that is 0 where a value is missing
+        first (int): the frame's index of nda's first value, when nda holds only some rows
+
+    Returns:
+        (`numpy.ndarray`): a float array for floats, else an np.object_ array
+    """
+    bits = np.frombuffer(validity, dtype=np.uint8)[first // 8:(first + nda.size + 7) // 8 + 1]
+    valid = np.unpackbits(bits)[first % 8:first % 8 + nda.size].astype(np.bool_)
+    out = nda.astype(nda.dtype if nda.dtype.kind == 'f' else np.object_)
+    out.reshape(-1)[~valid] = np.nan
+    return out
+
+
 class PBObject(object):
     """
     Most objects mirror PB objects.
@@ -517,10 +1478,20 @@ class PBObject(object):
     Note that _create_table and _write_row must use the same strings for column
     identifiers.   _pb_type simply returns the protocol buffer object from the PB compiled
     python class.
+
+    A view (see view_of_pb) shares another pb.  Methods that modify the pb must call
+    _own_pb() first, so the view copies it before the first change.
+
+    Catalog-wide operations hold many records, so every class in the hierarchy declares
+    __slots__.  Subclasses must too, else their instances get a __dict__ again.
     """
 
+    # _pb_shared is True while self.pb belongs to another object, e.g., an hframe embedded in a frame
+    __slots__ = ('pb', 'state', '_pb_shared')
+
     def __init__(self):
         self.state = RecordState.invalid
+        self._pb_shared = False
 
     def init_internal_state(self):
         """
@@ -604,6 +1575,53 @@ class PBObject(object):
         _ = cls._create_table(metadata)
         metadata.create_all()
 
+    @classmethod
+    def get_tables(cls):
+        """
+        Do not over-ride
+        Return the unbound table(s) from _create_table(cls, metadata).
+        We build these once per class and share them across all engines.
+
+        Returns:
+            sqlalchemy.Table or dict[str:<table>, sqlalchemy.Table]
+        """
+        tbls = _pb_table_cache.get(cls)
+        if tbls is None:
+            tbls = cls._create_table(MetaData())
+            _pb_table_cache[cls] = tbls
+        return tbls
+
+    @classmethod
+    def create_indexes(cls, db_engine):
+        """
+        Do not over-ride
+        Create any indexes declared in _create_table(cls, metadata) that
+        an existing table does not have yet.  create_table() only creates
+        indexes along with new tables.  Indexes on columns the table does
+        not have yet are left for the migration that adds those columns.
+
+        Args:
+            db_engine: sqlalchemy engine
+
+        Returns:
+            (list): names of the indexes created
+        """
+        metadata = MetaData()
+        _ = cls._create_table(metadata)
+        inspector = sa_inspect(db_engine)
+        existing_tables = inspector.get_table_names()
+        created = []
+        for table in metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = set(idx['name'] for idx in inspector.get_indexes(table.name))
+            columns = set(c['name'] for c in inspector.get_columns(table.name))
+            for index in table.indexes:
+                if index.name not in existing and all(c.name in columns for c in index.columns):
+                    index.create(bind=db_engine)
+                    created.append(index.name)
+        return created
+
     def write_row(self, state, db_conn):
         """
         Do not over-ride
@@ -625,9 +1643,8 @@ class PBObject(object):
         """
         from sqlalchemy.exc import IntegrityError
 
-        metadata = MetaData()
         self.state = state
-        pb_tbls = self._create_table(metadata)
+        pb_tbls = self.get_tables()
         pb_rows = self._write_row()
 
         try:
@@ -686,6 +1703,70 @@ class PBObject(object):
         obj.init_internal_state()
         return obj
 
+    @classmethod
+    def view_of_pb(cls, other_pb):
+        """
+        Given another pb of same type, wrap it without copying.  The pb is copied
+        the first time this object modifies it.  Do not modify view.pb directly.
+
+        Args:
+            other_pb:
+
+        Returns:
+            object
+        """
+
+        obj = cls.__new__(cls)
+        setattr(obj, 'pb', other_pb)
+        obj._pb_shared = True
+        obj.init_internal_state()
+        return obj
+
+    def _own_pb(self):
+        """
+        If this is a view, copy the shared pb so that we may modify it.
+
+        Returns:
+            None
+        """
+        if getattr(self, '_pb_shared', False):
+            pb = self._pb_type()
+            pb.CopyFrom(self.pb)
+            self.pb = pb
+            self._pb_shared = False
+
+    def __getstate__(self):
+        """
+        Slotted objects have no __dict__ for pickle and copy to use, so return the slots that
+        are set.  The generated pb classes do not pickle, so we store the pb as bytes.
+
+        Returns:
+            (dict): slot name to value
+        """
+        state = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+        if 'pb' in state:
+            state['pb'] = state['pb'].SerializeToString()
+        # The copy owns its pb
+        state['_pb_shared'] = False
+        return state
+
+    def __setstate__(self, state):
+        """
+        Args:
+            state (dict): from __getstate__
+
+        Returns:
+            None
+        """
+        for name, value in state.iteritems():
+            if name == 'pb':
+                value = self._pb_type().FromString(value)
+            setattr(self, name, value)
+
     @classmethod
     def from_row(cls, sa_result):
         """
@@ -732,8 +1813,12 @@ class HyperFrameRecord(PBObject):
     HyperFrameRecord stores a named list of frames (or tensors)
     Includes lineage, tags, and links
     This is the in-python representation.   Each can import / export to PBs and DBs (via named tuples)
+
+    The frame and tag dicts are built from the pb the first time they are used.
     """
 
+    __slots__ = ('_frame_cache', '_frame_dict', '_tag_dict')
+
     table_name = 'hframes'
 
     def __init__(self, owner='', human_name='', processing_name='', uuid='',
@@ -771,9 +1856,7 @@ class HyperFrameRecord(PBObject):
         self.pb.uuid = uuid
         self.pb.presentation = presentation
 
-        self.frame_cache = defaultdict(FrameRecord)
-        self.frame_dict  = {}
-        self.tag_dict    = {}
+        self.init_internal_state()
 
         if frames is not None:
             self.add_frames(frames)
@@ -784,8 +1867,7 @@ class HyperFrameRecord(PBObject):
         if lin_obj is not None:
             self.add_lineage(lin_obj)
 
-        self.pb.ClearField('hash')
-        self.pb.hash = hashlib.md5(self.pb.SerializeToString()).hexdigest()
+        integrity.set_pb_hash(self.pb)
 
     def is_presentable(self):
         """
@@ -811,6 +1893,8 @@ class HyperFrameRecord(PBObject):
             hyperframe.HyperFrameRecord
 
         """
+        self._own_pb()
+
         self.pb.uuid = new_hfr_uuid
 
         self.pb.lineage.hframe_uuid   = new_hfr_uuid
@@ -830,10 +1914,12 @@ class HyperFrameRecord(PBObject):
             hyperframe.HyperFrameRecord
 
         """
+        self._own_pb()
+
         # reset the internal frame_cache and frame_dict
         # these will be rebuilt on add_frames
-        self.frame_cache = defaultdict(FrameRecord)
-        self.frame_dict  = {}
+        self._frame_cache = None
+        self._frame_dict  = None
 
         self.pb.ClearField('frames')
         self.add_frames(new_frames)
@@ -853,8 +1939,9 @@ class HyperFrameRecord(PBObject):
             hyperframe.HyperFrameRecord
 
         """
+        self._own_pb()
 
-        self.tag_dict    = {}
+        self._tag_dict   = None
 
         self.pb.ClearField('tags')
         self.add_tags(new_tags)
@@ -890,6 +1977,7 @@ class HyperFrameRecord(PBObject):
             hyperframe.HyperFrameRecord
 
         """
+        self._own_pb()
 
         self.pb.presentation = new_presentation
 
@@ -906,19 +1994,19 @@ class HyperFrameRecord(PBObject):
             hyperframe.HyperFrameRecord
 
         """
+        self._own_pb()
 
         if new_time:
             self.pb.lineage.creation_date = time.time()
 
-        self.pb.ClearField('hash')
-        self.pb.hash = hashlib.md5(self.pb.SerializeToString()).hexdigest()
+        integrity.set_pb_hash(self.pb)
 
         return self
 
     def init_internal_state(self):
         """
-        If you create a HFR and just set the pb, this will create
-        the frame and tag dicts.
+        If you create a HFR and just set the pb, this will reset
+        the frame cache and the frame and tag dicts.  They are built on first use.
 
         Args:
             row:
@@ -927,15 +2015,42 @@ class HyperFrameRecord(PBObject):
             None
         """
 
-        self.frame_cache = defaultdict(FrameRecord)
-        self.frame_dict  = {}
-        self.tag_dict    = {}
+        self._frame_cache = None
+        self._frame_dict  = None
+        self._tag_dict    = None
 
-        for string_tuple in self.pb.frames:
-            self.frame_dict[string_tuple.k] = string_tuple.v
+    def __getstate__(self):
+        """
+        The frame and tag dicts are rebuilt from the copy's own pb, and the copy gets its own
+        frame cache (of the same FrameRecords), so adding frames or tags to one does not change the other.
+        """
+        state = super(HyperFrameRecord, self).__getstate__()
+        state['_frame_dict'] = None
+        state['_tag_dict'] = None
+        if state.get('_frame_cache') is not None:
+            state['_frame_cache'] = defaultdict(FrameRecord, state['_frame_cache'])
+        return state
 
-        for string_tuple in self.pb.tags:
-            self.tag_dict[string_tuple.k] = string_tuple.v
+    @property
+    def frame_cache(self):
+        """ FrameRecords added to this in-memory HFR, by name """
+        if self._frame_cache is None:
+            self._frame_cache = defaultdict(FrameRecord)
+        return self._frame_cache
+
+    @property
+    def frame_dict(self):
+        """ Frame name to frame uuid """
+        if self._frame_dict is None:
+            self._frame_dict = {string_tuple.k: string_tuple.v for string_tuple in self.pb.frames}
+        return self._frame_dict
+
+    @property
+    def tag_dict(self):
+        """ Tag key to value """
+        if self._tag_dict is None:
+            self._tag_dict = {string_tuple.k: string_tuple.v for string_tuple in self.pb.tags}
+        return self._tag_dict
 
     @staticmethod
     def make_filename(uuid):
@@ -965,19 +2080,43 @@ class HyperFrameRecord(PBObject):
                         Column('processing_name', String),
                         Column('creation_date', DateTime), #TIMESTAMP),
                         Column('state', Enum(RecordState)),
-                        Column('pb', BLOB)
+                        Column('pb', LargeBinary),
+                        # Bundle resolution looks up the latest by processing or human name.
+                        Index('ix_hframes_processing_name_creation_date', 'processing_name', 'creation_date'),
+                        Index('ix_hframes_human_name_creation_date', 'human_name', 'creation_date'),
+                        Index('ix_hframes_state', 'state'),
+                        # Listings page through all hframes youngest first.
+                        Index('ix_hframes_creation_date_uuid', 'creation_date', 'uuid')
                         )
 
         tags = Table(HyperFrameRecord.table_name+'_tags', metadata,
                      Column('key', String),
                      Column('uuid', String(50)),
                      Column('value', String),
+                     # The value as a number, if it is one, for range queries
+                     Column('num_value', Float),
                      # explicit/composite unique constraint.  'name' is optional.
-                     UniqueConstraint('key', 'uuid', name='uix_1')
+                     UniqueConstraint('key', 'uuid', name='uix_1'),
+                     # Tag queries are answered from these indexes without touching the table.
+                     Index('ix_hframes_tags_key_value_uuid', 'key', 'value', 'uuid'),
+                     Index('ix_hframes_tags_key_num_value_uuid', 'key', 'num_value', 'uuid'),
+                     # Projections join each page of hframes to all of their tags.
+                     Index('ix_hframes_tags_uuid', 'uuid')
                      )
 
+        # One row for each (processing_name, uuid) in lineage.depends_on, so we can walk
+        # lineage in SQL instead of reading every hframe pb.
+        edges = Table(LINEAGE_EDGES_TABLE, metadata,
+                      Column('child_uuid', String(50)),
+                      Column('parent_uuid', String(50)),
+                      Column('parent_processing_name', String),
+                      UniqueConstraint('child_uuid', 'parent_uuid', name='uix_lineage_edges'),
+                      Index('ix_lineage_edges_parent_uuid_child_uuid', 'parent_uuid', 'child_uuid')
+                      )
+
         return {HyperFrameRecord.table_name: hframes,
-                HyperFrameRecord.table_name+'_tags': tags}
+                HyperFrameRecord.table_name+'_tags': tags,
+                LINEAGE_EDGES_TABLE: edges}
 
     @staticmethod
     def _pb_type():
@@ -1008,9 +2147,12 @@ class HyperFrameRecord(PBObject):
         for string_tuple in self.pb.tags:
             r = {'uuid': self.pb.uuid,
                  'key': string_tuple.k,
-                 'value': string_tuple.v}
+                 'value': string_tuple.v,
+                 'num_value': tag_query.tag_number(string_tuple.v)}
             rows[HyperFrameRecord.table_name+'_tags'].append(r)
 
+        rows[LINEAGE_EDGES_TABLE].extend(lineage_edge_rows(self.pb))
+
         return rows
 
     def add_frames(self, frames):
@@ -1025,6 +2167,7 @@ class HyperFrameRecord(PBObject):
         Returns:
             Nothing
         """
+        self._own_pb()
 
         for f in frames:
             if isinstance(f, tuple):
@@ -1055,18 +2198,17 @@ class HyperFrameRecord(PBObject):
             names (:list:str):  Names to retrieve or all if none.
 
         Returns:
-            (:obj:list FrameRecord)
+            (:obj:list FrameRecord): in the hframe's frame order, or the order of names
         """
 
-        def _resolve_frame(self, data_context, name, uuid, testing_dir=None):
+        def _resolve_frame(self, loaded, name, uuid, testing_dir=None):
             """
-            Given hframe, context and name, return FrameRecord.
-            Up to the context to resolve Frame PB given hframe.uuid and frame.uuid
+            Given hframe, the frames the context loaded, and name, return FrameRecord.
 
             Args:
                 self: the hyperframe record
+                loaded (dict): frame uuid to FrameRecord from DataContext.load_frames, or None
                 name: the name of the frame
-                data_context: the context in which you think this exists
 
             Returns:
                 FrameRecord
@@ -1074,27 +2216,25 @@ class HyperFrameRecord(PBObject):
             """
             if name in self.frame_cache:
                 return self.frame_cache[name]
+            elif loaded is not None:
+                return loaded[uuid]
+            elif testing_dir is not None:
+                return r_pb_fs(os.path.join(testing_dir, FrameRecord.make_filename(uuid)), FrameRecord)
             else:
-                if data_context is not None:
-                    # TODO: Move this into DataContext and handle non-local reads
-                    fr = r_pb_fs(os.path.join(data_context.get_object_dir(),
-                                              self.pb.uuid,
-                                              FrameRecord.make_filename(uuid)), FrameRecord)
-                    # NOTE: UGLY -- one extra variable in the FrameRecord that is not in the FrameRecord.pb
-                    # TODO: REMOVE this dependency.   Means we have to be very careful about FR copies
-                    fr.hframe_uuid = self.pb.uuid
-                elif testing_dir is not None:
-                    fr = r_pb_fs(os.path.join(testing_dir, FrameRecord.make_filename(uuid)), FrameRecord)
-                else:
-                    fr = None
-                return fr
+                return None
 
         if names is None:
-            name_uuids = [(k, v) for k, v in self.frame_dict.iteritems()]
+            name_uuids = [(string_tuple.k, string_tuple.v) for string_tuple in self.pb.frames]
         else:
             name_uuids = [(k, self.frame_dict[k]) for k in names]
 
-        return [_resolve_frame(self, data_context, name, uuid, testing_dir=testing_dir) for name, uuid in name_uuids]
+        loaded = None
+        if data_context is not None:
+            # Up to the context to resolve the Frame PBs given hframe.uuid and frame.uuid
+            missing = set(uuid for name, uuid in name_uuids if name not in self.frame_cache)
+            loaded = data_context.load_frames([self], frame_uuids=missing) if missing else {}
+
+        return [_resolve_frame(self, loaded, name, uuid, testing_dir=testing_dir) for name, uuid in name_uuids]
 
     def get_frame_ids(self, names=None):
         """
@@ -1104,10 +2244,10 @@ class HyperFrameRecord(PBObject):
             names (:list:str):  Names to retrieve or all if none.
 
         Returns:
-            (:obj:list (str,str))
+            (:obj:list (str,str)): in the hframe's frame order, or the order of names
         """
         if names is None:
-            names = [n for n in self.frame_dict.keys()]
+            return [(string_tuple.k, string_tuple.v) for string_tuple in self.pb.frames]
 
         return [(name, self.frame_dict[name]) for name in names]
 
@@ -1123,6 +2263,7 @@ class HyperFrameRecord(PBObject):
         Returns:
             Nothing
         """
+        self._own_pb()
 
         for k, v in tags.iteritems():
             t = self.pb.tags.add()
@@ -1171,6 +2312,7 @@ class HyperFrameRecord(PBObject):
         :param lin_obj:
         :return:
         """
+        self._own_pb()
         self.pb.lineage.CopyFrom(lin_obj.pb)
 
     def get_lineage(self):
@@ -1193,8 +2335,111 @@ class HyperFrameRecord(PBObject):
         return s
 
 
+class HyperFrameRow(object):
+    """
+    A lightweight, read-only bundle served from the catalog columns and tags table.
+
+    Listings only need the uuid, names, date, and tags.  We read the pb from the catalog,
+    and parse it (and build the frame and tag dicts), only on first access to `pb`.
+    """
+
+    __slots__ = ('uuid', 'owner', 'human_name', 'processing_name', 'creation_date', 'state', 'tag_dict',
+                 '_pb_bytes', '_record', '_engine')
+
+    def __init__(self, uuid, owner, human_name, processing_name, creation_date, state, tags=None, pb_bytes=None,
+                 engine_g=None):
+        """
+        Args:
+            uuid (str):
+            owner (str):
+            human_name (str):
+            processing_name (str):
+            creation_date (float): seconds since the epoch, as in the lineage pb
+            state (`RecordState`):
+            tags (:dict:(str,str)): the hframe's tags
+            pb_bytes (str): serialized HyperFrame pb, or None to read it from engine_g when asked
+            engine_g: the catalog the row came from
+        """
+        self.uuid = uuid
+        self.owner = owner
+        self.human_name = human_name
+        self.processing_name = processing_name
+        self.creation_date = creation_date
+        self.state = state
+        self.tag_dict = {} if tags is None else tags
+        self._pb_bytes = pb_bytes
+        self._record = None
+        self._engine = engine_g
+
+    @classmethod
+    def from_rows(cls, sa_result, engine_g):
+        """
+        Build rows from a projection query, one row per hframe, and read their tags
+        with select_hfr_tags_db.
+
+        Args:
+           sa_result:  a sqlalchemy result object
+           engine_g: the catalog, for the tags, and for the pb when asked
+
+        Returns:
+            [`HyperFrameRow`, ]
+        """
+        objs = []
+        for row in sa_result:
+            creation_date = row['creation_date']
+            if creation_date is not None:
+                creation_date = time.mktime(creation_date.timetuple()) + creation_date.microsecond / 1e6
+            objs.append(cls(row['uuid'], row['owner'], row['human_name'], row['processing_name'],
+                            creation_date, row['state'], engine_g=engine_g))
+        if len(objs) > 0:
+            tags = select_hfr_tags_db(engine_g, [obj.uuid for obj in objs])
+            for obj in objs:
+                obj.tag_dict = tags.get(obj.uuid, {})
+        return objs
+
+    @property
+    def record(self):
+        """
+        Returns:
+            (`HyperFrameRecord`): the full record, read and parsed on first use
+        """
+        if self._record is None:
+            if self._pb_bytes is None and self._engine is not None:
+                self._pb_bytes = select_hfr_pb_db(self._engine, self.uuid)
+            if self._pb_bytes is None:
+                raise Exception("HyperFrameRow {} has no pb bytes to parse".format(self.uuid))
+            self._record = HyperFrameRecord.from_str_bytes(str(self._pb_bytes))
+            if integrity.should_verify('read'):
+                integrity.verify_pb(self._record.pb, str(self._pb_bytes))
+            self._record.state = self.state
+        return self._record
+
+    @property
+    def pb(self):
+        return self.record.pb
+
+    def get_tag(self, name):
+        return self.tag_dict.get(name, None)
+
+    def get_tags(self):
+        return self.tag_dict
+
+    def get_human_name(self):
+        return self.human_name
+
+    def to_string(self):
+        s = "HumanName[{}] ProcName[{}] Timestamp[{}] Owner[{}] uuid[{}]".format(self.human_name,
+                                                                               self.processing_name,
+                                                                               self.creation_date,
+                                                                               self.owner,
+                                                                               self.uuid)
+        return s
+
+
 class LineageRecord(PBObject):
 
+    __slots__ = ()
+
     table_name = 'lineage'
 
     def __init__(self, hframe_name=None, hframe_uuid=None,
@@ -1247,7 +2492,7 @@ class LineageRecord(PBObject):
                          Column('code_hash', String(50)),
                          Column('creation_date', DateTime), #TIMESTAMP),
                          Column('state', Enum(RecordState)),
-                         Column('pb', BLOB)
+                         Column('pb', LargeBinary)
                          )
         return lineage
 
@@ -1315,9 +2560,13 @@ class LineageRecord(PBObject):
 
 class FrameRecord(PBObject):
 
+    # hframe_uuid is the hframe this frame belongs to, it is not in the pb
+    __slots__ = ('hframe_uuid',)
+
     table_name = 'frames'
 
-    def __init__(self, name=None, hframe_uuid=None, type=None, shape=None, data=None, byteorder=None, hframes=None, links=None):
+    def __init__(self, name=None, hframe_uuid=None, type=None, shape=None, data=None, byteorder=None, hframes=None, links=None,
+                 codec=None):
         """
         Data is held in "Frames."  These are individual tensors or n-dimensional vectors.
 
@@ -1325,9 +2574,10 @@ class FrameRecord(PBObject):
         :param hframe_uuid:  UUID of owning hyperframe
         :param type:  Tensors hold data of a single type hyperframe_pb2.Type.
         :param shape: (x,y,...,z)
-        :param data:    the inline byte array or array of strings if type == hyperframe_pb.STRING
+        :param data:    the inline byte array (see encode_utf8 for UTF8) or array of strings if type == hyperframe_pb.STRING
         :param hframes (:list:`HyperFrameRecords`) :  List of HyperFrameRecords
         :param links:   An array of LinkRecords
+        :param codec:   The compression.CODECS codec that compressed data, or None
         """
 
         super(FrameRecord, self).__init__()
@@ -1349,10 +2599,11 @@ class FrameRecord(PBObject):
             self.pb.shape.extend(shape)
 
         if hframes is not None:
-            self.pb.hframes.extend([HyperFrameRecord.copy_from_pb(hfrcd.pb).pb for hfrcd in hframes])
+            # extend copies each message into this frame, we don't need to copy them first
+            self.pb.hframes.extend([hfrcd.pb for hfrcd in hframes])
 
         if links is not None:
-            self.pb.links.extend([LinkBase.copy_from_pb(lrcd.pb).pb for lrcd in links])
+            self.pb.links.extend([lrcd.pb for lrcd in links])
 
         if data is not None:
             if self.pb.type == hyperframe_pb2.STRING:
@@ -1363,10 +2614,10 @@ class FrameRecord(PBObject):
                 self.pb.byteorder = FrameRecord.get_proto_byteorder(byteorder)
             else:
                 self.pb.byteorder = hyperframe_pb2.NA
+            if codec is not None:
+                self.pb.codec = hyperframe_pb2.Codec.Value(codec.upper())
 
-        self.pb.ClearField('hash')
-
-        self.pb.hash = hashlib.md5(self.pb.SerializeToString()).hexdigest()
+        integrity.set_pb_hash(self.pb)
 
     @staticmethod
     def _create_table(metadata):
@@ -1386,7 +2637,7 @@ class FrameRecord(PBObject):
                           Column('hframe_uuid', String(50)),
                           Column('name', String),
                           Column('state', Enum(RecordState)),
-                          Column('pb', BLOB)
+                          Column('pb', LargeBinary)
                           )
         return frame_tbl
 
@@ -1427,14 +2678,15 @@ class FrameRecord(PBObject):
 
     def get_hframes(self):
         """
-        NOTE: This is returning copies!
+        NOTE: These are views of the hyperframes in this frame.  They copy their pb the first time
+        a mod_* method changes it.  Do not change their pb directly.
 
         Returns:
             (:list:`HyperFrameRecords`): The ordered set of hyperframes in this frame or None
 
         """
         assert self.pb.type == hyperframe_pb2.HFRAME
-        return [HyperFrameRecord.copy_from_pb(pb) for pb in self.pb.hframes]
+        return [HyperFrameRecord.view_of_pb(pb) for pb in self.pb.hframes]
 
     def get_link_urls(self):
         """
@@ -1461,6 +2713,46 @@ class FrameRecord(PBObject):
     def make_filename(uuid):
         return "{}_frame.pb".format(uuid)
 
+    @staticmethod
+    def make_sidecar_filename(uuid):
+        return "{}{}".format(uuid, SIDECAR_SUFFIX)
+
+    def get_sidecar_filename(self):
+        """
+        Assuming a sidecar FrameRecord, return the name of its .npy file in the bundle directory
+
+        Returns:
+            (str): <uuid>_frame.npy, of the frame that wrote it
+        """
+        assert self.is_sidecar_frame()
+        return self.get_data_filename()
+
+    def get_data_filename(self):
+        """
+        The file in the bundle directory that holds this frame's data, a .npy sidecar or a Parquet file.
+        Many frames may share one Parquet file.
+
+        Returns:
+            (str): the file name, or None if the data is inline, or the frame holds links or hyperframes
+        """
+        if self.pb.type in (hyperframe_pb2.LINK, hyperframe_pb2.HFRAME) or len(self.pb.links) == 0:
+            return None
+        return LinkBase.find_url(self.pb.links[0]).replace(common.BUNDLE_URI_SCHEME, '')
+
+    def verify_data_file(self, data_dir):
+        """
+        Check this frame's sidecar or Parquet file against its content_hash, see integrity.verify_file.
+
+        Args:
+            data_dir (str): local bundle directory
+
+        Returns:
+            None, raises an Exception if the hash does not match
+        """
+        filename = self.get_data_filename()
+        if filename is not None:
+            integrity.verify_file(self.pb, os.path.join(data_dir, filename))
+
     def get_filename(self):
         """
 
@@ -1481,13 +2773,12 @@ class FrameRecord(PBObject):
         assert(self.is_link_frame())
         assert(len(self.pb.links) == 0)
 
-        self.pb.links.extend([LinkBase.copy_from_pb(lrcd.pb).pb for lrcd in links])
+        self._own_pb()
+        self.pb.links.extend([lrcd.pb for lrcd in links])
 
         self.pb.shape.extend((len(links),))
 
-        self.pb.ClearField('hash')
-
-        self.pb.hash = hashlib.md5(self.pb.SerializeToString()).hexdigest()
+        integrity.set_pb_hash(self.pb)
 
         return self
 
@@ -1501,13 +2792,13 @@ class FrameRecord(PBObject):
         Returns:
             (`hyperframe.FrameRecord`)
         """
+        self._own_pb()
+
         self.hframe_uuid = new_hfr_uuid
 
         self.pb.uuid = str(uuid.uuid1())
 
-        self.pb.ClearField('hash')
-
-        self.pb.hash = hashlib.md5(self.pb.SerializeToString()).hexdigest()
+        integrity.set_pb_hash(self.pb)
 
         return self
 
@@ -1597,6 +2888,26 @@ class FrameRecord(PBObject):
         link_pb = self.pb.links[0]
         return link_pb.WhichOneof('link') == 'database'
 
+    def is_sidecar_frame(self):
+        """
+        Whether this frame's array is in a .npy sidecar file instead of inline
+
+        Returns:
+            (bool):
+        """
+        filename = self.get_data_filename()
+        return filename is not None and filename.endswith(SIDECAR_SUFFIX)
+
+    def is_parquet_frame(self):
+        """
+        Whether this frame is a column of its bundle's Parquet file
+
+        Returns:
+            (bool):
+        """
+        filename = self.get_data_filename()
+        return filename is not None and filename.endswith(PARQUET_SUFFIX)
+
     def is_hfr_frame(self):
         """
         Whether this frame contains hyperframes or not
@@ -1649,8 +2960,12 @@ class FrameRecord(PBObject):
             hyperframe_pb2.FLOAT16: np.float16,
             hyperframe_pb2.FLOAT32: np.float32,
             hyperframe_pb2.FLOAT64: np.float64,
-            hyperframe_pb2.OBJECT:  np.object_
-            # Special Case -- manual conversion on string type -- hyperframe_pb2.STRING:  np.string_
+            hyperframe_pb2.OBJECT:  np.object_,
+            # Frame.unit holds the unit
+            hyperframe_pb2.DATETIME64:  np.datetime64,
+            hyperframe_pb2.TIMEDELTA64: np.timedelta64
+            # Special Case -- codes and a dictionary frame -- hyperframe_pb2.CATEGORICAL
+            # Special Case -- manual conversion on string types -- hyperframe_pb2.STRING, UTF8, LARGE_UTF8
         }
 
         if proto_type in numpy_types:
@@ -1688,7 +3003,9 @@ class FrameRecord(PBObject):
             unicode:    'STRING',
             np.unicode_: 'STRING',
             np.string_: 'STRING',
-            np.object_: 'OBJECT'
+            np.object_: 'OBJECT',
+            np.datetime64:  'DATETIME64',
+            np.timedelta64: 'TIMEDELTA64'
         }
 
         if isinstance(numpy_type, np.dtype):
@@ -1698,55 +3015,135 @@ class FrameRecord(PBObject):
             return proto_types[numpy_type]
         raise KeyError('Could not find a message array type for {}'.format(numpy_type))
 
-    def to_ndarray(self):
+    def to_ndarray(self, data_dir=None, mmap_mode='r', rows=None):
         """
         Convert a Frame to a numpy ndarray
 
+        With rows, sidecar frames map, and Parquet frames read, only those rows.  Inline frames
+        decode only those rows, but compressed frames decompress all their data first.
+
+        Args:
+            data_dir (str): The bundle's local directory, needed for sidecar and Parquet frames
+            mmap_mode (str): How to map sidecar frames, 'r' read-only or 'c' copy-on-write
+            rows (slice): Optional.  Only these rows, of the first dimension.  A 0-d frame is one row.
+
         Returns:
             (`numpy.ndarray`):
 
         """
 
+        if rows is not None and len(self.pb.shape) == 0:
+            return self.to_ndarray(data_dir=data_dir, mmap_mode=mmap_mode).reshape((1,))[rows]
+
+        step = 1
+        if rows is not None:
+            rows, step = row_range(rows, self.pb.shape[0])
+            row_size = int(np.prod(self.pb.shape[1:]))
+
         if self.pb.type == hyperframe_pb2.HFRAME:
             # Choose to pass HyperFrames as UUIDs
-            nda = np.array([hf_pb.uuid for hf_pb in self.pb.hframes], dtype=np.string_)
+            hframes = self.pb.hframes if rows is None else self.pb.hframes[rows]
+            nda = np.array([hf_pb.uuid for hf_pb in hframes], dtype=np.string_)
 
         elif self.pb.type == hyperframe_pb2.LINK:
-            nda = np.array([LinkBase.find_url(lr) for lr in self.pb.links])
+            links = self.pb.links if rows is None else self.pb.links[rows]
+            nda = np.array([LinkBase.find_url(lr) for lr in links])
+
+        elif self.is_parquet_frame():
+            if data_dir is None:
+                raise Exception("Frame {} is a column of {}, which needs the bundle directory".format(
+                    self.pb.name, self.get_data_filename()))
+            nda = read_parquet_columns(os.path.join(data_dir, self.get_data_filename()), [self.pb.name],
+                                       rows=rows)[0]
 
         elif self.pb.type == hyperframe_pb2.STRING:
-            if len(self.pb.strings) > 0:
-                if isinstance(self.pb.strings[0], str):
-                    nda = np.array(self.pb.strings, dtype=np.string_)
-                elif isinstance(self.pb.strings[0], unicode):
-                    nda = np.array(self.pb.strings, dtype=np.unicode_)
+            strings = self.pb.strings if rows is None else \
+                self.pb.strings[rows.start * row_size:rows.stop * row_size]
+            if len(strings) > 0:
+                if isinstance(strings[0], str):
+                    nda = np.array(strings, dtype=np.string_)
+                elif isinstance(strings[0], unicode):
+                    nda = np.array(strings, dtype=np.unicode_)
                 else:
                     raise Exception(
-                        "Unable to convert pb strings to suitable type for ndarray {}".format(type(self.pb.strings[0])))
+                        "Unable to convert pb strings to suitable type for ndarray {}".format(type(strings[0])))
             else:
-                nda = np.array(self.pb.strings)  # nothing there, defaults to object array
+                nda = np.array(strings)  # nothing there, defaults to object array
+
+        elif self.pb.type in (hyperframe_pb2.UTF8, hyperframe_pb2.LARGE_UTF8):
+            nda = decode_utf8(self.pb.type, self.get_data(), tuple(self.pb.shape), rows=rows)
+
+        elif self.pb.type == hyperframe_pb2.CATEGORICAL:
+            nda = np.asarray(self.make_categorical(rows=rows))
+
         else:
-            nda = self.make_numpy_array()
+            nda = self.make_numpy_array(data_dir=data_dir, mmap_mode=mmap_mode, rows=rows)
+
+        if len(self.pb.validity) > 0:
+            nda = apply_validity(nda, self.pb.validity, first=0 if rows is None else rows.start * row_size)
+
+        if step != 1:
+            nda = nda[::step]
 
         return nda
 
-    def to_series(self):
+    def to_values(self, data_dir=None, mmap_mode='r', rows=None):
+        """
+        Convert a Frame to the values of a column: a pandas Categorical for a CATEGORICAL frame,
+        else to_ndarray
+
+        Args:
+            data_dir (str): The bundle's local directory, needed for sidecar and Parquet frames
+            mmap_mode (str): How to map sidecar frames, 'r' read-only or 'c' copy-on-write
+            rows (slice): Optional.  Only these rows, see to_ndarray
+
+        Returns:
+            (`numpy.ndarray`, `pandas.Categorical`):
+        """
+        if self.pb.type == hyperframe_pb2.CATEGORICAL:
+            if rows is None:
+                return self.make_categorical()
+            rows, step = row_range(rows, self.pb.shape[0])
+            return self.make_categorical(rows=rows)[::step]
+        return self.to_ndarray(data_dir=data_dir, mmap_mode=mmap_mode, rows=rows)
+
+    def to_series(self, data_dir=None):
         """
         Convert a Frame to a Pandas series.
 
+        Args:
+            data_dir (str): The bundle's local directory, needed for sidecar and Parquet frames
+
         Returns:
             ('pandas.core.series.Series`):
         """
 
-        nda = self.to_ndarray()
+        nda = self.to_values(data_dir=data_dir)
         if nda.ndim == 0:
             nda = nda.reshape((1,))
 
         return pd.Series(data=nda, name=self.pb.name)
 
-    def make_numpy_array(self):
+    def get_data(self):
+        """
+        The frame's inline bytes, decompressed if it has a codec.
+
+        Returns:
+            (str)
+        """
+        if self.pb.codec == hyperframe_pb2.UNCOMPRESSED:
+            return self.pb.data
+        return compression.decompress(self.pb.data, hyperframe_pb2.Codec.Name(self.pb.codec).lower())
+
+    def make_numpy_array(self, data_dir=None, mmap_mode='r', rows=None):
         """
-        Create a np ndarray from native bytes in frame
+        Create a np ndarray from native bytes in frame.  A sidecar frame returns a memory map
+        of its .npy file.
+
+        Args:
+            data_dir (str): The bundle's local directory, needed for sidecar frames
+            mmap_mode (str): 'r' read-only or 'c' copy-on-write, writes stay in memory
+            rows (slice): Optional.  A view of only rows start to stop, see row_range
 
         Returns:
             (`numpy.ndarray`)
@@ -1755,17 +3152,76 @@ class FrameRecord(PBObject):
         assert (self.pb.type != hyperframe_pb2.LINK)
         assert (self.pb.type != hyperframe_pb2.HFRAME)
         assert (self.pb.type != hyperframe_pb2.STRING)
+        assert (self.pb.type != hyperframe_pb2.UTF8)
+        assert (self.pb.type != hyperframe_pb2.LARGE_UTF8)
+        assert (self.pb.type != hyperframe_pb2.CATEGORICAL)
+
+        if self.is_sidecar_frame():
+            if data_dir is None:
+                raise Exception("Frame {} keeps its data in {}, which needs the bundle directory".format(
+                    self.pb.name, self.get_sidecar_filename()))
+            nda = np.load(os.path.join(data_dir, self.get_sidecar_filename()), mmap_mode=mmap_mode)
+            assert nda.shape == tuple(self.pb.shape)
+            return nda if rows is None else nda[rows]
 
         dtype = np.dtype(FrameRecord.get_numpy_type(self.pb.type))
+        if self.pb.unit:
+            # e.g., M8 and ns, datetime64[ns]
+            dtype = np.dtype('{}[{}]'.format(dtype.str[1:], self.pb.unit))
         dtype = dtype.newbyteorder(FrameRecord.get_numpy_byteorder(self.pb.byteorder))
 
-        nda = np.frombuffer(self.pb.data, dtype=dtype)
-        nda = nda.reshape(self.pb.shape)
+        if rows is None:
+            nda = np.frombuffer(self.get_data(), dtype=dtype)
+            nda = nda.reshape(self.pb.shape)
+        else:
+            row_size = int(np.prod(self.pb.shape[1:]))
+            nda = np.frombuffer(self.get_data(), dtype=dtype, count=(rows.stop - rows.start) * row_size,
+                                offset=rows.start * row_size * dtype.itemsize)
+            nda = nda.reshape((rows.stop - rows.start,) + tuple(self.pb.shape[1:]))
 
         return nda
 
+    def make_categorical(self, rows=None):
+        """
+        Create a pandas Categorical from the codes in a CATEGORICAL frame and the values in its dictionary.
+
+        Args:
+            rows (slice): Optional.  Only the codes of rows start to stop, see row_range
+
+        Returns:
+            (`pandas.Categorical`)
+        """
+        assert (self.pb.type == hyperframe_pb2.CATEGORICAL)
+
+        dtype = np.dtype(FrameRecord.get_numpy_type(self.pb.index_type))
+        dtype = dtype.newbyteorder(FrameRecord.get_numpy_byteorder(self.pb.byteorder))
+        codes = np.frombuffer(self.get_data(), dtype=dtype).reshape(-1)
+        if rows is not None:
+            codes = codes[rows]
+
+        # The dictionary is inline, to_ndarray needs no bundle directory
+        categories = FrameRecord.view_of_pb(self.pb.dictionary).to_ndarray()
+
+        return pd.Categorical.from_codes(codes, categories, ordered=self.pb.ordered)
+
+    def set_validity(self, valid):
+        """
+        Record which of this frame's values are missing.
+
+        Args:
+            valid (`numpy.ndarray`): booleans in the frame's shape, False where a value is missing
+
+        Returns:
+            (`hyperframe.FrameRecord`)
+        """
+        self._own_pb()
+        self.pb.validity = np.packbits(valid.reshape(-1)).tobytes()
+        integrity.set_pb_hash(self.pb)
+        return self
+
     @staticmethod
-    def from_ndarray(hfid, name, nda):
+    def from_ndarray(hfid, name, nda, sidecar_dir=None, sidecar_size=0, string_type='UTF8', codec='none',
+                     codec_min_size=compression.MIN_SIZE):
         """
         Create frame pb from numpy ndarray
 
@@ -1773,12 +3229,40 @@ class FrameRecord(PBObject):
             hfid:
             name:
             nda:
+            sidecar_dir (str): Optional.  Local bundle directory for .npy sidecar files
+            sidecar_size (int): Write numeric arrays of at least this many bytes to sidecar_dir, 0 never does
+            string_type (str): Store strings as 'UTF8' frames, or as 'STRING' frames for older readers
+            codec (str): How to compress inline data, a compression.CODEC_SETTINGS setting
+            codec_min_size (int): Never compress less than this many bytes
 
         Returns:
 
         """
 
-        if nda.dtype.type == np.object_:
+        if string_type not in STRING_TYPES:
+            raise Exception("Unknown string type {}, expected one of {}".format(string_type, STRING_TYPES))
+
+        byteorder = nda.dtype.byteorder
+        valid = None
+
+        if nda.dtype.type == np.object_ and string_type == 'UTF8':
+            typed, valid = typed_objects(nda)
+            if typed is None:
+                # ESCAPE HATCH -- Made from duct tape and JSON
+                import json
+                frame_type, series_data = encode_utf8(np.array([json.dumps(element) for element in nda.reshape(-1)],
+                                                               dtype=np.object_))
+            elif typed.dtype.type == np.object_:
+                frame_type, series_data = encode_utf8(typed)
+            else:
+                frame = FrameRecord.from_ndarray(hfid, name, typed, sidecar_dir=sidecar_dir,
+                                                 sidecar_size=sidecar_size, codec=codec, codec_min_size=codec_min_size)
+                if valid is not None:
+                    frame.set_validity(valid)
+                return frame
+            byteorder = '<'
+
+        elif nda.dtype.type == np.object_:
             # NOTE: EXPENSIVE TESTS for STRINGS that come from ndarrays inside of Pandas series
             if all(isinstance(x, str) for x in nda):
                 frame_type = FrameRecord.get_proto_type(str)
@@ -1793,6 +3277,10 @@ class FrameRecord(PBObject):
                 series_data = [json.dumps(element) for element in nda]
                 # raise Exception("make_native_frame does not yet support non-string objects")
 
+        elif (nda.dtype.type == np.unicode_ or nda.dtype.type == np.string_) and string_type == 'UTF8':
+            frame_type, series_data = encode_utf8(nda)
+            byteorder = '<'
+
         elif nda.dtype.type == np.unicode_ or nda.dtype.type == np.string_:
             # If it's an ndarray containing scalar string types
             frame_type = FrameRecord.get_proto_type(nda.dtype)
@@ -1802,19 +3290,112 @@ class FrameRecord(PBObject):
                 series_data = nda
         else:
             frame_type = FrameRecord.get_proto_type(nda.dtype)
+            if sidecar_dir is not None and 0 < sidecar_size <= nda.nbytes and frame_type != 'OBJECT':
+                return FrameRecord.make_sidecar_frame(hfid, name, nda, sidecar_dir)
             series_data = nda.tobytes()
 
+        used_codec = None
+        if isinstance(series_data, bytes):
+            used_codec, series_data = compression.compress(series_data, codec, codec_min_size)
+
         frame = FrameRecord(name=name,
                             hframe_uuid=hfid,
                             type=frame_type,
-                            byteorder=nda.dtype.byteorder,
+                            byteorder=byteorder,
                             shape=nda.shape,
-                            data=series_data)
+                            data=series_data,
+                            codec=used_codec)
+
+        if nda.dtype.kind in 'mM':
+            frame.pb.unit = datetime_unit(nda.dtype)
+            integrity.set_pb_hash(frame.pb)
+
+        if valid is not None:
+            frame.set_validity(valid)
+
+        return frame
+
+    @staticmethod
+    def make_sidecar_frame(hfid, name, nda, sidecar_dir):
+        """
+        Write nda to a .npy file in sidecar_dir and return a frame that links to it.
+        np.save writes the array without a copy, and aligns the data so readers can memory map it.
+
+        Args:
+            hfid (str): hyperframe id
+            name (str): column name
+            nda (`numpy.ndarray`): a numeric array
+            sidecar_dir (str): local bundle directory
+
+        Returns:
+            (`FrameRecord`)
+        """
+        frame = FrameRecord(name=name,
+                            hframe_uuid=hfid,
+                            type=FrameRecord.get_proto_type(nda.dtype),
+                            shape=nda.shape)
+        frame.pb.byteorder = FrameRecord.get_proto_byteorder(nda.dtype.byteorder)
+        if nda.dtype.kind in 'mM':
+            frame.pb.unit = datetime_unit(nda.dtype)
+
+        filename = FrameRecord.make_sidecar_filename(frame.pb.uuid)
+        np.save(os.path.join(sidecar_dir, filename), nda, allow_pickle=False)
+
+        frame.pb.links.extend([FileLinkRecord(frame.pb.uuid, None, common.BUNDLE_URI_SCHEME + filename).pb])
+        frame.pb.content_hash = integrity.hash_file(os.path.join(sidecar_dir, filename))
+        integrity.set_pb_hash(frame.pb)
+
+        return frame
+
+    @staticmethod
+    def make_parquet_frames(hfid, df, data_dir):
+        """
+        Write the dataframe's columns to one Parquet file in data_dir and return a frame for each
+        column that links to it.  Readers can read only the columns they need.
+
+        Args:
+            hfid (str): hyperframe id
+            df (`pandas.DataFrame`): columns of numbers, booleans, or strings
+            data_dir (str): local bundle directory
+
+        Returns:
+            (list:`FrameRecord`): in the order of df's columns
+        """
+        filename = parquet_filename(hfid)
+        write_parquet(os.path.join(data_dir, filename), df)
+        content_hash = integrity.hash_file(os.path.join(data_dir, filename))
+
+        return [FrameRecord.make_parquet_frame(hfid, name, df[name].dtype, df[name].shape, filename, content_hash)
+                for name in df.columns]
+
+    @staticmethod
+    def make_parquet_frame(hfid, name, dtype, shape, filename, content_hash):
+        """
+        A frame for one column of a bundle's Parquet file.
+
+        Args:
+            hfid (str): hyperframe id
+            name (str): column name
+            dtype (`numpy.dtype`): the column's dtype, np.object_ for strings
+            shape (tuple): the column's shape
+            filename (str): the Parquet file, in the bundle directory
+            content_hash (str): integrity.hash_file of the Parquet file
 
+        Returns:
+            (`FrameRecord`)
+        """
+        frame = FrameRecord(name=name,
+                            hframe_uuid=hfid,
+                            type='UTF8' if np.dtype(dtype).type == np.object_ else FrameRecord.get_proto_type(dtype),
+                            shape=shape)
+        frame.pb.links.extend([FileLinkRecord(frame.pb.uuid, None, common.BUNDLE_URI_SCHEME + filename).pb])
+        frame.pb.content_hash = content_hash
+        integrity.set_pb_hash(frame.pb)
         return frame
 
     @staticmethod
-    def from_serieslike(hfid, name, series_like):
+    def from_serieslike(hfid, name, series_like, sidecar_dir=None, sidecar_size=0, string_type='UTF8', codec='none',
+                        codec_min_size=compression.MIN_SIZE):
         """
         Create frame pb from pandas Series
 
@@ -1822,18 +3403,68 @@ class FrameRecord(PBObject):
             hfid (str): hyperframe id
             name (str): column name
             series_like (`pandas.Series`, `numpy.ndarray`): pandas series | ndarray
+            sidecar_dir (str): Optional.  Local bundle directory for .npy sidecar files
+            sidecar_size (int): Write numeric arrays of at least this many bytes to sidecar_dir, 0 never does
+            string_type (str): Store strings as 'UTF8' frames, or as 'STRING' frames for older readers
+            codec (str): How to compress inline data, a compression.CODEC_SETTINGS setting
+            codec_min_size (int): Never compress less than this many bytes
 
         Returns:
             (`FrameRecord`)
         """
 
+        if pd.api.types.is_datetime64tz_dtype(series_like):
+            # .values would be datetime64 in UTC, without the time zone
+            series_like = series_like.astype(np.object_)
+
         if isinstance(series_like, pd.Series):
             series_like = series_like.values
 
-        if all(isinstance(x, HyperFrameRecord) for x in series_like):
+        if pd.api.types.is_categorical_dtype(series_like):
+            return FrameRecord.from_categorical(hfid, name, series_like, string_type=string_type, codec=codec,
+                                                codec_min_size=codec_min_size)
+        elif all(isinstance(x, HyperFrameRecord) for x in series_like):
             return FrameRecord.make_hframe_frame(hfid, name, series_like)
         else:
-            return FrameRecord.from_ndarray(hfid, name, series_like)
+            return FrameRecord.from_ndarray(hfid, name, series_like, sidecar_dir=sidecar_dir,
+                                            sidecar_size=sidecar_size, string_type=string_type, codec=codec,
+                                            codec_min_size=codec_min_size)
+
+    @staticmethod
+    def from_categorical(hfid, name, categorical, string_type='UTF8', codec='none', codec_min_size=compression.MIN_SIZE):
+        """
+        Create a CATEGORICAL frame pb: the categorical's codes, and a dictionary frame of its categories.
+
+        Args:
+            hfid (str): hyperframe id
+            name (str): column name
+            categorical (`pandas.Categorical`):
+            string_type (str): Store string categories as 'UTF8' frames, or as 'STRING' frames
+            codec (str): How to compress the codes, a compression.CODEC_SETTINGS setting
+            codec_min_size (int): Never compress less than this many bytes
+
+        Returns:
+            (`FrameRecord`)
+        """
+        dictionary = FrameRecord.from_ndarray(hfid, name, np.asarray(categorical.categories), string_type=string_type,
+                                              codec=codec, codec_min_size=codec_min_size)
+
+        codes = np.asarray(categorical.codes)
+        used_codec, data = compression.compress(codes.tobytes(), codec, codec_min_size)
+
+        frame = FrameRecord(name=name,
+                            hframe_uuid=hfid,
+                            type='CATEGORICAL',
+                            byteorder=codes.dtype.byteorder,
+                            shape=codes.shape,
+                            data=data,
+                            codec=used_codec)
+        frame.pb.dictionary.CopyFrom(dictionary.pb)
+        frame.pb.index_type = hyperframe_pb2.Type.Value(FrameRecord.get_proto_type(codes.dtype))
+        frame.pb.ordered = categorical.ordered
+        integrity.set_pb_hash(frame.pb)
+
+        return frame
 
     @staticmethod
     def make_hframe_frame(hfid, name, hframes):
@@ -1945,6 +3576,290 @@ read_row(connection)  - uses existing connection read the row and return a new o
 """
 
 
+class SidecarAppender(object):
+    """
+    Write a frame's .npy sidecar file a chunk of rows at a time, e.g., as a pipe_run generator yields them.
+
+    The file starts with an APPEND_HEADER_SIZE header, and each chunk's rows follow as they arrive.
+    A chunk that does not safely cast to the frame's dtype, e.g., floats after ints, promotes the
+    frame to np.result_type of the two, and the rows so far are rewritten, PROMOTE_BLOCK_ROWS at a time.
+    close() writes the final shape into the header and returns the frame, as make_sidecar_frame does.
+    """
+
+    # Rows copied at a time when promote rewrites the sidecar
+    PROMOTE_BLOCK_ROWS = 1 << 16
+
+    def __init__(self, hfid, name, sidecar_dir, dtype, row_shape=()):
+        """
+        Args:
+            hfid (str): hyperframe id
+            name (str): column name
+            sidecar_dir (str): local bundle directory
+            dtype (`numpy.dtype`): a numeric, boolean, or datetime dtype
+            row_shape (tuple): the shape of each row, () for a column
+        """
+        self.frame = FrameRecord(name=name, hframe_uuid=hfid, type=FrameRecord.get_proto_type(dtype))
+        self.dtype = np.dtype(dtype)
+        self.row_shape = tuple(row_shape)
+        self.num_rows = 0
+        self.filename = FrameRecord.make_sidecar_filename(self.frame.pb.uuid)
+        self.path = os.path.join(sidecar_dir, self.filename)
+        self.f = open(self.path, 'wb')
+        self.f.write(npy_header(self.dtype, (0,) + self.row_shape))
+
+    def append(self, nda):
+        """
+        Args:
+            nda (`numpy.ndarray`): rows to add, with the same row shape
+
+        Returns:
+            None
+        """
+        if tuple(nda.shape[1:]) != self.row_shape:
+            raise Exception("Frame {} has rows of shape {}, found a chunk of {}".format(
+                self.frame.pb.name, self.row_shape, nda.shape))
+        if not np.can_cast(nda.dtype, self.dtype, casting='safe'):
+            try:
+                dtype = np.result_type(self.dtype, nda.dtype)
+            except TypeError:
+                dtype = np.dtype(np.object_)
+            if dtype.kind not in 'biufmM':
+                raise Exception("Frame {} holds {}, found a chunk of {}".format(self.frame.pb.name, self.dtype,
+                                                                               nda.dtype))
+            self.promote(dtype)
+        np.ascontiguousarray(nda.astype(self.dtype, copy=False)).tofile(self.f)
+        self.num_rows += len(nda)
+
+    def promote(self, dtype):
+        """
+        Rewrite the rows so far as dtype.
+
+        Args:
+            dtype (`numpy.dtype`): a dtype the frame's rows safely cast to
+
+        Returns:
+            None
+        """
+        _logger.debug("Promoting frame {} from {} to {}".format(self.frame.pb.name, self.dtype, dtype))
+        rows = self.read()
+        promoted_path = self.path + '.promote'
+        with open(promoted_path, 'wb') as f:
+            f.write(npy_header(dtype, (0,) + self.row_shape))
+            for i in range(0, self.num_rows, self.PROMOTE_BLOCK_ROWS):
+                rows[i:i + self.PROMOTE_BLOCK_ROWS].astype(dtype).tofile(f)
+        del rows
+        self.f.close()
+        os.rename(promoted_path, self.path)
+        # Not 'ab', close() rewrites the header
+        self.f = open(self.path, 'r+b')
+        self.f.seek(0, os.SEEK_END)
+        self.dtype = np.dtype(dtype)
+        self.frame.pb.type = hyperframe_pb2.Type.Value(FrameRecord.get_proto_type(self.dtype))
+
+    def read(self):
+        """
+        Returns:
+            (`numpy.ndarray`): the rows so far, memory mapped
+        """
+        self.f.flush()
+        if self.num_rows == 0:
+            return np.empty((0,) + self.row_shape, dtype=self.dtype)
+        return np.memmap(self.path, dtype=self.dtype, mode='r', offset=APPEND_HEADER_SIZE,
+                         shape=(self.num_rows,) + self.row_shape)
+
+    def abort(self):
+        """
+        Close and remove the sidecar, e.g., when the bundle's generator fails.
+
+        Returns:
+            None
+        """
+        self.f.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def close(self):
+        """
+        Returns:
+            (`FrameRecord`): the frame, with one bundle:// link to the sidecar
+        """
+        shape = (self.num_rows,) + self.row_shape
+        self.f.seek(0)
+        self.f.write(npy_header(self.dtype, shape))
+        self.f.close()
+
+        frame = self.frame
+        frame.pb.shape.extend(shape)
+        frame.pb.byteorder = FrameRecord.get_proto_byteorder(self.dtype.byteorder)
+        if self.dtype.kind in 'mM':
+            frame.pb.unit = datetime_unit(self.dtype)
+        frame.pb.links.extend([FileLinkRecord(frame.pb.uuid, None, common.BUNDLE_URI_SCHEME + self.filename).pb])
+        frame.pb.content_hash = integrity.hash_file(self.path)
+        integrity.set_pb_hash(frame.pb)
+
+        return frame
+
+
+class ParquetAppender(object):
+    """
+    Write a DF bundle's Parquet file a chunk of rows at a time, e.g., as `dsdt add` parses a csv.
+
+    Chunks are held until they make a PARQUET_ROW_GROUP_ROWS row group.  promote() changes the
+    types of columns, e.g., to floats after a chunk with NaN in a column of ints, and drop() takes
+    columns out of the file.  Both rewrite the row groups written so far a group at a time.
+    close() returns a frame for each column, as make_parquet_frames does.
+    """
+
+    def __init__(self, hfid, data_dir, dtypes):
+        """
+        Args:
+            hfid (str): hyperframe id
+            data_dir (str): local bundle directory
+            dtypes (list): (column name, `numpy.dtype`) pairs, numbers, booleans, or np.object_ for strings
+        """
+        if PYARROW is None:
+            raise Exception("Writing Parquet frames needs pyarrow, try 'pip install disdat[parquet]'")
+        self.hfid = hfid
+        self.dtypes = OrderedDict((c, np.dtype(d)) for c, d in dtypes)
+        self.filename = parquet_filename(hfid)
+        self.path = os.path.join(data_dir, self.filename)
+        self.pending = []
+        self.pending_rows = 0
+        self.num_rows = 0
+        self.writer = None
+
+    def append(self, df):
+        """
+        Args:
+            df (`pandas.DataFrame`): rows to add, with at least the file's columns, of types that
+                safely cast to them, see promote
+
+        Returns:
+            None
+        """
+        self.pending.append(df[list(self.dtypes)])
+        self.pending_rows += len(df)
+        if self.pending_rows >= PARQUET_ROW_GROUP_ROWS:
+            self.flush(whole_groups=True)
+
+    def flush(self, whole_groups=False):
+        """
+        Write the rows held so far.
+
+        Args:
+            whole_groups (bool): Only write whole PARQUET_ROW_GROUP_ROWS row groups, and hold the rest
+
+        Returns:
+            None
+        """
+        if len(self.pending) == 0:
+            return
+        df = pd.concat(self.pending, ignore_index=True) if len(self.pending) > 1 else self.pending[0]
+        num_rows = len(df) - len(df) % PARQUET_ROW_GROUP_ROWS if whole_groups else len(df)
+        self.pending = [df.iloc[num_rows:]] if num_rows < len(df) else []
+        self.pending_rows = len(df) - num_rows
+        self._write(df.iloc[:num_rows])
+
+    def _write(self, df):
+        if len(self.dtypes) == 0:
+            return
+        schema = parquet_schema(self.dtypes.items())
+        df = df.astype({c: d for c, d in self.dtypes.items() if d.type != np.object_}, copy=False)
+        if self.writer is None:
+            self.writer = PYARROW.parquet.ParquetWriter(self.path, schema)
+        self.writer.write_table(PYARROW.Table.from_pandas(df, schema=schema, preserve_index=False),
+                                row_group_size=PARQUET_ROW_GROUP_ROWS)
+        self.num_rows += len(df)
+
+    def promote(self, dtypes):
+        """
+        Change the types of some columns, rewriting the rows so far.
+
+        Args:
+            dtypes (dict): column name to a `numpy.dtype` its values safely cast to
+
+        Returns:
+            None
+        """
+        _logger.debug("Promoting Parquet columns {}".format(dtypes))
+        self._rewrite(OrderedDict((c, np.dtype(dtypes.get(c, d))) for c, d in self.dtypes.items()), [])
+
+    def drop(self, names):
+        """
+        Take columns out of the file, e.g., when a chunk has strings in a column of numbers.
+
+        Args:
+            names (list(str)): column names
+
+        Returns:
+            (dict): column name to `numpy.ndarray` of its rows so far
+        """
+        return self._rewrite(OrderedDict((c, d) for c, d in self.dtypes.items() if c not in names), names)
+
+    def _rewrite(self, dtypes, drop):
+        """
+        Returns:
+            (dict): column name to `numpy.ndarray` of the rows so far, for each column in drop
+        """
+        dropped = dict((c, []) for c in drop)
+        old_dtypes = self.dtypes
+        self.dtypes = dtypes
+
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            self.num_rows = 0
+            old_path = self.path + '.rewrite'
+            os.rename(self.path, old_path)
+            parquet_file = PYARROW.parquet.ParquetFile(old_path)
+            for i in range(parquet_file.num_row_groups):
+                df = parquet_file.read_row_group(i).to_pandas()
+                for c in drop:
+                    dropped[c].append(df[c].values)
+                self._write(df)
+            del parquet_file
+            os.remove(old_path)
+
+        for df in self.pending:
+            for c in drop:
+                dropped[c].append(df[c].values)
+        self.pending = [df[list(dtypes)] for df in self.pending]
+
+        return dict((c, np.concatenate(dropped[c]) if len(dropped[c]) > 0 else np.empty(0, dtype=old_dtypes[c]))
+                    for c in drop)
+
+    def close(self):
+        """
+        Returns:
+            (list:`FrameRecord`): a frame for each column, in order
+        """
+        self.flush()
+        if len(self.dtypes) == 0:
+            return []
+        if self.writer is None:
+            # No rows, write the schema
+            self.writer = PYARROW.parquet.ParquetWriter(self.path, parquet_schema(self.dtypes.items()))
+        self.writer.close()
+        self.writer = None
+        content_hash = integrity.hash_file(self.path)
+        return [FrameRecord.make_parquet_frame(self.hfid, c, d, (self.num_rows,), self.filename, content_hash)
+                for c, d in self.dtypes.items()]
+
+    def abort(self):
+        """
+        Close and remove the file, e.g., when the bundle's generator fails.
+
+        Returns:
+            None
+        """
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        for path in (self.path, self.path + '.rewrite'):
+            if os.path.exists(path):
+                os.remove(path)
+
+
 class LinkAuthBase(PBObject):
     """
     The authoritative information in a Link.
@@ -1955,6 +3870,8 @@ class LinkAuthBase(PBObject):
     row (uuid, type, blob)
     """
 
+    __slots__ = ()
+
     table_name = 'linkauth'
 
     def __init__(self):
@@ -1971,7 +3888,7 @@ class LinkAuthBase(PBObject):
                          Column('uuid', String(50), primary_key=True),
                          Column('profile', String),
                          Column('state', Enum(RecordState)),
-                         Column('pb', BLOB)
+                         Column('pb', LargeBinary)
                          )
         return linkauth
 
@@ -2027,6 +3944,9 @@ class S3LinkAuthRecord(LinkAuthBase):
     """
     Information required to access an S3 bucket
     """
+
+    __slots__ = ()
+
     def __init__(self, aws_access_key_id=None, aws_secret_access_key=None,
                  aws_session_token=None, profile=None):
         super(S3LinkAuthRecord, self).__init__()
@@ -2038,9 +3958,7 @@ class S3LinkAuthRecord(LinkAuthBase):
         self.pb.s3_auth.aws_secret_access_key = aws_secret_access_key
         self.pb.s3_auth.aws_session_token = aws_session_token
 
-        self.pb.ClearField('hash')
-
-        self.pb.hash = hashlib.md5(self.pb.SerializeToString()).hexdigest()
+        integrity.set_pb_hash(self.pb)
 
         assert (self.pb.IsInitialized())
 
@@ -2055,6 +3973,9 @@ class VerticaLinkAuthRecord(LinkAuthBase):
     """
     Authentication to Vertica
     """
+
+    __slots__ = ()
+
     def __init__(self, driver, description, database, servername, uid, pwd, port, sslmode, profile=None):
         super(VerticaLinkAuthRecord, self).__init__()
 
@@ -2070,8 +3991,7 @@ class VerticaLinkAuthRecord(LinkAuthBase):
         self.pb.vertica_auth.port= port
         self.pb.vertica_auth.sslmode = sslmode
 
-        self.pb.ClearField('hash')
-        self.pb.hash = hashlib.md5(self.pb.SerializeToString()).hexdigest()
+        integrity.set_pb_hash(self.pb)
 
         assert (self.pb.IsInitialized())
 
@@ -2090,6 +4010,8 @@ class LinkBase(PBObject):
     and we are using ABCMeta as our class creator
     """
 
+    __slots__ = ()
+
     table_name = 'links'
 
     def __init__(self, frame_uuid, linkauth_uuid=None):
@@ -2122,7 +4044,7 @@ class LinkBase(PBObject):
                      Column('linkauth_uuid', String(50)),
                      Column('url', Text),
                      Column('state', Enum(RecordState)),
-                     Column('pb', BLOB)
+                     Column('pb', LargeBinary)
                      )
         return link
 
@@ -2191,6 +4113,9 @@ class LinkBase(PBObject):
 # TODO: Unify these types
 
 class FileLinkRecord(LinkBase):
+
+    __slots__ = ()
+
     def __init__(self, hframe_uuid, linkauth_uuid, path):
         """
 
@@ -2203,13 +4128,15 @@ class FileLinkRecord(LinkBase):
         assert (path.startswith(common.BUNDLE_URI_SCHEME))
         self.pb.local.path = path
 
-        self.pb.ClearField('hash')
-        self.pb.hash = hashlib.md5(self.pb.SerializeToString()).hexdigest()
+        integrity.set_pb_hash(self.pb)
         # XXX Add size?   self.size = 0
         assert (self.pb.IsInitialized())
 
 
 class S3LinkRecord(LinkBase):
+
+    __slots__ = ()
+
     def __init__(self, hframe_uuid, linkauth_uuid, url):
         """
 
@@ -2222,13 +4149,15 @@ class S3LinkRecord(LinkBase):
         assert (url.startswith(common.BUNDLE_URI_SCHEME))
         self.pb.s3.url = url
 
-        self.pb.ClearField('hash')
-        self.pb.hash = hashlib.md5(self.pb.SerializeToString()).hexdigest()
+        integrity.set_pb_hash(self.pb)
         # XXX Add size?   self.size = 0
         assert (self.pb.IsInitialized())
 
 
 class DatabaseLinkRecord(LinkBase):
+
+    __slots__ = ()
+
     def __init__(self, hframe_uuid, linkauth_uuid, url, servername, database, schema, table, columns, port, dsn):
         """
 
@@ -2260,8 +4189,7 @@ class DatabaseLinkRecord(LinkBase):
         self.pb.database.port = port
         self.pb.database.dsn = dsn
 
-        self.pb.ClearField('hash')
-        self.pb.hash = hashlib.md5(self.pb.SerializeToString()).hexdigest()
+        integrity.set_pb_hash(self.pb)
         assert (self.pb.IsInitialized())
 
 
@@ -20,7 +20,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   name='hyperframe.proto',
   package='bundle',
   syntax='proto3',
-  serialized_pb=_b('\n\x10hyperframe.proto\x12\x06\x62undle\"#\n\x0bStringTuple\x12\t\n\x01k\x18\x01 \x01(\t\x12\t\n\x01v\x18\x02 \x01(\t\"\xfa\x01\n\nHyperFrame\x12\r\n\x05owner\x18\x01 \x01(\t\x12\x12\n\nhuman_name\x18\x02 \x01(\t\x12\x17\n\x0fprocessing_name\x18\x03 \x01(\t\x12\x0c\n\x04uuid\x18\x04 \x01(\t\x12#\n\x06\x66rames\x18\x05 \x03(\x0b\x32\x13.bundle.StringTuple\x12 \n\x07lineage\x18\x06 \x01(\x0b\x32\x0f.bundle.Lineage\x12!\n\x04tags\x18\x07 \x03(\x0b\x32\x13.bundle.StringTuple\x12*\n\x0cpresentation\x18\x08 \x01(\x0e\x32\x14.bundle.Presentation\x12\x0c\n\x04hash\x18\t \x01(\t\"\xe3\x01\n\x05\x46rame\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04uuid\x18\x02 \x01(\t\x12\x1a\n\x04type\x18\x03 \x01(\x0e\x32\x0c.bundle.Type\x12\r\n\x05shape\x18\x04 \x03(\r\x12$\n\tbyteorder\x18\x05 \x01(\x0e\x32\x11.bundle.ByteOrder\x12#\n\x07hframes\x18\x06 \x03(\x0b\x32\x12.bundle.HyperFrame\x12\x1b\n\x05links\x18\x07 \x03(\x0b\x32\x0c.bundle.Link\x12\x0f\n\x07strings\x18\x08 \x03(\t\x12\x0c\n\x04\x64\x61ta\x18\t \x01(\x0c\x12\x0c\n\x04hash\x18\n \x01(\t\"\xc0\x02\n\x07Lineage\x12\x13\n\x0bhframe_name\x18\x01 \x01(\t\x12\x13\n\x0bhframe_uuid\x18\x02 \x01(\t\x12\x11\n\tcode_repo\x18\x03 \x01(\t\x12\x11\n\tcode_name\x18\x04 \x01(\t\x12\x13\n\x0b\x63ode_semver\x18\x05 \x01(\t\x12\x11\n\tcode_hash\x18\x06 \x01(\t\x12\x13\n\x0b\x63ode_branch\x18\x07 \x01(\t\x12\x14\n\x0c\x64\x61ta_context\x18\x08 \x01(\t\x12\x13\n\x0b\x64\x61ta_branch\x18\t \x01(\t\x12\x15\n\rcreation_date\x18\n \x01(\x01\x12.\n\ndepends_on\x18\x0b \x03(\x0b\x32\x1a.bundle.Lineage.Dependency\x1a\x36\n\nDependency\x12\x13\n\x0bhframe_name\x18\x01 \x01(\t\x12\x13\n\x0bhframe_uuid\x18\x02 \x01(\t\"\x97\x01\n\x08LinkAuth\x12\x0f\n\x07profile\x18\x01 \x01(\t\x12\x0c\n\x04uuid\x18\x02 \x01(\t\x12%\n\x07s3_auth\x18\x03 \x01(\x0b\x32\x12.bundle.S3LinkAuthH\x00\x12/\n\x0cvertica_auth\x18\x04 \x01(\x0b\x32\x17.bundle.VerticaLinkAuthH\x00\x12\x0c\n\x04hash\x18\x05 \x01(\tB\x06\n\x04\x61uth\"a\n\nS3LinkAuth\x12\x19\n\x11\x61ws_access_key_id\x18\x01 \x01(\t\x12\x1d\n\x15\x61ws_secret_access_key\x18\x02 \x01(\t\x12\x19\n\x11\x61ws_session_token\x18\x03 \x01(\t\"\x95\x01\n\x0fVerticaLinkAuth\x12\x0e\n\x06\x64river\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\x12\x10\n\x08\x64\x61tabase\x18\x03 \x01(\t\x12\x12\n\nservername\x18\x04 \x01(\t\x12\x0b\n\x03uid\x18\x05 \x01(\t\x12\x0b\n\x03pwd\x18\x06 \x01(\t\x12\x0c\n\x04port\x18\x07 \x01(\t\x12\x0f\n\x07sslmode\x18\x08 \x01(\t\"\xc1\x01\n\x04Link\x12\x0c\n\x04uuid\x18\x01 \x01(\t\x12\x12\n\nframe_uuid\x18\x02 \x01(\t\x12\x15\n\rlinkauth_uuid\x18\x03 \x01(\t\x12\x0c\n\x04hash\x18\x04 \x01(\t\x12\"\n\x05local\x18\x05 \x01(\x0b\x32\x11.bundle.LocalLinkH\x00\x12\x1c\n\x02s3\x18\x06 \x01(\x0b\x32\x0e.bundle.S3LinkH\x00\x12(\n\x08\x64\x61tabase\x18\x07 \x01(\x0b\x32\x14.bundle.DatabaseLinkH\x00\x42\x06\n\x04link\"\x19\n\tLocalLink\x12\x0c\n\x04path\x18\x01 \x01(\t\"\x15\n\x06S3Link\x12\x0b\n\x03url\x18\x01 \x01(\t\"\x8c\x01\n\x0c\x44\x61tabaseLink\x12\x0b\n\x03url\x18\x01 \x01(\t\x12\x10\n\x08\x64\x61tabase\x18\x02 \x01(\t\x12\x12\n\nservername\x18\x03 \x01(\t\x12\x0e\n\x06schema\x18\x04 \x01(\t\x12\r\n\x05table\x18\x05 \x01(\t\x12\x0f\n\x07\x63olumns\x18\x06 \x03(\t\x12\x0b\n\x03\x64sn\x18\x07 \x01(\t\x12\x0c\n\x04port\x18\x08 \x01(\x05*L\n\x0cPresentation\x12\x06\n\x02HF\x10\x00\x12\x06\n\x02\x44\x46\x10\x01\x12\n\n\x06SCALAR\x10\x03\x12\n\n\x06TENSOR\x10\x04\x12\x07\n\x03ROW\x10\x05\x12\x0b\n\x07\x44\x45\x46\x41ULT\x10\x06*(\n\tByteOrder\x12\x07\n\x03\x42IG\x10\x00\x12\n\n\x06LITTLE\x10\x01\x12\x06\n\x02NA\x10\x02*\xe8\x01\n\x04Type\x12\x08\n\x04NONE\x10\x00\x12\x08\n\x04LINK\x10\x01\x12\x0b\n\x07\x46LOAT16\x10\x02\x12\x0b\n\x07\x46LOAT32\x10\x03\x12\x0b\n\x07\x46LOAT64\x10\x04\x12\t\n\x05UINT8\x10\x05\x12\n\n\x06UINT16\x10\x06\x12\n\n\x06UINT32\x10\x07\x12\n\n\x06UINT64\x10\x08\x12\x08\n\x04INT8\x10\t\x12\t\n\x05INT16\x10\n\x12\t\n\x05INT32\x10\x0b\x12\t\n\x05INT64\x10\x0c\x12\n\n\x06STRING\x10\r\x12\x08\n\x04\x42OOL\x10\x0e\x12\r\n\tCOMPLEX64\x10\x0f\x12\x0e\n\nCOMPLEX128\x10\x10\x12\n\n\x06HFRAME\x10\x11\x12\n\n\x06OBJECT\x10\x12\x62\x06proto3')
+  serialized_pb=_b('\n\x10hyperframe.proto\x12\x06\x62undle\"#\n\x0bStringTuple\x12\t\n\x01k\x18\x01 \x01(\t\x12\t\n\x01v\x18\x02 \x01(\t\"\xfa\x01\n\nHyperFrame\x12\r\n\x05owner\x18\x01 \x01(\t\x12\x12\n\nhuman_name\x18\x02 \x01(\t\x12\x17\n\x0fprocessing_name\x18\x03 \x01(\t\x12\x0c\n\x04uuid\x18\x04 \x01(\t\x12#\n\x06\x66rames\x18\x05 \x03(\x0b\x32\x13.bundle.StringTuple\x12 \n\x07lineage\x18\x06 \x01(\x0b\x32\x0f.bundle.Lineage\x12!\n\x04tags\x18\x07 \x03(\x0b\x32\x13.bundle.StringTuple\x12*\n\x0cpresentation\x18\x08 \x01(\x0e\x32\x14.bundle.Presentation\x12\x0c\n\x04hash\x18\t \x01(\t\"\x8d\x03\n\x05\x46rame\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04uuid\x18\x02 \x01(\t\x12\x1a\n\x04type\x18\x03 \x01(\x0e\x32\x0c.bundle.Type\x12\r\n\x05shape\x18\x04 \x03(\r\x12$\n\tbyteorder\x18\x05 \x01(\x0e\x32\x11.bundle.ByteOrder\x12#\n\x07hframes\x18\x06 \x03(\x0b\x32\x12.bundle.HyperFrame\x12\x1b\n\x05links\x18\x07 \x03(\x0b\x32\x0c.bundle.Link\x12\x0f\n\x07strings\x18\x08 \x03(\t\x12\x0c\n\x04\x64\x61ta\x18\t \x01(\x0c\x12\x0c\n\x04hash\x18\n \x01(\t\x12\x1c\n\x05\x63odec\x18\x0b \x01(\x0e\x32\r.bundle.Codec\x12\x0c\n\x04unit\x18\x0c \x01(\t\x12!\n\ndictionary\x18\r \x01(\x0b\x32\r.bundle.Frame\x12 \n\nindex_type\x18\x0e \x01(\x0e\x32\x0c.bundle.Type\x12\x0f\n\x07ordered\x18\x0f \x01(\x08\x12\x10\n\x08validity\x18\x10 \x01(\x0c\x12\x14\n\x0c\x63ontent_hash\x18\x11 \x01(\t\"\xc0\x02\n\x07Lineage\x12\x13\n\x0bhframe_name\x18\x01 \x01(\t\x12\x13\n\x0bhframe_uuid\x18\x02 \x01(\t\x12\x11\n\tcode_repo\x18\x03 \x01(\t\x12\x11\n\tcode_name\x18\x04 \x01(\t\x12\x13\n\x0b\x63ode_semver\x18\x05 \x01(\t\x12\x11\n\tcode_hash\x18\x06 \x01(\t\x12\x13\n\x0b\x63ode_branch\x18\x07 \x01(\t\x12\x14\n\x0c\x64\x61ta_context\x18\x08 \x01(\t\x12\x13\n\x0b\x64\x61ta_branch\x18\t \x01(\t\x12\x15\n\rcreation_date\x18\n \x01(\x01\x12.\n\ndepends_on\x18\x0b \x03(\x0b\x32\x1a.bundle.Lineage.Dependency\x1a\x36\n\nDependency\x12\x13\n\x0bhframe_name\x18\x01 \x01(\t\x12\x13\n\x0bhframe_uuid\x18\x02 \x01(\t\"\x97\x01\n\x08LinkAuth\x12\x0f\n\x07profile\x18\x01 \x01(\t\x12\x0c\n\x04uuid\x18\x02 \x01(\t\x12%\n\x07s3_auth\x18\x03 \x01(\x0b\x32\x12.bundle.S3LinkAuthH\x00\x12/\n\x0cvertica_auth\x18\x04 \x01(\x0b\x32\x17.bundle.VerticaLinkAuthH\x00\x12\x0c\n\x04hash\x18\x05 \x01(\tB\x06\n\x04\x61uth\"a\n\nS3LinkAuth\x12\x19\n\x11\x61ws_access_key_id\x18\x01 \x01(\t\x12\x1d\n\x15\x61ws_secret_access_key\x18\x02 \x01(\t\x12\x19\n\x11\x61ws_session_token\x18\x03 \x01(\t\"\x95\x01\n\x0fVerticaLinkAuth\x12\x0e\n\x06\x64river\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\x12\x10\n\x08\x64\x61tabase\x18\x03 \x01(\t\x12\x12\n\nservername\x18\x04 \x01(\t\x12\x0b\n\x03uid\x18\x05 \x01(\t\x12\x0b\n\x03pwd\x18\x06 \x01(\t\x12\x0c\n\x04port\x18\x07 \x01(\t\x12\x0f\n\x07sslmode\x18\x08 \x01(\t\"\xc1\x01\n\x04Link\x12\x0c\n\x04uuid\x18\x01 \x01(\t\x12\x12\n\nframe_uuid\x18\x02 \x01(\t\x12\x15\n\rlinkauth_uuid\x18\x03 \x01(\t\x12\x0c\n\x04hash\x18\x04 \x01(\t\x12\"\n\x05local\x18\x05 \x01(\x0b\x32\x11.bundle.LocalLinkH\x00\x12\x1c\n\x02s3\x18\x06 \x01(\x0b\x32\x0e.bundle.S3LinkH\x00\x12(\n\x08\x64\x61tabase\x18\x07 \x01(\x0b\x32\x14.bundle.DatabaseLinkH\x00\x42\x06\n\x04link\"\x19\n\tLocalLink\x12\x0c\n\x04path\x18\x01 \x01(\t\"\x15\n\x06S3Link\x12\x0b\n\x03url\x18\x01 \x01(\t\"\x8c\x01\n\x0c\x44\x61tabaseLink\x12\x0b\n\x03url\x18\x01 \x01(\t\x12\x10\n\x08\x64\x61tabase\x18\x02 \x01(\t\x12\x12\n\nservername\x18\x03 \x01(\t\x12\x0e\n\x06schema\x18\x04 \x01(\t\x12\r\n\x05table\x18\x05 \x01(\t\x12\x0f\n\x07\x63olumns\x18\x06 \x03(\t\x12\x0b\n\x03\x64sn\x18\x07 \x01(\t\x12\x0c\n\x04port\x18\x08 \x01(\x05*L\n\x0cPresentation\x12\x06\n\x02HF\x10\x00\x12\x06\n\x02\x44\x46\x10\x01\x12\n\n\x06SCALAR\x10\x03\x12\n\n\x06TENSOR\x10\x04\x12\x07\n\x03ROW\x10\x05\x12\x0b\n\x07\x44\x45\x46\x41ULT\x10\x06*(\n\tByteOrder\x12\x07\n\x03\x42IG\x10\x00\x12\n\n\x06LITTLE\x10\x01\x12\x06\n\x02NA\x10\x02*\xb4\x02\n\x04Type\x12\x08\n\x04NONE\x10\x00\x12\x08\n\x04LINK\x10\x01\x12\x0b\n\x07\x46LOAT16\x10\x02\x12\x0b\n\x07\x46LOAT32\x10\x03\x12\x0b\n\x07\x46LOAT64\x10\x04\x12\t\n\x05UINT8\x10\x05\x12\n\n\x06UINT16\x10\x06\x12\n\n\x06UINT32\x10\x07\x12\n\n\x06UINT64\x10\x08\x12\x08\n\x04INT8\x10\t\x12\t\n\x05INT16\x10\n\x12\t\n\x05INT32\x10\x0b\x12\t\n\x05INT64\x10\x0c\x12\n\n\x06STRING\x10\r\x12\x08\n\x04\x42OOL\x10\x0e\x12\r\n\tCOMPLEX64\x10\x0f\x12\x0e\n\nCOMPLEX128\x10\x10\x12\n\n\x06HFRAME\x10\x11\x12\n\n\x06OBJECT\x10\x12\x12\x08\n\x04UTF8\x10\x13\x12\x0e\n\nLARGE_UTF8\x10\x14\x12\x0e\n\nDATETIME64\x10\x15\x12\x0f\n\x0bTIMEDELTA64\x10\x16\x12\x0f\n\x0b\x43\x41TEGORICAL\x10\x17*6\n\x05\x43odec\x12\x10\n\x0cUNCOMPRESSED\x10\x00\x12\x08\n\x04ZLIB\x10\x01\x12\x07\n\x03LZ4\x10\x02\x12\x08\n\x04ZSTD\x10\x03\x62\x06proto3')
 )
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
@@ -57,8 +57,8 @@ _PRESENTATION = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   options=None,
-  serialized_start=1665,
-  serialized_end=1741,
+  serialized_start=1835,
+  serialized_end=1911,
 )
 _sym_db.RegisterEnumDescriptor(_PRESENTATION)
 
@@ -84,8 +84,8 @@ _BYTEORDER = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   options=None,
-  serialized_start=1743,
-  serialized_end=1783,
+  serialized_start=1913,
+  serialized_end=1953,
 )
 _sym_db.RegisterEnumDescriptor(_BYTEORDER)
 
@@ -172,15 +172,66 @@ _TYPE = _descriptor.EnumDescriptor(
       name='OBJECT', index=18, number=18,
       options=None,
       type=None),
+    _descriptor.EnumValueDescriptor(
+      name='UTF8', index=19, number=19,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='LARGE_UTF8', index=20, number=20,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='DATETIME64', index=21, number=21,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='TIMEDELTA64', index=22, number=22,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='CATEGORICAL', index=23, number=23,
+      options=None,
+      type=None),
   ],
   containing_type=None,
   options=None,
-  serialized_start=1786,
-  serialized_end=2018,
+  serialized_start=1956,
+  serialized_end=2264,
 )
 _sym_db.RegisterEnumDescriptor(_TYPE)
 
 Type = enum_type_wrapper.EnumTypeWrapper(_TYPE)
+_CODEC = _descriptor.EnumDescriptor(
+  name='Codec',
+  full_name='bundle.Codec',
+  filename=None,
+  file=DESCRIPTOR,
+  values=[
+    _descriptor.EnumValueDescriptor(
+      name='UNCOMPRESSED', index=0, number=0,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='ZLIB', index=1, number=1,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='LZ4', index=2, number=2,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='ZSTD', index=3, number=3,
+      options=None,
+      type=None),
+  ],
+  containing_type=None,
+  options=None,
+  serialized_start=2266,
+  serialized_end=2320,
+)
+_sym_db.RegisterEnumDescriptor(_CODEC)
+
+Codec = enum_type_wrapper.EnumTypeWrapper(_CODEC)
 HF = 0
 DF = 1
 SCALAR = 3
@@ -209,6 +260,15 @@ COMPLEX64 = 15
 COMPLEX128 = 16
 HFRAME = 17
 OBJECT = 18
+UTF8 = 19
+LARGE_UTF8 = 20
+DATETIME64 = 21
+TIMEDELTA64 = 22
+CATEGORICAL = 23
+UNCOMPRESSED = 0
+ZLIB = 1
+LZ4 = 2
+ZSTD = 3
 
 
 
@@ -414,6 +474,55 @@ _FRAME = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
+    _descriptor.FieldDescriptor(
+      name='codec', full_name='bundle.Frame.codec', index=10,
+      number=11, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='unit', full_name='bundle.Frame.unit', index=11,
+      number=12, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='dictionary', full_name='bundle.Frame.dictionary', index=12,
+      number=13, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='index_type', full_name='bundle.Frame.index_type', index=13,
+      number=14, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='ordered', full_name='bundle.Frame.ordered', index=14,
+      number=15, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='validity', full_name='bundle.Frame.validity', index=15,
+      number=16, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='content_hash', full_name='bundle.Frame.content_hash', index=16,
+      number=17, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
   ],
   extensions=[
   ],
@@ -427,7 +536,7 @@ _FRAME = _descriptor.Descriptor(
   oneofs=[
   ],
   serialized_start=319,
-  serialized_end=546,
+  serialized_end=716,
 )
 
 
@@ -464,8 +573,8 @@ _LINEAGE_DEPENDENCY = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=815,
-  serialized_end=869,
+  serialized_start=985,
+  serialized_end=1039,
 )
 
 _LINEAGE = _descriptor.Descriptor(
@@ -564,8 +673,8 @@ _LINEAGE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=549,
-  serialized_end=869,
+  serialized_start=719,
+  serialized_end=1039,
 )
 
 
@@ -626,8 +735,8 @@ _LINKAUTH = _descriptor.Descriptor(
       name='auth', full_name='bundle.LinkAuth.auth',
       index=0, containing_type=None, fields=[]),
   ],
-  serialized_start=872,
-  serialized_end=1023,
+  serialized_start=1042,
+  serialized_end=1193,
 )
 
 
@@ -671,8 +780,8 @@ _S3LINKAUTH = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1025,
-  serialized_end=1122,
+  serialized_start=1195,
+  serialized_end=1292,
 )
 
 
@@ -751,8 +860,8 @@ _VERTICALINKAUTH = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1125,
-  serialized_end=1274,
+  serialized_start=1295,
+  serialized_end=1444,
 )
 
 
@@ -827,8 +936,8 @@ _LINK = _descriptor.Descriptor(
       name='link', full_name='bundle.Link.link',
       index=0, containing_type=None, fields=[]),
   ],
-  serialized_start=1277,
-  serialized_end=1470,
+  serialized_start=1447,
+  serialized_end=1640,
 )
 
 
@@ -858,8 +967,8 @@ _LOCALLINK = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1472,
-  serialized_end=1497,
+  serialized_start=1642,
+  serialized_end=1667,
 )
 
 
@@ -889,8 +998,8 @@ _S3LINK = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1499,
-  serialized_end=1520,
+  serialized_start=1669,
+  serialized_end=1690,
 )
 
 
@@ -969,8 +1078,8 @@ _DATABASELINK = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1523,
-  serialized_end=1663,
+  serialized_start=1693,
+  serialized_end=1833,
 )
 
 _HYPERFRAME.fields_by_name['frames'].message_type = _STRINGTUPLE
@@ -981,6 +1090,9 @@ _FRAME.fields_by_name['type'].enum_type = _TYPE
 _FRAME.fields_by_name['byteorder'].enum_type = _BYTEORDER
 _FRAME.fields_by_name['hframes'].message_type = _HYPERFRAME
 _FRAME.fields_by_name['links'].message_type = _LINK
+_FRAME.fields_by_name['codec'].enum_type = _CODEC
+_FRAME.fields_by_name['dictionary'].message_type = _FRAME
+_FRAME.fields_by_name['index_type'].enum_type = _TYPE
 _LINEAGE_DEPENDENCY.containing_type = _LINEAGE
 _LINEAGE.fields_by_name['depends_on'].message_type = _LINEAGE_DEPENDENCY
 _LINKAUTH.fields_by_name['s3_auth'].message_type = _S3LINKAUTH
@@ -1017,6 +1129,7 @@ DESCRIPTOR.message_types_by_name['DatabaseLink'] = _DATABASELINK
 DESCRIPTOR.enum_types_by_name['Presentation'] = _PRESENTATION
 DESCRIPTOR.enum_types_by_name['ByteOrder'] = _BYTEORDER
 DESCRIPTOR.enum_types_by_name['Type'] = _TYPE
+DESCRIPTOR.enum_types_by_name['Codec'] = _CODEC
 
 StringTuple = _reflection.GeneratedProtocolMessageType('StringTuple', (_message.Message,), dict(
   DESCRIPTOR = _STRINGTUPLE,
@@ -0,0 +1,347 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Hashes of protobuf records, and when we check them.
+
+Each HyperFrame, Frame, Link, and LinkAuth pb carries a hash of its own
+serialization (with the hash field cleared).  Records written by older
+versions of disdat hold a bare MD5 hex digest.  Newer records may name their
+algorithm, '<algorithm>:<hex digest>', so every record can be verified
+whatever the [integrity] hash setting is now.
+
+Frames whose data is in a .npy sidecar or a Parquet file also carry a
+content_hash of that file.  The verify policy checks it when rebuilding or
+pulling, but not on other reads, so readers can still memory map the file.
+
+The [integrity] section of disdat.cfg sets:
+
+    hash         md5 (default, readable by older versions of disdat), sha256,
+                 blake2b (hashlib or pyblake2), or xxh64 (xxhash)
+    verify       always (default), rebuild-and-pull (only when rebuilding the
+                 catalog or pulling from a remote), sampled (rebuild and pull,
+                 and sample_rate of all other reads), or never
+    sample_rate  fraction of reads checked by 'sampled'
+"""
+
+import hashlib
+import logging
+import random
+
+from google.protobuf.internal import decoder
+
+_logger = logging.getLogger(__name__)
+
+INTEGRITY_SECTION = 'integrity'
+INTEGRITY_DEFAULTS = {'hash': 'md5',
+                      'verify': 'always',
+                      'sample_rate': '0.01'}
+
+VERIFY_POLICIES = ('always', 'rebuild-and-pull', 'sampled', 'never')
+
+# Why we are reading a record, see should_verify()
+READ_EVENTS = ('read', 'rebuild', 'pull')
+
+# hash_file reads this many bytes at a time
+FILE_BLOCK_SIZE = 1 << 20
+
+
+def _blake2b():
+    if hasattr(hashlib, 'blake2b'):
+        return lambda: hashlib.blake2b(digest_size=32)
+    try:
+        import pyblake2
+    except ImportError:
+        return None
+    return lambda: pyblake2.blake2b(digest_size=32)
+
+
+def _xxh64():
+    try:
+        import xxhash
+    except ImportError:
+        return None
+    return xxhash.xxh64
+
+
+# algorithm -> constructor of a hashlib-like object, or None if not installed
+HASH_ALGORITHMS = {'md5': hashlib.md5,
+                   'sha256': hashlib.sha256,
+                   'blake2b': _blake2b(),
+                   'xxh64': _xxh64()}
+
+_settings = None
+
+
+def integrity_settings(parser=None):
+    """
+    Read the [integrity] section of disdat.cfg.  Missing options take INTEGRITY_DEFAULTS.
+
+    Args:
+        parser (ConfigParser): Optional, defaults to the DisdatConfig parser
+
+    Returns:
+        (dict): e.g., {'hash': 'md5', 'verify': 'always', 'sample_rate': 0.01}
+    """
+    if parser is None:
+        from disdat.common import DisdatConfig
+        parser = DisdatConfig.instance().parser
+
+    settings = {}
+    for option, default in INTEGRITY_DEFAULTS.iteritems():
+        if parser.has_section(INTEGRITY_SECTION) and parser.has_option(INTEGRITY_SECTION, option):
+            settings[option] = parser.get(INTEGRITY_SECTION, option).strip()
+        else:
+            settings[option] = default
+
+    settings['hash'] = settings['hash'].lower()
+    if settings['hash'] not in HASH_ALGORITHMS:
+        raise Exception("disdat.cfg [{}] hash must be one of {}, found {}".format(
+            INTEGRITY_SECTION, sorted(HASH_ALGORITHMS), settings['hash']))
+    if HASH_ALGORITHMS[settings['hash']] is None:
+        raise Exception("disdat.cfg [{}] hash {} is not installed, try 'pip install disdat[hash]'".format(
+            INTEGRITY_SECTION, settings['hash']))
+
+    settings['verify'] = settings['verify'].lower()
+    if settings['verify'] not in VERIFY_POLICIES:
+        raise Exception("disdat.cfg [{}] verify must be one of {}, found {}".format(
+            INTEGRITY_SECTION, VERIFY_POLICIES, settings['verify']))
+
+    try:
+        settings['sample_rate'] = float(settings['sample_rate'])
+    except ValueError:
+        raise Exception("disdat.cfg [{}] sample_rate must be a number, found {}".format(
+            INTEGRITY_SECTION, settings['sample_rate']))
+    if not 0.0 <= settings['sample_rate'] <= 1.0:
+        raise Exception("disdat.cfg [{}] sample_rate must be between 0 and 1, found {}".format(
+            INTEGRITY_SECTION, settings['sample_rate']))
+
+    return settings
+
+
+def configure(settings=None):
+    """
+    Set the hash algorithm and verify policy for this process.
+
+    Args:
+        settings (dict): from integrity_settings(), or None for the defaults
+
+    Returns:
+        None
+    """
+    global _settings
+    if settings is None:
+        settings = integrity_settings(_EmptyParser())
+    _settings = settings
+
+
+def get_settings():
+    if _settings is None:
+        configure()
+    return _settings
+
+
+class _EmptyParser(object):
+    """ Stands in for a ConfigParser without an [integrity] section """
+    def has_section(self, section):
+        return False
+
+
+def hash_bytes(data, algorithm=None):
+    """
+    Hash serialized bytes.
+
+    Args:
+        data (str): bytes, or a memoryview of them
+        algorithm (str): Optional, defaults to the configured hash
+
+    Returns:
+        (str): bare hex digest for md5, '<algorithm>:<hex digest>' otherwise
+    """
+    return _hash_parts([data], algorithm)
+
+
+def hash_file(file_path, algorithm=None):
+    """
+    Hash a data file, e.g., a .npy sidecar or a Parquet file, a block at a time.
+
+    Args:
+        file_path (str): local path to the file
+        algorithm (str): Optional, defaults to the configured hash
+
+    Returns:
+        (str): bare hex digest for md5, '<algorithm>:<hex digest>' otherwise
+    """
+    with open(file_path, 'rb') as f:
+        return _hash_parts(iter(lambda: f.read(FILE_BLOCK_SIZE), b''), algorithm)
+
+
+def verify_file(frame_pb, file_path):
+    """
+    Check a data file against the content_hash of the frame that links to it.
+    Frames written before we hashed their files have no content_hash, and pass.
+
+    Args:
+        frame_pb: Frame pb
+        file_path (str): local path to the frame's data file
+
+    Returns:
+        None, raises an Exception if the hash does not match
+    """
+    if frame_pb.content_hash == '':
+        return
+    algorithm = hash_algorithm(frame_pb.content_hash)
+    if hash_file(file_path, algorithm) != frame_pb.content_hash:
+        raise Exception("Disdat Frame {} data file {} failed its {} integrity check".format(
+            frame_pb.uuid, file_path, algorithm))
+
+
+def _hash_parts(parts, algorithm=None):
+    """
+    Hash bytes that are in more than one piece, as hash_bytes hashes them joined.
+    """
+    if algorithm is None:
+        algorithm = get_settings()['hash']
+    ctor = HASH_ALGORITHMS.get(algorithm)
+    if ctor is None:
+        raise Exception("Disdat hash algorithm {} is not available, try 'pip install disdat[hash]'".format(algorithm))
+    h = ctor()
+    for data in parts:
+        h.update(data)
+    if algorithm == 'md5':
+        return h.hexdigest()
+    return "{}:{}".format(algorithm, h.hexdigest())
+
+
+def hash_algorithm(pb_hash):
+    """
+    Args:
+        pb_hash (str): the hash field of a pb
+
+    Returns:
+        (str): the algorithm that made it
+    """
+    if ':' in pb_hash:
+        return pb_hash.split(':', 1)[0]
+    return 'md5'
+
+
+def set_pb_hash(pb):
+    """
+    Set the hash field of a pb from its serialization without the hash.
+
+    Args:
+        pb: HyperFrame, Frame, Link, or LinkAuth pb
+
+    Returns:
+        (str): the hash
+    """
+    pb.ClearField('hash')
+    pb.hash = hash_bytes(pb.SerializeToString())
+    return pb.hash
+
+
+def _hash_field_span(pb, contents):
+    """
+    Where the hash field is in the bytes pb was parsed from.  Python protobuf writes fields in
+    field number order, so these bytes without the hash field are what set_pb_hash hashed.
+    Walks the top-level fields, skipping over each value.
+
+    Returns:
+        (int, int): start and end of the serialized hash field, or None if it is not there once
+    """
+    hash_number = pb.DESCRIPTOR.fields_by_name['hash'].number
+    span = None
+    pos = 0
+    end = len(contents)
+    try:
+        while pos < end:
+            start = pos
+            tag, pos = decoder._DecodeVarint(contents, pos)
+            wire_type = tag & 0x7
+            if wire_type == 0:
+                _, pos = decoder._DecodeVarint(contents, pos)
+            elif wire_type == 1:
+                pos += 8
+            elif wire_type == 2:
+                size, pos = decoder._DecodeVarint(contents, pos)
+                pos += size
+            elif wire_type == 5:
+                pos += 4
+            else:
+                # Groups, which our pbs do not have
+                return None
+            if tag >> 3 == hash_number:
+                if span is not None or wire_type != 2:
+                    return None
+                span = (start, pos)
+    except IndexError:
+        return None
+    if pos != end:
+        return None
+    return span
+
+
+def verify_pb(pb, contents=None):
+    """
+    Check the hash field of a pb.  If we have the bytes it was parsed from, we hash
+    those, less the hash field wherever it is, instead of serializing the pb again.
+
+    Args:
+        pb: HyperFrame, Frame, Link, or LinkAuth pb
+        contents (str): Optional, the bytes pb was parsed from
+
+    Returns:
+        None, raises an Exception if the hash does not match
+    """
+    old_hash = pb.hash
+    algorithm = hash_algorithm(old_hash)
+
+    if contents is not None and old_hash != '':
+        span = _hash_field_span(pb, contents)
+        if span is not None:
+            body = memoryview(contents)
+            if _hash_parts([body[:span[0]], body[span[1]:]], algorithm) == old_hash:
+                return
+            # Bytes written by another protobuf may order fields differently, serialize them again to be sure
+
+    pb.ClearField('hash')
+    body = pb.SerializeToString()
+    pb.hash = old_hash
+
+    if hash_bytes(body, algorithm) != old_hash:
+        raise Exception("Disdat {} {} failed its {} integrity check".format(
+            pb.DESCRIPTOR.name, getattr(pb, 'uuid', ''), algorithm))
+
+
+def should_verify(event='read'):
+    """
+    Whether the verify policy checks this read.
+
+    Args:
+        event (str): one of READ_EVENTS.  'rebuild' and 'pull' read records we did not just write.
+
+    Returns:
+        (bool)
+    """
+    policy = get_settings()['verify']
+    if policy == 'always':
+        return True
+    if policy == 'never':
+        return False
+    if event != 'read':
+        return True
+    if policy == 'sampled':
+        return random.random() < get_settings()['sample_rate']
+    return False
@@ -171,6 +171,7 @@ class PipeTask(luigi.Task, PipeBase):
         self.user_set_human_name = None
         self.user_tags = {}
         self.add_deps  = {}
+        self.dep_selections = {}
         self.db_targets = []
 
     def bundle_outputs(self):
@@ -290,6 +291,7 @@ class PipeTask(luigi.Task, PipeBase):
         kwargs = self.prepare_pipe_kwargs()
 
         self.add_deps.clear()
+        self.dep_selections.clear()
         self.pipe_requires(**kwargs)
         rslt = self.add_deps
 
@@ -458,7 +460,8 @@ class PipeTask(luigi.Task, PipeBase):
                 assert hfr.is_presentable()
                 if pce.instance.user_arg_name in kwargs:
                     _logger.warning('Task human name {} reused when naming task dependencies: Dependency hyperframe shadowed'.format(pce.instance.user_arg_name))
-                kwargs[user_arg_name] = self.pfs.get_curr_context().present_hfr(hfr)
+                selection = self.dep_selections.get(user_arg_name, {})
+                kwargs[user_arg_name] = self.pfs.get_curr_context().present_hfr(hfr, **selection)
         return kwargs
 
     """
@@ -488,6 +491,13 @@ class PipeTask(luigi.Task, PipeBase):
         The input_df has the data in either jsonData or fileData.
         A sharded task will receive a subset of all possible inputs.
 
+        pipe_run may also be a generator that yields DataFrame, or ndarray, chunks.  Disdat writes
+        each chunk as it arrives, so the bundle may be larger than memory, see parse_pipe_chunks.
+        A numeric column that changes type in a later chunk, e.g., ints then floats with NaN, is
+        promoted.  One that changes to strings, or objects, is held in memory from then on; rows
+        already written stay memory mapped until the column is closed, and its numbers become
+        strings, as pd.read_csv of the whole file would make them.
+
         Args:
             **kwargs:
 
@@ -497,16 +507,21 @@ class PipeTask(luigi.Task, PipeBase):
 
         raise NotImplementedError()
 
-    def add_dependency(self, name, task_class, params):
+    def add_dependency(self, name, task_class, params, columns=None, rows=None):
         """
         Disdat Pipe API Function
 
         Add a task and its parameters to our requirements
 
+        With columns or rows, run receives only those of the upstream bundle, see DataContext.present_hfr.
+        The upstream task still makes all of its bundle.
+
         Args:
             name (str): Name of our upstream (also name of argument in downstream)
             task_class (:object):  upstream task class
             params (:dict):  Dictionary of
+            columns (list(str)): Optional.  Only these columns of the upstream dataframe or row
+            rows (slice): Optional.  Only these rows of the upstream dataframe or tensor
 
         Returns:
             None
@@ -520,6 +535,9 @@ class PipeTask(luigi.Task, PipeBase):
         assert (name not in self.add_deps)
         self.add_deps[name] = (task_class, params)
 
+        if columns is not None or rows is not None:
+            self.dep_selections[name] = {'columns': columns, 'rows': rows}
+
         return
 
     def add_db_target(self, db_target):
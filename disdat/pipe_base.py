@@ -11,8 +11,8 @@ from __future__ import print_function
 
 from abc import ABCMeta, abstractmethod
 from disdat.fs import DisdatFS
-from disdat.data_context import DataContext
-from disdat.hyperframe import LineageRecord, HyperFrameRecord, FrameRecord
+from disdat.data_context import DataContext, ChunkedColumn, ChunkedDataFrame, storage_settings
+from disdat.hyperframe import LineageRecord, HyperFrameRecord, FrameRecord, packed_filename
 
 import disdat.common as common
 import os
@@ -188,7 +188,12 @@ class PipeBase(object):
             _logger.error("It is possible one of your tasks is parameterized in a non-deterministic fashion.")
             raise Exception("add_bundle_meta_files: Unable to find pce for task {}".format(pipe_task.pipe_id()))
 
-        hframe = {PipeBase.HFRAME: luigi.LocalTarget(os.path.join(pce.path, HyperFrameRecord.make_filename(pce.uuid)))}
+        if storage_settings()['layout'] == 'packed':
+            hframe_filename = packed_filename(pce.uuid)
+        else:
+            hframe_filename = HyperFrameRecord.make_filename(pce.uuid)
+
+        hframe = {PipeBase.HFRAME: luigi.LocalTarget(os.path.join(pce.path, hframe_filename))}
 
         return hframe
 
@@ -343,6 +348,8 @@ class PipeBase(object):
 
         The mirror to this function (that unpacks a presentable is disdat.fs.present_hfr()
 
+        If pipe_run is a generator, see parse_pipe_chunks.
+
         Args:
             hfid:
             val:
@@ -351,6 +358,9 @@ class PipeBase(object):
             Frames, Presentation
 
         """
+        if inspect.isgenerator(val):
+            return self.parse_pipe_chunks(hfid, val, human_name=human_name)
+
         frames = []
 
         managed_path = os.path.join(self.pfs.get_curr_context().get_object_dir(), hfid)
@@ -390,6 +400,90 @@ class PipeBase(object):
             presentation = hyperframe_pb2.SCALAR
             frames.append(DataContext.convert_scalar2frame(hfid, common.DEFAULT_FRAME_NAME + ':0', val, managed_path))
 
+        hfr = self.make_hframe(frames, hfid, self.bundle_inputs(),
+                               human_name=human_name,
+                               tags={"presentable": "True"},
+                               presentation=presentation)
+
+        return hfr
+
+    @staticmethod
+    def convert_chunks2frames(hfid, chunks, managed_path):
+        """
+        Make the frames of a bundle from chunks of its data, without holding them all.
+
+        Each chunk is added to its columns' frames as it arrives, see data_context.ChunkedDataFrame
+        and ChunkedColumn.  DataFrame chunks, with the same columns, make a DF bundle, ndarray chunks
+        a TENSOR bundle of their rows.  No chunks make an HF bundle, as returning None does.  If the
+        chunks raise, or do not match, the files written so far are removed.
+
+        Args:
+            hfid (str): the bundle's uuid
+            chunks (iterable): yields `pandas.DataFrame` or `numpy.ndarray`
+            managed_path (str): the bundle's managed path
+
+        Returns:
+            (presentation, list(`FrameRecord`)): the bundle's presentation and frames
+        """
+        names = None
+        chunked = None
+        frames = None
+        presentation = hyperframe_pb2.HF
+
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, pd.DataFrame):
+                    chunk_presentation = hyperframe_pb2.DF
+                    chunk_names = [c for c in chunk.columns if 'Unnamed:' not in c]
+                elif isinstance(chunk, np.ndarray) and chunk.ndim > 0:
+                    chunk_presentation = hyperframe_pb2.TENSOR
+                    chunk_names = [common.DEFAULT_FRAME_NAME + ':0']
+                else:
+                    raise Exception("Chunks may be DataFrames or ndarrays, found {}".format(type(chunk)))
+
+                if names is None:
+                    presentation = chunk_presentation
+                    names = chunk_names
+                    if presentation == hyperframe_pb2.DF:
+                        chunked = ChunkedDataFrame(hfid, names, managed_path)
+                    else:
+                        chunked = ChunkedColumn(hfid, names[0], managed_path)
+                elif chunk_presentation != presentation or chunk_names != names:
+                    raise Exception("Each chunk must have the same columns {}, found {}".format(names, chunk_names))
+
+                chunked.append(chunk)
+
+            if chunked is None:
+                frames = []
+            elif presentation == hyperframe_pb2.DF:
+                frames = chunked.close()
+            else:
+                frames = [chunked.close()]
+        finally:
+            if frames is None and chunked is not None:
+                # The chunks, or a column, failed: remove the files written so far
+                chunked.abort()
+
+        return presentation, frames
+
+    def parse_pipe_chunks(self, hfid, chunks, human_name=None):
+        """
+        Make an HFrame from the chunks a pipe_run generator yields, without holding them all.
+
+        See convert_chunks2frames.
+
+        Args:
+            hfid (str): the bundle's uuid
+            chunks (generator): yields `pandas.DataFrame` or `numpy.ndarray`
+            human_name (str):
+
+        Returns:
+            `HyperFrameRecord`
+        """
+        managed_path = os.path.join(self.pfs.get_curr_context().get_object_dir(), hfid)
+
+        presentation, frames = PipeBase.convert_chunks2frames(hfid, chunks, managed_path)
+
         hfr = self.make_hframe(frames, hfid, self.bundle_inputs(),
                                human_name=human_name,
                                tags={"presentable": "True"},
@@ -0,0 +1,259 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Tag queries over the hframes_tags table.
+
+A tag query is the usual dictionary of tags.  Values match exactly, unless the
+caller asks for operators (select_hfr_db(tag_operators=True), 'dsdt ls -t ... -to',
+'dsdt apply -it ... -ito').
+Then each value may carry an operator:
+
+    'v'          exact match (also '=v', to match a value that looks like an operator)
+    'v*'         prefix match, '*' alone matches any value of the key
+    '>=v', '>v', '<=v', '<v'    range
+    'lo..hi'     inclusive range
+
+Range operands that are numbers compare against the numeric value of the tag,
+so 'version:>=0.7' matches '0.7' and '1.0', but not '0.10'.  Other operands
+compare as strings.
+
+Each tag selects a set of hframe uuids, and the sets are intersected in SQL
+by nesting them, the most selective tag innermost.
+"""
+
+from collections import namedtuple
+import logging
+import math
+
+from sqlalchemy.sql import select, and_, bindparam, func
+
+_logger = logging.getLogger(__name__)
+
+TagPredicate = namedtuple('TagPredicate', 'key op value value2 numeric')
+
+# op -> number of operands
+OPS = {'eq': 1, 'exists': 0, 'prefix': 1, 'gt': 1, 'ge': 1, 'lt': 1, 'le': 1, 'between': 2}
+
+_RANGE_PREFIXES = (('>=', 'ge'), ('<=', 'le'), ('>', 'gt'), ('<', 'lt'))
+
+# Statements to count the rows that match a predicate, by (op, numeric)
+_count_stmt_cache = {}
+
+
+def tag_number(value):
+    """
+    The numeric value of a tag, stored alongside the string value.
+
+    Args:
+        value (str):
+
+    Returns:
+        (float): or None if the value is not a finite number
+    """
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(number) or math.isinf(number):
+        return None
+    return number
+
+
+def parse_tag_query(key, value):
+    """
+    Parse one tag of a tag query.
+
+    Args:
+        key (str): tag key
+        value: tag value, possibly with an operator.  Non-strings must match exactly.
+
+    Returns:
+        (`TagPredicate`)
+    """
+    if not isinstance(value, basestring):
+        return TagPredicate(key, 'eq', str(value), None, False)
+
+    if value.startswith('='):
+        return TagPredicate(key, 'eq', value[1:], None, False)
+
+    for prefix, op in _RANGE_PREFIXES:
+        if value.startswith(prefix):
+            operand = value[len(prefix):]
+            return TagPredicate(key, op, operand, None, tag_number(operand) is not None)
+
+    if '..' in value:
+        lo, hi = value.split('..', 1)
+        numeric = tag_number(lo) is not None and tag_number(hi) is not None
+        return TagPredicate(key, 'between', lo, hi, numeric)
+
+    if value.endswith('*'):
+        if len(value) == 1:
+            return TagPredicate(key, 'exists', None, None, False)
+        return TagPredicate(key, 'prefix', value[:-1], None, False)
+
+    return TagPredicate(key, 'eq', value, None, False)
+
+
+def parse_tag_queries(tags, operators=False):
+    """
+    Args:
+        tags (dict): tag key to value
+        operators (bool): values may carry an operator, see parse_tag_query.  Otherwise they match exactly.
+
+    Returns:
+        (list): `TagPredicate`s ordered by key
+    """
+    if not tags:
+        return []
+    if operators:
+        return [parse_tag_query(k, v) for k, v in sorted(tags.iteritems())]
+    return [TagPredicate(k, 'eq', v if isinstance(v, basestring) else str(v), None, False)
+            for k, v in sorted(tags.iteritems())]
+
+
+def _operand(pred, value):
+    if pred.numeric:
+        return tag_number(value)
+    return value
+
+
+def _prefix_upper_bound(prefix):
+    """
+    The smallest string greater than every string that starts with prefix.
+    """
+    prefix = prefix.decode('utf-8') if isinstance(prefix, str) else prefix
+    while len(prefix) > 0 and ord(prefix[-1]) >= 0xffff:
+        prefix = prefix[:-1]
+    if len(prefix) == 0:
+        return u'\uffff'
+    return prefix[:-1] + unichr(ord(prefix[-1]) + 1)
+
+
+def predicate_params(pred, i):
+    """
+    Bound parameter values for the i'th predicate of a query.
+
+    Returns:
+        (dict)
+    """
+    params = {'tag_key_{}'.format(i): pred.key}
+    if pred.op == 'prefix':
+        # value >= prefix AND value < prefix with its last character incremented.
+        # Unlike LIKE, this is case sensitive and can use the (key, value) index.
+        params['tag_value_{}'.format(i)] = pred.value
+        params['tag_value2_{}'.format(i)] = _prefix_upper_bound(pred.value)
+    elif OPS[pred.op] >= 1:
+        params['tag_value_{}'.format(i)] = _operand(pred, pred.value)
+        if OPS[pred.op] == 2:
+            params['tag_value2_{}'.format(i)] = _operand(pred, pred.value2)
+    return params
+
+
+def predicate_criteria(tags_tbl, op, numeric, i):
+    """
+    Criteria on a tags table (or alias) for the i'th predicate of a query.
+
+    Args:
+        tags_tbl: hframes_tags table or alias
+        op (str): one of OPS
+        numeric (bool): compare against num_value instead of value
+        i (int): predicate index, names its bind parameters
+
+    Returns:
+        sqlalchemy criteria
+    """
+    col = tags_tbl.c.num_value if numeric else tags_tbl.c.value
+    v1 = bindparam('tag_value_{}'.format(i))
+    v2 = bindparam('tag_value2_{}'.format(i))
+
+    criteria = [tags_tbl.c.key == bindparam('tag_key_{}'.format(i))]
+    if op == 'eq':
+        criteria.append(col == v1)
+    elif op == 'prefix':
+        criteria.extend([col >= v1, col < v2])
+    elif op == 'gt':
+        criteria.append(col > v1)
+    elif op == 'ge':
+        criteria.append(col >= v1)
+    elif op == 'lt':
+        criteria.append(col < v1)
+    elif op == 'le':
+        criteria.append(col <= v1)
+    elif op == 'between':
+        criteria.extend([col >= v1, col <= v2])
+    return and_(*criteria)
+
+
+def tag_filter(uuid_col, tags_tbl, tag_shape):
+    """
+    Criterion that keeps the hframes whose tags satisfy every predicate.
+    The first predicate in tag_shape is nested innermost, so the database
+    starts from the most selective tag and probes the others by uuid.
+
+    Args:
+        uuid_col: hframes uuid column to filter
+        tags_tbl: hframes_tags table
+        tag_shape (tuple): (op, numeric, index) of each predicate, most selective first
+
+    Returns:
+        sqlalchemy criterion
+    """
+    matching = None
+    for op, numeric, i in tag_shape:
+        t = tags_tbl.alias('tag_{}'.format(i))
+        criteria = predicate_criteria(t, op, numeric, i)
+        if matching is not None:
+            criteria = and_(criteria, t.c.uuid.in_(matching))
+        matching = select([t.c.uuid]).where(criteria).correlate(None)
+    return uuid_col.in_(matching)
+
+
+def order_by_selectivity(conn, tags_tbl, preds, execution_options=None):
+    """
+    Order predicates by how many tag rows they match, fewest first.
+    Each count is a range scan of a (key, value) or (key, num_value) index.
+
+    Exact matches, e.g., every predicate of a query without operators, are each a
+    point lookup in the (key, value) index.  They are left in order, so a lookup
+    by exact tags runs no counts.
+
+    Args:
+        conn: sqlalchemy connection
+        tags_tbl: hframes_tags table
+        preds (list): `TagPredicate`s
+        execution_options (dict): passed to conn.execution_options
+
+    Returns:
+        (list): `TagPredicate`s
+    """
+    if len(preds) < 2 or all(pred.op == 'eq' for pred in preds):
+        return preds
+
+    if execution_options:
+        conn = conn.execution_options(**execution_options)
+
+    counts = []
+    for pred in preds:
+        key = (pred.op, pred.numeric)
+        stmt = _count_stmt_cache.get(key)
+        if stmt is None:
+            stmt = select([func.count()]).select_from(tags_tbl).where(
+                predicate_criteria(tags_tbl, pred.op, pred.numeric, 0))
+            _count_stmt_cache[key] = stmt
+        counts.append(conn.execute(stmt, predicate_params(pred, 0)).scalar())
+
+    ordered = [pred for count, _, pred in sorted(zip(counts, range(len(preds)), preds))]
+    _logger.debug("Tag query selectivity {}".format(zip([p.key for p in ordered], sorted(counts))))
+    return ordered
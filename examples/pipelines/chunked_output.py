@@ -0,0 +1,67 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from disdat.pipe import PipeTask
+import disdat.api as api
+import numpy as np
+import pandas as pd
+
+"""
+Chunked Output Example
+
+Write a bundle a chunk at a time, and read a few of its rows downstream.
+
+This examples shows:
+1.) A pipe_run generator that yields dataframes.  Disdat writes each chunk as it
+arrives, so the bundle may be larger than memory.
+2.) An upstream dependency presented with only some of its columns and rows.
+
+Pre Execution:
+$export PYTHONPATH=$DISDAT_HOME/disdat/examples/pipelines
+$dsdt context examples; dsdt switch examples
+
+Execution:
+$python ./chunked_output.py
+or:
+$dsdt apply - - chunked_output.Readings
+
+"""
+
+
+class Sensor(PipeTask):
+    def pipe_run(self, pipeline_input=None):
+        for hour in range(24):
+            yield pd.DataFrame({'hour': np.full(3600, hour, dtype=np.int8),
+                                'second': np.arange(3600, dtype=np.int32),
+                                'reading': np.random.rand(3600)})
+
+
+class Readings(PipeTask):
+    def pipe_requires(self, pipeline_input=None):
+        self.add_dependency('noon', Sensor, {}, columns=['second', 'reading'], rows=slice(12 * 3600, 13 * 3600))
+
+    def pipe_run(self, pipeline_input=None, noon=None):
+        """
+        Summarize the readings of one hour
+
+        Args:
+            pipeline_input:  The user's input
+            noon:  The sensor's readings from 12:00 to 13:00
+
+        """
+        return noon.describe()
+
+
+if __name__ == "__main__":
+    api.apply('examples', '-', '-', 'Readings', params={})
@@ -116,6 +116,7 @@ setup(
     extras_require={
         'dev': [
             'pytest',
+            'pyarrow>=0.14.1,<0.17',  # so the Parquet tests run, 0.16 is the last for python 2
             'ipython<6.0',
             'mock',
             'nose',
@@ -127,6 +128,17 @@ setup(
             'sphinx',
             'sphinx_rtd_theme',
             'pyinstaller'
+        ],
+        'hash': [
+            'pyblake2;python_version<"3.6"',
+            'xxhash'
+        ],
+        'compress': [
+            'lz4',
+            'zstandard'
+        ],
+        'parquet': [
+            'pyarrow>=0.14.1,<0.17'  # 0.16 is the last pyarrow for python 2
         ]
     },
 
@@ -0,0 +1,172 @@
+"""
+Test adding csv/tsv files, a chunk at a time.
+"""
+
+import os
+import shutil
+import tempfile
+import uuid
+import pytest
+import numpy as np
+import pandas as pd
+import disdat.add as add
+import disdat.data_context as data_context
+import disdat.hyperframe as hyperframe
+
+
+def test_sniff_delimiter():
+    """
+    The delimiter and quote character come from the first lines, or the file name if there is one column.
+    """
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        def sniff(name, text, **kwargs):
+            path = os.path.join(tmp_dir, name)
+            with open(path, 'w') as f:
+                f.write(text)
+            return add.sniff_delimiter(path, **kwargs)
+
+        assert sniff('a.csv', 'a,b\n1,2\n3,4\n') == (',', '"')
+        assert sniff('a.tsv', 'a\tb\n1\t2\n3\t4\n') == ('\t', '"')
+        assert sniff('b.csv', "a;b\n1;'x;y'\n2;z\n") == (';', "'")
+        assert sniff('c.csv', 'a\n1\n2\n') == (',', '"')
+        assert sniff('c.tsv', 'a\n1\n2\n') == ('\t', '"')
+        # A cut off last line is not sniffed
+        assert sniff('d.csv', 'a|b\n1|2\n3|4\n5,', sample_size=14) == ('|', '"')
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_convert_csv2frames(monkeypatch):
+    """
+    Chunks of a csv are added to their frames as they are parsed, with dtype hints.
+    """
+    settings = data_context.storage_settings()
+    settings['sidecar_size'] = 1000
+    monkeypatch.setattr(data_context, 'storage_settings', lambda parser=None: settings)
+
+    object_dir = tempfile.mkdtemp()
+    try:
+        hfid = str(uuid.uuid1())
+        bundle_dir = os.path.join(object_dir, hfid)
+        os.makedirs(bundle_dir)
+
+        df = pd.DataFrame({'zip': ['{:05d}'.format(i) for i in range(1000)],
+                           'price': np.linspace(0, 1, 1000),
+                           'count': np.arange(1000)})
+        input_path = os.path.join(object_dir, 'sales.tsv')
+        df.to_csv(input_path, sep='\t')
+
+        task = add.AddTask(input_path, 'sales', {}, chunksize=100, dtypes={'zip': 'str'})
+        frames = task.convert_csv2frames(hfid, bundle_dir)
+
+        assert [fr.pb.name for fr in frames] == ['count', 'price', 'zip']
+        assert [fr.is_sidecar_frame() for fr in frames] == [True, True, False]
+        found = pd.DataFrame({fr.pb.name: fr.to_ndarray(data_dir=bundle_dir) for fr in frames})
+        pd.testing.assert_frame_equal(found, df[['count', 'price', 'zip']])
+
+        """ A missing value in a later chunk promotes the ints stored so far """
+        df['count'] = df['count'].astype(np.object_)
+        df.loc[500, 'count'] = None
+        df.to_csv(input_path, sep='\t')
+        for dtypes in ({}, {'count': 'float64'}):
+            frames = add.AddTask(input_path, 'sales', {}, chunksize=100, dtypes=dtypes).convert_csv2frames(
+                hfid, bundle_dir)
+            found = frames[0].to_ndarray(data_dir=bundle_dir)
+            assert found.dtype == np.float64
+            assert np.isnan(found[500])
+            assert found[999] == 999
+
+        """ chunksize 0 parses it all at once """
+        frames = add.AddTask(input_path, 'sales', {}, chunksize=0).convert_csv2frames(hfid, bundle_dir)
+        assert frames[0].to_ndarray(data_dir=bundle_dir).dtype == np.float64
+    finally:
+        shutil.rmtree(object_dir)
+
+
+def test_convert_csv2frames_late_strings(monkeypatch):
+    """
+    A column of numbers that turns to strings in a later chunk is stored as pd.read_csv reads the whole file,
+    whether its numbers were held or already in a sidecar.
+    """
+    object_dir = tempfile.mkdtemp()
+    try:
+        hfid = str(uuid.uuid1())
+        bundle_dir = os.path.join(object_dir, hfid)
+        os.makedirs(bundle_dir)
+
+        input_path = os.path.join(object_dir, 'codes.csv')
+        with open(input_path, 'w') as f:
+            f.write('a,b\n')
+            f.write(''.join('{},{}\n'.format(i, '' if i == 3 else i + 0.5) for i in range(10)))
+            f.write('x,y\n')
+        whole = pd.read_csv(input_path)
+
+        for sidecar_size in (0, 16):
+            settings = dict(data_context.storage_settings(), sidecar_size=sidecar_size)
+            monkeypatch.setattr(data_context, 'storage_settings', lambda parser=None: settings)
+            frames = add.AddTask(input_path, 'codes', {}, chunksize=4).convert_csv2frames(hfid, bundle_dir)
+            a, b = [fr.to_ndarray(data_dir=bundle_dir) for fr in frames]
+            assert a.tolist() == whole['a'].tolist()
+            assert b[:3].tolist() == whole['b'][:3].tolist() and b[-1] == 'y'
+            assert pd.isnull(b[3]) and pd.isnull(whole['b'][3])
+            # The sidecars streamed before the strings came are gone
+            assert os.listdir(bundle_dir) == []
+    finally:
+        shutil.rmtree(object_dir)
+
+
+@pytest.mark.skipif(hyperframe.PYARROW is None, reason="Parquet frames need pyarrow")
+def test_convert_csv2frames_parquet(monkeypatch):
+    """
+    With df_format parquet, chunks go to the bundle's Parquet file a row group at a time, and
+    columns are promoted, or taken out to frames, as later chunks need.
+    """
+    settings = data_context.storage_settings()
+    settings['df_format'] = 'parquet'
+    settings['sidecar_size'] = 1000
+    monkeypatch.setattr(data_context, 'storage_settings', lambda parser=None: settings)
+    monkeypatch.setattr(hyperframe, 'PARQUET_ROW_GROUP_ROWS', 250)
+
+    object_dir = tempfile.mkdtemp()
+    try:
+        hfid = str(uuid.uuid1())
+        bundle_dir = os.path.join(object_dir, hfid)
+        os.makedirs(bundle_dir)
+
+        df = pd.DataFrame({'zip': ['{:05d}'.format(i) for i in range(1000)],
+                           'count': np.arange(1000).astype(np.object_),
+                           'code': np.arange(1000).astype(np.object_)})
+        df.loc[500, 'count'] = None
+        df.loc[700, 'code'] = 'x'
+        input_path = os.path.join(object_dir, 'sales.csv')
+        df.to_csv(input_path, index=False)
+
+        task = add.AddTask(input_path, 'sales', {}, chunksize=100, dtypes={'zip': 'str'})
+        frames = dict((fr.pb.name, fr) for fr in task.convert_csv2frames(hfid, bundle_dir))
+
+        parquet_path = os.path.join(bundle_dir, hyperframe.parquet_filename(hfid))
+        assert [n for n in sorted(frames) if frames[n].is_parquet_frame()] == ['count', 'zip']
+        assert hyperframe.PYARROW.parquet.ParquetFile(parquet_path).num_row_groups == 4
+        assert frames['count'].pb.type == hyperframe.hyperframe_pb2.FLOAT64
+
+        count = frames['count'].to_ndarray(data_dir=bundle_dir)
+        assert np.isnan(count[500])
+        assert count[:500].tolist() == range(500)
+        assert frames['zip'].to_ndarray(data_dir=bundle_dir).tolist() == df['zip'].tolist()
+        # Ints, then strings, are all strings, as pd.read_csv of the whole file makes them
+        assert frames['code'].to_ndarray(data_dir=bundle_dir).tolist() == pd.read_csv(input_path)['code'].tolist()
+
+        """ A failed parse removes the Parquet file """
+        os.remove(parquet_path)
+
+        def fail():
+            for chunk in pd.read_csv(input_path, chunksize=300):
+                yield chunk
+            raise ValueError('failed')
+
+        with pytest.raises(ValueError):
+            add.PipeBase.convert_chunks2frames(hfid, fail(), bundle_dir)
+        assert not os.path.exists(parquet_path)
+    finally:
+        shutil.rmtree(object_dir)
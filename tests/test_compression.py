@@ -0,0 +1,74 @@
+"""
+Test compression of frame data.
+"""
+
+import os
+import shutil
+import tempfile
+import uuid
+
+import numpy as np
+import pytest
+
+import disdat.compression as compression
+import disdat.hyperframe as hyperframe
+import disdat.integrity as integrity
+
+
+def test_compress():
+    sparse = np.zeros(100000, dtype=np.float64)
+    sparse[::1000] = 1.0
+    data = sparse.tobytes()
+    noise = np.random.RandomState(0).rand(100000).tobytes()
+
+    for codec in compression.CODECS:
+        if compression.CODECS[codec] is None:
+            continue
+        used, compressed = compression.compress(data, codec)
+        assert used == codec
+        assert len(compressed) * 5 < len(data)
+        assert compression.decompress(compressed, codec) == data
+
+    """ auto compresses what a sample says will shrink, with the first installed codec """
+    assert compression.compress(data, 'auto')[0] == compression.auto_codec()
+    assert compression.compress(noise, 'auto') == (None, noise)
+
+    """ Nothing under min_size, and nothing with none """
+    assert compression.compress(data, 'zlib', min_size=len(data) + 1) == (None, data)
+    assert compression.compress(data, 'none') == (None, data)
+
+    assert compression.check_codec('ZLIB') == 'zlib'
+    with pytest.raises(Exception):
+        compression.check_codec('gzip')
+    with pytest.raises(Exception):
+        compression.decompress(b'', 'snappy')
+
+
+def test_compressed_frames():
+    """
+    Frames record their codec and make_numpy_array decompresses them.
+    """
+    testdir = tempfile.mkdtemp()
+    try:
+        hfid = str(uuid.uuid1())
+        low_cardinality = np.arange(200000, dtype=np.int64) % 7
+        strings = np.array(['status_{}'.format(i % 3) for i in range(20000)])
+
+        for nda in (low_cardinality, strings):
+            fr = hyperframe.FrameRecord.from_ndarray(hfid, 'col', nda, codec='auto')
+            assert fr.pb.codec != hyperframe.hyperframe_pb2.UNCOMPRESSED
+            assert len(fr.pb.data) * 5 < len(fr.get_data())
+
+            hyperframe.w_pb_fs(testdir, fr)
+            read = hyperframe.r_pb_fs(os.path.join(testdir, fr.get_filename()), hyperframe.FrameRecord)
+            integrity.verify_pb(read.pb)
+            assert np.array_equal(read.to_ndarray(), nda)
+
+        """ Small frames, and the default, stay uncompressed """
+        fr = hyperframe.FrameRecord.from_ndarray(hfid, 'col', low_cardinality[:100], codec='auto')
+        assert fr.pb.codec == hyperframe.hyperframe_pb2.UNCOMPRESSED
+        fr = hyperframe.FrameRecord.from_ndarray(hfid, 'col', low_cardinality)
+        assert fr.pb.codec == hyperframe.hyperframe_pb2.UNCOMPRESSED
+        assert fr.get_data() == low_cardinality.tobytes()
+    finally:
+        shutil.rmtree(testdir)
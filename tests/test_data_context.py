@@ -0,0 +1,478 @@
+"""
+Test for data context catalog implementations.
+"""
+
+
+from sqlalchemy import create_engine
+import ConfigParser
+import collections
+import os
+import shutil
+import tempfile
+import uuid
+import pytest
+import numpy as np
+import pandas as pd
+import disdat.data_context as data_context
+import disdat.hyperframe as hyperframe
+import disdat.hyperframe_pb2 as hyperframe_pb2
+import disdat.pipe_base as pipe_base
+
+
+def _make_parser(options=None):
+    parser = ConfigParser.SafeConfigParser()
+    if options is not None:
+        parser.add_section(data_context.CATALOG_SECTION)
+        for k, v in options.iteritems():
+            parser.set(data_context.CATALOG_SECTION, k, v)
+    return parser
+
+
+def test_catalog_settings():
+    """
+    Missing section or options take the defaults, set options are validated.
+    """
+    settings = data_context.catalog_settings(_make_parser())
+    assert settings['journal_mode'] == 'WAL'
+    assert settings['busy_timeout'] == 30000
+
+    settings = data_context.catalog_settings(_make_parser({'journal_mode': 'delete', 'busy_timeout': '50'}))
+    assert settings['journal_mode'] == 'DELETE'
+    assert settings['busy_timeout'] == 50
+    assert settings['synchronous'] == 'NORMAL'
+
+    with pytest.raises(Exception):
+        data_context.catalog_settings(_make_parser({'journal_mode': 'WAL; DROP TABLE hframes'}))
+
+    with pytest.raises(Exception):
+        data_context.catalog_settings(_make_parser({'mmap_size': 'lots'}))
+
+
+def test_storage_settings():
+    """
+    The [storage] layout, sidecar size, string type, codec, and df format.
+    """
+    parser = ConfigParser.SafeConfigParser()
+    assert data_context.storage_settings(parser) == {'layout': 'files', 'sidecar_size': 67108864,
+                                                     'string_type': 'UTF8', 'codec': 'auto', 'codec_min_size': 65536,
+                                                     'df_format': 'frames'}
+
+    parser.add_section(data_context.STORAGE_SECTION)
+    parser.set(data_context.STORAGE_SECTION, 'layout', 'Packed')
+    parser.set(data_context.STORAGE_SECTION, 'sidecar_size', '0')
+    parser.set(data_context.STORAGE_SECTION, 'string_type', 'string')
+    parser.set(data_context.STORAGE_SECTION, 'codec', 'ZLIB')
+    parser.set(data_context.STORAGE_SECTION, 'codec_min_size', '0')
+    assert data_context.storage_settings(parser) == {'layout': 'packed', 'sidecar_size': 0, 'string_type': 'STRING',
+                                                     'codec': 'zlib', 'codec_min_size': 0, 'df_format': 'frames'}
+
+    for option, bad in (('layout', 'zip'), ('sidecar_size', '-1'), ('sidecar_size', 'big'), ('string_type', 'ascii'),
+                        ('codec', 'gzip'), ('codec_min_size', '-1'), ('df_format', 'csv')):
+        parser.set(data_context.STORAGE_SECTION, option, bad)
+        with pytest.raises(Exception):
+            data_context.storage_settings(parser)
+        parser.remove_option(data_context.STORAGE_SECTION, option)
+
+
+def test_set_sqlite_pragmas():
+    """
+    Every new connection gets the catalog settings.
+    """
+    db_dir = tempfile.mkdtemp()
+    try:
+        engine = create_engine('sqlite:///' + os.path.join(db_dir, 'ctxt.db'))
+        data_context.set_sqlite_pragmas(engine, data_context.catalog_settings(_make_parser({'busy_timeout': '1234'})))
+        with engine.connect() as conn:
+            assert conn.execute('PRAGMA journal_mode').scalar().upper() == 'WAL'
+            assert conn.execute('PRAGMA busy_timeout').scalar() == 1234
+            assert conn.execute('PRAGMA synchronous').scalar() == 1  # NORMAL
+    finally:
+        shutil.rmtree(db_dir)
+
+
+def test_shared_catalog_url():
+    """
+    Two workers with engines on one catalog url see each other's bundles.
+    """
+    db_dir = tempfile.mkdtemp()
+    try:
+        settings = data_context.catalog_settings(
+            _make_parser({'url': 'sqlite:///' + os.path.join(db_dir, 'shared_{context}.db')}))
+        url = settings['url'].format(context='team')
+        assert url.endswith('shared_team.db')
+
+        engine_a = data_context.create_catalog_engine(url, settings)
+        engine_b = data_context.create_catalog_engine(url, settings)
+        hyperframe.HyperFrameRecord.create_table(engine_a)
+
+        hfr = hyperframe.HyperFrameRecord(owner='a', human_name='shared', processing_name='SharedTask',
+                                          uuid=str(uuid.uuid1()))
+        hyperframe.w_pb_db(hfr, engine_a)
+
+        found = hyperframe.select_hfr_db(engine_b, human_name='shared')
+        assert [f.pb.uuid for f in found] == [hfr.pb.uuid]
+    finally:
+        shutil.rmtree(db_dir)
+
+
+def _make_frame(name, size):
+    return hyperframe.FrameRecord(name=name, hframe_uuid=str(uuid.uuid1()), type='INT8', data=b'x' * size,
+                                  shape=(size,))
+
+
+def test_frame_cache_lru():
+    frs = [_make_frame('f{}'.format(i), 100) for i in range(4)]
+    size = frs[0].pb.ByteSize()
+    cache = data_context.FrameCache(3 * size)
+
+    for fr in frs[:3]:
+        cache.put(fr)
+    assert cache.get(frs[0].pb.uuid) is frs[0]
+
+    """ f1 is now the least recently used """
+    cache.put(frs[3])
+    assert cache.get(frs[1].pb.uuid) is None
+    assert [cache.get(fr.pb.uuid) for fr in (frs[0], frs[2], frs[3])] == [frs[0], frs[2], frs[3]]
+    assert cache.stats() == {'hits': 4, 'misses': 1, 'frames': 3, 'bytes': 3 * size}
+
+    cache.invalidate([frs[0].pb.uuid, frs[1].pb.uuid])
+    assert cache.get(frs[0].pb.uuid) is None
+    assert cache.nbytes == 2 * size
+
+    """ Too big to cache, or cache disabled """
+    cache.put(_make_frame('big', 1000))
+    assert len(cache) == 2
+    disabled = data_context.FrameCache(0)
+    disabled.put(frs[0])
+    assert len(disabled) == 0
+
+
+class _ObjectDirContext(object):
+    """ Just enough of a DataContext for HyperFrameRecord.get_frames """
+    load_frames = data_context.DataContext.load_frames.__func__
+    implicit_hframe_path = data_context.DataContext.implicit_hframe_path.__func__
+    convert_hfr2df = data_context.DataContext.convert_hfr2df.__func__
+    convert_hfr2ndarray = data_context.DataContext.convert_hfr2ndarray.__func__
+    present_hfr = data_context.DataContext.present_hfr.__func__
+
+    def __init__(self, object_dir, max_bytes):
+        self.object_dir = object_dir
+        self.frame_cache = data_context.FrameCache(max_bytes)
+        self.local_engine = create_engine('sqlite:///:memory:')
+        hyperframe.HyperFrameRecord.create_table(self.local_engine)
+        hyperframe.FrameRecord.create_table(self.local_engine)
+
+    def get_object_dir(self):
+        return self.object_dir
+
+
+def test_get_frames_frame_cache():
+    object_dir = tempfile.mkdtemp()
+    try:
+        hfid = str(uuid.uuid1())
+        frs = [_make_frame('f{}'.format(i), 100) for i in range(3)]
+        os.makedirs(os.path.join(object_dir, hfid))
+        for fr in frs:
+            hyperframe.w_pb_fs(os.path.join(object_dir, hfid), fr)
+        hfr = hyperframe.HyperFrameRecord(owner='fc', human_name='fc', processing_name='FrameCacheTask', uuid=hfid,
+                                          frames=[(fr.pb.name, fr.pb.uuid) for fr in frs])
+
+        ctxt = _ObjectDirContext(object_dir, 1 << 20)
+        first = hfr.get_frames(ctxt)
+        assert ctxt.frame_cache.stats()['misses'] == 3
+
+        """ A fresh copy of the hframe shares the parsed frames """
+        copy = hyperframe.HyperFrameRecord.from_str_bytes(hfr.pb.SerializeToString())
+        again = copy.get_frames(ctxt)
+        assert ctxt.frame_cache.stats()['hits'] == 3
+        assert sorted(id(fr) for fr in again) == sorted(id(fr) for fr in first)
+        assert all(fr.hframe_uuid == hfid for fr in again)
+    finally:
+        shutil.rmtree(object_dir)
+
+
+def test_load_frames():
+    """
+    Frames come from the catalog blobs in one query, and from their files if the catalog lacks them.
+    """
+    object_dir = tempfile.mkdtemp()
+    try:
+        ctxt = _ObjectDirContext(object_dir, 1 << 20)
+        hfrs = []
+        for i in range(3):
+            hfid = str(uuid.uuid1())
+            frs = [_make_frame('f{}'.format(j), 10) for j in range(4)]
+            for fr in frs:
+                fr.hframe_uuid = hfid
+            os.makedirs(os.path.join(object_dir, hfid))
+            for fr in frs:
+                hyperframe.w_pb_fs(os.path.join(object_dir, hfid), fr)
+            hfr = hyperframe.HyperFrameRecord(owner='fc', human_name='fc', processing_name='LoadFramesTask',
+                                              uuid=hfid, frames=[(fr.pb.name, fr.pb.uuid) for fr in frs])
+            """ The first hframe's frames are only on disk """
+            hyperframe.w_bundles_db((hfr, frs if i > 0 else []), ctxt.local_engine)
+            hfrs.append((hfr, frs))
+
+        in_db = [fr.pb.uuid for _, frs in hfrs[1:] for fr in frs]
+        assert set(fr.pb.uuid for fr in hyperframe.select_fr_db(ctxt.local_engine, in_db, batch=3)) == set(in_db)
+
+        frames = ctxt.load_frames([hfr for hfr, _ in hfrs])
+        for hfr, frs in hfrs:
+            for fr in frs:
+                assert frames[fr.pb.uuid].pb == fr.pb
+                assert frames[fr.pb.uuid].hframe_uuid == hfr.pb.uuid
+
+        """ Only some frames """
+        hfr, frs = hfrs[2]
+        ctxt.frame_cache.clear()
+        found = hfr.get_frames(ctxt, names=['f1', 'f3'])
+        assert [fr.pb.uuid for fr in found] == [frs[1].pb.uuid, frs[3].pb.uuid]
+        assert len(ctxt.frame_cache) == 2
+    finally:
+        shutil.rmtree(object_dir)
+
+
+def test_convert_hfr2df():
+    """
+    Columns come back in frame order, as the frames' arrays, and the dataframe can be modified.
+    """
+    object_dir = tempfile.mkdtemp()
+    try:
+        ctxt = _ObjectDirContext(object_dir, 1 << 20)
+        hfid = str(uuid.uuid1())
+        bundle_dir = os.path.join(object_dir, hfid)
+        os.makedirs(bundle_dir)
+
+        df = pd.DataFrame(collections.OrderedDict([('zeta', np.arange(100, dtype=np.int64)),
+                                                   ('alpha', np.linspace(0, 1, 100)),
+                                                   ('mid', ['s{}'.format(i) for i in range(100)]),
+                                                   ('flag', np.arange(100) % 3 == 0),
+                                                   ('big', np.arange(100, dtype=np.float64) * 2)]))
+        frames = [hyperframe.FrameRecord.from_serieslike(hfid, c, df[c], sidecar_dir=bundle_dir,
+                                                         sidecar_size=800 if c == 'big' else 0)
+                  for c in df.columns]
+        assert [fr.is_sidecar_frame() for fr in frames] == [False, False, False, False, True]
+        hfr = hyperframe.HyperFrameRecord(owner='df', human_name='df', processing_name='DFTask', uuid=hfid,
+                                          frames=frames)
+        hyperframe.w_bundles_db((hfr, frames), ctxt.local_engine)
+
+        found = ctxt.convert_hfr2df(hfr)
+        assert list(found.columns) == list(df.columns)
+        assert found.equals(df)
+
+        """ Modify in place, the sidecar file keeps its data """
+        found['zeta'] += 1
+        found.loc[0, 'big'] = -1.0
+        assert found['zeta'].iloc[0] == 1
+        again = ctxt.convert_hfr2df(hyperframe.HyperFrameRecord.from_str_bytes(hfr.pb.SerializeToString()))
+        assert again.equals(df)
+
+        """ Ragged columns are aligned """
+        ragged = data_context.DataContext.convert_arrays2df(['a', 'b'], [np.arange(3), np.arange(2)])
+        assert ragged.shape == (3, 2)
+        assert np.isnan(ragged['b'].iloc[2])
+    finally:
+        shutil.rmtree(object_dir)
+
+
+def test_typed_frames_convert_hfr2df():
+    """
+    Datetime, categorical, and nullable columns come back with their dtypes, not as strings.
+    """
+    object_dir = tempfile.mkdtemp()
+    try:
+        ctxt = _ObjectDirContext(object_dir, 1 << 20)
+        hfid = str(uuid.uuid1())
+
+        df = pd.DataFrame(collections.OrderedDict([('when', pd.date_range('2020-01-01', periods=6, freq='h')),
+                                                   ('took', pd.to_timedelta(np.arange(6), unit='s')),
+                                                   ('status', pd.Categorical(['ok', 'failed', 'ok'] * 2)),
+                                                   ('note', ['a', None, 'c', None, 'e', 'f'])]))
+        frames = [data_context.DataContext.convert_serieslike2frame(hfid, c, df[c], None) for c in df.columns]
+        hfr = hyperframe.HyperFrameRecord(owner='df', human_name='df', processing_name='DFTask', uuid=hfid,
+                                          frames=frames)
+        hyperframe.w_bundles_db((hfr, frames), ctxt.local_engine)
+
+        found = ctxt.convert_hfr2df(hfr)
+        assert [str(t) for t in found.dtypes] == ['datetime64[ns]', 'timedelta64[ns]', 'category', 'object']
+        assert found[['when', 'took', 'status']].equals(df[['when', 'took', 'status']])
+        assert found['note'].isnull().tolist() == df['note'].isnull().tolist()
+        assert found['note'].iloc[0] == 'a'
+    finally:
+        shutil.rmtree(object_dir)
+
+
+def test_convert_hfr2df_rows():
+    """
+    Only some rows of each kind of frame, and only some columns.
+    """
+    object_dir = tempfile.mkdtemp()
+    try:
+        ctxt = _ObjectDirContext(object_dir, 1 << 20)
+        hfid = str(uuid.uuid1())
+        bundle_dir = os.path.join(object_dir, hfid)
+        os.makedirs(bundle_dir)
+
+        df = pd.DataFrame(collections.OrderedDict([('zeta', np.arange(100, dtype=np.int64)),
+                                                   ('big', np.arange(100, dtype=np.float64) * 2),
+                                                   ('mid', [u's{}'.format(i) for i in range(100)]),
+                                                   ('note', ['n{}'.format(i) if i % 3 else None for i in range(100)]),
+                                                   ('status', pd.Categorical(['ok', 'failed'] * 50)),
+                                                   ('when', pd.date_range('2020-01-01', periods=100, freq='h'))]))
+        frames = [hyperframe.FrameRecord.from_serieslike(hfid, c, df[c], sidecar_dir=bundle_dir,
+                                                         sidecar_size=800 if c == 'big' else 0)
+                  for c in df.columns]
+        assert frames[1].is_sidecar_frame()
+        hfr = hyperframe.HyperFrameRecord(owner='df', human_name='df', processing_name='DFTask', uuid=hfid,
+                                          frames=frames, presentation=hyperframe_pb2.DF)
+        hyperframe.w_bundles_db((hfr, frames), ctxt.local_engine)
+
+        for rows in (slice(10), slice(7, 31), slice(95, 200), slice(-5, None), slice(3, 60, 7), slice(50, 50)):
+            found = ctxt.convert_hfr2df(hfr, rows=rows)
+            expected = df.iloc[rows].reset_index(drop=True)
+            assert found.drop('note', axis=1).equals(expected.drop('note', axis=1))
+            assert found['note'].isnull().tolist() == expected['note'].isnull().tolist()
+            assert found['note'].dropna().tolist() == expected['note'].dropna().tolist()
+
+        found = ctxt.present_hfr(hfr, columns=['mid', 'zeta'], rows=slice(2))
+        assert found.equals(df[['mid', 'zeta']].iloc[:2])
+
+        with pytest.raises(Exception):
+            ctxt.convert_hfr2df(hfr, rows=slice(None, None, -1))
+
+        """ Tensors have rows, not columns """
+        tensor = np.arange(60, dtype=np.int32).reshape((20, 3))
+        frames = [hyperframe.FrameRecord.from_ndarray(hfid, 'tensor', tensor)]
+        hfr = hyperframe.HyperFrameRecord(owner='df', human_name='tensor', processing_name='TensorTask',
+                                          uuid=str(uuid.uuid1()), frames=frames, presentation=hyperframe_pb2.TENSOR)
+        hyperframe.w_bundles_db((hfr, frames), ctxt.local_engine)
+        assert np.array_equal(ctxt.present_hfr(hfr, rows=slice(4, 6)), tensor[4:6])
+        with pytest.raises(Exception):
+            ctxt.present_hfr(hfr, columns=['tensor'])
+    finally:
+        shutil.rmtree(object_dir)
+
+
+def test_chunked_columns(monkeypatch):
+    """
+    Numeric columns go to a sidecar once their chunks reach sidecar_size, other columns are held until close.
+    """
+    settings = data_context.storage_settings(_make_parser())
+    settings['sidecar_size'] = 300
+    monkeypatch.setattr(data_context, 'storage_settings', lambda parser=None: settings)
+
+    object_dir = tempfile.mkdtemp()
+    try:
+        hfid = str(uuid.uuid1())
+        bundle_dir = os.path.join(object_dir, hfid)
+        os.makedirs(bundle_dir)
+
+        chunks = [pd.DataFrame(collections.OrderedDict([('ints', np.arange(i * 50, (i + 1) * 50, dtype=np.int32)),
+                                                        ('names', ['n{}'.format(j) for j in range(50)]),
+                                                        ('status', pd.Categorical(['ok', 'retry'][i % 2:] * 50)[:50])]))
+                  for i in range(4)]
+        columns = [data_context.ChunkedColumn(hfid, c, bundle_dir) for c in chunks[0].columns]
+        for chunk in chunks:
+            for column in columns:
+                column.append(chunk[column.name].values)
+            assert (columns[0].appender is not None) == (chunk is not chunks[0])
+            assert len(columns[1].chunks) > 0
+        frames = [column.close() for column in columns]
+
+        assert [fr.is_sidecar_frame() for fr in frames] == [True, False, False]
+        expected = pd.concat(chunks, ignore_index=True)
+        assert np.array_equal(frames[0].to_ndarray(data_dir=bundle_dir), expected['ints'].values)
+        assert frames[0].to_ndarray(data_dir=bundle_dir).dtype == np.int32
+        assert frames[1].to_ndarray().tolist() == expected['names'].tolist()
+        assert frames[2].to_values().tolist() == expected['status'].tolist()
+
+        """ Held chunks widen the column's dtype, chunks after it is in a sidecar promote it """
+        column = data_context.ChunkedColumn(hfid, 'ints', bundle_dir)
+        column.append(np.arange(50, dtype=np.int16))
+        column.append(np.arange(50, dtype=np.int64))
+        assert column.appender.dtype == np.int64
+        column.append(np.array([np.nan] * 50))
+        assert column.appender.dtype == np.float64
+        fr = column.close()
+        assert fr.pb.type == hyperframe_pb2.FLOAT64
+        found = fr.to_ndarray(data_dir=bundle_dir)
+        assert found[:100].tolist() == range(50) * 2
+        assert np.isnan(found[100:]).all()
+
+        """ Strings after a sidecar hold its rows, memory mapped, until close makes them all strings """
+        column = data_context.ChunkedColumn(hfid, 'ints', bundle_dir)
+        column.append(np.arange(50, dtype=np.int64))
+        sidecar = column.appender.path
+        column.append(np.array(['a'] * 50, dtype=np.object_))
+        assert column.appender is None and isinstance(column.chunks[0], np.memmap)
+        fr = column.close()
+        assert not os.path.exists(sidecar)
+        assert fr.to_ndarray().tolist() == [str(i) for i in range(50)] + ['a'] * 50
+
+        """ A failed generator removes the sidecars written so far """
+        def fail():
+            yield pd.DataFrame({'ints': np.arange(50)})
+            raise ValueError('failed')
+        sidecars = set(os.listdir(bundle_dir))
+        with pytest.raises(ValueError):
+            pipe_base.PipeBase.convert_chunks2frames(hfid, fail(), bundle_dir)
+        assert set(os.listdir(bundle_dir)) == sidecars
+
+        """ Without a local managed path, everything is held until close """
+        column = data_context.ChunkedColumn(hfid, 'ints', None)
+        for chunk in chunks:
+            column.append(chunk['ints'].values)
+        assert column.appender is None
+        assert np.array_equal(column.close().to_ndarray(), expected['ints'].values)
+    finally:
+        shutil.rmtree(object_dir)
+
+
+@pytest.mark.skipif(hyperframe.PYARROW is None, reason="Parquet frames need pyarrow")
+def test_parquet_frames_convert_hfr2df(monkeypatch):
+    """
+    Columns in the bundle's Parquet file are read back in frame order, and only those asked for.
+    """
+    # Rows are read a row group at a time
+    monkeypatch.setattr(hyperframe, 'PARQUET_ROW_GROUP_ROWS', 16)
+    object_dir = tempfile.mkdtemp()
+    try:
+        ctxt = _ObjectDirContext(object_dir, 1 << 20)
+        hfid = str(uuid.uuid1())
+        bundle_dir = os.path.join(object_dir, hfid)
+        os.makedirs(bundle_dir)
+
+        df = pd.DataFrame(collections.OrderedDict([('zeta', np.arange(100, dtype=np.int64)),
+                                                   ('alpha', np.linspace(0, 1, 100)),
+                                                   ('mid', [u's{}'.format(i) for i in range(100)]),
+                                                   ('flag', np.arange(100) % 3 == 0),
+                                                   ('mixed', [1, 'a'] * 50)]))
+        is_parquet = [data_context.DataContext.is_parquet_column(df[c].values) for c in df.columns]
+        assert is_parquet == [True, True, True, True, False]
+
+        frames = hyperframe.FrameRecord.make_parquet_frames(hfid, df[['zeta', 'alpha', 'mid', 'flag']], bundle_dir)
+        frames.append(hyperframe.FrameRecord.from_serieslike(hfid, 'mixed', df['mixed']))
+        assert [fr.is_parquet_frame() for fr in frames] == is_parquet
+        assert os.listdir(bundle_dir) == [hyperframe.parquet_filename(hfid)]
+        assert hyperframe.get_files_in_dir(bundle_dir) == []
+        hfr = hyperframe.HyperFrameRecord(owner='df', human_name='df', processing_name='DFTask', uuid=hfid,
+                                          frames=frames)
+        hyperframe.w_bundles_db((hfr, frames), ctxt.local_engine)
+
+        found = ctxt.convert_hfr2df(hfr)
+        assert list(found.columns) == list(df.columns)
+        assert found[['zeta', 'alpha', 'mid', 'flag']].equals(df[['zeta', 'alpha', 'mid', 'flag']])
+        assert found['mixed'].tolist() == ['1', '"a"'] * 50
+
+        found = ctxt.convert_hfr2df(hfr, columns=['mid', 'zeta'])
+        assert found.equals(df[['mid', 'zeta']])
+
+        found = ctxt.convert_hfr2df(hfr, columns=['mid', 'zeta'], rows=slice(40, 60, 2))
+        assert found.equals(df[['mid', 'zeta']].iloc[40:60:2].reset_index(drop=True))
+        found['zeta'] += 1
+        assert np.array_equal(frames[0].to_ndarray(data_dir=bundle_dir), df['zeta'].values)
+
+        with pytest.raises(Exception):
+            ctxt.convert_hfr2df(hfr, columns=['nope'])
+    finally:
+        shutil.rmtree(object_dir)
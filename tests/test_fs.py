@@ -4,6 +4,7 @@ Test for hyperframe implementations.
 
 
 from sqlalchemy import create_engine
+import argparse
 import os
 import shutil
 import tempfile
@@ -137,3 +138,21 @@ def _add_and_load_dir(disdatfs):
 ##########################################
 
 
+
+
+def test_cat_head_or_rows(monkeypatch):
+    """
+    argparse rejects 'dsdt cat' with both --head and --rows.
+    """
+    monkeypatch.setattr(disdat.fs, 'DisdatFS', lambda: None)
+    parser = argparse.ArgumentParser(prog='dsdt')
+    disdat.fs.init_fs_cl(parser.add_subparsers())
+
+    args = parser.parse_args(['cat', 'sales', '--head', '3'])
+    assert (args.head, args.rows) == (3, None)
+    args = parser.parse_args(['cat', 'sales', '--rows', '100:200'])
+    assert (args.head, args.rows) == (None, '100:200')
+
+    with pytest.raises(SystemExit) as e:
+        parser.parse_args(['cat', 'sales', '--head', '3', '--rows', '100:200'])
+    assert e.value.code != 0
@@ -4,15 +4,21 @@ Test for hyperframe implementations.
 
 
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import mysql
 import disdat.hyperframe as hyperframe
+import disdat.integrity as integrity
 from disdat.hyperframe import r_pb_db, r_pb_fs, w_pb_db, w_pb_fs
+import copy
+import datetime
 import os
+import pickle
 import shutil
 import hashlib
 import tempfile
 import uuid
 import pandas as pd
 import numpy as np
+import pytest
 
 
 def _make_linkauth_records():
@@ -387,3 +393,729 @@ def test_link_rw_db():
 
 
 
+
+
+##########################################
+# Catalog Query Test Calls
+##########################################
+
+
+def _make_simple_hframe_record(name, processing_name, tags=None):
+    """
+    Create a hyperframe with a single frame of int data.
+
+    Returns:
+        (`HyperFrameRecord`)
+    """
+    hfid = str(uuid.uuid1())
+    frames = [hyperframe.FrameRecord.from_ndarray(hfid, 'int_data', test_data['int_data'])]
+    return hyperframe.HyperFrameRecord(owner='vklartho', human_name=name, processing_name=processing_name,
+                                       uuid=hfid, frames=frames, tags=tags)
+
+
+def test_select_update_delete_hfr_db():
+    """
+    Write a few hframes, then find, update, and delete them through the catalog queries.
+    """
+    engine = create_engine('sqlite:///:memory:')
+    hyperframe.HyperFrameRecord.create_table(engine)
+
+    hf1 = _make_simple_hframe_record('sales.daily', 'SalesTask_1', tags={'region': 'west', 'root_task': 'True'})
+    hf2 = _make_simple_hframe_record('sales.daily', 'SalesTask_2', tags={'region': 'east'})
+    hf3 = _make_simple_hframe_record('salesXweekly', 'SalesTask_3', tags={'region': 'west'})
+    for hf in (hf1, hf2, hf3):
+        w_pb_db(hf, engine)
+
+    """ Exact matches and tag joins """
+    found = hyperframe.select_hfr_db(engine, human_name='sales.daily')
+    assert len(found) == 2  # '.' is a single character wildcard, but not '.*'
+
+    found = hyperframe.select_hfr_db(engine, processing_name='SalesTask_2')
+    assert [hfr.pb.uuid for hfr in found] == [hf2.pb.uuid]
+
+    found = hyperframe.select_hfr_db(engine, tags={'region': 'west'})
+    assert set(hfr.pb.uuid for hfr in found) == {hf1.pb.uuid, hf3.pb.uuid}
+
+    found = hyperframe.select_hfr_db(engine, tags={'region': 'west', 'root_task': True})
+    assert [hfr.pb.uuid for hfr in found] == [hf1.pb.uuid]
+
+    found = hyperframe.select_hfr_db(engine, processing_name='SalesTask_3', tags={'region': 'east'})
+    assert len(found) == 0
+
+    """ Same shape, different values, re-uses the statement """
+    found = hyperframe.select_hfr_db(engine, tags={'region': 'east'})
+    assert [hfr.pb.uuid for hfr in found] == [hf2.pb.uuid]
+
+    """ Pattern match and group by """
+    rows = hyperframe.select_hfr_db(engine, human_name='sales.*', groupby=True)
+    assert set(r['human_name'] for r in rows) == {'sales.daily', 'salesXweekly'}
+
+    """ Projection rows carry the tags and only parse the pb on demand """
+    rows = hyperframe.select_hfr_db(engine, tags={'region': 'west'}, orderby=True, projection=True)
+    assert set(r.uuid for r in rows) == {hf1.pb.uuid, hf3.pb.uuid}
+    row = [r for r in rows if r.uuid == hf1.pb.uuid][0]
+    assert row.tag_dict == {'region': 'west', 'root_task': 'True'}
+    assert row.processing_name == 'SalesTask_1'
+    assert row._record is None and row._pb_bytes is None
+    assert row.pb.uuid == hf1.pb.uuid
+    assert row.record.frame_dict == hf1.frame_dict
+
+    """ Update state """
+    hyperframe.update_hfr_db(engine, hyperframe.RecordState.deleted, uuid=hf1.pb.uuid)
+    found = hyperframe.select_hfr_db(engine, state=hyperframe.RecordState.deleted)
+    assert [hfr.pb.uuid for hfr in found] == [hf1.pb.uuid]
+    assert found[0].state == hyperframe.RecordState.deleted
+
+    """ Delete removes hframe and its tags """
+    hyperframe.delete_hfr_db(engine, uuid=hf1.pb.uuid)
+    assert len(hyperframe.select_hfr_db(engine, uuid=hf1.pb.uuid)) == 0
+    with engine.connect() as conn:
+        tag_uuids = [r['uuid'] for r in conn.execute('SELECT uuid from hframes_tags')]
+    assert hf1.pb.uuid not in tag_uuids
+    assert len(tag_uuids) == 2
+
+
+def test_create_indexes():
+    """
+    Tables created before the catalog indexes existed get them added in place.
+    """
+    engine = create_engine('sqlite:///:memory:')
+    with engine.connect() as conn:
+        conn.execute('CREATE TABLE hframes (uuid VARCHAR(50) PRIMARY KEY, owner VARCHAR, human_name VARCHAR, '
+                     'processing_name VARCHAR, creation_date DATETIME, state VARCHAR(7), pb BLOB)')
+        conn.execute('CREATE TABLE hframes_tags (key VARCHAR, uuid VARCHAR(50), value VARCHAR, '
+                     'CONSTRAINT uix_1 UNIQUE (key, uuid))')
+
+    created = hyperframe.HyperFrameRecord.create_indexes(engine)
+    assert set(created) == {'ix_hframes_processing_name_creation_date',
+                            'ix_hframes_human_name_creation_date',
+                            'ix_hframes_state',
+                            'ix_hframes_creation_date_uuid',
+                            'ix_hframes_tags_key_value_uuid',
+                            'ix_hframes_tags_uuid'}
+
+    assert hyperframe.HyperFrameRecord.create_indexes(engine) == []
+
+
+def test_w_bundles_db():
+    """
+    Write several bundles in one transaction, then write one again to exercise the duplicate fallback.
+    """
+    engine = create_engine('sqlite:///:memory:')
+    hyperframe.HyperFrameRecord.create_table(engine)
+    hyperframe.FrameRecord.create_table(engine)
+
+    hfrs = [_make_simple_hframe_record('bulk', 'BulkTask_{}'.format(i), tags={'i': str(i)}) for i in range(3)]
+    bundles = [(hfr, list(hfr.frame_cache.values())) for hfr in hfrs]
+
+    assert hyperframe.w_bundles_db(bundles, engine) == 3
+    assert len(hyperframe.select_hfr_db(engine, human_name='bulk')) == 3
+    assert len(r_pb_db(hyperframe.FrameRecord, engine)) == 3
+    assert [hfr.pb.uuid for hfr in hyperframe.select_hfr_db(engine, tags={'i': '1'})] == [hfrs[1].pb.uuid]
+
+    hf_new = _make_simple_hframe_record('bulk', 'BulkTask_3')
+    hyperframe.w_bundles_db([bundles[0], (hf_new, list(hf_new.frame_cache.values()))], engine)
+    assert len(hyperframe.select_hfr_db(engine, human_name='bulk')) == 4
+    assert len(r_pb_db(hyperframe.FrameRecord, engine)) == 4
+
+
+def test_select_hfr_db_latest_and_limit():
+    """
+    Push latest and limit down into SQL.
+    """
+    engine = create_engine('sqlite:///:memory:')
+    hyperframe.HyperFrameRecord.create_table(engine)
+
+    hfrs = []
+    for i, name in enumerate(['a', 'b', 'a', 'b', 'a']):
+        hfr = _make_simple_hframe_record(name, 'Task_{}'.format(name), tags={'v': str(i)})
+        hfr.pb.lineage.creation_date = 1000.0 + i
+        hfrs.append(hfr)
+        w_pb_db(hfr, engine)
+
+    found = hyperframe.select_hfr_db(engine, human_name='a', orderby=True, limit=1)
+    assert [hfr.pb.uuid for hfr in found] == [hfrs[4].pb.uuid]
+
+    found = hyperframe.select_hfr_db(engine, processing_name='Task_b', orderby=True, limit=5)
+    assert [hfr.pb.uuid for hfr in found] == [hfrs[3].pb.uuid, hfrs[1].pb.uuid]
+
+    found = hyperframe.select_hfr_db(engine, orderby=True, latest_only=True)
+    assert [hfr.pb.uuid for hfr in found] == [hfrs[4].pb.uuid, hfrs[3].pb.uuid]
+
+    """ Latest among the hframes that match the filter """
+    found = hyperframe.select_hfr_db(engine, tags={'v': '2'}, orderby=True, latest_only=True)
+    assert [hfr.pb.uuid for hfr in found] == [hfrs[2].pb.uuid]
+
+    """ Limit counts hframes, not tag rows """
+    rows = hyperframe.select_hfr_db(engine, human_name='a', orderby=True, projection=True, limit=2)
+    assert [r.uuid for r in rows] == [hfrs[4].pb.uuid, hfrs[2].pb.uuid]
+    assert rows[0].tag_dict == {'v': '4'}
+
+    rows = hyperframe.select_hfr_db(engine, orderby=True, projection=True, latest_only=True, limit=1)
+    assert [r.uuid for r in rows] == [hfrs[4].pb.uuid]
+
+    """ MySQL does not allow LIMIT in an IN subquery """
+    shape = hyperframe._filter_shape(None, None, 'a', None, None, [])
+    sql = str(hyperframe._select_stmt(shape, True, False, True, True).compile(dialect=mysql.dialect()))
+    assert 'LIMIT' in sql and ' IN (SELECT' not in sql
+
+    """ Projections do not read the pb blobs """
+    assert 'hframes.pb' not in sql
+
+
+def test_select_lineage_db():
+    """
+    Walk a diamond a -> (b, c) -> d upstream and downstream.  a was made from a bundle
+    that is not in this catalog.
+    """
+    engine = create_engine('sqlite:///:memory:')
+    hyperframe.HyperFrameRecord.create_table(engine)
+
+    ext_uuid = str(uuid.uuid1())
+    hfrs = {}
+
+    def make(name, parents):
+        hfid = str(uuid.uuid1())
+        depends_on = [(p, ext_uuid if p == 'ExtTask' else hfrs[p].pb.uuid) for p in parents]
+        lr = hyperframe.LineageRecord(hframe_name=name, hframe_uuid=hfid, code_repo='repo', code_name='lin',
+                                      code_semver='0.1.0', code_hash='abc', code_branch='develop',
+                                      depends_on=depends_on)
+        hfrs[name] = hyperframe.HyperFrameRecord(owner='lin', human_name=name.lower(), processing_name=name,
+                                                 uuid=hfid, lin_obj=lr)
+        w_pb_db(hfrs[name], engine)
+
+    make('A', ['ExtTask'])
+    make('B', ['A'])
+    make('C', ['A', 'A'])
+    make('D', ['B', 'C'])
+
+    nodes = hyperframe.select_lineage_db(engine, hfrs['D'].pb.uuid)
+    assert [(n.processing_name, n.depth) for n in nodes[:2]] == sorted([('B', 1), ('C', 1)],
+                                                                      key=lambda t: hfrs[t[0]].pb.uuid)
+    assert [(n.processing_name, n.depth) for n in nodes[2:]] == [('A', 2), ('ExtTask', 3)]
+    assert nodes[3].uuid == ext_uuid and nodes[3].human_name is None
+
+    nodes = hyperframe.select_lineage_db(engine, hfrs['D'].pb.uuid, depth=1)
+    assert set(n.processing_name for n in nodes) == {'B', 'C'}
+
+    nodes = hyperframe.select_lineage_db(engine, hfrs['A'].pb.uuid, direction='downstream')
+    assert [(n.human_name, n.depth) for n in nodes][2:] == [('d', 2)]
+    assert len(hyperframe.select_lineage_db(engine, ext_uuid, direction='downstream')) == 4
+
+    """ Deleting a bundle removes its edges to its inputs, but not the edges to it """
+    hyperframe.delete_hfr_db(engine, uuid=hfrs['C'].pb.uuid)
+    nodes = hyperframe.select_lineage_db(engine, hfrs['A'].pb.uuid, direction='downstream')
+    assert set((n.processing_name, n.depth) for n in nodes) == {('B', 1), ('D', 2)}
+    nodes = hyperframe.select_lineage_db(engine, hfrs['D'].pb.uuid, depth=1)
+    assert set((n.processing_name, n.human_name) for n in nodes) == {('B', 'b'), ('C', None)}
+
+
+def test_iter_hfr_db():
+    """
+    Page through hframes with a small page size, including ties on creation_date,
+    and remove hframes while we iterate.
+    """
+    engine = create_engine('sqlite:///:memory:')
+    hyperframe.HyperFrameRecord.create_table(engine)
+
+    hfrs = [_make_simple_hframe_record('pages', 'PageTask_{}'.format(i), tags={'page': 'yes'}) for i in range(7)]
+    for i, hfr in enumerate(hfrs):
+        # Three pairs of hframes share a creation date
+        hfr.pb.lineage.creation_date = 1000.0 + i // 2
+        w_pb_db(hfr, engine)
+
+    expected = [hfr.pb.uuid for hfr in hyperframe.select_hfr_db(engine, human_name='pages', orderby=True)]
+    assert len(expected) == 7
+
+    for page_size in (1, 2, 3, 7, 100):
+        found = [hfr.pb.uuid for hfr in hyperframe.iter_hfr_db(engine, human_name='pages', page_size=page_size)]
+        assert found == expected
+        rows = list(hyperframe.iter_hfr_db(engine, tags={'page': 'yes'}, projection=True, page_size=page_size))
+        assert [r.uuid for r in rows] == expected
+        assert all(r.tag_dict == {'page': 'yes'} for r in rows)
+
+    assert len(list(hyperframe.iter_pb_db(hyperframe.HyperFrameRecord, engine, page_size=2))) == 7
+
+    """ Remove all but the latest as we go """
+    it = hyperframe.iter_hfr_db(engine, human_name='pages', page_size=2)
+    latest = next(it)
+    for hfr in it:
+        hyperframe.delete_hfr_db(engine, uuid=hfr.pb.uuid)
+    assert [hfr.pb.uuid for hfr in hyperframe.select_hfr_db(engine, human_name='pages')] == [latest.pb.uuid]
+
+
+def test_hframe_frame_views():
+    """
+    Nested hframes are views of the frame's pb until they are modified.
+    """
+    children = [_make_simple_hframe_record('child_{}'.format(i), 'ChildTask', tags={'i': str(i)}) for i in range(3)]
+    fr = hyperframe.FrameRecord.make_hframe_frame(str(uuid.uuid1()), 'children', children)
+    fr_bytes = fr.pb.SerializeToString()
+    assert [pb for pb in fr.pb.hframes] == [c.pb for c in children]
+
+    views = fr.get_hframes()
+    assert [v.pb.uuid for v in views] == [c.pb.uuid for c in children]
+    assert [v.get_tag('i') for v in views] == ['0', '1', '2']
+    assert all(v._pb_shared for v in views)
+
+    """ Modifying a view copies its pb and leaves the frame alone """
+    new_uuid = str(uuid.uuid1())
+    views[0].mod_uuid(new_uuid)
+    views[1].replace_tags({'j': 'x'})
+    views[2].add_tags({'k': 'y'})
+    assert not any(v._pb_shared for v in views)
+    assert views[0].pb.uuid == new_uuid
+    assert views[1].get_tags() == {'j': 'x'}
+    assert fr.pb.SerializeToString() == fr_bytes
+    assert [v.pb.uuid for v in fr.get_hframes()] == [c.pb.uuid for c in children]
+
+    """ Modifying the children after making the frame does not change it """
+    children[0].mod_presentation(hyperframe.hyperframe_pb2.DF)
+    assert fr.pb.SerializeToString() == fr_bytes
+
+
+
+def _pb_dicts(hfr):
+    return ({st.k: st.v for st in hfr.pb.frames}, {st.k: st.v for st in hfr.pb.tags})
+
+
+def test_hframe_lazy_dicts():
+    """
+    frame_dict and tag_dict are built on first use, and stay in sync with the pb as frames and tags change.
+    """
+    hfr = _make_simple_hframe_record('lazy', 'LazyTask', tags={'a': '1'})
+    hfid = hfr.pb.uuid
+
+    """ Changes before the dicts are built """
+    hfr.add_frames([hyperframe.FrameRecord.from_ndarray(hfid, 'float64_data', test_data['float64_data'])])
+    hfr.add_tags({'b': '2'})
+    assert (hfr.frame_dict, hfr.tag_dict) == _pb_dicts(hfr)
+    assert sorted(hfr.frame_dict) == ['float64_data', 'int_data']
+    assert hfr.tag_dict == {'a': '1', 'b': '2'}
+
+    """ Changes after """
+    hfr.add_frames([('linked', str(uuid.uuid1()))])
+    hfr.add_tags({'c': '3'})
+    assert (hfr.frame_dict, hfr.tag_dict) == _pb_dicts(hfr)
+    assert hfr.get_tag('c') == '3'
+
+    hfr.replace_tags({'d': '4'})
+    assert hfr.tag_dict == {'d': '4'} == _pb_dicts(hfr)[1]
+    assert hfr.get_tag('a') is None
+
+    hfr.mod_frames([hyperframe.FrameRecord.from_ndarray(hfid, 'string_data', test_data['string_data'])])
+    assert hfr.frame_dict.keys() == ['string_data'] == _pb_dicts(hfr)[0].keys()
+    assert hfr.frame_cache.keys() == ['string_data']
+    assert [fr.pb.name for fr in hfr.get_frames(None)] == ['string_data']
+
+    """ And in views, which copy the pb first """
+    fr = hyperframe.FrameRecord.make_hframe_frame(str(uuid.uuid1()), 'children', [hfr])
+    view = fr.get_hframes()[0]
+    assert view.tag_dict == {'d': '4'}
+    view.add_tags({'e': '5'})
+    view.replace_tags({'f': '6'})
+    assert (view.frame_dict, view.tag_dict) == _pb_dicts(view)
+    assert view.tag_dict == {'f': '6'}
+    assert fr.get_hframes()[0].tag_dict == {'d': '4'}
+
+
+def test_record_pickle_copy():
+    """
+    Slotted records pickle and copy.  Each copy has its own pb and dicts.
+    """
+    hfr = _make_simple_hframe_record('copied', 'CopyTask', tags={'a': '1'})
+    assert hfr.tag_dict == {'a': '1'}
+    fr = hfr.frame_cache['int_data']
+    hfr_bytes = hfr.pb.SerializeToString()
+
+    copiers = [copy.copy, copy.deepcopy,
+               lambda o: pickle.loads(pickle.dumps(o)),
+               lambda o: pickle.loads(pickle.dumps(o, pickle.HIGHEST_PROTOCOL))]
+    for copier in copiers:
+        c = copier(hfr)
+        assert c.pb == hfr.pb and c.pb is not hfr.pb
+        assert (c.frame_dict, c.tag_dict) == (hfr.frame_dict, hfr.tag_dict)
+        assert c.state == hfr.state
+        np.testing.assert_array_equal(c.get_frames(None)[0].to_ndarray(), test_data['int_data'])
+
+        c.add_tags({'b': '2'})
+        c.add_frames([('linked', str(uuid.uuid1()))])
+        assert (c.frame_dict, c.tag_dict) == _pb_dicts(c)
+        assert hfr.pb.SerializeToString() == hfr_bytes
+        assert hfr.tag_dict == {'a': '1'} and hfr.frame_dict.keys() == ['int_data']
+        assert hfr.frame_cache.keys() == ['int_data']
+
+        c_fr = copier(fr)
+        assert c_fr.pb == fr.pb and c_fr.hframe_uuid == fr.hframe_uuid
+
+    """ A copy of a view owns its pb """
+    view = hyperframe.FrameRecord.make_hframe_frame(str(uuid.uuid1()), 'children', [hfr]).get_hframes()[0]
+    c = copy.copy(view)
+    assert not c._pb_shared and c.pb is not view.pb
+
+    link = hyperframe.FileLinkRecord(fr.pb.uuid, None, 'bundle://data.csv')
+    for record in list(_make_linkauth_records()) + [link]:
+        assert pickle.loads(pickle.dumps(record)).pb == record.pb
+
+
+def test_packed_bundle_rw_fs():
+    """
+    A packed bundle holds the hframe and its frames in one file, and r_pb_fs reads
+    records from it where the per-record files would be.
+    """
+    hfid = str(uuid.uuid1())
+    frames = [hyperframe.FrameRecord.from_ndarray(hfid, name, nda) for name, nda in test_data.iteritems()]
+    hfr = hyperframe.HyperFrameRecord(owner='vklartho', human_name='packed_hframe', uuid=hfid, frames=frames,
+                                      lin_obj=_make_lineage_record('packed_hframe', hfid))
+    slar, _ = _make_linkauth_records()
+
+    bundle_dir = os.path.join(testdir, hfr.pb.uuid)
+    os.makedirs(bundle_dir)
+    path = hyperframe.w_packed_fs(bundle_dir, hfr, frames + [slar])
+    assert os.path.basename(path) == hyperframe.packed_filename(hfr.pb.uuid)
+    assert os.listdir(bundle_dir) == [os.path.basename(path)]
+    assert hyperframe.get_files_in_dir(bundle_dir) == []
+
+    records = hyperframe.r_packed_fs(path)
+    assert len(records) == len(frames) + 2
+    assert records[hfr.pb.uuid].pb == hfr.pb
+    assert records[slar.pb.uuid].pb == slar.pb
+    for fr in frames:
+        assert isinstance(records[fr.pb.uuid], hyperframe.FrameRecord)
+        assert records[fr.pb.uuid].pb == fr.pb
+
+    """ Only the records asked for """
+    some = hyperframe.r_packed_fs(path, uuids=[frames[1].pb.uuid, hfr.pb.uuid])
+    assert sorted(some.keys()) == sorted([frames[1].pb.uuid, hfr.pb.uuid])
+
+    """ Readers of the one-file-per-record layout """
+    assert r_pb_fs(os.path.join(bundle_dir, hfr.get_filename()), hyperframe.HyperFrameRecord).pb == hfr.pb
+    assert r_pb_fs(os.path.join(bundle_dir, frames[0].get_filename()), hyperframe.FrameRecord).pb == frames[0].pb
+
+    """ Atomic rewrite keeps the frames """
+    hfr.replace_tags({'packed': 'True'})
+    hyperframe.w_packed_fs(bundle_dir, hfr, [records[fr.pb.uuid] for fr in frames], atomic=True)
+    records = hyperframe.r_packed_fs(path)
+    assert records[hfr.pb.uuid].get_tag('packed') == 'True'
+    assert len(records) == len(frames) + 1
+
+    with open(os.path.join(bundle_dir, 'not_packed'), 'wb') as f:
+        f.write(b'DSDTXXXX')
+    try:
+        hyperframe.r_packed_fs(os.path.join(bundle_dir, 'not_packed'))
+        assert False, "Read a file that is not a packed bundle"
+    except Exception as e:
+        assert 'packed bundle' in str(e)
+
+
+def test_sidecar_frames():
+    """
+    Arrays of at least sidecar_size bytes are written to .npy files and read back as memory maps.
+    """
+    hfid = str(uuid.uuid1())
+    bundle_dir = os.path.join(testdir, hfid)
+    os.makedirs(bundle_dir)
+
+    big = np.arange(1000, dtype=np.float64).reshape((100, 10))
+    swapped = np.arange(1000, dtype=np.int32).byteswap().newbyteorder()
+    small = np.arange(10, dtype=np.int64)
+
+    frames = [hyperframe.FrameRecord.from_serieslike(hfid, name, nda, sidecar_dir=bundle_dir, sidecar_size=4000)
+              for name, nda in (('big', big), ('swapped', swapped), ('small', small))]
+    assert [fr.is_sidecar_frame() for fr in frames] == [True, True, False]
+    assert not any(fr.is_link_frame() for fr in frames)
+    assert frames[0].pb.data == b''
+    assert sorted(os.listdir(bundle_dir)) == sorted(fr.get_sidecar_filename() for fr in frames[:2])
+    assert hyperframe.get_files_in_dir(bundle_dir) == []
+
+    """ The frames round trip through their pbs """
+    frames = [hyperframe.FrameRecord.from_str_bytes(fr.pb.SerializeToString()) for fr in frames]
+    for fr, nda in zip(frames, (big, swapped, small)):
+        found = fr.to_ndarray(data_dir=bundle_dir)
+        assert np.array_equal(found, nda)
+        assert found.dtype == nda.dtype
+    assert isinstance(frames[0].to_ndarray(data_dir=bundle_dir), np.memmap)
+    assert not frames[0].to_ndarray(data_dir=bundle_dir).flags.writeable
+    assert frames[1].to_series(data_dir=bundle_dir).sum() == swapped.sum()
+
+    try:
+        frames[0].to_ndarray()
+        assert False, "Read a sidecar frame without its bundle directory"
+    except Exception as e:
+        assert frames[0].get_sidecar_filename() in str(e)
+
+    """ No sidecar without a directory, or with sidecar_size 0 """
+    assert not hyperframe.FrameRecord.from_ndarray(hfid, 'big', big, sidecar_size=4000).is_sidecar_frame()
+    assert not hyperframe.FrameRecord.from_ndarray(hfid, 'big', big, sidecar_dir=bundle_dir).is_sidecar_frame()
+
+
+def test_utf8_frames():
+    """
+    Strings are stored as one UTF-8 buffer and its offsets, and STRING frames remain readable.
+    """
+    hfid = str(uuid.uuid1())
+    cases = [np.array(['a', 'bb', '', 'c\x00d']),
+             np.array([u'x', u'\xe9t\xe9', u'']),
+             np.array(['a', 'bc'], dtype=np.object_),
+             np.array([u'\u4e2d', u'b'], dtype=np.object_),
+             np.array([['a', 'b'], ['cc', '']]),
+             np.array(u'\xe9'),
+             np.array([], dtype=np.string_)]
+
+    for nda in cases:
+        fr = hyperframe.FrameRecord.from_ndarray(hfid, 'col', nda)
+        assert fr.pb.type == hyperframe.hyperframe_pb2.UTF8
+        assert len(fr.pb.strings) == 0
+        fr = hyperframe.FrameRecord.from_str_bytes(fr.pb.SerializeToString())
+        found = fr.to_ndarray()
+        assert found.shape == nda.shape
+        assert found.tolist() == nda.tolist()
+
+    """ All ASCII comes back as np.string_, four times smaller than np.unicode_ """
+    assert hyperframe.FrameRecord.from_ndarray(hfid, 'col', cases[2]).to_ndarray().dtype.type == np.string_
+    assert hyperframe.FrameRecord.from_ndarray(hfid, 'col', cases[3]).to_ndarray().dtype.type == np.unicode_
+
+    """ Other objects still take the JSON escape hatch """
+    fr = hyperframe.FrameRecord.from_ndarray(hfid, 'col', np.array([1, 'a', None], dtype=np.object_))
+    assert fr.to_ndarray().tolist() == ['1', '"a"', 'null']
+
+    """ Strings must be UTF-8 """
+    with pytest.raises(Exception):
+        hyperframe.FrameRecord.from_ndarray(hfid, 'col', np.array(['\xff\xfe']))
+
+    """ int32 offsets then the bytes, or int64 offsets past UTF8_MAX_BYTES """
+    frame_type, data = hyperframe.encode_utf8(np.array(['ab', 'c']))
+    assert frame_type == 'UTF8'
+    assert np.frombuffer(data[:12], dtype='<i4').tolist() == [0, 2, 3]
+    assert data[12:] == b'abc'
+    large = np.array([0, 2, 3], dtype='<i8').tobytes() + b'abc'
+    assert hyperframe.decode_utf8(hyperframe.hyperframe_pb2.LARGE_UTF8, large, (2,)).tolist() == ['ab', 'c']
+
+    """ Existing STRING frames, and string_type='STRING' """
+    fr = hyperframe.FrameRecord(name='col', hframe_uuid=hfid, type='STRING', shape=(2,), data=['a', u'\xe9'])
+    assert fr.to_ndarray().tolist() == [u'a', u'\xe9']
+    fr = hyperframe.FrameRecord.from_serieslike(hfid, 'col', pd.Series(['a', 'b']), string_type='STRING')
+    assert fr.pb.type == hyperframe.hyperframe_pb2.STRING
+    assert fr.to_ndarray().tolist() == ['a', 'b']
+
+
+def test_utf8_skewed_lengths():
+    """
+    One long string does not pad every other string to its length, they come back as objects.
+    """
+    hfid = str(uuid.uuid1())
+    strings = [u'a'] * 2000 + [u'x' * 20000] + [u'\xe9'] * 10
+
+    fr = hyperframe.FrameRecord.from_ndarray(hfid, 'col', np.array(strings, dtype=np.object_))
+    nda = fr.to_ndarray()
+    assert nda.dtype == np.object_
+    assert nda.tolist() == strings
+    assert fr.to_ndarray(rows=slice(1999, 2002)).tolist() == ['a', 'x' * 20000, u'\xe9']
+
+    """ Without the long string they are fixed width again """
+    nda = fr.to_ndarray(rows=slice(0, 2000))
+    assert nda.dtype == np.dtype('S1')
+    assert nda.tolist() == strings[:2000]
+
+    """ All ASCII objects are str """
+    fr = hyperframe.FrameRecord.from_ndarray(hfid, 'col', np.array(strings[:2001], dtype=np.object_))
+    assert [type(s) for s in set(fr.to_ndarray())] == [str, str] or set(map(type, fr.to_ndarray())) == {str}
+
+
+def test_typed_frames():
+    """
+    datetime64 and timedelta64 are int64 with a unit, categoricals are codes and a dictionary, and
+    missing values are a validity bitmap, instead of JSON strings.
+    """
+    hfid = str(uuid.uuid1())
+
+    def round_trip(series_like, **kwargs):
+        fr = hyperframe.FrameRecord.from_serieslike(hfid, 'col', series_like, **kwargs)
+        fr = hyperframe.FrameRecord.from_str_bytes(fr.pb.SerializeToString())
+        integrity.verify_pb(fr.pb)
+        return fr, fr.to_values()
+
+    stamps = pd.Series(pd.date_range('2020-01-01', periods=100, freq='s'))
+    stamps[3] = pd.NaT
+    fr, found = round_trip(stamps)
+    assert fr.pb.type == hyperframe.hyperframe_pb2.DATETIME64
+    assert fr.pb.unit == 'ns'
+    assert np.array_equal(found.view(np.int64), stamps.values.view(np.int64))
+
+    for nda in (np.arange(10).astype('m8[10ms]'), np.arange(10).astype('M8[D]')):
+        fr, found = round_trip(nda, codec='zlib', codec_min_size=0)
+        assert found.dtype == nda.dtype
+        assert np.array_equal(found, nda)
+
+    """ Datetime objects are converted with pandas, None becomes NaT """
+    fr, found = round_trip(np.array([datetime.datetime(2020, 1, 1), None], dtype=np.object_))
+    assert fr.pb.type == hyperframe.hyperframe_pb2.DATETIME64
+    assert found[0] == np.datetime64('2020-01-01') and np.isnat(found[1])
+
+    cat = pd.Categorical(['b', 'a', None, 'b'], categories=['b', 'a'], ordered=True)
+    fr, found = round_trip(pd.Series(cat))
+    assert fr.pb.type == hyperframe.hyperframe_pb2.CATEGORICAL
+    assert fr.pb.index_type == hyperframe.hyperframe_pb2.INT8
+    assert fr.pb.dictionary.type == hyperframe.hyperframe_pb2.UTF8
+    assert found.equals(cat)
+    assert fr.to_ndarray().tolist()[:2] == ['b', 'a']
+    assert fr.to_series().dtype.name == 'category'
+
+    """ Missing values in objects, NaN on the way out """
+    cases = [(np.array(['a', None, 'c', np.nan], dtype=np.object_), hyperframe.hyperframe_pb2.UTF8),
+             (np.array([1, None, 3], dtype=np.object_), hyperframe.hyperframe_pb2.INT64),
+             (np.array([True, None], dtype=np.object_), hyperframe.hyperframe_pb2.BOOL)]
+    for nda, frame_type in cases:
+        fr, found = round_trip(nda)
+        assert fr.pb.type == frame_type
+        assert len(fr.pb.validity) == 1
+        assert found.dtype == np.object_
+        assert pd.isnull(found).tolist() == pd.isnull(nda).tolist()
+        assert found[0] == nda[0]
+
+    """ Floats, with or without ints, stay floats """
+    for nda in (np.array([1.5, None, 2], dtype=np.object_), np.array([1.5, None, 2.5], dtype=np.object_)):
+        fr, found = round_trip(nda)
+        assert fr.pb.type == hyperframe.hyperframe_pb2.FLOAT64
+        assert len(fr.pb.validity) == 1
+        assert found.dtype == np.float64
+        assert found[0] == 1.5 and np.isnan(found[1]) and found[2] == nda[2]
+
+    """ Time zone aware datetimes keep their offset as ISO 8601 strings """
+    stamps = pd.Series(pd.date_range('2020-01-01', periods=3, tz='US/Pacific'))
+    stamps[1] = pd.NaT
+    fr, found = round_trip(stamps)
+    assert fr.pb.type == hyperframe.hyperframe_pb2.UTF8
+    assert found[0] == '2020-01-01T00:00:00-08:00' and pd.isnull(found[1])
+    assert pd.Timestamp(found[2]) == stamps[2]
+
+    """ Without missing values there is no bitmap, and numbers come back as numbers """
+    fr, found = round_trip(np.array([1, 2, 3], dtype=np.object_))
+    assert len(fr.pb.validity) == 0
+    assert found.dtype == np.int64
+
+    """ Other objects, and ints past int64, take the JSON escape hatch """
+    fr, found = round_trip(np.array([{'a': 1}, 2 ** 70], dtype=np.object_))
+    assert found.tolist() == ['{"a": 1}', str(2 ** 70)]
+
+
+def test_frame_rows():
+    """
+    to_ndarray and to_values with rows decode only those rows, and agree with slicing everything.
+    """
+    testdir = tempfile.mkdtemp()
+    try:
+        hfid = str(uuid.uuid1())
+        notes = np.array(['n{}'.format(i) if i % 3 else None for i in range(50)], dtype=np.object_)
+        cases = [hyperframe.FrameRecord.from_ndarray(hfid, 'ints', np.arange(50, dtype='>i4')),
+                 hyperframe.FrameRecord.from_ndarray(hfid, 'grid', np.arange(100.0).reshape((50, 2)), codec='zlib',
+                                                     codec_min_size=0),
+                 hyperframe.FrameRecord.from_ndarray(hfid, 'pairs', np.array([[u'\xe9{}'.format(i), 'x']
+                                                                              for i in range(50)])),
+                 hyperframe.FrameRecord.from_ndarray(hfid, 'notes', notes),
+                 hyperframe.FrameRecord.from_ndarray(hfid, 'legacy', np.array(['s{}'.format(i) for i in range(50)]),
+                                                     string_type='STRING'),
+                 hyperframe.FrameRecord.from_ndarray(hfid, 'sidecar', np.arange(50.0), sidecar_dir=testdir,
+                                                     sidecar_size=8),
+                 hyperframe.FrameRecord.from_serieslike(hfid, 'status', pd.Categorical(['a', 'b', 'c', None, 'b'] * 10))]
+
+        for fr in cases:
+            everything = fr.to_ndarray(data_dir=testdir)
+            for rows in (slice(0), slice(5), slice(9, 27), slice(45, 99), slice(-3, None), slice(1, 40, 3)):
+                found = fr.to_ndarray(data_dir=testdir, rows=rows)
+                assert found.shape == everything[rows].shape
+                assert pd.isnull(found).tolist() == pd.isnull(everything[rows]).tolist()
+                assert found[~pd.isnull(found)].tolist() == everything[rows][~pd.isnull(everything[rows])].tolist()
+        assert cases[-1].to_values(rows=slice(2, 4)).tolist() == ['c', np.nan]
+
+        """ A 0-d frame is one row """
+        fr = hyperframe.FrameRecord.from_ndarray(hfid, 'scalar', np.array(7))
+        assert fr.to_ndarray(rows=slice(1)).tolist() == [7]
+        assert fr.to_ndarray(rows=slice(1, None)).tolist() == []
+    finally:
+        shutil.rmtree(testdir)
+
+
+def test_sidecar_appender():
+    """
+    A sidecar written a chunk at a time is a .npy file like np.save writes.
+    """
+    testdir = tempfile.mkdtemp()
+    try:
+        hfid = str(uuid.uuid1())
+        chunks = [np.arange(i * 30, (i + 1) * 30, dtype=np.float64).reshape((10, 3)) for i in range(5)]
+        appender = hyperframe.SidecarAppender(hfid, 'tensor', testdir, np.float64, row_shape=(3,))
+        for chunk in chunks:
+            appender.append(chunk)
+        appender.append(np.arange(3, dtype=np.int32).reshape((1, 3)))
+        fr = appender.close()
+
+        expected = np.concatenate(chunks + [np.arange(3.0).reshape((1, 3))])
+        assert fr.is_sidecar_frame()
+        assert tuple(fr.pb.shape) == expected.shape
+        assert np.array_equal(np.load(os.path.join(testdir, fr.get_sidecar_filename())), expected)
+        found = fr.to_ndarray(data_dir=testdir)
+        assert isinstance(found, np.memmap)
+        assert np.array_equal(found, expected)
+        integrity.verify_pb(fr.pb)
+
+        """ Chunks must keep the row shape, and a finer or wider type promotes the rows so far """
+        appender = hyperframe.SidecarAppender(hfid, 'col', testdir, np.dtype('M8[s]'))
+        appender.PROMOTE_BLOCK_ROWS = 2
+        appender.append(np.array(['2020-01-01', '2020-01-02', '2020-01-03'], dtype='M8[s]'))
+        with pytest.raises(Exception):
+            appender.append(np.zeros((2, 2), dtype='M8[s]'))
+        appender.append(np.array(['2020-01-01T00:00:00.5'], dtype='M8[ms]'))
+        with pytest.raises(Exception):
+            appender.append(np.arange(2))
+        fr = appender.close()
+        assert fr.pb.unit == 'ms'
+        assert fr.to_ndarray(data_dir=testdir).tolist() == np.array(
+            ['2020-01-01', '2020-01-02', '2020-01-03', '2020-01-01T00:00:00.5'], dtype='M8[ms]').tolist()
+        integrity.verify_pb(fr.pb)
+
+        """ abort removes the sidecar """
+        appender = hyperframe.SidecarAppender(hfid, 'col', testdir, np.int64)
+        appender.append(np.arange(5))
+        appender.abort()
+        assert not os.path.exists(appender.path)
+    finally:
+        shutil.rmtree(testdir)
+
+
+@pytest.mark.skipif(hyperframe.PYARROW is None, reason="Parquet frames need pyarrow")
+def test_read_parquet_columns_rows(monkeypatch):
+    """
+    A row range reads only the row groups that hold it, and slices the rows out of them.
+    """
+    monkeypatch.setattr(hyperframe, 'PARQUET_ROW_GROUP_ROWS', 10)
+    testdir = tempfile.mkdtemp()
+    try:
+        df = pd.DataFrame({'i': np.arange(95), 's': ['s{}'.format(i) for i in range(95)]})
+        path = os.path.join(testdir, 'bundle.parquet')
+        hyperframe.write_parquet(path, df)
+        assert hyperframe.PYARROW.parquet.ParquetFile(path).num_row_groups == 10
+
+        groups_read = []
+        read_row_group = hyperframe.PYARROW.parquet.ParquetFile.read_row_group
+
+        def counted(self, i, *args, **kwargs):
+            groups_read.append(i)
+            return read_row_group(self, i, *args, **kwargs)
+
+        monkeypatch.setattr(hyperframe.PYARROW.parquet.ParquetFile, 'read_row_group', counted)
+
+        for rows, groups in ((slice(0, 10), [0]), (slice(5, 15), [0, 1]), (slice(9, 11), [0, 1]),
+                             (slice(10, 20), [1]), (slice(42, 43), [4]), (slice(88, 95), [8, 9]),
+                             (slice(90, 95), [9]), (slice(0, 95), range(10)), (slice(50, 50), [])):
+            del groups_read[:]
+            i, s = hyperframe.read_parquet_columns(path, ['i', 's'], rows=rows)
+            assert groups_read == groups
+            assert i.tolist() == df['i'].values[rows].tolist()
+            assert s.tolist() == df['s'].values[rows].tolist()
+
+        """ Only the columns asked for, in that order """
+        s, = hyperframe.read_parquet_columns(path, ['s'], rows=slice(3, 4))
+        assert s.tolist() == ['s3']
+    finally:
+        shutil.rmtree(testdir)
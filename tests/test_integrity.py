@@ -0,0 +1,157 @@
+"""
+Test record hashes and the [integrity] verify policy.
+"""
+
+import ConfigParser
+import os
+import shutil
+import tempfile
+import uuid
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import disdat.hyperframe as hyperframe
+import disdat.integrity as integrity
+
+
+def _settings(**options):
+    parser = ConfigParser.SafeConfigParser()
+    parser.add_section(integrity.INTEGRITY_SECTION)
+    for k, v in options.iteritems():
+        parser.set(integrity.INTEGRITY_SECTION, k, v)
+    return integrity.integrity_settings(parser)
+
+
+def _write_frame(testdir):
+    fr = hyperframe.FrameRecord(name='col', hframe_uuid=str(uuid.uuid1()), type='STRING',
+                                data=['a', 'b', 'c'])
+    hyperframe.w_pb_fs(testdir, fr)
+    return fr, os.path.join(testdir, fr.get_filename())
+
+
+def test_integrity_settings():
+    assert _settings() == {'hash': 'md5', 'verify': 'always', 'sample_rate': 0.01}
+    assert _settings(hash='XXH64', verify='sampled', sample_rate='0.5') == \
+        {'hash': 'xxh64', 'verify': 'sampled', 'sample_rate': 0.5}
+    for bad in ({'hash': 'crc32'}, {'verify': 'sometimes'}, {'sample_rate': 'half'}, {'sample_rate': '2'}):
+        with pytest.raises(Exception):
+            _settings(**bad)
+
+
+def test_hash_algorithms():
+    testdir = tempfile.mkdtemp()
+    try:
+        for algorithm in ('md5', 'sha256', 'blake2b', 'xxh64'):
+            if integrity.HASH_ALGORITHMS[algorithm] is None:
+                continue
+            integrity.configure(_settings(hash=algorithm))
+            fr, path = _write_frame(testdir)
+            assert integrity.hash_algorithm(fr.pb.hash) == algorithm
+            assert (':' in fr.pb.hash) == (algorithm != 'md5')
+
+            """ Records of every algorithm verify, whatever we hash new records with """
+            integrity.configure(_settings(hash='md5'))
+            read = hyperframe.r_pb_fs(path, hyperframe.FrameRecord)
+            assert read.pb.hash == fr.pb.hash
+            integrity.verify_pb(read.pb)
+    finally:
+        integrity.configure()
+        shutil.rmtree(testdir)
+
+
+def test_verify_policy():
+    testdir = tempfile.mkdtemp()
+    try:
+        fr, path = _write_frame(testdir)
+        with open(path, 'rb') as f:
+            contents = f.read()
+        with open(path, 'wb') as f:
+            f.write(contents.replace('b', 'x'))
+
+        with pytest.raises(Exception):
+            integrity.verify_pb(hyperframe.FrameRecord.from_str_bytes(contents.replace('b', 'x')).pb)
+
+        def read_fails(event):
+            try:
+                hyperframe.r_pb_fs(path, hyperframe.FrameRecord, event=event)
+            except Exception:
+                return True
+            return False
+
+        integrity.configure(_settings(verify='always'))
+        assert [read_fails(e) for e in integrity.READ_EVENTS] == [True, True, True]
+        integrity.configure(_settings(verify='rebuild-and-pull'))
+        assert [read_fails(e) for e in integrity.READ_EVENTS] == [False, True, True]
+        integrity.configure(_settings(verify='never'))
+        assert [read_fails(e) for e in integrity.READ_EVENTS] == [False, False, False]
+        integrity.configure(_settings(verify='sampled', sample_rate='0'))
+        assert [read_fails(e) for e in integrity.READ_EVENTS] == [False, True, True]
+        integrity.configure(_settings(verify='sampled', sample_rate='1'))
+        assert [read_fails(e) for e in integrity.READ_EVENTS] == [True, True, True]
+    finally:
+        integrity.configure()
+        shutil.rmtree(testdir)
+
+
+def test_verify_hash_field_span():
+    """
+    The bytes a pb was parsed from are hashed less the hash field, wherever it is, e.g., before
+    a compressed frame's codec or a frame's validity bitmap.
+    """
+    fr = hyperframe.FrameRecord.from_ndarray(str(uuid.uuid1()), 'col', np.array(['a' * 100] * 100 + [None]),
+                                             codec='zlib', codec_min_size=0)
+    assert fr.pb.codec != 0 and len(fr.pb.validity) > 0
+    contents = fr.pb.SerializeToString()
+
+    start, end = integrity._hash_field_span(fr.pb, contents)
+    assert contents[start:end].endswith(fr.pb.hash)
+    assert end < len(contents)
+    integrity.verify_pb(fr.pb, contents)
+
+    """ A change after the hash field fails too """
+    read = hyperframe.FrameRecord.from_str_bytes(contents)
+    read.pb.validity = chr(ord(read.pb.validity[0]) ^ 1) + read.pb.validity[1:]
+    with pytest.raises(Exception):
+        integrity.verify_pb(read.pb, read.pb.SerializeToString())
+
+
+def test_verify_data_files():
+    """
+    Sidecar and Parquet frames hash their data files, and a changed file fails verify_data_file.
+    """
+    testdir = tempfile.mkdtemp()
+    try:
+        hfid = str(uuid.uuid1())
+        nda = np.arange(1000, dtype=np.float64)
+        frames = [hyperframe.FrameRecord.from_ndarray(hfid, 'whole', nda, sidecar_dir=testdir, sidecar_size=1)]
+        appender = hyperframe.SidecarAppender(hfid, 'appended', testdir, np.int64)
+        appender.append(np.arange(10))
+        appender.append(np.array([0.5]))
+        frames.append(appender.close())
+        if hyperframe.PYARROW is not None:
+            frames.extend(hyperframe.FrameRecord.make_parquet_frames(hfid, pd.DataFrame({'a': nda, 'b': nda}), testdir))
+
+        for fr in frames:
+            assert fr.pb.content_hash == integrity.hash_file(os.path.join(testdir, fr.get_data_filename()))
+            integrity.verify_pb(fr.pb)
+            fr.verify_data_file(testdir)
+
+        # The Parquet frames share one file
+        for filename in set(fr.get_data_filename() for fr in frames):
+            with open(os.path.join(testdir, filename), 'r+b') as f:
+                f.seek(-1, os.SEEK_END)
+                last = f.read(1)
+                f.seek(-1, os.SEEK_END)
+                f.write(chr(ord(last) ^ 1))
+        for fr in frames:
+            with pytest.raises(Exception):
+                fr.verify_data_file(testdir)
+
+        """ Frames written before we hashed their files pass """
+        fr = frames[0]
+        fr.pb.ClearField('content_hash')
+        fr.verify_data_file(testdir)
+    finally:
+        shutil.rmtree(testdir)
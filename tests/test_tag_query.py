@@ -0,0 +1,129 @@
+"""
+Test for tag query implementations.
+"""
+
+
+from sqlalchemy import create_engine
+import uuid
+import disdat.data_context as data_context
+import disdat.hyperframe as hyperframe
+import disdat.tag_query as tag_query
+from disdat.tag_query import TagPredicate
+
+
+def test_parse_tag_query():
+    assert tag_query.parse_tag_query('k', 'v') == TagPredicate('k', 'eq', 'v', None, False)
+    assert tag_query.parse_tag_query('k', True) == TagPredicate('k', 'eq', 'True', None, False)
+    assert tag_query.parse_tag_query('k', '=>5') == TagPredicate('k', 'eq', '>5', None, False)
+    assert tag_query.parse_tag_query('k', '>=0.7') == TagPredicate('k', 'ge', '0.7', None, True)
+    assert tag_query.parse_tag_query('k', '<b') == TagPredicate('k', 'lt', 'b', None, False)
+    assert tag_query.parse_tag_query('k', '1..10') == TagPredicate('k', 'between', '1', '10', True)
+    assert tag_query.parse_tag_query('k', 'genome_*') == TagPredicate('k', 'prefix', 'genome_', None, False)
+    assert tag_query.parse_tag_query('k', '*') == TagPredicate('k', 'exists', None, None, False)
+
+    """ Without operators, every value is an exact match """
+    assert tag_query.parse_tag_queries({'k': '>=0.7', 'j': 'genome_*', 'b': True}) == [
+        TagPredicate('b', 'eq', 'True', None, False),
+        TagPredicate('j', 'eq', 'genome_*', None, False),
+        TagPredicate('k', 'eq', '>=0.7', None, False)]
+
+
+def _make_hfr(tags):
+    return hyperframe.HyperFrameRecord(owner='tq', human_name='tq', processing_name='TagQueryTask',
+                                       uuid=str(uuid.uuid1()), tags=tags)
+
+
+def test_select_hfr_db_tag_query():
+    engine = create_engine('sqlite:///:memory:')
+    hyperframe.HyperFrameRecord.create_table(engine)
+
+    hfrs = [_make_hfr({'version': '0.5', 'dataset': 'genome_a', 'team': 'x'}),
+            _make_hfr({'version': '0.7', 'dataset': 'genome_b', 'team': 'x'}),
+            _make_hfr({'version': '1.2', 'dataset': 'proteome', 'team': 'y'}),
+            _make_hfr({'version': '0.10', 'dataset': 'Genome_c'})]
+    for hfr in hfrs:
+        hyperframe.w_pb_db(hfr, engine)
+
+    def found(tags):
+        return set(hfr.pb.uuid for hfr in hyperframe.select_hfr_db(engine, tags=tags, tag_operators=True))
+
+    def uuids(*indexes):
+        return set(hfrs[i].pb.uuid for i in indexes)
+
+    assert found({'version': '>=0.7'}) == uuids(1, 2)
+    assert found({'version': '<0.7'}) == uuids(0, 3)
+    assert found({'version': '0.6..1.2'}) == uuids(1, 2)
+    assert found({'version': '0.10'}) == uuids(3)
+    assert found({'dataset': 'genome_*'}) == uuids(0, 1)
+    assert found({'team': '*'}) == uuids(0, 1, 2)
+    assert found({'dataset': '>p'}) == uuids(2)
+
+    """ Intersection """
+    assert found({'dataset': 'genome_*', 'version': '>0.5'}) == uuids(1)
+    assert found({'team': 'x', 'dataset': 'genome_*', 'version': '<1'}) == uuids(0, 1)
+    assert found({'team': 'y', 'dataset': 'genome_*'}) == set()
+
+    """ Most selective first """
+    preds = tag_query.parse_tag_queries({'team': '*', 'dataset': 'proteome'}, operators=True)
+    with engine.connect() as conn:
+        ordered = tag_query.order_by_selectivity(conn, hyperframe.HyperFrameRecord.get_tables()['hframes_tags'], preds)
+    assert [p.key for p in ordered] == ['dataset', 'team']
+
+    """ Exact matches are not counted, so need no connection """
+    preds = tag_query.parse_tag_queries({'team': 'x', 'dataset': 'proteome'}, operators=True)
+    assert tag_query.order_by_selectivity(None, None, preds) == preds
+
+
+def test_select_hfr_db_exact_tags():
+    """
+    Tag values that look like operators match exactly unless we ask for operators,
+    e.g., the input tags of a pipeline, or 'dsdt ls -t' without '-to'.
+    """
+    engine = create_engine('sqlite:///:memory:')
+    hyperframe.HyperFrameRecord.create_table(engine)
+
+    hfrs = [_make_hfr({'range': 'v1..v2', 'name': 'prefix*', 'min': '>=3'}),
+            _make_hfr({'range': 'v1', 'name': 'prefix_a', 'min': '3'}),
+            _make_hfr({'range': 'v2', 'name': 'prefix*', 'min': '4'})]
+    for hfr in hfrs:
+        hyperframe.w_pb_db(hfr, engine)
+
+    def found(tags, **kwargs):
+        return set(hfr.pb.uuid for hfr in hyperframe.select_hfr_db(engine, tags=tags, **kwargs))
+
+    def uuids(*indexes):
+        return set(hfrs[i].pb.uuid for i in indexes)
+
+    assert found({'range': 'v1..v2'}) == uuids(0)
+    assert found({'name': 'prefix*'}) == uuids(0, 2)
+    assert found({'min': '>=3'}) == uuids(0)
+    assert found({'range': 'v1..v2', 'name': 'prefix*', 'min': '>=3'}) == uuids(0)
+    assert set(r.uuid for r in hyperframe.iter_hfr_db(engine, tags={'min': '>=3'}, projection=True)) == uuids(0)
+
+    """ With operators """
+    assert found({'range': 'v1..v2'}, tag_operators=True) == uuids(0, 1, 2)
+    assert found({'name': 'prefix*'}, tag_operators=True) == uuids(0, 1, 2)
+    assert found({'min': '>=3'}, tag_operators=True) == uuids(1, 2)
+    assert found({'min': '=>=3'}, tag_operators=True) == uuids(0)
+
+
+def test_get_hframes_tag_operators():
+    """
+    The input tags of 'dsdt apply -it ... -ito' reach select_hfr_db through
+    DataContext.get_hframes, as do those of 'dsdt ls -t ... -to'.
+    """
+    ctxt = data_context.DataContext.__new__(data_context.DataContext)
+    ctxt.local_engine = create_engine('sqlite:///:memory:')
+    hyperframe.HyperFrameRecord.create_table(ctxt.local_engine)
+
+    hfrs = [_make_hfr({'version': '0.5'}),
+            _make_hfr({'version': '0.7'}),
+            _make_hfr({'version': '>=0.7'})]
+    for hfr in hfrs:
+        hyperframe.w_pb_db(hfr, ctxt.local_engine)
+
+    def found(tags, **kwargs):
+        return set(hfr.pb.uuid for hfr in ctxt.get_hframes(human_name='tq', tags=tags, **kwargs))
+
+    assert found({'version': '>=0.7'}) == {hfrs[2].pb.uuid}
+    assert found({'version': '>=0.7'}, tag_operators=True) == {hfrs[1].pb.uuid}